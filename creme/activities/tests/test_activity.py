@@ -50,7 +50,11 @@ from ..forms.activity import (
     UserMessagesSubCell,
 )
 from ..models import ActivitySubType, ActivityType, Calendar, Status
-from ..utils import check_activity_collisions
+from ..utils import (
+    check_activity_collisions,
+    find_activity_collisions,
+    get_busy_intervals,
+)
 from .base import (
     Activity,
     Contact,
@@ -2140,6 +2144,134 @@ class ActivityTestCase(_ActivitiesTestCase):
             busy=False, participants=[c1, c2],
         )
 
+    @skipIfCustomContact
+    def test_collision02(self):
+        "Several participants & several intervals (one query)."
+        user = self.login()
+
+        create_dt = partial(self.create_datetime, year=2010, month=10)
+        create_activity = partial(
+            Activity.objects.create, user=user, type_id=constants.ACTIVITYTYPE_MEETING,
+        )
+        act1 = create_activity(
+            title='meet01',
+            start=create_dt(day=1, hour=12), end=create_dt(day=1, hour=13),
+        )
+        act2 = create_activity(
+            title='meet02', busy=True,
+            start=create_dt(day=8, hour=14), end=create_dt(day=8, hour=15),
+        )
+        act3 = create_activity(
+            title='meet03', is_deleted=True,
+            start=create_dt(day=15, hour=12), end=create_dt(day=15, hour=13),
+        )
+
+        create_contact = partial(Contact.objects.create, user=user)
+        c1 = create_contact(first_name='Ryoga', last_name='Hibiki')
+        c2 = create_contact(first_name='Ranma', last_name='Saotome')
+        c3 = create_contact(first_name='Akane', last_name='Tendo')
+
+        create_rel = partial(
+            Relation.objects.create, user=user, type_id=constants.REL_SUB_PART_2_ACTIVITY,
+        )
+        create_rel(subject_entity=c1, object_entity=act1)
+        create_rel(subject_entity=c2, object_entity=act1)
+        create_rel(subject_entity=c2, object_entity=act2)
+        create_rel(subject_entity=c3, object_entity=act3)
+
+        # Weekly occurrences
+        intervals = [
+            (create_dt(day=day, hour=12, minute=30), create_dt(day=day, hour=14, minute=30))
+            for day in (1, 8, 15)
+        ]
+
+        with self.assertNumQueries(1):
+            collisions = find_activity_collisions(
+                intervals=intervals, participants=[c1, c2, c3],
+            )
+
+        self.assertDictEqual(
+            {
+                c1.id: [(*intervals[0], act1)],
+                c2.id: [(*intervals[1], act2), (*intervals[0], act1)],
+            },
+            {**collisions},
+        )
+
+        # Not busy
+        self.assertDictEqual(
+            {c2.id: [(*intervals[1], act2)]},
+            {**find_activity_collisions(
+                intervals=intervals, participants=[c1, c2, c3], busy=False,
+            )},
+        )
+
+        # Excluded activity
+        self.assertDictEqual(
+            {c2.id: [(*intervals[1], act2)]},
+            {**find_activity_collisions(
+                intervals=intervals, participants=[c1, c2, c3],
+                exclude_activity_id=act1.id,
+            )},
+        )
+
+    @skipIfCustomContact
+    def test_busy_intervals(self):
+        user = self.login()
+
+        create_dt = partial(self.create_datetime, year=2010, month=10, day=1)
+        create_activity = partial(
+            Activity.objects.create,
+            user=user, type_id=constants.ACTIVITYTYPE_MEETING, busy=True,
+        )
+        act1 = create_activity(
+            title='meet01', start=create_dt(hour=8), end=create_dt(hour=10),
+        )
+        act2 = create_activity(
+            title='meet02', start=create_dt(hour=9), end=create_dt(hour=11),
+        )
+        act3 = create_activity(
+            title='meet03', start=create_dt(hour=14), end=create_dt(hour=20),
+        )
+        act4 = create_activity(
+            title='meet04', start=create_dt(hour=12), end=create_dt(hour=13), busy=False,
+        )
+
+        create_contact = partial(Contact.objects.create, user=user)
+        c1 = create_contact(first_name='Ryoga', last_name='Hibiki')
+        c2 = create_contact(first_name='Ranma', last_name='Saotome')
+
+        create_rel = partial(
+            Relation.objects.create,
+            user=user, subject_entity=c1, type_id=constants.REL_SUB_PART_2_ACTIVITY,
+        )
+        for activity in (act1, act2, act3, act4):
+            create_rel(object_entity=activity)
+
+        start = create_dt(hour=9, minute=30)
+        end = create_dt(hour=18)
+
+        with self.assertNumQueries(1):
+            busy_intervals = get_busy_intervals([c1, c2], start=start, end=end)
+
+        self.assertDictEqual(
+            {
+                c1.id: [(start, create_dt(hour=11)), (create_dt(hour=14), end)],
+                c2.id: [],
+            },
+            busy_intervals,
+        )
+
+        # Not busying activities
+        self.assertListEqual(
+            [
+                (start, create_dt(hour=11)),
+                (create_dt(hour=12), create_dt(hour=13)),
+                (create_dt(hour=14), end),
+            ],
+            get_busy_intervals([c1], start=start, end=end, busy_only=False)[c1.id],
+        )
+
     def test_listviews(self):
         user = self.login()
         self.assertFalse(Activity.objects.all())
@@ -2485,7 +2617,8 @@ class ActivityTestCase(_ActivitiesTestCase):
         self.assertEqual('attachment; filename="Calendar.ics"', response['Content-Disposition'])
 
         # content = force_text(response.content)
-        content = force_str(response.content)
+        # content = force_str(response.content)
+        content = force_str(b''.join(response.streaming_content))
         self.assertStartsWith(
             content,
             'BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//CremeCRM//CremeCRM//EN\n'
@@ -960,6 +960,200 @@ class CalendarTestCase(_ActivitiesTestCase):
         )
         self.assertEqual(act4.id, data[3]['id'])
 
+    @skipIfCustomActivity
+    def test_activities_data_etag(self):
+        user = self.login()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2013, month=3, day=1)
+        end   = create_dt(year=2013, month=3, day=31, hour=23, minute=59)
+
+        create = partial(
+            Activity.objects.create,
+            user=user, type_id=constants.ACTIVITYTYPE_TASK,
+        )
+        act1 = create(
+            title='Act#1',
+            start=start + timedelta(days=1), end=start + timedelta(days=2),
+        )
+        act1.calendars.set([cal])
+
+        url = reverse('activities__calendars_activities')
+        data = {
+            'calendar_id': [cal.id],
+            'start': int(start.timestamp()),
+            'end': int(end.timestamp()),
+        }
+
+        response1 = self.assertGET200(url, data=data)
+        etag = response1.get('ETag')
+        self.assertTrue(etag)
+        self.assertTrue(response1.get('Last-Modified'))
+        self.assertIn('no-cache', response1.get('Cache-Control'))
+        self.assertEqual([act1.id], [d['id'] for d in response1.json()])
+
+        # Nothing changed
+        response2 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response2.status_code)
+        self.assertEqual(etag, response2.get('ETag'))
+        self.assertFalse(response2.content)
+
+        # New activity
+        act2 = create(
+            title='Act#2',
+            start=start + timedelta(days=3), end=start + timedelta(days=4),
+        )
+        act2.calendars.set([cal])
+
+        response3 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response3.status_code)
+        self.assertNotEqual(etag, response3.get('ETag'))
+        self.assertCountEqual([act1.id, act2.id], [d['id'] for d in response3.json()])
+        etag = response3.get('ETag')
+
+        # Removed activity
+        act2.delete()
+        response4 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response4.status_code)
+        self.assertNotEqual(etag, response4.get('ETag'))
+        etag = response4.get('ETag')
+
+        # Modified calendar
+        cal.color = 'FF0000' if cal.color != 'FF0000' else '00FF00'
+        cal.save()
+        response5 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response5.status_code)
+        self.assertNotEqual(etag, response5.get('ETag'))
+        etag = response5.get('ETag')
+
+        # Linked calendar (the activity is not modified)
+        cal2 = Calendar.objects.create(user=user, name='Cal #2')
+        act1.calendars.add(cal2)
+        data['calendar_id'].append(cal2.id)
+
+        response6 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response6.status_code)
+        etag = response6.get('ETag')
+
+        response7 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response7.status_code)
+
+        # Unlinked calendar
+        act1.calendars.remove(cal2)
+        response8 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response8.status_code)
+        self.assertNotEqual(etag, response8.get('ETag'))
+
+    @skipIfCustomActivity
+    def test_activities_data_etag_credentials(self):
+        user = self.login(is_superuser=False, allowed_apps=['activities'])
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_sc = partial(SetCredentials.objects.create, role=self.role)
+        create_sc(value=EntityCredentials.VIEW, set_type=SetCredentials.ESET_ALL)
+
+        start = self.create_datetime(year=2013, month=3, day=1)
+        act = Activity.objects.create(
+            user=user, type_id=constants.ACTIVITYTYPE_TASK, title='Act#1',
+            start=start + timedelta(days=1), end=start + timedelta(days=2),
+        )
+        act.calendars.set([cal])
+
+        url = reverse('activities__calendars_activities')
+        data = {
+            'calendar_id': [cal.id],
+            'start': int(start.timestamp()),
+            'end': int((start + timedelta(days=30)).timestamp()),
+        }
+
+        response1 = self.assertGET200(url, data=data)
+        self.assertFalse(response1.json()[0]['editable'])
+        etag = response1.get('ETag')
+
+        response2 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response2.status_code)
+
+        # The activity becomes editable
+        create_sc(value=EntityCredentials.CHANGE, set_type=SetCredentials.ESET_OWN)
+
+        response3 = self.client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response3.status_code)
+        self.assertNotEqual(etag, response3.get('ETag'))
+        self.assertTrue(response3.json()[0]['editable'])
+
+    @skipIfCustomActivity
+    def test_activities_data_changed_since(self):
+        user = self.login()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2013, month=3, day=1)
+        end   = create_dt(year=2013, month=3, day=31, hour=23, minute=59)
+
+        create = partial(
+            Activity.objects.create,
+            user=user, type_id=constants.ACTIVITYTYPE_TASK,
+        )
+        act1 = create(
+            title='Act#1',
+            start=start + timedelta(days=1), end=start + timedelta(days=2),
+        )
+        act2 = create(
+            title='Act#2',
+            start=start + timedelta(days=3), end=start + timedelta(days=4),
+        )
+
+        for act in (act1, act2):
+            act.calendars.set([cal])
+
+        Activity.objects.filter(id=act1.id).update(
+            modified=create_dt(year=2013, month=2, day=1),
+        )
+        Activity.objects.filter(id=act2.id).update(
+            modified=create_dt(year=2013, month=2, day=10),
+        )
+
+        other_cal = Calendar.objects.create(user=user, name='Other calendar')
+
+        url = reverse('activities__calendars_activities')
+        data = {
+            'calendar_id': [cal.id, other_cal.id],
+            'start': int(start.timestamp()),
+            'end': int(end.timestamp()),
+            'changed_since': int(create_dt(year=2013, month=2, day=5).timestamp()),
+        }
+
+        # Links unknown by the client => all the activities
+        content1 = self.assertGET200(url, data=data).json()
+        self.assertIsInstance(content1, dict)
+        self.assertCountEqual(
+            [act1.id, act2.id], [d['id'] for d in content1.get('activities')],
+        )
+        self.assertCountEqual([act1.id, act2.id], content1.get('ids'))
+
+        links_version = content1.get('links_version')
+        self.assertIsInstance(links_version, str)
+
+        content2 = self.assertGET200(
+            url, data={**data, 'links_version': links_version},
+        ).json()
+        self.assertEqual([act2.id], [d['id'] for d in content2.get('activities')])
+        self.assertCountEqual([act1.id, act2.id], content2.get('ids'))
+        self.assertEqual(links_version, content2.get('links_version'))
+
+        # The links changed, not the activities => all the activities
+        act1.calendars.add(other_cal)
+
+        content3 = self.assertGET200(
+            url, data={**data, 'links_version': links_version},
+        ).json()
+        self.assertCountEqual(
+            [(act1.id, cal.id), (act1.id, other_cal.id), (act2.id, cal.id)],
+            [(d['id'], d['calendar']) for d in content3.get('activities')],
+        )
+        self.assertNotEqual(links_version, content3.get('links_version'))
+
     @skipIfCustomActivity
     @override_settings(ACTIVITIES_DEFAULT_CALENDAR_IS_PUBLIC=False)
     def test_activities_data_multiple_users_private_default(self):
@@ -16,14 +16,16 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from django.db.models.query_utils import Q
+from collections import defaultdict
+
+from django.db.models import F, Q, QuerySet
 from django.utils.timezone import localtime
 from django.utils.translation import gettext as _
 
-from creme.creme_core.models import Relation, SettingValue
+from creme.creme_core.models import SettingValue
 
 from . import get_activity_model
-from .constants import FLOATING_TIME, NARROW, REL_SUB_PART_2_ACTIVITY
+from .constants import FLOATING_TIME, NARROW, REL_OBJ_PART_2_ACTIVITY
 from .setting_keys import auto_subjects_key
 
 
@@ -39,6 +41,118 @@ def get_last_day_of_a_month(date):
     return last_day
 
 
+def _colliding_activities(participant_ids, intervals, busy=True, exclude_activity_id=None):
+    """Get the activities of some participants which collide with some intervals
+    of time ; all the participants & all the intervals are managed by one query.
+    @param participant_ids: IDs of Contacts.
+    @param intervals: Sequence of tuples (start, end) ; naive datetimes are not accepted.
+    @param busy: If False, only the activities which busy their participants
+           are retrieved.
+    @param exclude_activity_id: ID of an Activity to ignore (generally the
+           edited one), or None.
+    @return: Iterator on tuples (participant_id, activity). An activity appears
+             once per participant ; the activities are ordered by start
+             (most recent first).
+    """
+    if not participant_ids or not intervals:
+        return
+
+    collision_test = Q()
+    for start, end in intervals:
+        collision_test |= ~(Q(end__lte=start) | Q(start__gte=end))
+
+    activities = get_activity_model().objects.filter(
+        collision_test,
+        is_deleted=False,
+        floating_type__in=(NARROW, FLOATING_TIME),
+        relations__type=REL_OBJ_PART_2_ACTIVITY,
+        relations__object_entity__in=participant_ids,
+    ).annotate(participant_id=F('relations__object_entity'))
+
+    if not busy:
+        activities = activities.filter(busy=True)
+
+    if exclude_activity_id is not None:
+        activities = activities.exclude(id=exclude_activity_id)
+
+    for activity in activities:
+        yield activity.participant_id, activity
+
+
+def find_activity_collisions(intervals, participants, busy=True, exclude_activity_id=None):
+    """Find which participants are busy during some intervals of time
+    (e.g. the occurrences of a recurring activity).
+    Only one query is performed, whatever the numbers of participants & intervals.
+    @param intervals: Sequence of tuples (start, end).
+    @param participants: Sequence of Contacts.
+    @param busy: Boolean ; does the checked activity busy its participants?
+           If False, only the busying activities are considered as colliding.
+    @param exclude_activity_id: ID of an Activity to ignore, or None.
+    @return: A dictionary {participant_id: [(start, end, activity), ...]}, where
+             (start, end) is the checked interval colliding with <activity>.
+             The participants without collision are not in the dictionary.
+    """
+    collisions = defaultdict(list)
+
+    for participant_id, activity in _colliding_activities(
+        participant_ids=[p.id for p in participants],
+        intervals=intervals,
+        busy=busy,
+        exclude_activity_id=exclude_activity_id,
+    ):
+        a_start = activity.start
+        a_end = activity.end
+
+        for start, end in intervals:
+            if a_end > start and a_start < end:
+                collisions[participant_id].append((start, end, activity))
+
+    return collisions
+
+
+def get_busy_intervals(participants, start, end, busy_only=True):
+    """Get the busy periods of some participants over a range of dates
+    (free/busy information).
+    @param participants: Sequence of Contacts.
+    @param start: Start of the range.
+    @param end: End of the range.
+    @param busy_only: If True (default), only the activities which busy their
+           participants are used.
+    @return: A dictionary {participant_id: [(start, end), ...]}. The periods are
+             sorted, merged when they overlap, & truncated to the range.
+             Each participant gets an entry (possibly an empty list).
+    """
+    activities_per_participant = defaultdict(list)
+
+    for participant_id, activity in _colliding_activities(
+        participant_ids=[p.id for p in participants],
+        intervals=[(start, end)],
+        busy=not busy_only,
+    ):
+        activities_per_participant[participant_id].append(activity)
+
+    busy_intervals = {}
+
+    for participant in participants:
+        merged = []
+
+        for activity in sorted(
+            activities_per_participant[participant.id], key=lambda a: a.start,
+        ):
+            a_start = max(activity.start, start)
+            a_end = min(activity.end, end)
+
+            if merged and a_start <= merged[-1][1]:
+                if a_end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], a_end)
+            else:
+                merged.append((a_start, a_end))
+
+        busy_intervals[participant.id] = merged
+
+    return busy_intervals
+
+
 def check_activity_collisions(
         activity_start,
         activity_end,
@@ -48,39 +162,20 @@ def check_activity_collisions(
     if not activity_start:
         return
 
-    collision_test = ~(Q(end__lte=activity_start) | Q(start__gte=activity_end))
-    collisions = []
+    collisions = find_activity_collisions(
+        intervals=[(activity_start, activity_end)],
+        participants=participants,
+        busy=busy,
+        exclude_activity_id=exclude_activity_id,
+    )
+    messages = []
 
     for participant in participants:
-        # Find activities of participant
-        activity_req = Relation.objects.filter(
-            subject_entity=participant.id, type=REL_SUB_PART_2_ACTIVITY,
-        )
-
-        # Exclude current activity if asked
-        if exclude_activity_id is not None:
-            activity_req = activity_req.exclude(object_entity=exclude_activity_id)
-
-        # Get id of activities of participant
-        activity_ids = activity_req.values_list('object_entity__id', flat=True)
-
-        # Do collision request
-        # TODO: can be done with less queries ?
-        #           Activity.objects.filter(
-        #               relations__object_entity=participant.id,
-        #               relations__object_entity__type=REL_OBJ_PART_2_ACTIVITY,
-        #           ).filter(collision_test)
-        busy_args = {} if busy else {'busy': True}
-        # TODO: test is_deleted=True
-        colliding_activity = get_activity_model().objects.filter(
-            collision_test,
-            is_deleted=False,
-            pk__in=activity_ids,
-            floating_type__in=(NARROW, FLOATING_TIME),
-            **busy_args
-        ).first()
-
-        if colliding_activity is not None:
+        participant_collisions = collisions.get(participant.id)
+
+        if participant_collisions:
+            # NB: the most recent colliding activity is used
+            colliding_activity = participant_collisions[0][2]
             collision_start = max(
                 activity_start.time(), localtime(colliding_activity.start).time(),
             )
@@ -88,7 +183,7 @@ def check_activity_collisions(
                 activity_end.time(), localtime(colliding_activity.end).time(),
             )
 
-            collisions.append(
+            messages.append(
                 _(
                     '{participant} already participates to the activity '
                     '«{activity}» between {start} and {end}.'
@@ -100,7 +195,7 @@ def check_activity_collisions(
                 )
             )
 
-    return collisions
+    return messages
 
 
 def get_ical_date(date_time):
@@ -109,16 +204,38 @@ def get_ical_date(date_time):
     return f'{dt.year}{dt.month:02}{dt.day:02}T{dt.hour:02}{dt.minute:02}{dt.second:02}Z'
 
 
+_ICAL_HEADER = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//CremeCRM//CremeCRM//EN
+"""
+_ICAL_FOOTER = '\nEND:VCALENDAR'
+
+
+def iter_ical(activities, chunk_size=256):
+    """Generate a normalized iCalendar string piece by piece (useful to stream
+    the export of a large number of activities).
+    @param activities: Iterable of Activities ; if it's a QuerySet, the
+           activities are retrieved by chunks.
+    @param chunk_size: Size of the chunks used to retrieve the activities of a QuerySet.
+    """
+    if isinstance(activities, QuerySet):
+        activities = activities.select_related('type').iterator(chunk_size=chunk_size)
+
+    yield _ICAL_HEADER
+
+    for activity in activities:
+        yield activity.as_ical_event()
+
+    yield _ICAL_FOOTER
+
+
 def get_ical(activities):
     """Return a normalized iCalendar string
     BEWARE: each parameter has to be separated by \n ONLY no spaces allowed!
     Example : BEGIN:VCALENDAR\nVERSION:2.0
+    See iter_ical() too.
     """
-    return """BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:-//CremeCRM//CremeCRM//EN
-{}
-END:VCALENDAR""".format(''.join(a.as_ical_event() for a in activities))
+    return ''.join(iter_ical(activities))
 
 
 def is_auto_orga_subject_enabled():
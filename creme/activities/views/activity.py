@@ -24,7 +24,7 @@ from functools import partial
 from dateutil.parser import isoparse
 from django.db.models import Q
 from django.forms.forms import BaseForm
-from django.http import Http404, HttpResponse
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
 from django.utils.timezone import get_current_timezone, is_naive, make_naive
@@ -48,7 +48,7 @@ from creme.persons import get_contact_model
 from .. import constants, custom_forms, get_activity_model
 from ..forms import activity as act_forms
 from ..models import ActivitySubType, ActivityType
-from ..utils import get_ical
+from ..utils import iter_ical
 
 Activity = get_activity_model()
 _CREATION_PERM_STR = cperm(Activity)
@@ -295,8 +295,9 @@ def download_ical(request):
         queryset=Activity.objects.filter(pk__in=act_ids), user=request.user,
     )
 
-    return HttpResponse(
-        get_ical(activities),
+    # NB: the content is streamed, because a lot of activities can be exported.
+    return StreamingHttpResponse(
+        iter_ical(activities),
         headers={
             'Content-Type': 'text/calendar',
             'Content-Disposition': 'attachment; filename="Calendar.ics"',
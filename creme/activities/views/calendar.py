@@ -21,22 +21,30 @@ from collections import defaultdict
 from copy import copy
 from datetime import datetime, timedelta
 from functools import partial
+from hashlib import sha256
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
-from django.db.models import Prefetch, Q
+from django.db.models import Count, Max, Prefetch, Q
 from django.db.transaction import atomic
 from django.http import HttpResponse
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from django.utils.timezone import get_current_timezone, make_naive, now
-from django.utils.translation import gettext
+from django.utils.translation import get_language, gettext
 from django.utils.translation import gettext_lazy as _
 
 from creme.creme_core.core.exceptions import ConflictError
 from creme.creme_core.http import CremeJsonResponse
-from creme.creme_core.models import DeletionCommand, EntityCredentials, Job
+from creme.creme_core.models import (
+    DeletionCommand,
+    EntityCredentials,
+    Job,
+    SetCredentials,
+)
 from creme.creme_core.utils import bool_from_str_extended, get_from_POST_or_404
 from creme.creme_core.utils.dates import make_aware_dt
 from creme.creme_core.utils.unicode_collation import collator
@@ -200,6 +208,8 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
     response_class = CremeJsonResponse
     start_arg = 'start'
     end_arg = 'end'
+    changed_since_arg = 'changed_since'
+    links_version_arg = 'links_version'
 
     # Example of possible format (NB: "activity" is passed in the context)
     # label = '[{activity.status}] {activity.title}'
@@ -207,11 +217,69 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
     calendar_ids_session_key = CalendarView.calendar_ids_session_key
 
     def get(self, request, *args, **kwargs):
-        return self.response_class(
-            self.get_activities_data(request),
-            safe=False,  # Result is not a dictionary
+        user = request.user
+
+        calendar_ids = [cal.id for cal in self.get_calendars(request)]
+        self.save_calendar_ids(request, calendar_ids)
+
+        start = self.get_start(request)
+        end   = self.get_end(request=request, start=start)
+
+        activities = self.get_activities_queryset(
+            user=user, calendar_ids=calendar_ids, start=start, end=end,
+        )
+        links_version = self.get_links_version(
+            activities=activities, calendar_ids=calendar_ids,
+        )
+        etag, last_modified = self.get_validators(
+            user=user, activities=activities, calendar_ids=calendar_ids,
+            links_version=links_version,
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
         )
 
+        if response is None:
+            changed_since = self._get_datetime(request=request, key=self.changed_since_arg)
+
+            if changed_since is None:
+                data = self._get_activities_data(
+                    user=user, activities=activities, calendar_ids=calendar_ids,
+                )
+            else:
+                # Delta mode: the client gets only the activities modified since
+                # its last call, & the IDs of all the activities in the range
+                # (so it can remove the missing ones).
+                # NB: linking/unlinking a calendar & an activity does not modify
+                #     the activity ; so all the activities are sent when the
+                #     links have changed since the version known by the client.
+                changed_activities = (
+                    activities.filter(modified__gt=changed_since)
+                    if request.GET.get(self.links_version_arg) == links_version else
+                    activities
+                )
+                data = {
+                    'activities': self._get_activities_data(
+                        user=user, activities=changed_activities, calendar_ids=calendar_ids,
+                    ),
+                    'ids': [*activities.values_list('id', flat=True)],
+                    'links_version': links_version,
+                }
+
+            response = self.response_class(
+                data,
+                safe=False,  # Result is not a dictionary
+            )
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+
+        # NB: the browser must check the freshness of the feed at each call.
+        patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
     def get_activity_label(self, activity):
         return self.label.format(activity=activity)
 
@@ -262,17 +330,10 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
                 copied.calendar = calendar
                 yield copied
 
-    def get_activities_data(self, request):
-        user = request.user
-
-        calendar_ids = [cal.id for cal in self.get_calendars(request)]
-        self.save_calendar_ids(request, calendar_ids)
-
-        start = self.get_start(request)
-        end   = self.get_end(request=request, start=start)
-
+    def get_activities_queryset(self, *, user, calendar_ids, start, end):
+        "Get the viewable activities of some calendars in a range of dates."
         # TODO: label when no calendar related to the participant of an unavailability
-        activities = EntityCredentials.filter(
+        return EntityCredentials.filter(
             user,
             Activity.objects
                     .filter(is_deleted=False)
@@ -282,13 +343,93 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
             # NB: we already filter by calendars ; maybe a future Django version
             #     will allow us to annotate the calendar ID directly
             #     (distinct() would have to be removed of course)
-                    .prefetch_related(Prefetch(
-                        'calendars',
-                        queryset=Calendar.objects.filter(id__in=calendar_ids),
-                        to_attr='concerned_calendars',
-                    ))
         )
 
+    @staticmethod
+    def get_credentials_version(user) -> str:
+        "Get a string which changes when the credentials of the user change."
+        if user.is_superuser:
+            return 'superuser'
+
+        return repr([
+            user.role_id,
+            sorted(team.id for team in user.teams),
+            [
+                *SetCredentials.objects
+                               .filter(role=user.role_id)
+                               .order_by('id')
+                               .values_list(
+                                   'id', 'value', 'set_type', 'ctype_id', 'forbidden',
+                                   'efilter_id',
+                               ),
+            ],
+        ])
+
+    @staticmethod
+    def get_links_version(*, activities, calendar_ids) -> str:
+        "Get a string which changes when the activities are linked to/unlinked from the calendars."
+        calendars_field = Activity._meta.get_field('calendars')
+        activity_fname = calendars_field.m2m_column_name()  # e.g. "activity_id"
+        calendar_fname = calendars_field.m2m_reverse_name()  # e.g. "calendar_id"
+        links = calendars_field.remote_field.through.objects.filter(**{
+            f'{activity_fname}__in': activities.values('id'),
+            f'{calendar_fname}__in': calendar_ids,
+        }).order_by(activity_fname, calendar_fname)
+        links_info = ','.join(
+            f'{activity_id}:{calendar_id}'
+            for activity_id, calendar_id in links.values_list(activity_fname, calendar_fname)
+        )
+
+        return sha256(links_info.encode()).hexdigest()
+
+    def get_validators(self, *, user, activities, calendar_ids, links_version=None):
+        """Get the validators of the feed.
+        The ETag changes when an activity is created/modified/removed in the
+        range (the number of activities & their last modification are used),
+        when an activity is linked to/unlinked from a calendar, when a calendar
+        is modified (colors are sent), or when the credentials of the user
+        change (see get_credentials_version()).
+        @param links_version: Result of get_links_version() (computed if None).
+        @return: Tuple (etag, last_modified) ; <last_modified> is a timestamp
+                 (or None if there is no activity).
+        """
+        info = activities.aggregate(last_modified=Max('modified'), count=Count('id'))
+        last_modified = info['last_modified']
+        calendars_info = ','.join(
+            f'{cal_id}:{color}'
+            for cal_id, color in Calendar.objects.filter(id__in=calendar_ids)
+                                                 .order_by('id')
+                                                 .values_list('id', 'color')
+        )
+
+        # NB: linking/unlinking a calendar & an activity does not modify the
+        #     activity, so the links are used too.
+        if links_version is None:
+            links_version = self.get_links_version(
+                activities=activities, calendar_ids=calendar_ids,
+            )
+
+        raw_etag = '#'.join([
+            str(user.id),
+            get_language(),
+            str(info['count']),
+            last_modified.isoformat() if last_modified else '',
+            calendars_info,
+            links_version,
+            self.get_credentials_version(user),
+        ])
+
+        return (
+            quote_etag(sha256(raw_etag.encode()).hexdigest()),
+            int(last_modified.timestamp()) if last_modified else None,
+        )
+
+    def _get_activities_data(self, *, user, activities, calendar_ids):
+        activities = activities.prefetch_related(Prefetch(
+            'calendars',
+            queryset=Calendar.objects.filter(id__in=calendar_ids),
+            to_attr='concerned_calendars',
+        ))
         activity_2_dict = partial(self._activity_2_dict, user=user)
 
         return [
@@ -296,6 +437,23 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
             for a in self._get_one_activity_per_calendar(activities)
         ]
 
+    def get_activities_data(self, request):
+        user = request.user
+
+        calendar_ids = [cal.id for cal in self.get_calendars(request)]
+        self.save_calendar_ids(request, calendar_ids)
+
+        start = self.get_start(request)
+        end   = self.get_end(request=request, start=start)
+
+        return self._get_activities_data(
+            user=user,
+            activities=self.get_activities_queryset(
+                user=user, calendar_ids=calendar_ids, start=start, end=end,
+            ),
+            calendar_ids=calendar_ids,
+        )
+
     @staticmethod
     def get_date_q(start, end):
         return Q(start__range=(start, end)) | Q(end__gt=start, start__lt=end)
@@ -28,23 +28,24 @@ class AssistantsTestCase(CremeTestCase):
         creator(contact01, contact02)
         old_count = HistoryLine.objects.count()
 
-        response = self.client.post(
-            self.build_merge_url(contact01, contact02),
-            follow=True,
-            data={
-                'user_1':      user.id,
-                'user_2':      user.id,
-                'user_merged': user.id,
-
-                'first_name_1':      contact01.first_name,
-                'first_name_2':      contact02.first_name,
-                'first_name_merged': contact01.first_name,
-
-                'last_name_1':      contact01.last_name,
-                'last_name_2':      contact02.last_name,
-                'last_name_merged': contact01.last_name,
-            },
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.build_merge_url(contact01, contact02),
+                follow=True,
+                data={
+                    'user_1':      user.id,
+                    'user_2':      user.id,
+                    'user_merged': user.id,
+
+                    'first_name_1':      contact01.first_name,
+                    'first_name_2':      contact02.first_name,
+                    'first_name_merged': contact01.first_name,
+
+                    'last_name_1':      contact01.last_name,
+                    'last_name_2':      contact02.last_name,
+                    'last_name_merged': contact01.last_name,
+                },
+            )
         self.assertNoFormError(response)
 
         self.assertDoesNotExist(contact02)
@@ -118,21 +118,22 @@ class CommercialApproachTestCase(CremeTestCase, BrickTestCaseMixin):
 
         old_count = HistoryLine.objects.count()
 
-        response = self.client.post(
-            self.build_merge_url(orga01, orga02),
-            follow=True,
-            data={
-                'user_1':      user.id,
-                'user_2':      user.id,
-                'user_merged': user.id,
-
-                'name_1':      orga01.name,
-                'name_2':      orga02.name,
-                'name_merged': orga01.name,
-
-                'subject_to_vat_merged': orga01.subject_to_vat,
-            },
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.build_merge_url(orga01, orga02),
+                follow=True,
+                data={
+                    'user_1':      user.id,
+                    'user_2':      user.id,
+                    'user_merged': user.id,
+
+                    'name_1':      orga01.name,
+                    'name_2':      orga02.name,
+                    'name_merged': orga01.name,
+
+                    'subject_to_vat_merged': orga01.subject_to_vat,
+                },
+            )
         self.assertNoFormError(response)
 
         self.assertDoesNotExist(orga02)
@@ -1,6 +1,7 @@
 from functools import partial
 
 from django.contrib.contenttypes.models import ContentType
+from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.translation import gettext as _
 from django.utils.translation import ngettext
@@ -8,6 +9,7 @@ from django.utils.translation import ngettext
 from creme.creme_config import bricks
 from creme.creme_config.constants import BRICK_STATE_HIDE_DELETED_CFIELDS
 from creme.creme_core.creme_jobs import deletor_type
+from creme.creme_core.global_info import clear_global_info
 from creme.creme_core.models import (
     BrickState,
     CremeEntity,
@@ -507,6 +509,7 @@ class CustomFieldsTestCase(BrickTestCaseMixin, CremeTestCase):
             data={'id': cfield.id},
         )
 
+    @override_settings(CONFIG_CACHE='default')
     def test_restore01(self):
         self.login()
 
@@ -516,6 +519,8 @@ class CustomFieldsTestCase(BrickTestCaseMixin, CremeTestCase):
             field_type=CustomField.DATETIME,
             is_deleted=True,
         )
+        self.assertTrue(CustomField.objects.get_for_model(FakeContact)[cfield.id].is_deleted)
+
         self.assertPOST200(
             reverse('creme_config__restore_custom_field'),
             data={'id': cfield.id},
@@ -524,6 +529,10 @@ class CustomFieldsTestCase(BrickTestCaseMixin, CremeTestCase):
         cfield = self.assertStillExists(cfield)
         self.assertFalse(cfield.is_deleted)
 
+        # The shared cache is invalidated
+        clear_global_info()
+        self.assertFalse(CustomField.objects.get_for_model(FakeContact)[cfield.id].is_deleted)
+
     def test_restore02(self):
         "Not allowed."
         self.login(is_superuser=False)  # admin_4_apps=('creme_core',)
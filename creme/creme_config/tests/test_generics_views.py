@@ -774,7 +774,9 @@ class GenericModelConfigTestCase(CremeTestCase, BrickTestCaseMixin):
             dcom,
         )
 
-        deletor_type.execute(dcom.job)
+        with self.captureOnCommitCallbacks(execute=True):
+            deletor_type.execute(dcom.job)
+
         self.assertDoesNotExist(status2del)
         self.assertEqual(default_status, self.refresh(ticket1).status)
 
@@ -871,7 +873,9 @@ class GenericModelConfigTestCase(CremeTestCase, BrickTestCaseMixin):
         self.assertEqual(FakeTicket, replacer.model_field.model)
         self.assertEqual('priority', replacer.model_field.name)
 
-        deletor_type.execute(dcom.job)
+        with self.captureOnCommitCallbacks(execute=True):
+            deletor_type.execute(dcom.job)
+
         self.assertDoesNotExist(prio2del)
 
         fallback_priority = self.refresh(ticket1).priority
@@ -113,9 +113,14 @@ class CustomFieldRestoration(base.ConfigDeletion):
     id_arg = 'id'
 
     def perform_deletion(self, request):
-        CustomField.objects.filter(
+        # NB: we use save() (not QuerySet.update()) to send the signal
+        #     "post_save" (the shared configuration cache is invalidated).
+        for cfield in CustomField.objects.filter(
             id=utils.get_from_POST_or_404(request.POST, self.id_arg),
-        ).update(is_deleted=False)
+            is_deleted=True,
+        ):
+            cfield.is_deleted = False
+            cfield.save()
 
 
 class EnumMixin:
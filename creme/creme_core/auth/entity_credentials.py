@@ -67,10 +67,18 @@ class EntityCredentials:
 
         return False
 
-    def __init__(self, user, entity: CremeEntity):
+    def __init__(self,
+                 user,
+                 entity: CremeEntity,
+                 filtered_ids: dict[int, set[int]] | None = None,
+                 ):
         """Constructor.
         @param user: <django.contrib.auth.get_user_model()> instance.
         @param entity: CremeEntity (or child class) instance.
+        @param filtered_ids: Optional result of
+               'UserRole.get_filtered_entity_ids()' (on a sequence of entities
+               which contains 'entity') ; it avoids queries to evaluate the
+               filters of credentials.
         """
         if user.is_superuser:
             value = self._ALL_CREDS
@@ -81,7 +89,7 @@ class EntityCredentials:
             sandbox = entity.sandbox
 
             if sandbox is None or self._sandbox_is_allowed(sandbox=sandbox, user=user):
-                value = role.get_perms(user, entity)
+                value = role.get_perms(user, entity, filtered_ids=filtered_ids)
             else:
                 value = self.NONE
 
@@ -16,6 +16,10 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
 from django.http.response import HttpResponseBase
 
 
@@ -51,13 +55,23 @@ class ExportBackend:
     id: unique export backend identifier: the file extension matching this backend.
     verbose_name: defines the backend for the user, used in the select backend popup.
     help_text: currently unused.
+    extension: extension of the generated file ; if it's empty, the id is used.
+    streaming: if True, the backend can produce its content chunk by chunk
+       (see stream() & get_streaming_response()) ; so the whole file does not
+       have to be built in memory before being sent.
     """
     id: str = 'OVERLOAD ME'
     verbose_name: str = 'OVERLOAD ME'
     help_text: str = 'OVERLOAD ME'
+    extension: str = ''
+    streaming: bool = False
 
     response: HttpResponseBase
 
+    # If the backend stores the file in a FileRef when save() is called, it
+    # should reference it here (needed to export in a job).
+    fileref = None
+
     def writerow(self, row):
         """
         Appends a row.
@@ -72,3 +86,24 @@ class ExportBackend:
               instance of <django.contrib.auth.get_user_model()>.
         """
         raise NotImplementedError
+
+    def stream(self, rows: Iterable[list]) -> Iterator[str | bytes]:
+        """Generator which produces the content of the file, chunk by chunk.
+        Only needed if the attribute "streaming" is True.
+        @param rows: Iterable of rows (see writerow()) ; it's consumed lazily.
+        """
+        raise NotImplementedError
+
+    def get_streaming_response(self,
+                               rows: Iterable[list],
+                               filename: str,
+                               user) -> HttpResponseBase:
+        """Build a response which sends the content of the file while the rows
+        are generated.
+        Only needed if the attribute "streaming" is True.
+        @param rows: Iterable of rows (see writerow()) ; it's consumed lazily.
+        @param filename: file name.
+        @param user: owner of the file ;
+              instance of <django.contrib.auth.get_user_model()>.
+        """
+        raise NotImplementedError
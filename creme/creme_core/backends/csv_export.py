@@ -17,8 +17,9 @@
 ################################################################################
 
 import csv
+from io import StringIO
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.template.defaultfilters import slugify
 from django.utils.translation import gettext_lazy as _
 
@@ -30,20 +31,50 @@ class CSVExportBackend(ExportBackend):
     verbose_name = _("CSV File (delimiter: ',')")
     delimiter: str = ','
     help_text = ''
+    extension = 'csv'
+    streaming = True
+
+    # Minimal size (in characters) of the chunks produced by stream()
+    chunk_size: int = 64 * 1024
 
     def __init__(self):
         self.response = HttpResponse(content_type='text/csv')
-        self.writer = csv.writer(
-            self.response,
-            quoting=csv.QUOTE_ALL,
-            delimiter=self.delimiter,
-        )
+        self.writer = self._build_writer(self.response)
+
+    def _build_writer(self, f):
+        return csv.writer(f, quoting=csv.QUOTE_ALL, delimiter=self.delimiter)
+
+    def _get_content_disposition(self, filename):
+        return f'attachment; filename="{slugify(filename)}.csv"'
 
     def writerow(self, row):
         return self.writer.writerow(row)
 
     def save(self, filename, user):
-        self.response['Content-Disposition'] = f'attachment; filename="{slugify(filename)}.csv"'
+        self.response['Content-Disposition'] = self._get_content_disposition(filename)
+
+    def stream(self, rows):
+        buffer = StringIO()
+        writerow = self._build_writer(buffer).writerow
+        chunk_size = self.chunk_size
+
+        for row in rows:
+            writerow(row)
+
+            if buffer.tell() >= chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        last_chunk = buffer.getvalue()
+        if last_chunk:
+            yield last_chunk
+
+    def get_streaming_response(self, rows, filename, user):
+        response = StreamingHttpResponse(self.stream(rows), content_type='text/csv')
+        response['Content-Disposition'] = self._get_content_disposition(filename)
+
+        return response
 
 
 class SemiCSVExportBackend(CSVExportBackend):
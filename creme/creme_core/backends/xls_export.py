@@ -51,6 +51,7 @@ class XLSExportBackend(ExportBackend):
                 basename(path),
             ),
         )
+        self.fileref = fileref
         self.response = HttpResponseRedirect(fileref.get_download_absolute_url())
         self.writer.save(path)
 
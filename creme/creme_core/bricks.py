@@ -31,6 +31,7 @@ from .gui.history import html_history_registry
 from .models import (
     CremeEntity,
     CremeProperty,
+    CremePropertyType,
     CustomField,
     EntityJobResult,
     Imprint,
@@ -49,7 +50,10 @@ logger = logging.getLogger(__name__)
 
 class PropertiesBrick(QuerysetBrick):
     id_ = QuerysetBrick.generate_id('creme_core', 'properties')
-    dependencies = (CremeProperty,)
+    # NB: the types are displayed (text, enabled) ; so their modifications
+    #     invalidate the cached fragments too.
+    dependencies = (CremeProperty, CremePropertyType)
+    cache_render = True
     verbose_name = _('Properties')
     description = _(
         'Displays the Properties attached to the current entity. '
@@ -219,6 +223,8 @@ class HistoryBrick(QuerysetBrick):
     )
     dependencies = '*'
     read_only = True
+    lazy = True  # NB: the lines of history can be numerous & slow to explain
+    concurrent_render = True
     order_by = '-id'  # faster than '-date'
     template_name = 'creme_core/bricks/history.html'
 
@@ -494,6 +500,21 @@ class MassImportJobErrorsBrick(JobErrorsBrick):
         return super()._build_queryset(job).prefetch_related('real_entity')
 
 
+class MassExportJobResultBrick(Brick):
+    id_ = Brick.generate_id('creme_core', 'mass_export_job_result')
+    dependencies = (Job,)
+    verbose_name = _('Exported file')
+    template_name = 'creme_core/bricks/massexport-result.html'
+    configurable = False
+
+    def detailview_display(self, context):
+        job = context['job']
+
+        return self._render(self.get_template_context(
+            context, fileref=job.type.get_fileref(job),
+        ))
+
+
 class JobsBrick(QuerysetBrick):
     id_ = QuerysetBrick.generate_id('creme_core', 'jobs')
     verbose_name = _('Jobs')
@@ -20,13 +20,15 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from itertools import chain
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Sequence
 
 from django.db import models
+from django.db.models.signals import post_save, pre_save
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
-from creme.creme_core.models import CremeEntity
+from creme.creme_core.models import CremeEntity, HistoryLine
+from creme.creme_core.models.entity import _SEARCH_FIELD_MAX_LENGTH
 
 
 class CastError(Exception):
@@ -247,6 +249,11 @@ class BatchAction:
 
         return False
 
+    @property
+    def field_name(self) -> str:
+        "Name of the modified field."
+        return self._field_name
+
     def __str__(self):
         op = self._operator
         field = self._model._meta.get_field(self._field_name).verbose_name
@@ -258,3 +265,77 @@ class BatchAction:
                 field=field, operator=op, value=self._value,
             )
         )
+
+
+def can_bulk_update(model: type[CremeEntity]) -> bool:
+    """Can the instances of a model be updated with bulk_update_entities()?
+    The models which override the method save() need it to be called
+    (e.g. to update some related instances).
+    """
+    return model.save is CremeEntity.save
+
+
+def bulk_update_entities(model: type[CremeEntity],
+                         entities: Sequence[CremeEntity],
+                         field_names: Iterable[str],
+                         ) -> None:
+    """Write some modified entities with QuerySet.bulk_update() ; it's useful
+    to modify many entities in jobs (see can_bulk_update()).
+    Like with a regular save(), the signal "pre_save" is sent for each entity,
+    & the fields modified by their pre-save hook (e.g. "modified") or by
+    CremeEntity.save() are updated too ; the lines of history are created in
+    bulk, & the signal "post_save" is sent for each entity.
+    Notice that only these fields & the fields <field_names> are written (the
+    modifications of other fields by the receivers of "pre_save" are ignored).
+
+    @param model: Class inheriting CremeEntity.
+    @param entities: Instances of <model> ; they must have been retrieved from
+           the DB before being modified (like with a regular edition).
+    @param field_names: Names of the modified fields.
+    """
+    manager = model._default_manager
+    db = manager.db
+    updated_fields = [*field_names, 'header_filter_search_field']
+
+    # NB: bulk_update() does not call CremeEntity.save() & Field.pre_save()
+    #     (e.g. "auto_now" of the field "modified"), & it does not send the
+    #     signal "pre_save" ; so we do the same work here.
+    hooked_fields = [
+        field
+        for field in model._meta.concrete_fields
+        if not field.primary_key and type(field).pre_save is not models.Field.pre_save
+    ]
+
+    for entity in entities:
+        entity.header_filter_search_field = \
+            entity._search_field_value()[:_SEARCH_FIELD_MAX_LENGTH]
+
+        pre_save.send(
+            sender=model, instance=entity, raw=False, using=db, update_fields=None,
+        )
+
+        for field in hooked_fields:
+            attname = field.attname
+            old_value = getattr(entity, attname)
+            new_value = field.pre_save(entity, False)
+
+            if new_value != old_value:
+                setattr(entity, attname, new_value)
+
+                if field.name not in updated_fields:
+                    updated_fields.append(field.name)
+
+    manager.bulk_update(entities, fields=updated_fields)
+    HistoryLine.create_edition_lines(entities)
+
+    # NB: bulk_update() does not send the signal "post_save", so we send it
+    #     in order to call the receivers (search index, cache of bricks,
+    #     synchronisation of related instances...). The lines of history
+    #     have already been created (the receiver of the history does not
+    #     find modifications anymore). The argument "update_fields" is None
+    #     like with a regular save() (some receivers ignore partial saves).
+    for entity in entities:
+        post_save.send(
+            sender=model, instance=entity, created=False, raw=False,
+            using=db, update_fields=None,
+        )
@@ -0,0 +1,285 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Cache for the rendered bricks of detail-views.
+
+The bricks which opt in (see the attribute 'Brick.cache_render') are rendered
+once, & their HTML is stored in a cache of Django (see settings.BRICK_CACHE).
+The key of a fragment is built from:
+  - the brick's ID, the entity (& the date of its last modification).
+  - the user, the language, the state of the brick (see BrickState) & its
+    context (pagination, order...).
+  - the versions of the brick's dependencies (see 'Brick.dependencies' &
+    'Brick.relation_type_deps') ; these versions are incremented when an
+    instance of the related models is saved/deleted.
+So the obsolete fragments are never read again (& they expire naturally).
+The context of the brick stored in the session by the rendering (pagination,
+order...) is stored with the HTML, & the session is updated when the fragment
+is used.
+"""
+
+from __future__ import annotations
+
+import logging
+from hashlib import sha256
+from json import dumps as json_dump
+from typing import TYPE_CHECKING, Iterator
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+from django.db.models import Model, signals
+from django.dispatch import receiver
+from django.utils.translation import get_language
+
+from ..models import CremeUser, Relation, SetCredentials, UserRole
+from .cache import ConfigCache
+
+if TYPE_CHECKING:
+    from ..gui.bricks import Brick
+
+logger = logging.getLogger(__name__)
+
+
+class BrickRenderCache(ConfigCache):
+    """Cache shared between requests (& processes if the cache backend is
+    shared) for the HTML of the bricks.
+
+    When settings.BRICK_CACHE is None, the cache is disabled: the bricks are
+    always rendered.
+    """
+    key_prefix = 'creme_core-brick'
+
+    # The credentials of the users are used by (almost) all the bricks
+    common_dependencies = (CremeUser, UserRole, SetCredentials)
+
+    def __init__(self, alias: str | None = None, timeout: int | None = None):
+        """Constructor.
+        @param alias: Name of the Django's cache to use (see settings.CACHES) ;
+               by default settings.BRICK_CACHE is used.
+        @param timeout: Expiration delay of fragments (in seconds) ;
+               by default settings.BRICK_CACHE_TIMEOUT is used.
+        """
+        super().__init__(alias=alias, timeout=timeout)
+        self._watched_models: set[type[Model]] = {*self.common_dependencies}
+
+    @property
+    def backend(self) -> BaseCache | None:
+        alias = self._alias or settings.BRICK_CACHE
+
+        return None if alias is None else caches[alias]
+
+    @property
+    def timeout(self) -> int:
+        timeout = self._timeout
+        return settings.BRICK_CACHE_TIMEOUT if timeout is None else timeout
+
+    @staticmethod
+    def model_namespace(model: type[Model]) -> str:
+        meta = model._meta
+        return f'{meta.app_label}.{meta.model_name}'
+
+    @staticmethod
+    def rtype_namespace(rtype_id: str) -> str:
+        return f'creme_core.relation.{rtype_id}'
+
+    def _iter_namespaces(self, brick: Brick) -> Iterator[str]:
+        model_namespace = self.model_namespace
+
+        for model in self.common_dependencies:
+            yield model_namespace(model)
+
+        for dep in brick.dependencies:
+            if dep is Relation and brick.relation_type_deps:
+                yield from map(self.rtype_namespace, brick.relation_type_deps)
+            else:
+                yield model_namespace(dep)
+
+    def is_cacheable(self, brick: Brick) -> bool:
+        return brick.cache_render and brick.dependencies != '*'
+
+    def watch(self, brick_class: type[Brick]) -> None:
+        """The versions of the dependencies of a class of Brick are incremented
+        when an instance of these models is saved/deleted.
+        Hint: the classes registered in the brick registry are watched.
+        """
+        if brick_class.cache_render and brick_class.dependencies != '*':
+            self._watched_models.update(brick_class.dependencies)
+
+    def invalidate_instance(self, instance: Model) -> bool:
+        """Increment the versions related to a saved/deleted instance.
+        @return True if the model of the instance is watched.
+        """
+        model = type(instance)
+        watched = self._watched_models
+        invalidated = False
+
+        for watched_model in (model, *model._meta.get_parent_list()):
+            if watched_model not in watched:
+                continue
+
+            self.invalidate(self.model_namespace(watched_model))
+            invalidated = True
+
+            if watched_model is Relation:
+                self.invalidate(self.rtype_namespace(instance.type_id))
+
+        return invalidated
+
+    def build_key(self, brick: Brick, context: dict) -> str | None:
+        """Build the key of the fragment of a brick.
+        @return A string, or None if the brick cannot be cached.
+        """
+        backend = self.backend
+        entity = context.get('object')
+        if backend is None or entity is None or not self.is_cacheable(brick):
+            return None
+
+        from ..gui.bricks import BricksManager
+
+        brick_id = brick.id_
+        user = context['user']
+        request = context['request']
+        state = BricksManager.get(context).get_state(brick_id, user)
+
+        key_data = [
+            brick_id,
+            entity.id,
+            entity.modified.isoformat() if entity.modified else None,
+            user.id,
+            get_language(),
+            [state.is_open, state.show_empty_fields, state.json_extra_data],
+            self._get_session_state(brick, context),
+            # NB: pagination, order...
+            sorted(
+                (k, v) for k, v in request.GET.items() if k.startswith(f'{brick_id}_')
+            ),
+            brick.reloading_info,
+            [
+                self._get_version(backend, namespace)
+                for namespace in self._iter_namespaces(brick)
+            ],
+        ]
+
+        return '{}-fragment-{}'.format(
+            self.key_prefix,
+            sha256(
+                json_dump(key_data, default=str, sort_keys=True).encode()
+            ).hexdigest(),
+        )
+
+    def render(self, brick: Brick, method_name: str, context: dict) -> str:
+        """Render a brick ; the HTML is retrieved from the cache if possible.
+        @param brick: Instance of Brick.
+        @param method_name: Name of the render method ("detailview_display"...).
+        @param context: Template context (the brick can modify it).
+        """
+        render_func = getattr(brick, method_name)
+
+        if method_name != 'detailview_display':
+            return render_func(context)
+
+        key = self.build_key(brick, context)
+        if key is None:
+            return render_func(context)
+
+        backend = self.backend
+
+        try:
+            fragment = backend.get(key)
+        except Exception as e:
+            logger.warning('BrickRenderCache.render(): error with the backend (%s)', e)
+            return render_func(context)
+
+        if fragment is None:
+            html = render_func(context)
+            session_state = self._get_session_state(brick, context)
+
+            try:
+                keys = {key}
+
+                # NB: the rendering can store the context of the brick in the
+                #     session (e.g. the order of a QuerysetBrick) ; the next
+                #     rendering with this context gives the same HTML, so we
+                #     store the fragment with the key of this context too.
+                if session_state is not None:
+                    keys.add(self.build_key(brick, context))
+
+                backend.set_many(
+                    {k: (html, session_state) for k in keys},
+                    timeout=self.timeout,
+                )
+            except Exception as e:
+                logger.warning('BrickRenderCache.render(): error with the backend (%s)', e)
+        else:
+            html, session_state = fragment
+            self._set_session_state(brick, context, session_state)
+
+        return html
+
+    # NB: the rendering of a brick can store its context (pagination, order...)
+    #     in the session (see Brick.get_template_context()) ; so we store this
+    #     context with the HTML & we update the session when the fragment is used.
+    @staticmethod
+    def _get_session_state(brick: Brick, context: dict) -> dict | None:
+        request = context['request']
+        base_url = request.GET.get('base_url', request.path)
+
+        return request.session.get(
+            'brickcontexts_manager', {},
+        ).get(base_url, {}).get(brick.id_)
+
+    @staticmethod
+    def _set_session_state(brick: Brick, context: dict, state: dict | None) -> None:
+        if state is None:
+            return
+
+        request = context['request']
+        base_url = request.GET.get('base_url', request.path)
+        session = request.session
+        url_contexts = session.setdefault('brickcontexts_manager', {}).setdefault(base_url, {})
+
+        if url_contexts.get(brick.id_) != state:
+            url_contexts[brick.id_] = state
+            session.modified = True
+
+
+brick_render_cache = BrickRenderCache()
+
+
+def _invalidate_fragments(instance):
+    if (
+        brick_render_cache.backend is not None
+        and brick_render_cache.invalidate_instance(instance)
+    ):
+        # NB: another process can render the brick before the end of the
+        #     current transaction (see ConfigCache.invalidate_on_change()).
+        transaction.on_commit(lambda: brick_render_cache.invalidate_instance(instance))
+
+
+@receiver(signals.post_save, dispatch_uid='creme_core-brick_cache_save')
+@receiver(signals.post_delete, dispatch_uid='creme_core-brick_cache_delete')
+def _invalidate_on_change(sender, instance, **kwargs):
+    _invalidate_fragments(instance)
+
+
+@receiver(signals.m2m_changed, dispatch_uid='creme_core-brick_cache_m2m')
+def _invalidate_on_m2m_change(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidate_fragments(instance)
@@ -0,0 +1,295 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Rendering of a group of bricks (see the views which reload the bricks).
+
+The bricks which accept it (see the attribute 'Brick.concurrent_render') can
+be rendered concurrently by a pool of threads (shared by all the requests ;
+each thread uses its own connection to the database), while the other bricks
+are rendered by the thread of the request. Each concurrent brick has a budget
+(time & number of queries) ; a brick which exceeds it is replaced by an error
+placeholder instead of stalling the whole reloading (& its queries are
+interrupted by the database).
+The concurrent bricks do not modify the session & the shared data directly
+(they are not thread-safe): they work on copies, & their modifications are
+applied by the thread of the request.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent import futures
+from contextlib import nullcontext
+from copy import copy, deepcopy
+from time import monotonic
+from typing import TYPE_CHECKING, Sequence
+
+from django.conf import settings
+from django.db import OperationalError, connection
+from django.utils import timezone, translation
+
+from ..global_info import clear_global_info, set_global_info
+from ..utils.concurrent import get_shared_executor, release_db_connections
+from ..utils.db import statement_timeout
+from .brick_cache import brick_render_cache
+
+if TYPE_CHECKING:
+    from ..gui.bricks import Brick
+
+logger = logging.getLogger(__name__)
+
+
+class BrickBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudget:
+    """Execution wrapper for the database connection (see
+    'django.db.backends.base.base.BaseDatabaseWrapper.execute_wrapper()')
+    which interrupts the rendering of a brick (by raising BrickBudgetExceeded)
+    when it performs too many queries, or when it runs out of time.
+    """
+    def __init__(self, max_queries: int = 0, timeout: float = 0):
+        """Constructor.
+        @param max_queries: Maximum number of queries ; 0 means "no limit".
+        @param timeout: Time budget (in seconds) from the creation of the
+               budget ; 0 means "no limit".
+        """
+        self.max_queries = max_queries
+        self.deadline = monotonic() + timeout if timeout else None
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+
+        max_queries = self.max_queries
+        if max_queries and self.count > max_queries:
+            raise BrickBudgetExceeded(f'more than {max_queries} queries')
+
+        deadline = self.deadline
+        if deadline is not None and monotonic() > deadline:
+            raise BrickBudgetExceeded('time budget exceeded')
+
+        return execute(sql, params, many, context)
+
+
+class _SessionRecorder(dict):
+    """Stand-in for the session, used by a brick rendered by another thread.
+    It contains a copy of the contexts of the bricks (the only data of the
+    session used by the bricks) ; the modifications are applied to the real
+    session by the thread of the request (see apply()).
+    """
+    key = 'brickcontexts_manager'
+
+    def __init__(self, session):
+        super().__init__()
+        self.modified = False
+        self._original = original = session.get(self.key) or {}
+        self[self.key] = deepcopy(original)
+
+    def apply(self, session) -> None:
+        if not self.modified:
+            return
+
+        key = self.key
+        original = self._original
+
+        for base_url, brick_contexts in self[key].items():
+            original_contexts = original.get(base_url) or {}
+
+            for brick_id, brick_context in brick_contexts.items():
+                if original_contexts.get(brick_id) != brick_context:
+                    session.setdefault(key, {}).setdefault(base_url, {})[brick_id] = brick_context
+                    session.modified = True
+
+
+class _IsolatedContext:
+    """Copy of the template context for a brick rendered by another thread ;
+    the request uses a _SessionRecorder, & the shared data are copied.
+    The modifications are applied to the original context by the thread of the
+    request (see apply()).
+    """
+    def __init__(self, context: dict):
+        request = copy(context['request'])
+        request.session = self.session = _SessionRecorder(request.session)
+
+        shared = context['shared']
+        self._shared_snapshot = {**shared}
+        self.context = {**context, 'request': request, 'shared': {**shared}}
+
+    def apply(self, context: dict) -> None:
+        self.session.apply(context['request'].session)
+
+        shared = context['shared']
+        snapshot = self._shared_snapshot
+        missing = object()
+
+        for key, value in self.context['shared'].items():
+            if snapshot.get(key, missing) is not value:
+                shared[key] = value
+
+
+class BricksRenderer:
+    """Render a group of bricks with the same template context.
+
+    The context is copied for each brick (in order to avoid annoying
+    side-effects), but the dictionary with the key "shared" (see
+    'creme_core.context_processors.get_shared_data') is the same instance for
+    all the bricks, in order to explicitly share data between bricks ; notice
+    that the bricks rendered concurrently cannot rely on the order of rendering.
+    """
+    def __init__(self,
+                 method_name: str = 'detailview_display',
+                 workers: int | None = None,
+                 timeout: float | None = None,
+                 max_queries: int | None = None,
+                 ):
+        """Constructor.
+        @param method_name: Name of the Brick's render method
+               ("detailview_display", "home_display"...).
+        @param workers: Number of threads ; 0 means that all the bricks are
+               rendered sequentially by the current thread (without budget).
+               By default, settings.BRICK_RELOAD_WORKERS is used.
+        @param timeout: Time budget of the rendering of a brick (in seconds).
+               By default, settings.BRICK_RELOAD_TIMEOUT is used.
+        @param max_queries: Maximum number of queries performed by the
+               rendering of a brick ; 0 means "no limit".
+               By default, settings.BRICK_RELOAD_MAX_QUERIES is used.
+        """
+        self.method_name = method_name
+        self.workers = settings.BRICK_RELOAD_WORKERS if workers is None else workers
+        self.timeout = settings.BRICK_RELOAD_TIMEOUT if timeout is None else timeout
+        self.max_queries = (
+            settings.BRICK_RELOAD_MAX_QUERIES if max_queries is None else max_queries
+        )
+
+    def _render(self, brick: Brick, context: dict) -> str:
+        # NB: the HTML can be retrieved from the cache (see Brick.cache_render).
+        return brick_render_cache.render(brick, self.method_name, {**context})
+
+    def _render_in_thread(self, brick: Brick, context: dict, language: str, tz) -> str:
+        set_global_info(user=context['user'], per_request_cache={})
+        timeout = self.timeout
+        budget = QueryBudget(max_queries=self.max_queries, timeout=timeout)
+
+        # NB: the queries are interrupted by the DB, so a brick which has
+        #     exceeded its budget releases its thread. The queries which set &
+        #     reset the timeout are not counted by the budget (so the timeout
+        #     is always reset, even if the deadline has passed).
+        timeout_context = statement_timeout(timeout) if timeout else nullcontext()
+
+        try:
+            with translation.override(language), timezone.override(tz):
+                with timeout_context:
+                    with connection.execute_wrapper(budget):
+                        return self._render(brick, context)
+        except OperationalError as e:
+            if budget.deadline is None or monotonic() < budget.deadline:
+                raise
+
+            raise BrickBudgetExceeded('time budget exceeded') from e
+        finally:
+            # The thread (& its connection) is re-used for other bricks
+            clear_global_info()
+            release_db_connections()
+
+    def error_display(self, brick: Brick, context: dict) -> str:
+        "Render the placeholder of a brick which has exceeded its budget."
+        return brick.error_display({**context})
+
+    def _submit_all(self,
+                    executor,
+                    bricks,
+                    contexts: list[_IsolatedContext],
+                    ) -> list[futures.Future]:
+        render = self._render_in_thread
+        language = translation.get_language()
+        tz = timezone.get_current_timezone()
+
+        return [
+            executor.submit(render, brick, isolated.context, language, tz)
+            for brick, isolated in zip(bricks, contexts)
+        ]
+
+    def render(self, bricks: Sequence[Brick], context: dict) -> list[tuple[str, str]]:
+        """Render some bricks.
+        @param bricks: Instances of Brick.
+        @param context: Template context (a dictionary) ; it must contain the
+               BricksManager which contains the bricks.
+        @return: A list of tuples (brick_ID, brick_HTML), in the order of <bricks>.
+        """
+        workers = self.workers
+        concurrent_indices = [
+            i for i, brick in enumerate(bricks) if brick.concurrent_render
+        ] if workers > 0 else []
+
+        if not concurrent_indices:
+            return [(brick.id_, self._render(brick, context)) for brick in bricks]
+
+        from ..gui.bricks import BricksManager
+
+        # NB: the states of the bricks are retrieved (& cached) by the current
+        #     thread, because the cache of the BricksManager is not thread-safe.
+        BricksManager.get(context).get_state(bricks[0].id_, context['user'])
+
+        renders: list[str | None] = [None] * len(bricks)
+        workers = min(workers, len(concurrent_indices))
+        timeout = self.timeout
+        # NB: the pool is shared by all the requests, in order to bound the
+        #     number of threads/connections to the DB.
+        executor = get_shared_executor('creme_bricks', self.workers)
+        start = monotonic()
+
+        # NB: the copies are built by the current thread, before the other
+        #     bricks modify the context.
+        isolated_contexts = [_IsolatedContext(context) for _i in concurrent_indices]
+        submitted = self._submit_all(
+            executor, [bricks[i] for i in concurrent_indices], isolated_contexts,
+        )
+
+        # The other bricks are rendered by the current thread meanwhile
+        for i, brick in enumerate(bricks):
+            if not brick.concurrent_render:
+                renders[i] = self._render(brick, context)
+
+        for index, (i, isolated, future) in enumerate(
+            zip(concurrent_indices, isolated_contexts, submitted)
+        ):
+            brick = bricks[i]
+            # NB: the bricks are rendered by "waves" of <workers> bricks ;
+            #     each wave has its own time budget.
+            deadline = start + timeout * (1 + index // workers)
+
+            try:
+                renders[i] = future.result(timeout=max(0, deadline - monotonic()))
+            except (futures.TimeoutError, BrickBudgetExceeded) as e:
+                # NB: we do not wait for the bricks which have exceeded their
+                #     time budget (their queries are interrupted) ; the ones
+                #     which have not started yet are not rendered at all. The
+                #     modifications of these bricks are ignored.
+                future.cancel()
+                logger.warning(
+                    'BricksRenderer: the brick "%s" has exceeded its budget (%s)',
+                    brick.id_, e or 'timeout',
+                )
+
+                renders[i] = self.error_display(brick, context)
+            else:
+                isolated.apply(context)
+
+        return [(brick.id_, html) for brick, html in zip(bricks, renders)]
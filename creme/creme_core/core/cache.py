@@ -0,0 +1,200 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Cache for configuration instances, shared between requests.
+
+The configuration models (FieldsConfig, CustomField, SettingValue...) are read
+very often but rarely modified. The readers of these models use the per-request
+cache (see 'creme_core.global_info'), and the cache of this module as second
+level, in order to avoid the queries in the following requests.
+
+The values are stored in a cache of Django (see settings.CONFIG_CACHE) with
+versioned keys: each namespace (i.e. group of related values) has a version
+number, which is incremented when an instance of the related models is
+saved/deleted (see ConfigCache.invalidate_on_change()) ; so the obsolete values
+are never read again (& they expire naturally).
+"""
+
+from __future__ import annotations
+
+import logging
+from time import time_ns
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+from django.db.models import Model, signals
+
+from ..global_info import get_per_request_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigCache:
+    """Cache shared between requests (& processes if the cache backend is
+    shared) for the configuration instances.
+
+    When settings.CONFIG_CACHE is None, the cache is disabled: get_many()
+    returns nothing & set_many() does nothing.
+    """
+    key_prefix = 'creme_core-config'
+
+    def __init__(self, alias: str | None = None, timeout: int | None = None):
+        """Constructor.
+        @param alias: Name of the Django's cache to use (see settings.CACHES) ;
+               by default settings.CONFIG_CACHE is used.
+        @param timeout: Expiration delay of values (in seconds) ;
+               by default settings.CONFIG_CACHE_TIMEOUT is used.
+        """
+        self._alias = alias
+        self._timeout = timeout
+
+    @property
+    def backend(self) -> BaseCache | None:
+        "Get the Django's cache which stores the values (None means 'disabled')."
+        alias = self._alias or settings.CONFIG_CACHE
+
+        return None if alias is None else caches[alias]
+
+    @property
+    def timeout(self) -> int:
+        timeout = self._timeout
+        return settings.CONFIG_CACHE_TIMEOUT if timeout is None else timeout
+
+    def _version_key(self, namespace: str) -> str:
+        return f'{self.key_prefix}-{namespace}-version'
+
+    @staticmethod
+    def _initial_version() -> int:
+        # NB: we use the time to get an initial version, in order to avoid
+        #     re-using the version of old keys if the version's key has been
+        #     evicted from the cache.
+        return time_ns() // 1000
+
+    def _get_version(self, backend: BaseCache, namespace: str) -> int:
+        # The versions are retrieved once per request
+        versions = get_per_request_cache().setdefault(
+            f'{self.key_prefix}_cache_versions', {},
+        )
+        version = versions.get(namespace)
+
+        if version is None:
+            version_key = self._version_key(namespace)
+            version = backend.get(version_key)
+
+            if version is None:
+                backend.add(version_key, self._initial_version(), timeout=None)
+                version = backend.get(version_key)
+
+            versions[namespace] = version
+
+        return version
+
+    def _prefix(self, backend: BaseCache, namespace: str) -> str:
+        return f'{self.key_prefix}-{namespace}-{self._get_version(backend, namespace)}-'
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> dict[str, Any]:
+        """Get several values from the cache.
+        @param namespace: Group of values (e.g. 'my_app-my_model').
+        @param keys: Keys of the values in the namespace (strings).
+        @return A dictionary with the found values (key: key in the namespace).
+        """
+        backend = self.backend
+        if backend is None:
+            return {}
+
+        prefix = self._prefix(backend, namespace)
+        prefix_length = len(prefix)
+
+        try:
+            found = backend.get_many([prefix + key for key in keys])
+        except Exception as e:
+            logger.warning('ConfigCache.get_many(): error with the backend (%s)', e)
+            return {}
+
+        return {full_key[prefix_length:]: value for full_key, value in found.items()}
+
+    def get(self, namespace: str, key: str, default=None):
+        return self.get_many(namespace, [key]).get(key, default)
+
+    def set_many(self, namespace: str, data: dict[str, Any]) -> None:
+        """Store several values in the cache.
+        @param namespace: Group of values.
+        @param data: Dictionary; keys are keys in the namespace (strings).
+        """
+        backend = self.backend
+        if backend is None or not data:
+            return
+
+        prefix = self._prefix(backend, namespace)
+
+        try:
+            backend.set_many(
+                {prefix + key: value for key, value in data.items()},
+                timeout=self.timeout,
+            )
+        except Exception as e:
+            logger.warning('ConfigCache.set_many(): error with the backend (%s)', e)
+
+    def set(self, namespace: str, key: str, value) -> None:
+        self.set_many(namespace, {key: value})
+
+    def invalidate(self, namespace: str) -> None:
+        "All the values of the namespace become obsolete."
+        backend = self.backend
+        if backend is None:
+            return
+
+        version_key = self._version_key(namespace)
+        versions = get_per_request_cache().setdefault(
+            f'{self.key_prefix}_cache_versions', {},
+        )
+
+        try:
+            version = backend.incr(version_key)
+        except ValueError:  # The key does not exist
+            version = max(self._initial_version(), versions.get(namespace, 0) + 1)
+            backend.set(version_key, version, timeout=None)
+
+        versions[namespace] = version
+
+    def invalidate_on_change(self, namespace: str, *models: type[Model]) -> None:
+        """Invalidate a namespace each time an instance of the given models is
+        saved or deleted.
+        Notice that the methods QuerySet.update() & QuerySet.bulk_create() do
+        not send signals ; so you have to call invalidate() yourself.
+        """
+        def _handler(sender, **kwargs):
+            self.invalidate(namespace)
+
+            # NB: another process can put in the cache the value it reads before
+            #     the end of the current transaction.
+            transaction.on_commit(lambda: self.invalidate(namespace))
+
+        # NB: 'weak=False' because _handler is a local function
+        for model in models:
+            for signal in (signals.post_save, signals.post_delete):
+                signal.connect(
+                    _handler, sender=model, weak=False,
+                    dispatch_uid=f'creme_core-config_cache-{namespace}-{model.__name__}',
+                )
+
+
+config_cache = ConfigCache()
@@ -468,7 +468,7 @@ class EntityCellRegularField(EntityCell):
             #       (see EntityCellFunctionField too)
             from ..gui.field_printers import field_printers_registry
 
-            self._printer_html = printer = field_printers_registry.build_field_printer(
+            self._printer_html = printer = field_printers_registry.get_field_printer(
                 model=entity.__class__,
                 field_name=self.value,
                 output='html',
@@ -482,7 +482,7 @@ class EntityCellRegularField(EntityCell):
         if printer is None:
             from ..gui.field_printers import field_printers_registry
 
-            self._printer_csv = printer = field_printers_registry.build_field_printer(
+            self._printer_csv = printer = field_printers_registry.get_field_printer(
                 model=entity.__class__,
                 field_name=self.value,
                 output='csv',
@@ -707,7 +707,7 @@ class EntityCellRelation(EntityCell):
               is_hidden: bool = False,
               ) -> EntityCellRelation | None:
         try:
-            rtype = RelationType.objects.get(pk=rtype_id)
+            rtype = RelationType.objects.get_cached(rtype_id)
         except RelationType.DoesNotExist:
             logger.warning(
                 'EntityCellRelation: relation type "%s" does not exist',
@@ -727,9 +727,15 @@ class EntityCellRelation(EntityCell):
 
     @staticmethod
     def populate_entities(cells, entities, user):
-        CremeEntity.populate_relations(
-            entities,
-            [cell.relation_type.id for cell in cells]
+        rtype_ids = [cell.relation_type.id for cell in cells]
+        CremeEntity.populate_relations(entities, rtype_ids)
+
+        # The permissions on the related entities are checked when rendering
+        user.populate_credentials(
+            relation.real_object
+            for entity in entities
+            for rtype_id in rtype_ids
+            for relation in entity.get_relations(rtype_id)
         )
 
     def render_html(self, entity, user):
@@ -22,6 +22,7 @@ import logging
 from datetime import datetime
 from decimal import Decimal
 from functools import partial
+from typing import Sequence
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist
@@ -51,6 +52,7 @@ from creme.creme_core.models import (
 from creme.creme_core.models.custom_field import _TABLES
 from creme.creme_core.utils.date_range import date_range_registry
 from creme.creme_core.utils.dates import date_2_dict, make_aware_dt
+from creme.creme_core.utils.db import populate_related
 from creme.creme_core.utils.meta import FieldInfo, is_date_field
 
 from . import (
@@ -64,6 +66,15 @@ from . import (
 logger = logging.getLogger(__name__)
 
 
+def _populate_field_chain(*, entities: Sequence[CremeEntity], field_info: FieldInfo) -> None:
+    "Retrieve the instances related by ForeignKeys in a chain of fields."
+    if len(field_info) > 1 and isinstance(field_info[0], ForeignKey):
+        populate_related(
+            entities,
+            ['__'.join(field.name for field in field_info[:-1])],
+        )
+
+
 class FilterConditionHandler:
     """A condition handler is linked to an instance of
     <creme_core.models.EntityFilterCondition> & provide the behaviour specific
@@ -110,6 +121,16 @@ class FilterConditionHandler:
         """
         raise NotImplementedError
 
+    def populate_entities(self, *, entities: Sequence[CremeEntity], user) -> None:
+        """Fill the caches of several entities, in order to call accept() on
+        each one of them with few queries (see EntityFilter.accept_many()).
+        The default implementation does nothing.
+
+        @param entities: Sequence of <CremeEntity> instances.
+        @param user: Instance of <django.contrib.auth.get_user_model()>.
+        """
+        pass
+
     @property
     def applicable_on_entity_base(self) -> bool:
         """Can this handler be applied on CremeEntity (QuerySet or simple instance)?
@@ -225,6 +246,12 @@ class SubFilterConditionHandler(FilterConditionHandler):
     def accept(self, *, entity, user):
         return self.subfilter.accept(entity=entity, user=user)
 
+    def populate_entities(self, *, entities, user):
+        subfilter = self.subfilter
+
+        if subfilter:
+            subfilter.populate_entities(entities=entities, user=user)
+
     @property
     def applicable_on_entity_base(self):
         return self.subfilter.applicable_on_entity_base
@@ -411,6 +438,9 @@ class RegularFieldConditionHandler(OperatorConditionHandlerMixin,
             accept(field_value=field_value)
         )
 
+    def populate_entities(self, *, entities, user):
+        _populate_field_chain(entities=entities, field_info=self.field_info)
+
     # TODO: multi-value is stupid for some operator (LT, GT etc...) => improve checking ???
     @classmethod
     def build(cls, *, model, name, data):
@@ -686,7 +716,18 @@ class DateRegularFieldConditionHandler(DateFieldHandlerMixin,
         BaseRegularFieldConditionHandler.__init__(self, model=model, field_name=field_name)
         DateFieldHandlerMixin.__init__(self, **kwargs)
 
-    # def accept(self, *, entity, user):  TODO ? (not needed currently for credentials filters)
+    def accept(self, *, entity, user):
+        accept = partial(self._get_date_range().accept, now=now())
+        field_value = self.field_info.value_from(entity)
+
+        return (
+            any(accept(value) for value in field_value)
+            if isinstance(field_value, list) else
+            accept(field_value)
+        )
+
+    def populate_entities(self, *, entities, user):
+        _populate_field_chain(entities=entities, field_info=self.field_info)
 
     @classmethod
     def build(cls, *, model, name, data):
@@ -790,6 +831,16 @@ class BaseCustomFieldConditionHandler(FilterConditionHandler):
     def applicable_on_entity_base(self):
         return True
 
+    def populate_entities(self, *, entities, user):
+        cfield = self.custom_field
+
+        if cfield:
+            cf_id = cfield.id
+            CremeEntity.populate_custom_values(
+                [entity for entity in entities if cf_id not in entity._cvalues_map],
+                [cfield],
+            )
+
     @property
     def custom_field(self) -> CustomField | bool:
         cfield = self._custom_field
@@ -1068,7 +1119,16 @@ class DateCustomFieldConditionHandler(DateFieldHandlerMixin,
         )
         DateFieldHandlerMixin.__init__(self, **kwargs)
 
-    # def accept(self, *, entity, user):  TODO ? (not needed currently for credentials filters)
+    def accept(self, *, entity, user):
+        cfield = self.custom_field
+        if not cfield:
+            return False
+
+        # NB: like with get_q(), an entity without value is not accepted, even
+        #     by the range "Is empty".
+        cfvalue = entity.get_custom_value(cfield)
+
+        return cfvalue is not None and self._get_date_range().accept(cfvalue.value, now=now())
 
     @classmethod
     def build(cls, *, model, name, data):
@@ -1165,6 +1225,13 @@ class BaseRelationConditionHandler(FilterConditionHandler):
     def applicable_on_entity_base(self):
         return True
 
+    def populate_entities(self, *, entities, user):
+        rtype_id = self._rtype_id
+        CremeEntity.populate_relations(
+            [entity for entity in entities if rtype_id not in entity._relations_map],
+            [rtype_id],
+        )
+
     @classmethod
     def query_for_related_conditions(cls, instance):
         return Q(
@@ -1217,8 +1284,8 @@ class RelationConditionHandler(BaseRelationConditionHandler):
 
     def accept(self, *, entity, user):
         # NB: we use get_relations() in order to get a cached result, & so avoid
-        #     additional queries when calling several times this method.
-        # TODO: add a system to populate relations when checking several entities
+        #     additional queries when calling several times this method
+        #     (see populate_entities() to fill the cache of several entities).
         relations = entity.get_relations(relation_type_id=self._rtype_id)
 
         if self._entity_id:
@@ -1226,11 +1293,7 @@ class RelationConditionHandler(BaseRelationConditionHandler):
             found = any(r.object_entity_id == entity_id for r in relations)
         elif self._ct_id:
             ct_id = self._ct_id
-            # TODO: get_relations() with real_obj_entities==False does not select_related()
-            #       => real_obj_entities = True ?
-            #          select_related() even if real_obj_entities==False ?
-            #          CT's ID stored in Relation (RealEntityForeignKey) ??
-            found = any(r.object_entity.entity_type_id == ct_id for r in relations)
+            found = any(r.object_ctype_id == ct_id for r in relations)
         else:
             found = bool(relations)
 
@@ -1407,7 +1470,46 @@ class RelationSubFilterConditionHandler(BaseRelationConditionHandler):
 
         self._exclude = exclude
 
-    # def accept(self, *, entity, user):  TODO ? (not needed currently for credentials filters)
+    def _filtered_objects(self, entity, subfilter):
+        # NB: the sub-filter only accepts the entities of its model (see get_q()),
+        #     excepted a sub-filter on CremeEntity which accepts all the entities.
+        ctype = subfilter.entity_type
+        any_ctype = ctype.model_class() is CremeEntity
+
+        for relation in entity.get_relations(self._rtype_id, real_obj_entities=True):
+            obj = relation.real_object
+
+            if any_ctype or obj.entity_type_id == ctype.id:
+                yield obj
+
+    def accept(self, *, entity, user):
+        subfilter = self.subfilter
+
+        if subfilter:
+            accept = partial(subfilter.accept, user=user)
+            found = any(
+                accept(entity=obj) for obj in self._filtered_objects(entity, subfilter)
+            )
+        else:
+            found = False
+
+        return not found if self._exclude else found
+
+    def populate_entities(self, *, entities, user):
+        super().populate_entities(entities=entities, user=user)
+
+        subfilter = self.subfilter
+        if subfilter:
+            # NB: the related entities can have different models, but the
+            #     sub-filter can only populate the entities of its model.
+            subfilter.populate_entities(
+                entities=[
+                    obj
+                    for entity in entities
+                    for obj in self._filtered_objects(entity, subfilter)
+                ],
+                user=user,
+            )
 
     @classmethod
     def build(cls, *, model, name, data):
@@ -1537,12 +1639,17 @@ class PropertyConditionHandler(FilterConditionHandler):
     def accept(self, *, entity, user):
         ptype_id = self._ptype_id
         # NB: we use get_properties() in order to get a cached result, & so avoid
-        #     additional queries when calling several times this method.
-        # TODO: add a system to populate properties when checking several entities
+        #     additional queries when calling several times this method
+        #     (see populate_entities() to fill the cache of several entities).
         accepted = any(prop.type_id == ptype_id for prop in entity.get_properties())
 
         return not accepted if self._exclude else accepted
 
+    def populate_entities(self, *, entities, user):
+        CremeEntity.populate_properties(
+            [entity for entity in entities if entity._properties is None]
+        )
+
     @property
     def applicable_on_entity_base(self):
         return True
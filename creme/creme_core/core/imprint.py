@@ -18,13 +18,78 @@
 
 from __future__ import annotations
 
+import atexit
+import logging
 from datetime import timedelta
+from threading import Lock
+from time import monotonic
 
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.signals import request_finished
 # from django.db.models.functions import Now
+from django.dispatch import receiver
 from django.utils.timezone import now
 
 from creme.creme_core.models import CremeEntity, Imprint
 
+logger = logging.getLogger(__name__)
+
+
+class ImprintBuffer:
+    """Container (thread-safe) for the Imprints which have not been written yet.
+    The imprints are written with a bulk query when the buffer contains
+    settings.IMPRINT_BUFFER_SIZE instances, or at the end of a request (i.e.
+    after the response has been sent) when the oldest instance has been added
+    more than settings.IMPRINT_BUFFER_DELAY seconds ago.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._imprints: list[Imprint] = []
+        self._oldest: float | None = None  # see monotonic()
+
+    def __len__(self):
+        return len(self._imprints)
+
+    def add(self, imprint: Imprint) -> None:
+        with self._lock:
+            imprints = self._imprints
+            imprints.append(imprint)
+
+            if self._oldest is None:
+                self._oldest = monotonic()
+
+            full = len(imprints) >= settings.IMPRINT_BUFFER_SIZE
+
+        if full:
+            self.flush()
+
+    def expired(self) -> bool:
+        "Should the imprints be written because of their age?"
+        oldest = self._oldest
+
+        return oldest is not None and monotonic() - oldest >= settings.IMPRINT_BUFFER_DELAY
+
+    def flush(self) -> None:
+        """Write the pending imprints."""
+        with self._lock:
+            imprints = self._imprints
+            self._imprints = []
+            self._oldest = None
+
+        if not imprints:
+            return
+
+        # NB: the entities can have been deleted since the creation of the imprints.
+        existing_ids = {
+            *CremeEntity.objects.filter(
+                id__in={imprint.entity_id for imprint in imprints},
+            ).values_list('id', flat=True),
+        }
+        Imprint.objects.bulk_create(
+            [imprint for imprint in imprints if imprint.entity_id in existing_ids],
+        )
+
 
 class _ImprintManager:
     class RegistrationError(Exception):
@@ -32,6 +97,7 @@ class _ImprintManager:
 
     def __init__(self):
         self._granularities: dict[type[CremeEntity], timedelta] = {}
+        self.buffer = ImprintBuffer()
 
     def register(self, model: type[CremeEntity], **timedelta_kwargs) -> _ImprintManager:
         granularity = timedelta(**timedelta_kwargs)
@@ -44,12 +110,35 @@ class _ImprintManager:
     def get_granularity(self, model: type[CremeEntity]) -> timedelta | None:
         return self._granularities.get(model)
 
+    def _buffer_imprint(self, entity: CremeEntity, user, granularity) -> Imprint | None:
+        # NB: the cache replaces the query on the existing imprints ; an
+        #     imprint is created when the key has expired (or has been evicted).
+        created = caches[DEFAULT_CACHE_ALIAS].add(
+            f'creme_core-imprint-{user.id}-{entity.id}', True,
+            timeout=granularity.total_seconds(),
+        )
+        if not created:
+            return None
+
+        imprint = Imprint(real_entity=entity, user=user)
+        self.buffer.add(imprint)
+
+        return imprint
+
     def create_imprint(self, entity: CremeEntity, user) -> Imprint | None:
+        """Create an Imprint if the model is registered & if there is no
+        recent imprint for this entity & this user.
+        When settings.IMPRINT_BUFFER_SIZE is not 0, the imprint is not saved
+        immediately (see ImprintBuffer).
+        """
         # NB: there can be some data race, & so create 2 lines when only 1
         #     should be better, but it's not a real issue (we could fix the data
         #     it in the brick, to avoid additional query here).
         granularity = self.get_granularity(entity.__class__)
 
+        if granularity is not None and settings.IMPRINT_BUFFER_SIZE:
+            return self._buffer_imprint(entity=entity, user=user, granularity=granularity)
+
         if (
             granularity is not None
             and not Imprint.objects.filter(
@@ -67,3 +156,22 @@ class _ImprintManager:
 
 
 imprint_manager = _ImprintManager()
+
+
+@receiver(request_finished, dispatch_uid='creme_core-flush_imprints')
+def _flush_expired_imprints(sender, **kwargs):
+    buffer = imprint_manager.buffer
+
+    if buffer.expired():
+        try:
+            buffer.flush()
+        except Exception:
+            logger.exception('Error when writing the pending imprints')
+
+
+@atexit.register
+def _flush_imprints():
+    try:
+        imprint_manager.buffer.flush()
+    except Exception as e:
+        logger.warning('The pending imprints cannot be written: %s', e)
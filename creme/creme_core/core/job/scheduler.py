@@ -37,6 +37,7 @@ from creme.creme_core.utils.system import (
 )
 
 from .queue import Command, get_queue
+from .worker import WorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -61,12 +62,22 @@ class JobScheduler:
     The "period" of pseudo-periodic is computed each time they are run. But
     the manager runs them regularly (see settings.PSEUDO_PERIOD) in order to
     reduce the aftermath of a redis/... connection problem.
+
+    When settings.JOBMANAGER_WORKERS is not 0, the jobs are not run in new
+    processes, but sent to a pool of pre-initialized processes (see WorkerPool).
     """
     def __init__(self):
         self._max_user_jobs = settings.MAX_USER_JOBS
         self._queue = get_queue()
         self._procs = {}  # key: job.id; value: subprocess.Popen instance
 
+        workers_count = settings.JOBMANAGER_WORKERS
+        self._workers: WorkerPool | None = WorkerPool(
+            size=workers_count,
+            max_jobs=settings.JOBMANAGER_WORKER_MAX_JOBS,
+            max_memory=settings.JOBMANAGER_WORKER_MAX_MEMORY * 1024 * 1024,
+        ) if workers_count > 0 else None
+
         # Heap, which elements are (wakeup_date, job_instance)
         #   => closer wakeup in the first element.
         self._system_jobs = []
@@ -186,6 +197,11 @@ class JobScheduler:
     def _start_job(self, job: Job):
         logger.info('JobScheduler: start %s', repr(job))
 
+        workers = self._workers
+        if workers is not None:
+            workers.run_job(job.id)
+            return
+
         self._procs[job.id] = python_subprocess(
             f'import django; '
             f'django.setup(); '
@@ -195,15 +211,39 @@ class JobScheduler:
 
     def _end_job(self, job: Job):
         logger.info('JobScheduler: end %s', repr(job))
+
+        workers = self._workers
+        if workers is not None:
+            workers.release(job.id)
+            return
+
         proc = self._procs.pop(job.id, None)
         if proc is not None:
             proc.wait()  # TODO: use return code ??
 
     def _handle_kill(self, *args):
-        logger.info('Job manager stops: %d running job(s)', len(self._procs))
+        workers = self._workers
+
+        if workers is None:
+            logger.info('Job manager stops: %d running job(s)', len(self._procs))
+        else:
+            logger.info(
+                'Job manager stops: %d running job(s)',
+                sum(1 for worker in workers if worker.job_id is not None),
+            )
+            workers.stop()
+
         self._queue.destroy()
         exit()
 
+    def workers_metrics(self) -> list[dict]:
+        """Get some information about the workers (see WorkerPool.metrics()).
+        @return A list of dictionaries (one per worker) ; the list is empty when
+                the pool of workers is disabled.
+        """
+        workers = self._workers
+        return [] if workers is None else workers.metrics()
+
     def _handle_command_end(self, cmd: Command):
         job_id = cmd.data_id
 
@@ -339,6 +379,10 @@ class JobScheduler:
 
         enable_exit_handler(self._handle_kill)
 
+        workers = self._workers
+        if workers is not None:
+            workers.fill()
+
         users_jobs = self._users_jobs
         system_jobs = self._system_jobs
         system_jobs_starts = self._system_jobs_starts
@@ -370,6 +414,9 @@ class JobScheduler:
             else:
                 print('No user job at the moment.')
 
+            if workers is not None:
+                print(f'Pool of workers: {len(workers)} process(es).')
+
             print('\nQuit the server with CTRL-BREAK.')
 
         MAX_USER_JOBS = self._max_user_jobs
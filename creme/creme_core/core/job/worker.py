@@ -0,0 +1,262 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Pool of pre-initialized ("warm") processes which run the jobs.
+
+Starting a new Python process for each job means that each job pays the
+initialization of the interpreter, of Django & of all the apps before doing
+any work. The workers of a pool are started once, and receive the IDs of the
+jobs to run through their standard input ; when a job is finished, the END
+command is still sent through the job queue (see JobType.execute()).
+
+Workers are recycled (i.e. stopped & replaced by a new process) when they have
+run a given number of jobs or when they use too much memory.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from subprocess import PIPE, Popen
+from typing import Iterator
+
+from django.utils.timezone import now
+
+from creme.creme_core.utils.system import python_subprocess
+
+logger = logging.getLogger(__name__)
+
+
+def _get_rss(pid: int) -> int | None:
+    """Get the resident memory of a process.
+    @return A size in bytes, or None if the information is not available
+            (the file-system "/proc" is only available on some platforms).
+    """
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class Worker:
+    """Scheduler-side representation of a worker process."""
+    def __init__(self, process: Popen):
+        self.process = process
+        self.started = now()
+        self.jobs_count = 0
+        self.job_id: int | None = None  # ID of the running job
+
+    def __repr__(self):
+        return (
+            f'Worker(pid={self.pid}, jobs_count={self.jobs_count}, job_id={self.job_id})'
+        )
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    @property
+    def rss(self) -> int | None:
+        return _get_rss(self.pid)
+
+    @property
+    def metrics(self) -> dict:
+        return {
+            'pid': self.pid,
+            'started': self.started,
+            'jobs_count': self.jobs_count,
+            'job_id': self.job_id,
+            'rss': self.rss,
+        }
+
+    def run_job(self, job_id: int) -> None:
+        "Send the ID of the job to run to the process."
+        self.job_id = job_id
+        self.jobs_count += 1
+
+        stdin = self.process.stdin
+        stdin.write(f'{job_id}\n'.encode())
+        stdin.flush()
+
+    def stop(self) -> None:
+        "Ask the process to stop (when it is idle) & wait for it."
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+        self.process.wait()
+
+
+class WorkerPool:
+    """Set of workers used by the JobScheduler.
+
+    There are always at least <size> workers ready ; if all the workers are busy
+    when a job must be started, a new worker is created (so the semantic of
+    system jobs & of settings.MAX_USER_JOBS is the same as without pool), and
+    the extra workers are stopped when they become idle.
+    """
+    def __init__(self, size: int, max_jobs: int = 0, max_memory: int = 0):
+        """Constructor.
+        @param size: Number of workers which are started in advance.
+        @param max_jobs: Number of jobs run by a worker before it's recycled ;
+               0 means "no limit".
+        @param max_memory: Resident memory (in bytes) from which a worker is
+               recycled (checked after each job) ; 0 means "no limit".
+        """
+        if size < 1:
+            raise ValueError(f'The size of a WorkerPool must be >= 1 (size={size})')
+
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_memory = max_memory
+
+        self._idle_workers: list[Worker] = []
+        self._busy_workers: dict[int, Worker] = {}  # Key: job ID
+
+    def __iter__(self) -> Iterator[Worker]:
+        yield from self._busy_workers.values()
+        yield from self._idle_workers
+
+    def __len__(self):
+        return len(self._idle_workers) + len(self._busy_workers)
+
+    def _create_worker(self) -> Worker:
+        worker = Worker(python_subprocess(
+            'import django; '
+            'django.setup(); '
+            'from creme.creme_core.core.job.worker import run_worker; '
+            'run_worker()',
+            stdin=PIPE,
+        ))
+        logger.info('WorkerPool: new worker (pid=%s)', worker.pid)
+
+        return worker
+
+    def _must_be_recycled(self, worker: Worker) -> bool:
+        if not worker.is_alive:
+            logger.warning('WorkerPool: the worker (pid=%s) is dead', worker.pid)
+            return True
+
+        max_jobs = self.max_jobs
+        if max_jobs and worker.jobs_count >= max_jobs:
+            logger.info(
+                'WorkerPool: the worker (pid=%s) has run %s jobs -> recycled',
+                worker.pid, worker.jobs_count,
+            )
+            return True
+
+        max_memory = self.max_memory
+        if max_memory:
+            rss = worker.rss
+            if rss is not None and rss >= max_memory:
+                logger.info(
+                    'WorkerPool: the worker (pid=%s) uses %s bytes -> recycled',
+                    worker.pid, rss,
+                )
+                return True
+
+        return False
+
+    def fill(self) -> None:
+        "Remove the dead idle workers & start new ones to reach the pool's size."
+        idle_workers = self._idle_workers
+        idle_workers[:] = [w for w in idle_workers if w.is_alive]
+
+        for _i in range(self.size - len(self)):
+            idle_workers.append(self._create_worker())
+
+    def run_job(self, job_id: int) -> Worker:
+        idle_workers = self._idle_workers
+
+        while idle_workers:
+            worker = idle_workers.pop()
+            if worker.is_alive:
+                break
+
+            logger.warning('WorkerPool: the worker (pid=%s) is dead', worker.pid)
+        else:
+            worker = self._create_worker()
+
+        self._busy_workers[job_id] = worker
+        worker.run_job(job_id)
+
+        return worker
+
+    def release(self, job_id: int) -> Worker | None:
+        "The job is finished ; its worker can run another job."
+        worker = self._busy_workers.pop(job_id, None)
+
+        if worker is None:
+            logger.warning('WorkerPool.release() -> no worker for the job id=%s', job_id)
+        else:
+            worker.job_id = None
+            logger.info('WorkerPool: job id=%s ended; metrics: %s', job_id, worker.metrics)
+
+            if len(self) >= self.size or self._must_be_recycled(worker):
+                worker.stop()
+            else:
+                self._idle_workers.append(worker)
+
+            self.fill()
+
+        return worker
+
+    def metrics(self) -> list[dict]:
+        "Get the metrics of all the workers (see Worker.metrics)."
+        return [worker.metrics for worker in self]
+
+    def stop(self) -> None:
+        for worker in self:
+            worker.stop()
+
+        self._idle_workers.clear()
+        self._busy_workers.clear()
+
+
+def run_worker(stdin=None) -> None:
+    """Main loop of a worker process (Django must be set up).
+    Read the IDs of the jobs to run, until the end of the input stream.
+    """
+    from django.db import close_old_connections
+
+    from creme.creme_core.global_info import clear_global_info
+
+    from . import job_type_registry
+
+    for line in (stdin or sys.stdin):
+        try:
+            job_id = int(line)
+        except ValueError:
+            logger.warning('Worker: invalid job ID "%s"', line.strip())
+            continue
+
+        try:
+            job_type_registry(job_id)
+        except Exception:
+            logger.exception('Worker: error when running the job id=%s', job_id)
+        finally:
+            # Nothing must leak between 2 jobs (like a per-request cache)
+            clear_global_info()
+            close_old_connections()
@@ -65,13 +65,18 @@ class FlowPaginator:
     queryset: QuerySet
 
     _per_page: int
-    _count: int
+    _count: int | None
     _key_field_info: FieldInfo
     _key: str
     _attr_name: str
     _reverse_order: bool
 
-    def __init__(self, queryset: QuerySet, key: str, per_page: int, count: int = sys.maxsize):
+    def __init__(self,
+                 queryset: QuerySet,
+                 key: str,
+                 per_page: int,
+                 count: int | None = sys.maxsize,
+                 ):
         """Constructor.
         @param queryset: QuerySet instance. Beware: lines must have always the
                same order when sub-set queries are performed, or the paginated
@@ -87,6 +92,9 @@ class FlowPaginator:
                The default value _should_ be overridden with the correct value ;
                it is only useful when a whole queryset is iterated with pages()
                (because count is not used).
+               <None> means that the total is unknown (computing it can be
+               too slow with big tables) ; the pages work, but 'num_pages' is
+               unknown too.
         @raise ValueError: If key is invalid.
         """
         assert per_page > 1
@@ -109,12 +117,12 @@ class FlowPaginator:
         return self._reverse_order
 
     @property
-    def count(self) -> int:
+    def count(self) -> int | None:
         return self._count
 
     @count.setter
     def count(self, value):
-        self._count = int(value)
+        self._count = None if value is None else int(value)
 
     @property
     def key(self) -> str:
@@ -160,12 +168,16 @@ class FlowPaginator:
 
     # TODO: 'allow_empty_first_page' feature like in django.core.paginator.Paginator
     @property
-    def num_pages(self) -> int:
+    def num_pages(self) -> int | None:
         """
-        Returns the total number of pages.
+        Returns the total number of pages (None if the total number of entities is unknown).
         """
         if self._num_pages is None:
-            self._num_pages = int(ceil(self.count / self.per_page))
+            count = self.count
+            if count is None:
+                return None
+
+            self._num_pages = int(ceil(count / self.per_page))
 
         return self._num_pages
 
@@ -259,7 +271,9 @@ class FlowPaginator:
         # methods in local contexts...
         # entities: Iterable[Model]
 
-        if move_type == 'first' or self.count <= per_page:
+        count = self.count
+
+        if move_type == 'first' or (count is not None and count <= per_page):
             entities = [*self.queryset[:per_page + 1]]
             next_item = None if len(entities) <= per_page else entities.pop()
             first_page = True
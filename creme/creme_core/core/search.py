@@ -19,14 +19,35 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable
+from concurrent import futures
+from functools import lru_cache
+from time import monotonic
+from typing import Iterable, Sequence
 
-from django.db.models import Model
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import OperationalError, connections, transaction
+from django.db.models import Count, IntegerField, Model, OuterRef, Subquery
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
 from django.db.models.query import Q, QuerySet
+from django.utils.module_loading import import_string
 
 from ..core import entity_cell
-from ..models import CustomField, FieldsConfig, SearchConfigItem
+from ..global_info import clear_global_info, get_per_request_cache
+from ..models import (
+    CremeEntity,
+    CustomField,
+    CustomFieldValue,
+    EntityCredentials,
+    FieldsConfig,
+    SearchConfigItem,
+    SearchDocument,
+)
+from ..utils.concurrent import get_shared_executor, release_db_connections
+from ..utils.db import get_capped_count, populate_related, statement_timeout
 from ..utils.string import smart_split
+from .paginator import FlowPaginator
 
 logger = logging.getLogger(__name__)
 
@@ -68,12 +89,34 @@ def _q_for_customfield(cell, word):
         )
 
 
-class Searcher:
-    """Build QuerySets to search strings contained in instances of some given models.
+class SearchBackend:
+    """Base class of the back-ends used by Searcher to find the entities which
+    contain some words.
+    The back-end used by default is given by settings.SEARCH_BACKEND.
+    """
+    # <True> means that the back-end uses the SearchDocuments (so they must be
+    # maintained ; see SearchIndex).
+    indexed: bool = False
 
-    The search configuration (see the model SearchConfigItem) is used to know
-    which fields to use.
-    Hidden fields (see model FieldsConfig) are ignored.
+    def search(self,
+               model: type[CremeEntity],
+               cells: Sequence[entity_cell.EntityCell],
+               words: Sequence[str],
+               ) -> QuerySet:
+        """Get the entities which contain the given words.
+        @param model: Class inheriting CremeEntity.
+        @param cells: Sequence of EntityCells (not empty) in which the words are searched.
+        @param words: Searched strings ; each word must be contained in (at
+               least) one cell.
+        @return: QuerySet on model.
+        """
+        raise NotImplementedError
+
+
+class RegularSearchBackend(SearchBackend):
+    """Search the words in the fields of the entities directly (lookups
+    "icontains") ; it does not need an index, but the tables of the entities
+    are scanned at each search.
     """
     CELL_TO_Q = {
         entity_cell.EntityCellRegularField.type_id:
@@ -82,32 +125,11 @@ class Searcher:
         entity_cell.EntityCellCustomField.type_id: _q_for_customfield,
     }
 
-    def __init__(self, models: Iterable[type[Model]], user):
-        """Constructor.
-
-        @param models: Iterable of classes inheriting <django.db.models.Model>.
-        @param user: Instance of <django.contrib.auth.get_user_model()>.
-        """
-        self.user = user
-
-        search_map: dict[type[Model], list[entity_cell.EntityCell]] = {}
-        models = [*models]  # Several iterations
-        # TODO: move in iter_for_models() ?
-        FieldsConfig.objects.get_for_models(models)  # Fill cache
-
-        for sci in SearchConfigItem.objects.iter_for_models(models, user):
-            if not sci.disabled:
-                model = sci.content_type.model_class()
-                search_map[model] = [*sci.refined_cells]
-
-        self._search_map = search_map
-
     def _build_query(self, words, cells) -> Q:
         """Build a Q with given fields for the given search.
         Each word must be contained in (at least) one field.
 
         @param words: Searched strings.
-        # @param fields: Sequence of <creme_core.models.search.SearchField> objects.
         @param cells: Sequence of <creme_core.core.entity_cell.EntityCell> objects.
         @return: Instance of <django.db.models.query.Q>.
         """
@@ -130,6 +152,311 @@ class Searcher:
 
         return result_q
 
+    def search(self, model, cells, words):
+        # TODO: distinct() only if there is a JOIN...
+        return model.objects.filter(self._build_query(words, cells)).distinct()
+
+
+@lru_cache(maxsize=None)
+def _has_fts_table(db_alias: str, table_name: str) -> bool:
+    connection = connections[db_alias]
+
+    with connection.cursor() as cursor:
+        return table_name in connection.introspection.table_names(cursor)
+
+
+class IndexSearchBackend(SearchBackend):
+    """Search the words in the SearchDocuments (denormalized texts of the
+    searchable fields), which are retrieved with an index when the database
+    supports it:
+      - PostgreSQL: index of trigrams (extension "pg_trgm") ; it's used by the
+        lookup "contains".
+      - SQLite: full-text table (FTS5 with the tokenizer "trigram").
+      - Other databases: the table of the documents is scanned (it's still
+        faster than the regular search, because there is no JOIN).
+    The found entities are annotated with their relevance (attribute
+    "search_relevance", i.e. the number of fields containing a searched word),
+    & ordered by relevance.
+
+    Notice that the SearchDocuments must be built (see the command
+    "creme_search_index") when this back-end is activated.
+    """
+    indexed = True
+
+    fts_table = 'creme_core_searchdocument_fts'
+
+    # Minimal length of a word which can be searched with the FTS table.
+    fts_min_length = 3
+
+    def _word_q(self, word: str) -> Q:
+        "Get the Q instance which retrieves the SearchDocuments containing a (normalized) word."
+        connection = connections[SearchDocument.objects.db]
+
+        if (
+            connection.vendor == 'sqlite'
+            and len(word) >= self.fts_min_length
+            and _has_fts_table(connection.alias, self.fts_table)
+        ):
+            fts_table = self.fts_table
+
+            return Q(id__in=RawSQL(
+                f'SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s',
+                # NB: the word is searched as a phrase (no FTS operator)
+                ('"{}"'.format(word.replace('"', '""')),),
+            ))
+
+        return Q(content__contains=word)
+
+    def search(self, model, cells, words):
+        normalize = SearchIndex.normalize
+        words_q = [self._word_q(word) for word in map(normalize, words) if word]
+        documents = SearchDocument.objects.filter(
+            entity_type=ContentType.objects.get_for_model(model),
+            cell_key__in=[cell.key for cell in cells],
+        )
+
+        qs = model.objects.all()
+        any_word_q = Q()
+
+        for word_q in words_q:
+            qs = qs.filter(id__in=documents.filter(word_q).values('entity_id'))
+            any_word_q |= word_q
+
+        return qs.annotate(
+            search_relevance=Coalesce(
+                Subquery(
+                    documents.filter(any_word_q, entity=OuterRef('pk'))
+                             .order_by()
+                             .values('entity')
+                             .annotate(relevance=Count('id'))
+                             .values('relevance'),
+                    output_field=IntegerField(),
+                ),
+                0,
+            ),
+        ).order_by('-search_relevance', *model._meta.ordering, 'id')
+
+
+def get_search_backend() -> SearchBackend:
+    "Get an instance of the back-end given by settings.SEARCH_BACKEND."
+    return import_string(settings.SEARCH_BACKEND)()
+
+
+class SearchIndex:
+    """Build & maintain the SearchDocuments used by the search back-ends which
+    are "indexed" (see IndexSearchBackend).
+
+    There is a document per entity & per searchable cell (only the regular &
+    custom fields are managed). The searchable cells of a model are the cells
+    of all its search configurations (i.e. for all the roles) ; so the
+    documents must be rebuilt (see rebuild()) when the search configuration is
+    modified.
+    The documents are updated when the entities & their custom values are
+    saved ; but the modifications which do not send the signals (like
+    QuerySet.update()) or the modifications of the instances referenced by
+    the entities (e.g. the searched field is "sector__title") are not managed.
+    """
+    @property
+    def enabled(self) -> bool:
+        "Are the documents used (so they have to be updated) ?"
+        return getattr(import_string(settings.SEARCH_BACKEND), 'indexed', False)
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        "Normalize a text (stored content or searched word)."
+        return ' '.join(str(value).split()).casefold()
+
+    def get_cells(self, model: type[CremeEntity]) -> list[entity_cell.EntityCell]:
+        "Get the cells (regular & custom fields) which are indexed for a model."
+        cells_per_model = get_per_request_cache().setdefault(
+            'creme_core-search_index_cells', {},
+        )
+        cells = cells_per_model.get(model)
+
+        if cells is None:
+            ctype = ContentType.objects.get_for_model(model)
+            items = [
+                *SearchConfigItem.objects.filter(content_type=ctype, disabled=False),
+            ] or [SearchConfigItem(content_type=ctype)]
+            cells_per_key = {}
+
+            for item in items:
+                for cell in (item.refined_cells if item.all_fields else item.cells):
+                    if isinstance(cell, (entity_cell.EntityCellRegularField,
+                                         entity_cell.EntityCellCustomField)):
+                        cells_per_key.setdefault(cell.key, cell)
+
+            cells_per_model[model] = cells = [*cells_per_key.values()]
+
+        return cells
+
+    @staticmethod
+    def _custom_value_content(cvalue: CustomFieldValue | None) -> str:
+        if cvalue is None:
+            return ''
+
+        field_type = cvalue.custom_field.field_type
+
+        if field_type == CustomField.MULTI_ENUM:
+            return ' '.join(str(enum_value) for enum_value in cvalue.value.all())
+
+        if field_type == CustomField.ENUM:
+            return str(cvalue.value)
+
+        value = cvalue.value
+
+        return '' if value is None else str(value)
+
+    def _cell_content(self, cell: entity_cell.EntityCell, entity: CremeEntity) -> str:
+        if isinstance(cell, entity_cell.EntityCellCustomField):
+            return self._custom_value_content(entity.get_custom_value(cell.custom_field))
+
+        value = cell.field_info.value_from(entity)
+
+        if isinstance(value, list):
+            return ' '.join(str(elt) for elt in value if elt is not None)
+
+        return '' if value is None else str(value)
+
+    def build_documents(self, entities: Sequence[CremeEntity]) -> list[SearchDocument]:
+        """Build the (not saved) documents of some entities.
+        @param entities: Sequence of entities with the same model.
+        """
+        if not entities:
+            return []
+
+        model = type(entities[0])
+        cells = self.get_cells(model)
+        entity_type = ContentType.objects.get_for_model(model)
+        normalize = self.normalize
+
+        populate_related(
+            entities,
+            [
+                cell.value
+                for cell in cells
+                if isinstance(cell, entity_cell.EntityCellRegularField)
+            ],
+        )
+        CremeEntity.populate_custom_values(
+            entities,
+            [
+                cell.custom_field
+                for cell in cells
+                if isinstance(cell, entity_cell.EntityCellCustomField)
+            ],
+        )
+
+        documents = []
+
+        for entity in entities:
+            for cell in cells:
+                content = normalize(self._cell_content(cell, entity))
+
+                if content:
+                    documents.append(SearchDocument(
+                        entity_id=entity.id, entity_type=entity_type,
+                        cell_key=cell.key, content=content,
+                    ))
+
+        return documents
+
+    def update(self, entities: Sequence[CremeEntity]) -> None:
+        """Build the documents of some entities (the old documents are deleted).
+        @param entities: Sequence of entities with the same model.
+        """
+        documents = self.build_documents(entities)
+
+        with transaction.atomic():
+            SearchDocument.objects.filter(
+                entity__in=[entity.id for entity in entities],
+            ).delete()
+            SearchDocument.objects.bulk_create(documents)
+
+    def update_custom_value(self, cvalue: CustomFieldValue, deleted: bool = False) -> None:
+        "Update the document related to a custom value."
+        cfield = cvalue.custom_field
+        model = cfield.content_type.model_class()
+        cell_key = entity_cell.EntityCellCustomField(cfield).key
+
+        if not any(cell.key == cell_key for cell in self.get_cells(model)):
+            return
+
+        content = '' if deleted else self.normalize(self._custom_value_content(cvalue))
+
+        with transaction.atomic():
+            SearchDocument.objects.filter(
+                entity=cvalue.entity_id, cell_key=cell_key,
+            ).delete()
+
+            if content:
+                SearchDocument.objects.create(
+                    entity_id=cvalue.entity_id, entity_type=cfield.content_type,
+                    cell_key=cell_key, content=content,
+                )
+
+    def rebuild(self, model: type[CremeEntity], chunk_size: int = 256) -> int:
+        """Build (again) the documents of all the entities of a model.
+        @param model: Class inheriting CremeEntity.
+        @param chunk_size: Number of entities retrieved & indexed at once.
+        @return: The number of indexed entities.
+        """
+        SearchDocument.objects.filter(
+            entity_type=ContentType.objects.get_for_model(model),
+        ).delete()
+
+        count = 0
+        paginator = FlowPaginator(
+            # NB: the deleted entities can be found too
+            queryset=model.objects.order_by('id'), key='id', per_page=chunk_size,
+        )
+
+        for entities_page in paginator.pages():
+            entities = entities_page.object_list
+
+            SearchDocument.objects.bulk_create(self.build_documents(entities))
+            count += len(entities)
+
+        return count
+
+
+search_index = SearchIndex()
+
+
+class Searcher:
+    """Build QuerySets to search strings contained in instances of some given models.
+
+    The search configuration (see the model SearchConfigItem) is used to know
+    which fields to use.
+    Hidden fields (see model FieldsConfig) are ignored.
+    """
+    def __init__(self,
+                 models: Iterable[type[Model]],
+                 user,
+                 backend: SearchBackend | None = None,
+                 ):
+        """Constructor.
+
+        @param models: Iterable of classes inheriting <django.db.models.Model>.
+        @param user: Instance of <django.contrib.auth.get_user_model()>.
+        @param backend: Instance of SearchBackend ; by default, the back-end
+               given by settings.SEARCH_BACKEND is used.
+        """
+        self.user = user
+        self.backend = backend or get_search_backend()
+
+        search_map: dict[type[Model], list[entity_cell.EntityCell]] = {}
+        models = [*models]  # Several iterations
+        # TODO: move in iter_for_models() ?
+        FieldsConfig.objects.get_for_models(models)  # Fill cache
+
+        for sci in SearchConfigItem.objects.iter_for_models(models, user):
+            if not sci.disabled:
+                model = sci.content_type.model_class()
+                search_map[model] = [*sci.refined_cells]
+
+        self._search_map = search_map
+
     def get_cells(self, model: type[Model]) -> list[entity_cell.EntityCell]:
         """Get the list of EntityCells instances used to search in 'model'."""
         return self._search_map[model]
@@ -149,9 +476,192 @@ class Searcher:
 
         assert cells is not None  # search on a disabled model ?
 
-        strings = smart_split(research)
+        return self.backend.search(
+            model=model, cells=cells, words=smart_split(research),
+        ) if cells else None
 
-        # TODO: distinct() only if there is a JOIN...
-        return model.objects.filter(
-            self._build_query(strings, cells)
-        ).distinct() if cells else None
+
+class SearchResult:
+    """Result of the search in a model (see SearchRunner).
+
+    Attributes:
+        - model: Class inheriting CremeEntity.
+        - queryset: QuerySet of the found entities (filtered by the
+          credentials), or None if all the searchable fields are hidden.
+        - entities: List of the first found entities.
+        - count: Number of found entities ; None if the search has been
+          interrupted.
+        - capped: <True> means that there are more than <count> entities.
+        - timed_out: <True> means that the search has been interrupted because
+          it has exceeded its time budget (entities & count are not available).
+    """
+    def __init__(self, model: type[CremeEntity], queryset: QuerySet | None):
+        self.model = model
+        self.queryset = queryset
+        self.entities: list[CremeEntity] = []
+        self.count: int | None = 0 if queryset is None else None
+        self.capped = False
+        self.timed_out = False
+
+    def __repr__(self):
+        return (
+            f'SearchResult(model={self.model.__name__}, count={self.count}, '
+            f'capped={self.capped}, timed_out={self.timed_out})'
+        )
+
+
+class SearchRunner:
+    """Run the searches of a Searcher in all its models, & retrieve the first
+    found entities & their number.
+
+    The models can be searched concurrently by a pool of threads (each thread
+    uses its own connection to the database) ; in this case, each model has a
+    time budget, & the models which exceed it are reported as "timed out"
+    instead of blocking the whole search.
+    """
+    def __init__(self,
+                 searcher: Searcher,
+                 workers: int | None = None,
+                 timeout: float | None = None,
+                 ):
+        """Constructor.
+        @param searcher: Instance of Searcher.
+        @param workers: Number of threads ; 0 means that the models are searched
+               sequentially by the current thread (without time budget).
+               By default, settings.SEARCH_WORKERS is used.
+        @param timeout: Time budget of the search in a model (in seconds).
+               By default, settings.SEARCH_TIMEOUT is used.
+        """
+        self.searcher = searcher
+        self.workers = settings.SEARCH_WORKERS if workers is None else workers
+        self.timeout = settings.SEARCH_TIMEOUT if timeout is None else timeout
+
+    @staticmethod
+    def _fetch(queryset: QuerySet,
+               limit: int,
+               count_cap: int | None,
+               ) -> tuple[list[CremeEntity], int, bool]:
+        "@return: A tuple (entities, count, capped)."
+        if limit > 0:
+            entities = [*queryset[:limit]]
+
+            if len(entities) < limit:
+                # NB: no need to count
+                return entities, len(entities), False
+        else:
+            entities = [*queryset]
+            return entities, len(entities), False
+
+        if count_cap is None:
+            return entities, queryset.count(), False
+
+        count = get_capped_count(queryset, count_cap)
+
+        return entities, min(count, count_cap), count > count_cap
+
+    def _fetch_in_thread(self, queryset, limit, count_cap):
+        """Run by the threads of the pool.
+        @return: The tuple returned by _fetch(), or None if the time budget has
+                 been exceeded (the queries are interrupted by the database,
+                 in order to release the thread quickly).
+        """
+        timeout = self.timeout
+        deadline = monotonic() + timeout
+
+        try:
+            with statement_timeout(timeout, using=queryset.db):
+                return self._fetch(queryset, limit, count_cap)
+        except OperationalError:
+            if monotonic() < deadline:
+                raise
+
+            return None
+        finally:
+            # The thread (& its connection) is re-used for other searches
+            clear_global_info()
+            release_db_connections()
+
+    def _run_concurrently(self, results, limit, count_cap) -> None:
+        workers = min(self.workers, len(results))
+        timeout = self.timeout
+        # NB: the pool is shared by all the requests, in order to bound the
+        #     number of threads/connections to the DB.
+        executor = get_shared_executor('creme_search', self.workers)
+        start = monotonic()
+
+        # NB: the threads only return values ; the results are only modified
+        #     by the current thread (so a search which ends after its time
+        #     budget cannot modify its result).
+        submitted = [
+            executor.submit(self._fetch_in_thread, result.queryset, limit, count_cap)
+            for result in results
+        ]
+
+        for index, (result, future) in enumerate(zip(results, submitted)):
+            # NB: the models are searched by "waves" of <workers> models ;
+            #     each wave has its own time budget.
+            deadline = start + timeout * (1 + index // workers)
+
+            try:
+                fetched = future.result(timeout=max(0, deadline - monotonic()))
+            except futures.TimeoutError:
+                # NB: we do not wait for the timed out searches ; the ones
+                #     which have not started yet are not run at all, & the
+                #     queries of the running ones are interrupted by the DB.
+                future.cancel()
+                fetched = None
+
+            if fetched is None:
+                logger.warning(
+                    'SearchRunner: the search in the model "%s" has timed out',
+                    result.model.__name__,
+                )
+
+                result.count = None
+                result.timed_out = True
+            else:
+                result.entities, result.count, result.capped = fetched
+
+    def run(self,
+            research: str,
+            limit: int = 0,
+            count_cap: int | None = None,
+            ) -> list[SearchResult]:
+        """Search in the models of the searcher.
+        @param research: Searched string (see Searcher.search()).
+        @param limit: Number of entities retrieved per model ; 0 means "all".
+        @param count_cap: Maximum number of entities counted per model
+               (see utils.db.get_capped_count()) ; None means "exact count".
+               Notice that the entities are not counted if there are less
+               entities than <limit>.
+        @return: A list of SearchResult (one per model, in the order of
+                 Searcher.models).
+        """
+        searcher = self.searcher
+        user = searcher.user
+        results = []
+        to_fetch = []
+
+        # NB: the QuerySets are built by the current thread (configuration,
+        #     credentials...), & only evaluated by the threads.
+        for model in searcher.models:
+            queryset = searcher.search(model, research)
+            result = SearchResult(
+                model=model,
+                queryset=None if queryset is None else EntityCredentials.filter(user, queryset),
+            )
+            results.append(result)
+
+            if queryset is not None:
+                to_fetch.append(result)
+
+        if to_fetch:
+            if self.workers > 0:
+                self._run_concurrently(to_fetch, limit, count_cap)
+            else:
+                for result in to_fetch:
+                    result.entities, result.count, result.capped = self._fetch(
+                        result.queryset, limit, count_cap,
+                    )
+
+        return results
@@ -1,5 +1,8 @@
 from .batch_process import batch_process_type
 from .deletor import deletor_type
+from .history_archiver import history_archiver_type
+from .history_writer import history_writer_type
+from .mass_export import mass_export_type
 from .mass_import import mass_import_type
 from .reminder import reminder_type
 from .temp_files_cleaner import temp_files_cleaner_type
@@ -11,5 +14,8 @@ jobs = (
     trash_cleaner_type,
     batch_process_type,
     mass_import_type,
+    mass_export_type,
     reminder_type,
+    history_writer_type,
+    history_archiver_type,
 )
@@ -27,18 +27,38 @@ from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 
-from ..core.batch_process import BatchAction
+from ..core.batch_process import (
+    BatchAction,
+    bulk_update_entities,
+    can_bulk_update,
+)
 from ..core.paginator import FlowPaginator
-from ..models import EntityCredentials, EntityFilter, EntityJobResult
+from ..models import (
+    EntityCredentials,
+    EntityFilter,
+    EntityJobResult,
+    HistoryLine,
+)
 from .base import JobProgress, JobType
 
 logger = logging.getLogger(__name__)
 
 
 class _BatchProcessType(JobType):
+    """Apply some BatchActions on the entities of a given type (optionally
+    filtered by an EntityFilter).
+
+    The entities are processed by chunks (one transaction per chunk): each
+    chunk is locked & retrieved with one query, & the results are created
+    in bulk. When the model does not override the method save(), the
+    modified entities are written in bulk (see
+    'creme_core.core.batch_process.bulk_update_entities()').
+    """
     id = JobType.generate_id('creme_core', 'batch_process')
     verbose_name = _('Batch process')
 
+    chunk_size = 1024
+
     def _get_actions(self, model, job_data):
         for kwargs in job_data['actions']:
             yield BatchAction(model, **kwargs)
@@ -76,6 +96,41 @@ class _BatchProcessType(JobType):
 
         return humanized
 
+    def _process_chunk(self, *, job, model, entity_ids, actions, bulk) -> None:
+        with atomic(), HistoryLine.buffered():
+            results = []
+            changed_entities = []
+
+            # NB: the entities which have been deleted since the pagination are ignored
+            for entity in model._default_manager.select_for_update().filter(id__in=entity_ids):
+                # NB: all the actions are applied (no short-circuit)
+                if not any([action(entity) for action in actions]):
+                    continue
+
+                try:
+                    entity.full_clean()
+                except ValidationError as e:
+                    results.append(EntityJobResult(
+                        job=job,
+                        real_entity=entity,
+                        messages=self._humanize_validation_error(entity, e),
+                    ))
+                else:
+                    changed_entities.append(entity)
+                    results.append(EntityJobResult(job=job, real_entity=entity))
+
+            if changed_entities:
+                if bulk:
+                    bulk_update_entities(
+                        model, changed_entities,
+                        field_names={action.field_name for action in actions},
+                    )
+                else:
+                    for entity in changed_entities:
+                        entity.save()
+
+            EntityJobResult.objects.bulk_create(results)
+
     def _execute(self, job):
         job_data = job.data
         model = self._get_model(job_data)
@@ -95,41 +150,26 @@ class _BatchProcessType(JobType):
 
         entities = EntityCredentials.filter(job.user, entities, EntityCredentials.CHANGE)
         paginator = FlowPaginator(
-            queryset=entities.order_by('id'), key='id', per_page=1024,
+            # NB: the entities are retrieved (& locked) again by _process_chunk()
+            queryset=entities.order_by('id').only('id', 'entity_type'),
+            key='id', per_page=self.chunk_size,
+        )
+        process_chunk = partial(
+            self._process_chunk,
+            job=job, model=model,
+            actions=[*self._get_actions(model, job_data)],
+            bulk=can_bulk_update(model),
         )
-        actions = [*self._get_actions(model, job_data)]
-        create_result = partial(EntityJobResult.objects.create, job=job)
 
         for entities_page in paginator.pages():
-            for entity in entities_page.object_list:
-                if entity.id in already_processed:
-                    continue
+            entity_ids = [
+                entity.id
+                for entity in entities_page.object_list
+                if entity.id not in already_processed
+            ]
 
-                changed = False
-
-                with atomic():
-                    try:
-                        final_entity = model.objects.select_for_update().get(id=entity.id)
-                    except model.DoesNotExist:
-                        continue
-
-                    for action in actions:
-                        if action(final_entity):
-                            changed = True
-
-                    if changed:
-                        try:
-                            final_entity.full_clean()
-                        except ValidationError as e:
-                            create_result(
-                                # entity=final_entity,
-                                real_entity=final_entity,
-                                messages=self._humanize_validation_error(final_entity, e)
-                            )
-                        else:
-                            final_entity.save()
-                            # create_result(entity=final_entity)
-                            create_result(real_entity=final_entity)
+            if entity_ids:
+                process_chunk(entity_ids=entity_ids)
 
     def progress(self, job):
         count = EntityJobResult.objects.filter(job=job).count()
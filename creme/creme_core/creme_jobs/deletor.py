@@ -16,16 +16,26 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from collections import Counter
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
 
-from django.db.models import F, ProtectedError
+from django.db.models import F, ProtectedError, Q
 from django.db.transaction import atomic
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 
-from ..models import DeletionCommand, FieldsConfig, JobResult
+from ..core.batch_process import bulk_update_entities, can_bulk_update
+from ..models import (
+    CremeEntity,
+    DeletionCommand,
+    FieldsConfig,
+    HistoryLine,
+    JobResult,
+)
 from ..signals import pre_replace_and_delete
+from ..utils import chunktools
 from ..utils.translation import get_model_verbose_name
 from .base import JobProgress, JobType
 
@@ -36,6 +46,65 @@ class _DeletorType(JobType):
     id = JobType.generate_id('creme_core', 'deletor')
     verbose_name = _('Replace & delete')
 
+    # Number of entities updated by transaction (bulk mode)
+    chunk_size = 256
+
+    def _replace_one_by_one(self, dcom, instance_2_del, model_field, new_value):
+        dcom_mngr = DeletionCommand.objects
+        rel_mngr = model_field.model._default_manager
+        field_name = model_field.name
+
+        for pk in rel_mngr.filter(
+            **{field_name: instance_2_del.pk}
+        ).values_list('pk', flat=True):
+            # NB1: we perform a .save(), not an .update() in order to:
+            #       - let the model compute it's business logic (if there is one).
+            #       - get an HistoryLine for entities.
+            # NB2: as in edition view, we perform a select_for_update() to avoid
+            #      overriding other fields (if there are concurrent accesses)
+            with atomic():
+                related_instance = rel_mngr.select_for_update().filter(pk=pk).first()
+                if related_instance is not None:
+                    if model_field.many_to_many:
+                        getattr(related_instance, field_name).add(new_value)
+                    else:
+                        setattr(related_instance, field_name, new_value)
+                        related_instance.save()
+
+                dcom_mngr.filter(pk=dcom.pk).update(updated_count=F('updated_count') + 1)
+
+    def _replace_in_bulk(self, dcom, instance_2_del, model, replacements):
+        """Replace the values of several ForeignKeys of an entity model at once.
+        @param replacements: List of tuples (model_field, new_value).
+        """
+        dcom_mngr = DeletionCommand.objects
+        rel_mngr = model._default_manager
+        pk_2_del = instance_2_del.pk
+        ids = [
+            *rel_mngr.filter(
+                reduce(or_, (Q(**{field.name: pk_2_del}) for field, __ in replacements)),
+            ).order_by('pk').values_list('pk', flat=True)
+        ]
+        field_names = [field.name for field, __ in replacements]
+
+        for ids_chunk in chunktools.iter_as_chunk(ids, self.chunk_size):
+            # NB: as in edition view, we perform a select_for_update() to avoid
+            #     overriding other fields (if there are concurrent accesses)
+            with atomic(), HistoryLine.buffered():
+                entities = [*rel_mngr.select_for_update().filter(pk__in=ids_chunk)]
+                count = 0
+
+                for entity in entities:
+                    for field, new_value in replacements:
+                        if getattr(entity, field.attname) == pk_2_del:
+                            setattr(entity, field.name, new_value)
+                            count += 1
+
+                # NB: the models which do not override save() have no business
+                #     logic, so the history lines can be created in bulk.
+                bulk_update_entities(model, entities, field_names)
+                dcom_mngr.filter(pk=dcom.pk).update(updated_count=F('updated_count') + count)
+
     def _execute(self, job):
         dcom_mngr = DeletionCommand.objects
         dcom = dcom_mngr.get(job=job)
@@ -45,13 +114,14 @@ class _DeletorType(JobType):
                              .get(pk=dcom.pk_to_delete)
 
         # TODO: is_deleted field ?
-        # TODO: regroup by same CType & update several fields at once when its possible
+        # The ForeignKeys of the same entity model are updated at once
+        # (with bulk queries) when it's possible.
+        bulk_replacements = defaultdict(list)
+
         for replacer in dcom.replacers:
             new_value = replacer.get_value()
-
             model_field = replacer.model_field
-            rel_mngr   = model_field.model._default_manager
-            field_name = model_field.name
+            model = model_field.model
 
             pre_replace_and_delete.send_robust(
                 sender=instance_2_del,
@@ -59,24 +129,17 @@ class _DeletorType(JobType):
                 replacing_instance=new_value,
             )
 
-            for pk in rel_mngr.filter(
-                **{field_name: instance_2_del.pk}
-            ).values_list('pk', flat=True):
-                # NB1: we perform a .save(), not an .update() in order to:
-                #       - let the model compute it's business logic (if there is one).
-                #       - get an HistoryLine for entities.
-                # NB2: as in edition view, we perform a select_for_update() to avoid
-                #      overriding other fields (if there are concurrent accesses)
-                with atomic():
-                    related_instance = rel_mngr.select_for_update().filter(pk=pk).first()
-                    if related_instance is not None:
-                        if model_field.many_to_many:
-                            getattr(related_instance, field_name).add(new_value)
-                        else:
-                            setattr(related_instance, field_name, new_value)
-                            related_instance.save()
-
-                    dcom_mngr.filter(pk=dcom.pk).update(updated_count=F('updated_count') + 1)
+            if (
+                not model_field.many_to_many
+                and issubclass(model, CremeEntity)
+                and can_bulk_update(model)
+            ):
+                bulk_replacements[model].append((model_field, new_value))
+            else:
+                self._replace_one_by_one(dcom, instance_2_del, model_field, new_value)
+
+        for model, replacements in bulk_replacements.items():
+            self._replace_in_bulk(dcom, instance_2_del, model, replacements)
 
         try:
             instance_2_del.delete()
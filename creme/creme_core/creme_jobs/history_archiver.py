@@ -0,0 +1,109 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+import logging
+from datetime import datetime
+
+from django.db.transaction import atomic
+from django.utils.timezone import now
+from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy
+
+from ..models import ArchivedHistoryLine, HistoryLine, JobResult
+from ..utils.date_period import date_period_registry
+from .base import JobType
+
+logger = logging.getLogger(__name__)
+
+
+class _HistoryArchiverType(JobType):
+    """Move the old lines of history to the table of ArchivedHistoryLine,
+    in order to keep the table of HistoryLine small.
+    """
+    id           = JobType.generate_id('creme_core', 'history_archiver')
+    verbose_name = gettext_lazy('History archiver')
+    periodic     = JobType.PERIODIC
+
+    # Number of lines moved by transaction
+    chunk_size = 256
+
+    def archive(self, date_limit: datetime) -> int:
+        """Move the lines created before a given date.
+        @return The number of archived lines.
+        """
+        lines_qs = HistoryLine.objects.filter(date__lt=date_limit).order_by('id')
+        count = 0
+
+        while True:
+            with atomic():
+                hlines = [*lines_qs.select_for_update()[:self.chunk_size]]
+                if not hlines:
+                    break
+
+                ArchivedHistoryLine.objects.bulk_create(
+                    [ArchivedHistoryLine.from_line(hline) for hline in hlines],
+                )
+                # NB: we do not use HistoryLine.delete_lines(), because the
+                #     related lines are archived too (or they will be later).
+                HistoryLine.objects.filter(id__in=[hline.id for hline in hlines]).delete()
+
+            count += len(hlines)
+
+        return count
+
+    def _execute(self, job):
+        delay = self.get_delay(job)
+
+        if delay is None:
+            JobResult.objects.create(
+                job=job,
+                messages=[
+                    _("The configured delay is invalid. Edit the job's configuration to fix it."),
+                ],
+            )
+        else:
+            count = self.archive(date_limit=now() - delay.as_timedelta())
+            logger.info('_HistoryArchiverType: %s line(s) of history archived.', count)
+
+    @staticmethod
+    def get_delay(job):
+        """Returns the delay (lines older than it will be archived).
+        @param job: Job instance. Its type must be _HistoryArchiverType.
+        @return: A creme_core.utils.date_period.DatePeriod instance, or None in an error occurred.
+        """
+        try:
+            return date_period_registry.deserialize(job.data['delay'])
+        except Exception:
+            logger.exception('Error in _HistoryArchiverType.get_delay()')
+
+    def get_description(self, job):
+        delay = self.get_delay(job)
+
+        return [
+            _('Archive the lines of history which are older than: {}').format(delay)
+            if delay else
+            _('Archive the old lines of history'),
+        ]
+
+    def get_config_form_class(self, job):
+        from ..forms.history_archiver import HistoryArchiverJobForm
+
+        return HistoryArchiverJobForm
+
+
+history_archiver_type = _HistoryArchiverType()
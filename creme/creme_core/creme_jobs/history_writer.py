@@ -0,0 +1,127 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from ..models import CremeEntity, HistoryLine, PendingHistoryChunk
+from ..utils.dates import dt_from_ISO8601, dt_to_ISO8601
+from .base import JobType
+
+
+class _HistoryWriterType(JobType):
+    """Write the lines of history which have been buffered by the requests/jobs
+    (see 'creme_core.models.HistoryLine.buffered()' & the setting
+    "HISTORY_ASYNC_FLUSH").
+    The lines are queued as instances of PendingHistoryChunk ; it's a system
+    job, so the buffered lines do not create jobs for the users (which are
+    limited, see settings.MAX_JOBS_PER_USER).
+    """
+    id = JobType.generate_id('creme_core', 'history_writer')
+    verbose_name = _('Writing of history')
+    periodic = JobType.PSEUDO_PERIODIC
+
+    def enqueue(self, lines: Sequence[HistoryLine]) -> PendingHistoryChunk:
+        """Queue some lines, which will be written by the job.
+        The chunk is created in the current transaction (so the lines are not
+        written if it's rolled back) ; the job is woken up after the commit.
+        """
+        chunk = PendingHistoryChunk.objects.create(
+            lines=[
+                [
+                    hline.entity_id,
+                    hline.entity_ctype_id,
+                    hline.entity_owner_id,
+                    hline.username,
+                    dt_to_ISO8601(hline.date),
+                    hline.type,
+                    hline.value,
+                ] for hline in lines
+            ],
+        )
+        transaction.on_commit(self.refresh_job)
+
+        return chunk
+
+    @staticmethod
+    def _write(chunk: PendingHistoryChunk) -> None:
+        lines = [
+            HistoryLine(
+                entity_id=entity_id,
+                entity_ctype_id=ctype_id,
+                entity_owner_id=owner_id,
+                username=username,
+                date=dt_from_ISO8601(date_str),
+                type=line_type,
+                value=value,
+            ) for entity_id, ctype_id, owner_id, username, date_str, line_type, value
+            in chunk.lines
+        ]
+
+        # NB: the entities can have been deleted since the creation of the chunk.
+        existing_ids = {
+            *CremeEntity.objects.filter(
+                id__in={hline.entity_id for hline in lines if hline.entity_id},
+            ).values_list('id', flat=True),
+        }
+        for hline in lines:
+            if hline.entity_id not in existing_ids:
+                hline.entity_id = None
+
+        HistoryLine.objects.bulk_create(lines, batch_size=512)
+
+    def _execute(self, job):
+        # NB: the chunks are written in the order of creation ; each chunk is
+        #     written (& removed from the queue) in its own transaction.
+        for chunk_id in [
+            *PendingHistoryChunk.objects.order_by('id').values_list('id', flat=True),
+        ]:
+            with transaction.atomic():
+                chunk = PendingHistoryChunk.objects.select_for_update().filter(
+                    id=chunk_id,
+                ).first()
+
+                if chunk is not None:
+                    self._write(chunk)
+                    chunk.delete()
+
+    # We have to implement it because it is a PSEUDO_PERIODIC JobType
+    def next_wakeup(self, job, now_value):
+        return now_value if PendingHistoryChunk.objects.exists() else None
+
+    def get_description(self, job):
+        count = sum(
+            len(lines)
+            for lines in PendingHistoryChunk.objects.values_list('lines', flat=True)
+        )
+
+        return [
+            ngettext(
+                '{count} line of history to write',
+                '{count} lines of history to write',
+                count
+            ).format(count=count),
+        ]
+
+
+history_writer_type = _HistoryWriterType()
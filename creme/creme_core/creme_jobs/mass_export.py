@@ -0,0 +1,158 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+import logging
+from os.path import basename, join
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.mail import EmailMessage
+from django.http import HttpRequest, QueryDict
+from django.template.defaultfilters import slugify
+from django.utils.translation import gettext
+from django.utils.translation import gettext_lazy as _
+
+from ..models import FileRef
+from ..utils.file_handling import FileCreator
+from .base import JobType
+
+logger = logging.getLogger(__name__)
+
+
+class _MassExportType(JobType):
+    """Export the entities of a list-view in a file, like the view
+    'creme_core.views.mass_export.MassExport' does (the parameters of the view
+    are stored in the job's data), when there are too many entities to generate
+    the file during the HTTP request.
+    """
+    id           = JobType.generate_id('creme_core', 'mass_export')
+    verbose_name = _('Mass export')
+
+    dir_parts = ('mass_export',)  # Sub-directory under settings.MEDIA_ROOT
+
+    def _get_ctype(self, job_data):
+        return ContentType.objects.get_for_id(job_data['ctype'])
+
+    def _build_view(self, job):
+        from ..views.mass_export import MassExport
+
+        request = HttpRequest()
+        request.user = job.user
+        request.GET = QueryDict(job.data['GET'])
+
+        view = MassExport()
+        view.setup(request)
+
+        return view
+
+    def _write_file(self, backend, rows, filename, user):
+        name = f'{slugify(filename)}.{backend.extension or backend.id}'
+        dir_path = join(settings.MEDIA_ROOT, *self.dir_parts)
+        path = FileCreator(dir_path=dir_path, name=name).create()
+
+        with open(path, 'wb') as f:
+            for chunk in backend.stream(rows):
+                f.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
+        return FileRef.objects.create(
+            user=user,
+            basename=name,
+            filedata='{}/{}'.format('/'.join(self.dir_parts), basename(path)),
+        )
+
+    def _notify(self, job, fileref):
+        user = job.user
+        email = user.email
+
+        if not email:
+            return
+
+        try:
+            EmailMessage(
+                subject=gettext('Your export is ready'),
+                body=gettext(
+                    'The file «{file}» can be downloaded from the page of the job:\n{url}'
+                ).format(
+                    file=fileref.basename,
+                    url=settings.SITE_DOMAIN + job.get_absolute_url(),
+                ),
+                from_email=settings.EMAIL_SENDER,
+                to=[email],
+            ).send()
+        except Exception as e:
+            logger.warning('Error while sending the mass export notification (%s)', e)
+
+    def _execute(self, job):
+        user = job.user
+        view = self._build_view(job)
+        backend = view.get_backend_class()()
+        ctype = view.get_ctype()
+        hf = view.get_header_filter()
+        cells = view.get_cells(header_filter=hf)
+        efilter = view.get_entity_filter()
+        rows = view.generate_rows(
+            ctype=ctype, header_filter=hf, cells=cells, efilter=efilter,
+            paginator=view.get_entities_paginator(
+                model=ctype.model_class(), cells=cells, efilter=efilter,
+            ),
+        )
+
+        if backend.streaming:
+            fileref = self._write_file(
+                backend=backend, rows=rows, filename=ctype.model, user=user,
+            )
+        else:
+            writerow = backend.writerow
+            for row in rows:
+                writerow(row)
+
+            backend.save(ctype.model, user)
+            fileref = backend.fileref
+
+            if fileref is None:
+                raise self.Error(gettext('The export backend did not create any file.'))
+
+        job.data['fileref'] = fileref.id
+        self._notify(job=job, fileref=fileref)
+
+    @property
+    def results_bricks(self):
+        from ..bricks import MassExportJobResultBrick
+        return [MassExportJobResultBrick()]
+
+    def get_description(self, job):
+        try:
+            desc = [
+                gettext('Export «{model}»').format(
+                    model=self._get_ctype(job.data).model_class()._meta.verbose_name_plural,
+                ),
+            ]
+        except Exception:
+            logger.exception('Error in _MassExportType.get_description')
+            desc = ['?']
+
+        return desc
+
+    def get_fileref(self, job):
+        "Get the instance of FileRef corresponding to the generated file (or None)."
+        fileref_id = (job.data or {}).get('fileref')
+
+        return None if fileref_id is None else FileRef.objects.filter(id=fileref_id).first()
+
+
+mass_export_type = _MassExportType()
@@ -27,7 +27,7 @@ from django.utils.translation import ngettext
 from creme.documents import get_document_model
 
 from ..forms.mass_import import form_factory, get_header
-from ..models import MassImportJobResult
+from ..models import HistoryLine, MassImportJobResult
 from ..utils.translation import get_model_verbose_name
 from .base import JobProgress, JobType
 
@@ -61,7 +61,9 @@ class _MassImportType(JobType):
                 gettext('Invalid data [{}]').format(form.errors.as_text())
             )
 
-        form.process(job)
+        # NB: the lines of history are written by groups
+        with HistoryLine.buffered():
+            form.process(job)
 
     def progress(self, job):
         count = MassImportJobResult.objects.filter(job=job).count()
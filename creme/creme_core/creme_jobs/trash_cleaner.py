@@ -19,7 +19,7 @@
 import logging
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import F, ProtectedError
+from django.db.models import PROTECT, F, ProtectedError
 from django.db.transaction import atomic
 from django.db.utils import NotSupportedError
 from django.utils.translation import gettext as _
@@ -28,22 +28,100 @@ from django.utils.translation import gettext_lazy, ngettext
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 
 from ..core.paginator import FlowPaginator
-from ..models import CremeEntity, EntityJobResult, TrashCleaningCommand
+from ..models import (
+    CremeEntity,
+    CremeProperty,
+    EntityJobResult,
+    HistoryLine,
+    Relation,
+    TrashCleaningCommand,
+)
+from ..models.history import _get_deleted_entity_ids
+from ..utils.dependence_sort import DependenciesLoopError, dependence_sort
 from .base import JobProgress, JobType
 
 logger = logging.getLogger(__name__)
 
 
 class _TrashCleanerType(JobType):
+    """Delete definitively the entities in the trash.
+
+    The entities are deleted by pages (one transaction per page). The pages of
+    the models which do not override the deletion methods are deleted with
+    a few queries (the signals are still sent by the deletion of the QuerySets,
+    & the lines of history are created in bulk) ; when a page cannot be
+    deleted this way (because of dependencies), its entities are deleted one
+    by one to find the guilty ones.
+    """
     id = JobType.generate_id('creme_core', 'trash_cleaner')
     verbose_name = gettext_lazy('Trash cleaner')
 
+    # Number of entities deleted by transaction
+    page_size = 256
+
+    @staticmethod
+    def _can_bulk_delete(model) -> bool:
+        # NB: the models which override a deletion method need it to be called
+        #     (e.g. to delete some related instances).
+        return (
+            model.delete is CremeEntity.delete
+            and model._delete_without_transaction is CremeEntity._delete_without_transaction
+            and model._pre_delete is CremeEntity._pre_delete
+        )
+
+    @staticmethod
+    def _sort_entity_classes(entity_classes):
+        """Sort the classes of entities in order to delete the classes which
+        reference (with a protecting ForeignKey) another class before this one.
+        """
+        def referencing_classes(model):
+            return [
+                rel.related_model
+                for rel in model._meta.related_objects
+                if rel.on_delete is PROTECT and rel.related_model is not model
+            ]
+
+        try:
+            return dependence_sort(
+                entity_classes,
+                get_key=lambda model: model,
+                get_dependencies=lambda model: [
+                    other
+                    for other in entity_classes
+                    if other is not model and any(
+                        issubclass(other, ref_model)
+                        for ref_model in referencing_classes(model)
+                    )
+                ],
+            )
+        except DependenciesLoopError:
+            # NB: the retry-loop will do its best
+            return entity_classes
+
+    @staticmethod
+    def _delete_in_bulk(entities) -> None:
+        # NB: we do the same work than CremeEntity.delete(), but with
+        #     some queries for all the entities.
+        entity_ids = [entity.id for entity in entities]
+        _get_deleted_entity_ids().update(entity_ids)
+
+        Relation.objects.filter(
+            subject_entity__in=entity_ids,
+        ).exclude(type__is_internal=True).delete()
+        CremeProperty.objects.filter(creme_entity__in=entity_ids).delete()
+
+        for entity in entities:
+            entity._delete_stored_files()
+
+        type(entities[0]).objects.filter(id__in=entity_ids).delete()
+
     def _execute(self, job):
         # NB 1: we try to delete the remaining entities (which could not be deleted
         #       because of relationships) when there are errors, while the previous
         #       iteration managed to remove some entities.
         #       It will not work with cyclic references (but it is certainly very unusual).
-        # NB 2: we do not use delete() method of queryset in order to send signals.
+        # NB 2: we do not use delete() method of queryset on CremeEntity in order
+        #       to send signals for the real entities.
         user = job.user
         cmd_qs = TrashCleaningCommand.objects.filter(job=job)
 
@@ -56,10 +134,10 @@ class _TrashCleanerType(JobType):
         except NotSupportedError:
             ctype_ids = {*ctype_ids_qs}
 
-        entity_classes = [
+        entity_classes = self._sort_entity_classes([
             ct.model_class()
             for ct in map(ContentType.objects.get_for_id, ctype_ids)
-        ]
+        ])
 
         while True:
             errors = False
@@ -98,6 +176,7 @@ class _TrashCleanerType(JobType):
             #             for entity in entities_page.object_list:
             #                 entity = entity.get_real_entity()
             for entity_class in entity_classes:
+                bulk = self._can_bulk_delete(entity_class)
                 paginator = FlowPaginator(
                     queryset=EntityCredentials.filter(
                         user,
@@ -105,15 +184,44 @@ class _TrashCleanerType(JobType):
                         EntityCredentials.DELETE,
                     ).order_by('id'),  # .select_for_update()
                     key='id',
-                    per_page=256,
+                    per_page=self.page_size,
                 )
 
                 for entities_page in paginator.pages():
                     with atomic():
                         # NB (#60): Move 'SELECT FOR UPDATE' here for now (see above).
-                        for entity in entity_class.objects.filter(
-                            pk__in=entities_page.object_list
-                        ).select_for_update():
+                        entities = [
+                            *entity_class.objects.filter(
+                                pk__in=entities_page.object_list
+                            ).select_for_update()
+                        ]
+                        if not entities:
+                            continue
+
+                        if bulk:
+                            try:
+                                with atomic(), HistoryLine.buffered():
+                                    self._delete_in_bulk(entities)
+                            except Exception as e:
+                                # NB: the entities are deleted one by one
+                                #     to find (& report) the guilty ones.
+                                if not isinstance(e, ProtectedError):
+                                    logger.warning(
+                                        'Error when emptying the trash in bulk (%s) ; '
+                                        'the entities are deleted one by one.', e,
+                                    )
+
+                                _get_deleted_entity_ids().difference_update(
+                                    entity.id for entity in entities
+                                )
+                            else:
+                                progress = True
+                                cmd_qs.update(deleted_count=F('deleted_count') + len(entities))
+                                continue
+
+                        deleted_count = 0
+
+                        for entity in entities:
                             try:
                                 entity.delete()
                             except ProtectedError:
@@ -128,8 +236,11 @@ class _TrashCleanerType(JobType):
                                     _('Deletion caused an unexpected error [{}].').format(e),
                                 )
                             else:
-                                progress = True
-                                cmd_qs.update(deleted_count=F('deleted_count') + 1)
+                                deleted_count += 1
+
+                        if deleted_count:
+                            progress = True
+                            cmd_qs.update(deleted_count=F('deleted_count') + deleted_count)
 
             if not errors or not progress:
                 break
@@ -29,7 +29,13 @@ from django.forms.models import fields_for_model, model_to_dict
 from django.utils.translation import gettext as _
 
 from ..gui import merge
-from ..models import CremeEntity, CustomField, CustomFieldValue, FieldsConfig
+from ..models import (
+    CremeEntity,
+    CustomField,
+    CustomFieldValue,
+    FieldsConfig,
+    HistoryLine,
+)
 from ..signals import pre_merge_related
 from ..utils import replace_related_object
 from .base import _CUSTOM_NAME, CremeForm
@@ -236,32 +242,34 @@ class MergeEntitiesBaseForm(CremeForm):
 
     @atomic
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        cdata = self.cleaned_data
-
-        entity1 = self.entity1
-        entity2 = self.entity2
-
-        entity1.save()
-        self._post_entity1_update(entity1, entity2, cdata)
-        pre_merge_related.send_robust(sender=entity1, other_entity=entity2)
-
-        replace_related_object(entity2, entity1)
-
-        # ManyToManyFields
-        for m2m_field in entity1._meta.many_to_many:
-            name = m2m_field.name
-            m2m_data = cdata.get(name)
-            if m2m_data is not None:
-                getattr(entity1, name).set(m2m_data)
-
-        try:
-            entity2.delete()
-        except Exception as e:
-            logger.error(
-                'Error when merging 2 entities: the old one "%s"(id=%s) cannot be deleted: %s',
-                entity2, entity2.id, e
-            )
+        # NB: the lines of history are written at once
+        with HistoryLine.buffered():
+            super().save(*args, **kwargs)
+            cdata = self.cleaned_data
+
+            entity1 = self.entity1
+            entity2 = self.entity2
+
+            entity1.save()
+            self._post_entity1_update(entity1, entity2, cdata)
+            pre_merge_related.send_robust(sender=entity1, other_entity=entity2)
+
+            replace_related_object(entity2, entity1)
+
+            # ManyToManyFields
+            for m2m_field in entity1._meta.many_to_many:
+                name = m2m_field.name
+                m2m_data = cdata.get(name)
+                if m2m_data is not None:
+                    getattr(entity1, name).set(m2m_data)
+
+            try:
+                entity2.delete()
+            except Exception as e:
+                logger.error(
+                    'Error when merging 2 entities: the old one "%s"(id=%s) cannot be deleted: %s',
+                    entity2, entity2.id, e
+                )
 
 
 def mergefield_factory(modelfield: models.Field,
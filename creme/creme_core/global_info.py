@@ -27,7 +27,7 @@
 from collections import defaultdict
 from functools import wraps
 from threading import current_thread
-from typing import DefaultDict, Hashable
+from typing import DefaultDict, Hashable, Iterable, Iterator
 
 _globals: DefaultDict = defaultdict(dict)
 
@@ -56,6 +56,24 @@ def clear_global_info() -> None:
     _globals.pop(current_thread(), None)
 
 
+def iter_in_request_context(items: Iterable, user) -> Iterator:
+    """Iterate on some items with the global information of a request
+    (the user & an empty per-request cache).
+    It's useful for the streamed responses: their content is generated after
+    the middlewares have been called, so the global information of the request
+    have been cleared.
+
+    @param items: Iterable (typically a generator which builds the content).
+    @param user: Instance of <django.contrib.auth.get_user_model()>.
+    """
+    set_global_info(user=user, per_request_cache={})
+
+    try:
+        yield from items
+    finally:
+        clear_global_info()
+
+
 def get_per_request_cache() -> dict:
     """Get a special global data, which is a dictionary used as a per-request cache.
 
@@ -42,6 +42,7 @@ from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
 from ..constants import MODELBRICK_ID
+from ..core.brick_cache import brick_render_cache
 from ..core.entity_cell import EntityCell, EntityCellRegularField
 from ..core.field_tags import FieldTag
 from ..core.sorter import cell_sorter_registry
@@ -142,7 +143,37 @@ class Brick:
     #   (but it is still reloaded when the dependant bricks are reloaded of course).
     read_only: bool = False
 
+    # 'True' means that the HTML of the brick (on detail-views) can be stored
+    # in a cache (see settings.BRICK_CACHE & 'creme_core.core.brick_cache').
+    # The fragment is used again while the entity, the user, the state of the
+    # brick & the instances of the dependencies models (see the attributes
+    # 'dependencies' & 'relation_type_deps') do not change ; so the brick must
+    # not display other data (& must not contain a CSRF token).
+    # Notice that the class of the brick must be registered (in order to watch
+    # its dependencies), & that the wildcard dependencies ('*') are not cached.
+    cache_render: bool = False
+
+    # 'True' means that the brick is not rendered with the page (detail-view,
+    # home...): a placeholder is displayed, & the content is retrieved by the
+    # JavaScript once the page is loaded (with the reloading view of the page ;
+    # all the lazy bricks of a page are retrieved with one query).
+    # It's useful for the slow bricks, which would delay the display of the
+    # whole page (see the argument "lazy" of the templatetag {% brick_display %}
+    # too).
+    lazy: bool = False
+
+    # 'True' means that the brick can be rendered by another thread than the
+    # thread of the request, at the same time as the other bricks, by the
+    # views which reload the bricks (see settings.BRICK_RELOAD_WORKERS &
+    # 'creme_core.core.brick_render'). So the rendering must only read the
+    # database, & must not depend on the order of rendering (i.e. the data
+    # stored in context['shared'] by the other bricks).
+    concurrent_render: bool = False
+
     template_name: str = 'OVERRIDE_ME.html'  # Used to render the brick of course
+    placeholder_template_name: str = 'creme_core/bricks/placeholder.html'
+    # Used when the rendering exceeds its budget (see 'concurrent_render')
+    error_template_name: str = 'creme_core/bricks/render-error.html'
     context_class = _BrickContext  # Class of the instance which stores the context in the session.
 
     # ATTRIBUTES USED ONLY BY THE CONFIGURATION GUI FOR THE BRICKS (ie: in creme_config) ----------
@@ -208,6 +239,28 @@ class Brick:
         """
         return self._render(self.get_template_context(context))
 
+    def placeholder_display(self, context: dict) -> str:
+        """Render a placeholder for the brick ; the JavaScript replaces it by
+        the content of the brick (see the attribute 'lazy').
+        """
+        # NB: we use the method of Brick, because the child classes need
+        #     their data (queryset...) to build their context.
+        return get_template(self.placeholder_template_name).render(
+            Brick._build_template_context(
+                self, context=context, brick_id=self.id_, brick_context=self.context_class(),
+            )
+        )
+
+    def error_display(self, context: dict) -> str:
+        """Render a placeholder for the brick, which indicates that the brick
+        cannot be rendered for now (see the attribute 'concurrent_render').
+        """
+        return get_template(self.error_template_name).render(
+            Brick._build_template_context(
+                self, context=context, brick_id=self.id_, brick_context=self.context_class(),
+            )
+        )
+
     def _iter_dependencies_info(self):
         for dep in self.dependencies:
             if isinstance(dep, type) and issubclass(dep, Model):
@@ -807,6 +860,8 @@ class _BrickRegistry:
             if setdefault(brick_id, brick_cls) is not brick_cls:
                 raise self.RegistrationError(f"Duplicated brick's id: {brick_id}")
 
+            brick_render_cache.watch(brick_cls)
+
         return self
 
     # TODO: factorise
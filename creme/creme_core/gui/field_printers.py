@@ -552,6 +552,10 @@ class _FieldPrintersRegistry:
             'csv':  print_choice,
         }
 
+        # Printers built by get_field_printer() ;
+        # key: tuple (model, field_name, output).
+        self._compiled_printers: dict[tuple[type[Model], str, str], ReducedPrinter] = {}
+
         css_default        = getattr(settings, 'CSS_DEFAULT_LISTVIEW')
         css_default_header = getattr(settings, 'CSS_DEFAULT_HEADER_LISTVIEW')
 
@@ -592,6 +596,8 @@ class _FieldPrintersRegistry:
         @return Self to chain calls.
         """
         self._printers_maps[output][field] = printer
+        self._compiled_printers.clear()
+
         return self
 
     def register_choice_printer(
@@ -604,6 +610,8 @@ class _FieldPrintersRegistry:
         @return Self to chain calls.
         """
         self._choice_printers[output] = printer
+        self._compiled_printers.clear()
+
         return self
 
     def register_listview_css_class(
@@ -722,19 +730,41 @@ class _FieldPrintersRegistry:
             output: str = 'html') -> ReducedPrinter:
         return self._build_field_printer(FieldInfo(model, field_name), output=output)
 
+    def get_field_printer(
+            self,
+            model: type[models.Model],
+            field_name: str,
+            output: str = 'html') -> ReducedPrinter:
+        """Get the printer of a field ; it's built once (see build_field_printer()),
+        & stored until a new printer is registered.
+        @param model: A class inheriting <django.models.Model>.
+        @param field_name: Name of the field ; can be a "chain" of fields (e.g. 'sector__title').
+        @param output: string in {'html', 'csv'}.
+        @return A callable object, with 2 arguments: the instance of <model> & the user.
+        """
+        key = (model, field_name, output)
+        printer = self._compiled_printers.get(key)
+
+        if printer is None:
+            self._compiled_printers[key] = printer = self.build_field_printer(
+                model, field_name, output=output,
+            )
+
+        return printer
+
     def get_html_field_value(
             self,
             obj: models.Model,
             field_name: str,
             user) -> str:
-        return self.build_field_printer(obj.__class__, field_name)(obj, user)
+        return self.get_field_printer(obj.__class__, field_name)(obj, user)
 
     def get_csv_field_value(
             self,
             obj: models.Model,
             field_name: str,
             user) -> str:
-        return self.build_field_printer(obj.__class__, field_name, output='csv')(obj, user)
+        return self.get_field_printer(obj.__class__, field_name, output='csv')(obj, user)
 
 
 field_printers_registry = _FieldPrintersRegistry()
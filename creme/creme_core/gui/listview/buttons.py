@@ -20,6 +20,7 @@ from __future__ import annotations
 
 from typing import Any, Iterator
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 
 from creme.creme_core import backends
@@ -95,6 +96,18 @@ class MassExportButton(ListViewButton):
         ]
         context['extra_q'] = lv_context['extra_q']
 
+        threshold = settings.MASS_EXPORT_JOB_THRESHOLD
+        if threshold is None:
+            threshold = settings.FAST_QUERY_MODE_THRESHOLD
+
+        # NB: the count can be approximated (see EntitiesList.count_entities()) ;
+        #     when it's not exact, the cap has been exceeded, & the count is
+        #     only a minimum (so we cannot compare it with the threshold).
+        count = lv_context.get('entities_count')
+        context['use_job'] = count is not None and (
+            count >= threshold or lv_context.get('count_mode', 'exact') != 'exact'
+        )
+
         return context
 
 
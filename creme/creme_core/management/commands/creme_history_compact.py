@@ -0,0 +1,79 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from django.core.management.base import BaseCommand, CommandError
+
+from creme.creme_core.core.paginator import FlowPaginator
+from creme.creme_core.models import ArchivedHistoryLine, HistoryLine
+
+
+class Command(BaseCommand):
+    help = (
+        'Compact the values of the lines of history (archived ones included) '
+        'which have been written with a verbose JSON format by old versions.\n'
+        'Hint: this command can be run while the application is used.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-c', '--chunk-size',
+            action='store', dest='chunk_size', type=int, default=1024,
+            help='Number of lines processed at once [default: %(default)s]',
+        )
+
+    @staticmethod
+    def compact(model, chunk_size: int) -> int:
+        "@return The number of modified lines."
+        compact_value = HistoryLine.compact_value
+        paginator = FlowPaginator(
+            queryset=model.objects.order_by('id').only('id', 'value'),
+            key='id', per_page=chunk_size,
+        )
+        count = 0
+
+        for lines_page in paginator.pages():
+            modified_lines = []
+
+            for line in lines_page.object_list:
+                value = line.value
+                compacted = compact_value(value)
+
+                if compacted != value:
+                    line.value = compacted
+                    modified_lines.append(line)
+
+            if modified_lines:
+                model.objects.bulk_update(modified_lines, fields=['value'])
+                count += len(modified_lines)
+
+        return count
+
+    def handle(self, *args, **options):
+        verbosity = options['verbosity']
+        chunk_size = options['chunk_size']
+
+        if chunk_size < 2:
+            raise CommandError('The chunk size must be greater than 1.')
+
+        for model in (HistoryLine, ArchivedHistoryLine):
+            count = self.compact(model, chunk_size=chunk_size)
+
+            if verbosity:
+                self.stdout.write(
+                    f'{count} "{model.__name__}" compacted.', self.style.SUCCESS,
+                )
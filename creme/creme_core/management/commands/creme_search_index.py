@@ -0,0 +1,91 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from creme.creme_core.core.search import search_index
+from creme.creme_core.registry import creme_registry
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the documents used by the indexed search back-ends '
+        '(see settings.SEARCH_BACKEND).\n'
+        'By default, the documents of all the types of entity are built ; '
+        'you can give the models to index with their names '
+        '(like "persons.contact").\n'
+        'Hint: run this command when you activate an indexed back-end, & when '
+        'you modify the search configuration.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.model_name',
+            help='Models to index (default: all the types of entity).',
+        )
+        parser.add_argument(
+            '-c', '--chunk-size',
+            action='store', dest='chunk_size', type=int, default=256,
+            help='Number of entities indexed at once [default: %(default)s]',
+        )
+
+    def _get_models(self, model_names):
+        entity_models = [*creme_registry.iter_entity_models()]
+
+        if not model_names:
+            return entity_models
+
+        models = []
+
+        for model_name in model_names:
+            try:
+                model = apps.get_model(model_name)
+            except (LookupError, ValueError) as e:
+                raise CommandError(f'Invalid model "{model_name}": {e}') from e
+
+            if model not in entity_models:
+                raise CommandError(f'The model "{model_name}" is not a type of entity.')
+
+            models.append(model)
+
+        return models
+
+    def handle(self, *args, **options):
+        verbosity = options['verbosity']
+        chunk_size = options['chunk_size']
+
+        if chunk_size < 2:
+            raise CommandError('The chunk size must be greater than 1.')
+
+        models = self._get_models(options['models'])
+
+        if verbosity and not search_index.enabled:
+            self.stdout.write(
+                'Beware: the current search back-end does not use the index.',
+                self.style.WARNING,
+            )
+
+        for model in models:
+            if verbosity > 1:
+                self.stdout.write(f'Indexing "{model.__name__}"...')
+
+            count = search_index.rebuild(model, chunk_size=chunk_size)
+
+            if verbosity:
+                self.stdout.write(f'{count} "{model.__name__}" indexed.', self.style.SUCCESS)
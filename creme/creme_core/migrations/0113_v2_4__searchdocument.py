@@ -0,0 +1,100 @@
+import logging
+
+from django.db import DatabaseError, migrations, models, transaction
+from django.db.models.deletion import CASCADE
+
+from creme.creme_core.models.fields import EntityCTypeForeignKey
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'creme_core_searchdocument'
+FTS_TABLE = 'creme_core_searchdocument_fts'  # See IndexSearchBackend.fts_table
+TRIGRAM_INDEX = 'creme_core_searchdocument_content_trgm'
+
+
+def create_text_index(apps, schema_editor):
+    connection = schema_editor.connection
+    vendor = connection.vendor
+
+    try:
+        with transaction.atomic(using=connection.alias):
+            if vendor == 'sqlite':
+                # NB: "external content" table ; it's synchronised with triggers.
+                schema_editor.execute(
+                    f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+                    f'content, content="{TABLE}", content_rowid="id", tokenize="trigram")'
+                )
+                schema_editor.execute(
+                    f'CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN '
+                    f'INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); '
+                    f'END'
+                )
+                schema_editor.execute(
+                    f'CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN '
+                    f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) '
+                    f"VALUES ('delete', old.id, old.content); "
+                    f'END'
+                )
+                schema_editor.execute(
+                    f'CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {TABLE} BEGIN '
+                    f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) '
+                    f"VALUES ('delete', old.id, old.content); "
+                    f'INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); '
+                    f'END'
+                )
+            elif vendor == 'postgresql':
+                schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                schema_editor.execute(
+                    f'CREATE INDEX {TRIGRAM_INDEX} ON {TABLE} '
+                    f'USING gin (content gin_trgm_ops)'
+                )
+    except DatabaseError as e:
+        # NB: the search back-end works without this index (but slower)
+        logger.warning(
+            'The text index of SearchDocument cannot be created (%s) ; '
+            'the search will be slower with the back-end "IndexSearchBackend".', e,
+        )
+
+
+def drop_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('creme_core', '0112_v2_4__menuitem_per_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                )),
+                ('cell_key', models.CharField(editable=False, max_length=100)),
+                ('content', models.TextField(editable=False)),
+                ('entity', models.ForeignKey(
+                    editable=False, on_delete=CASCADE,
+                    related_name='+', to='creme_core.cremeentity',
+                )),
+                ('entity_type', EntityCTypeForeignKey(
+                    editable=False, on_delete=CASCADE,
+                    related_name='+', to='contenttypes.contenttype',
+                )),
+            ],
+            options={
+                'index_together': {('entity_type', 'cell_key')},
+            },
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+    ]
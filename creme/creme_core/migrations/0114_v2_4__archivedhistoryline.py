@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.deletion import CASCADE, SET_NULL
+from django.utils.timezone import now
+
+from creme.creme_core.models import fields as core_fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('creme_core', '0113_v2_4__searchdocument'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='historyline',
+            index_together={('entity', 'date')},
+        ),
+        migrations.CreateModel(
+            name='ArchivedHistoryLine',
+            fields=[
+                ('id', models.IntegerField(editable=False, primary_key=True, serialize=False)),
+                ('entity', models.ForeignKey(
+                    null=True, on_delete=SET_NULL,
+                    related_name='+', to='creme_core.cremeentity',
+                )),
+                ('entity_ctype', core_fields.CTypeForeignKey(
+                    on_delete=CASCADE, related_name='+', to='contenttypes.contenttype',
+                )),
+                ('entity_owner', core_fields.CremeUserForeignKey(
+                    related_name='+', to=settings.AUTH_USER_MODEL,
+                )),
+                ('username', models.CharField(max_length=30)),
+                ('date', models.DateTimeField(verbose_name='Date')),
+                ('type', models.PositiveSmallIntegerField(verbose_name='Type')),
+                ('value', models.TextField(null=True)),
+                ('archiving_date', core_fields.CreationDateTimeField(
+                    blank=True, default=now, editable=False,
+                )),
+            ],
+            options={
+                'verbose_name': 'Archived line of history',
+                'verbose_name_plural': 'Archived lines of history',
+                'index_together': {('entity', 'date')},
+            },
+        ),
+    ]
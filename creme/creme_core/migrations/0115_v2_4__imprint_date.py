@@ -0,0 +1,18 @@
+from django.db import migrations
+from django.utils.timezone import now
+
+from creme.creme_core.models import fields as core_fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('creme_core', '0114_v2_4__archivedhistoryline'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='imprint',
+            name='date',
+            field=core_fields.CreationDateTimeField(blank=True, default=now, editable=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+from django.utils.timezone import now
+
+from creme.creme_core.models import fields as core_fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('creme_core', '0115_v2_4__imprint_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingHistoryChunk',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                )),
+                ('created', core_fields.CreationDateTimeField(
+                    blank=True, default=now, editable=False,
+                )),
+                ('lines', models.JSONField(default=list, editable=False)),
+            ],
+        ),
+    ]
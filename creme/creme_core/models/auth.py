@@ -231,17 +231,37 @@ class UserRole(models.Model):
 
         return setcredentials
 
-    def get_perms(self, user, entity: CremeEntity) -> int:
-        """@return (can_view, can_change, can_delete, can_link, can_unlink) 5 boolean tuple."""
+    def get_perms(self,
+                  user,
+                  entity: CremeEntity,
+                  filtered_ids: dict[int, set[int]] | None = None,
+                  ) -> int:
+        """@return (can_view, can_change, can_delete, can_link, can_unlink) 5 boolean tuple.
+        @param filtered_ids: Optional result of get_filtered_entity_ids().
+        """
         real_entity_class = entity.entity_type.model_class()
 
         if self.is_app_allowed_or_administrable(real_entity_class._meta.app_label):
-            perms = SetCredentials.get_perms(self._get_setcredentials(), user, entity)
+            perms = SetCredentials.get_perms(
+                self._get_setcredentials(), user, entity, filtered_ids=filtered_ids,
+            )
         else:
             perms = EntityCredentials.NONE
 
         return perms
 
+    def get_filtered_entity_ids(self,
+                                user,
+                                entities: Sequence[CremeEntity],
+                                ) -> dict[int, set[int]]:
+        """Evaluate at once the filters of the credentials (with type ESET_FILTER)
+        on several entities.
+        @see SetCredentials.get_filtered_entity_ids().
+        """
+        return SetCredentials.get_filtered_entity_ids(
+            self._get_setcredentials(), user, entities,
+        )
+
     # TODO: factorise
     def filter(self,
                user,
@@ -419,8 +439,15 @@ class SetCredentials(models.Model):
 
         return format_str.format(**args)
 
-    def _get_perms(self, user, entity: CremeEntity) -> int:
-        """@return An integer with binary flags for permissions."""
+    def _get_perms(self,
+                   user,
+                   entity: CremeEntity,
+                   filtered_ids: dict[int, set[int]] | None = None,
+                   ) -> int:
+        """@return An integer with binary flags for permissions.
+        @param filtered_ids: Optional result of get_filtered_entity_ids() ;
+               if the instance has been evaluated, the filter is not used.
+        """
         ctype_id = self.ctype_id
 
         if not ctype_id or ctype_id == entity.entity_type_id:
@@ -433,7 +460,12 @@ class SetCredentials(models.Model):
                 if user.id == user_id or any(user_id == t.id for t in user.teams):
                     return self.value
             else:  # SetCredentials.ESET_FILTER
-                if self.efilter.accept(entity=entity.get_real_entity(), user=user):
+                accepted_ids = None if filtered_ids is None else filtered_ids.get(self.id)
+
+                if accepted_ids is None:
+                    if self.efilter.accept(entity=entity.get_real_entity(), user=user):
+                        return self.value
+                elif entity.id in accepted_ids:
                     return self.value
 
         return EntityCredentials.NONE
@@ -442,20 +474,70 @@ class SetCredentials(models.Model):
     def get_perms(sc_sequence: Sequence[SetCredentials],
                   user,
                   entity: CremeEntity,
+                  filtered_ids: dict[int, set[int]] | None = None,
                   ) -> int:
-        """@param sc_sequence: Sequence of SetCredentials instances."""
+        """@param sc_sequence: Sequence of SetCredentials instances.
+        @param filtered_ids: Optional result of get_filtered_entity_ids().
+        """
         perms = reduce(
             or_op,
-            (sc._get_perms(user, entity) for sc in sc_sequence if not sc.forbidden),
+            (
+                sc._get_perms(user, entity, filtered_ids)
+                for sc in sc_sequence if not sc.forbidden
+            ),
             EntityCredentials.NONE
         )
 
         for sc in sc_sequence:
             if sc.forbidden:
-                perms &= ~sc._get_perms(user, entity)
+                perms &= ~sc._get_perms(user, entity, filtered_ids)
 
         return perms
 
+    @classmethod
+    def get_filtered_entity_ids(cls,
+                                sc_sequence: Sequence[SetCredentials],
+                                user,
+                                entities: Sequence[CremeEntity],
+                                ) -> dict[int, set[int]]:
+        """Evaluate the filters of the SetCredentials with type ESET_FILTER on
+        several entities at once; it performs one query per filter (instead of
+        retrieving the real entity & its related instances for each entity).
+        @param sc_sequence: Sequence of SetCredentials instances.
+        @param user: User instance (used by the filters' conditions).
+        @param entities: Sequence of CremeEntity instances.
+        @return A dictionary ; keys are IDs of SetCredentials, values are the
+                IDs of the accepted entities.
+        """
+        filtered_ids = {}
+
+        for sc in sc_sequence:
+            if sc.set_type != cls.ESET_FILTER:
+                continue
+
+            ctype_id = sc.ctype_id
+            entity_ids = [
+                entity.id
+                for entity in entities
+                if not ctype_id or ctype_id == entity.entity_type_id
+            ]
+            accepted_ids = set()
+
+            if entity_ids:
+                efilter = sc.efilter
+                accepted_ids.update(
+                    efilter.filter(
+                        efilter.entity_type.model_class()
+                                           ._default_manager
+                                           .filter(pk__in=entity_ids),
+                        user=user,
+                    ).order_by().values_list('id', flat=True)
+                )
+
+            filtered_ids[sc.id] = accepted_ids
+
+        return filtered_ids
+
     @classmethod
     def _can_do(cls,
                 sc_sequence: Sequence[SetCredentials],
@@ -1079,6 +1161,38 @@ class CremeUser(AbstractBaseUser):
 
         return creds
 
+    def populate_credentials(self, entities: Iterable[CremeEntity]) -> None:
+        """Compute the credentials of the user for several entities at once
+        (e.g. the entities of a page), & store them in the entities' cache ;
+        so the methods has_perm_to_view(), has_perm_to_change() etc... perform
+        no query with these entities.
+        It's faster than computing the credentials of each entity, because the
+        filters of the credentials (ESET_FILTER) perform one query per filter
+        (instead of queries per entity).
+        @param entities: Iterable of CremeEntity instances.
+        """
+        user_id = self.id
+        entities = [
+            entity
+            for entity in entities
+            if user_id not in (getattr(entity, '_credentials_map', None) or ())
+        ]
+
+        if not entities:
+            return
+
+        filtered_ids = (
+            None if self.is_superuser else
+            self.role.get_filtered_entity_ids(self, entities)
+        )
+
+        for entity in entities:
+            creds_map = getattr(entity, '_credentials_map', None)
+            if creds_map is None:
+                entity._credentials_map = creds_map = {}
+
+            creds_map[user_id] = EntityCredentials(self, entity, filtered_ids=filtered_ids)
+
     def has_perm(self, perm: str, obj=None) -> bool:
         """
         Returns True if the user has the specified permission. This method
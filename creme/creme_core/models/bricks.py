@@ -38,6 +38,7 @@ from ..constants import (
     SETTING_BRICK_DEFAULT_STATE_IS_OPEN,
     SETTING_BRICK_DEFAULT_STATE_SHOW_EMPTY_FIELDS,
 )
+from ..core.cache import config_cache
 from ..utils.content_type import entity_ctypes
 # from ..utils.serializers import json_encode
 from .auth import UserRole
@@ -60,6 +61,9 @@ logger = logging.getLogger(__name__)
 
 
 class BrickDetailviewLocationManager(models.Manager):
+    # Namespace in the shared configuration cache (see creme_core.core.cache)
+    cache_namespace = 'creme_core-detailview_locations'
+
     # TODO: Enum for zone
     def create_if_needed(
             self,
@@ -114,6 +118,26 @@ class BrickDetailviewLocationManager(models.Manager):
             zone=zone, model=model, role=role,
         )
 
+    def for_ctype(self, ctype: ContentType) -> list[BrickDetailviewLocation]:
+        """Get the instances of the default configuration & the ones related to
+        a ContentType (for all the roles), ordered by 'order'.
+        The result is stored in the shared configuration cache
+        (see 'creme_core.core.cache').
+        """
+        namespace = self.cache_namespace
+        key = str(ctype.id)
+        locs = config_cache.get(namespace, key)
+
+        if locs is None:
+            locs = [
+                *self.filter(
+                    models.Q(content_type=None) | models.Q(content_type=ctype)
+                ).order_by('order'),
+            ]
+            config_cache.set(namespace, key, locs)
+
+        return locs
+
     def filter_for_model(self, model: type[CremeEntity]) -> models.QuerySet:
         return self.filter(
             content_type=ContentType.objects.get_for_model(model),
@@ -236,6 +260,11 @@ class BrickDetailviewLocation(CremeModel):
         )
 
 
+config_cache.invalidate_on_change(
+    BrickDetailviewLocation.objects.cache_namespace, BrickDetailviewLocation,
+)
+
+
 class BrickHomeLocation(CremeModel):
     role = models.ForeignKey(
         UserRole, verbose_name=_('Related role'),
@@ -30,6 +30,7 @@ from django.utils.timezone import localtime
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from ..core.cache import config_cache
 from ..global_info import get_per_request_cache
 from ..utils.content_type import as_ctype
 from .base import CremeModel
@@ -46,6 +47,9 @@ __all__ = (
 
 
 class CustomFieldManager(models.Manager):
+    # Namespace in the shared configuration cache (see creme_core.core.cache)
+    cache_namespace = 'creme_core-custom_fields'
+
     # TODO: python 3.8 '/' argument ?
     # TODO: exclude deleted fields?
     def compatible(self, ct_or_model):
@@ -60,7 +64,14 @@ class CustomFieldManager(models.Manager):
 
         cached_cfields = cache.get(key)
         if cached_cfields is None:
-            cached_cfields = cache[key] = [*self.filter(content_type=ct)]
+            namespace = self.cache_namespace
+            cached_cfields = config_cache.get(namespace, str(ct.id))
+
+            if cached_cfields is None:
+                cached_cfields = [*self.filter(content_type=ct)]
+                config_cache.set(namespace, str(ct.id), cached_cfields)
+
+            cache[key] = cached_cfields
 
         return OrderedDict((cfield.id, cfield) for cfield in cached_cfields)
 
@@ -505,3 +516,5 @@ _TABLES: dict[int, type[CustomFieldValue]] = OrderedDict([
     (CustomField.ENUM,       CustomFieldEnum),
     (CustomField.MULTI_ENUM, CustomFieldMultiEnum),
 ])
+
+config_cache.invalidate_on_change(CustomField.objects.cache_namespace, CustomField)
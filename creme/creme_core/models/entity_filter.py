@@ -22,7 +22,7 @@ import logging
 from itertools import zip_longest
 from json import loads as json_load
 from re import compile as compile_re
-from typing import TYPE_CHECKING, Iterable, Iterator
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
@@ -35,6 +35,7 @@ from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext, pgettext_lazy
 
+from ..core.cache import config_cache
 from ..core.entity_filter import (
     EF_USER,
     _EntityFilterRegistry,
@@ -60,9 +61,7 @@ class EntityFilterList(list):
     Indeed, it's as a cache.
     """
     def __init__(self, content_type: ContentType, user):
-        super().__init__(
-            EntityFilter.objects.filter_by_user(user).filter(entity_type=content_type)
-        )
+        super().__init__(EntityFilter.objects.get_for_ctype(ctype=content_type, user=user))
         self._selected: EntityFilter | None = None
 
     @property
@@ -82,6 +81,9 @@ class EntityFilterList(list):
 
 
 class EntityFilterManager(models.Manager):
+    # Namespace in the shared configuration cache (see creme_core.core.cache)
+    cache_namespace = 'creme_core-entity_filters'
+
     def get_latest_version(self, base_pk: str) -> EntityFilter:
         """Get the latest EntityFilter from the family which uses the 'base_pk'.
         @raises EntityFilter.DoesNotExist If there is none instance in this family
@@ -152,6 +154,38 @@ class EntityFilterManager(models.Manager):
             )
         )
 
+    def get_for_ctype(self, ctype: ContentType, user) -> list[EntityFilter]:
+        """Get the instances related to a ContentType which a user can see.
+        It's equivalent to 'filter_by_user(user).filter(entity_type=ctype)', but
+        the instances of the ContentType are stored in the shared configuration
+        cache (see 'creme_core.core.cache') & the visibility is checked in Python.
+        @param ctype: A ContentType instance.
+        @param user: A User instance.
+        """
+        if user.is_team:
+            raise ValueError(
+                f'EntityFilterManager.get_for_ctype(): '
+                f'user cannot be a team ({user})'
+            )
+
+        namespace = self.cache_namespace
+        key = str(ctype.id)
+        instances = config_cache.get(namespace, key)
+
+        if instances is None:
+            instances = [*self.filter(filter_type=EF_USER, entity_type=ctype)]
+            config_cache.set(namespace, key, instances)
+
+        if user.is_staff:
+            return instances
+
+        user_ids = {user.id, *(team.id for team in user.teams)}
+
+        return [
+            instance for instance in instances
+            if not instance.is_private or instance.user_id in user_ids
+        ]
+
     def smart_update_or_create(self,
                                pk: str,
                                name: str,
@@ -380,6 +414,32 @@ class EntityFilter(models.Model):  # CremeModel ???
 
         return any(accepted) if self.use_or else all(accepted)
 
+    def accept_many(self, entities: Iterable[CremeEntity], user) -> list[bool]:
+        """Check several CremeEntity instances at once ; the relations, the
+        properties, the custom values... used by the conditions are retrieved
+        for all the entities (see populate_entities()), so it's faster than
+        calling accept() on each entity.
+
+        @param entities: Iterable of <CremeEntity> instances (real entities
+               if the conditions use fields of the filter's model -- see
+               'CremeEntity.populate_real_entities()').
+        @param user: see accept().
+        @return: A list of booleans (one per entity, in the same order).
+        """
+        entities = [*entities]
+        self.populate_entities(entities=entities, user=user)
+        accept = self.accept
+
+        return [accept(entity=entity, user=user) for entity in entities]
+
+    def populate_entities(self, entities: Sequence[CremeEntity], user) -> None:
+        """Fill the caches of several entities with the data used by the
+        conditions (see FilterConditionHandler.populate_entities()).
+        """
+        if entities:
+            for condition in self.get_conditions():
+                condition.handler.populate_entities(entities=entities, user=user)
+
     @property
     def applicable_on_entity_base(self) -> bool:
         """Can this filter be applied on CremeEntity (QuerySet or simple instance)?
@@ -946,3 +1006,6 @@ def _delete_related_efc(sender, instance, **kwargs):
 
     if q:
         EntityFilterCondition.objects.filter(q).delete()
+
+
+config_cache.invalidate_on_change(EntityFilter.objects.cache_namespace, EntityFilter)
@@ -32,6 +32,7 @@ from django.db.models import BooleanField
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from ..core.cache import config_cache
 from ..core.field_tags import FieldTag
 from ..global_info import get_per_request_cache
 from ..utils.meta import FieldInfo
@@ -69,6 +70,9 @@ logger = logging.getLogger(__name__)
 
 
 class FieldsConfigManager(models.Manager):
+    # Namespace in the shared configuration cache (see creme_core.core.cache)
+    cache_namespace = 'creme_core-fields_config'
+
     def configurable_fields(self, model: type[Model]) -> Iterator[tuple[Field, list[str]]]:
         conf_model = self.model
         REQUIRED = conf_model.REQUIRED
@@ -126,20 +130,43 @@ class FieldsConfigManager(models.Manager):
             else:
                 result[model] = fc
 
-        # Step 2: fill 'result' with configs in DB
-        for fc in self.filter(content_type__in=not_cached_ctypes):
-            ct = fc.content_type
-            result[ct.model_class()] = cache[cache_key_fmt(ct.id)] = fc
+        # Step 2: fill 'result' with configs in the shared cache
+        not_shared_ctypes = []
+        if not_cached_ctypes:
+            shared_configs = config_cache.get_many(
+                self.cache_namespace, (str(ct.id) for ct in not_cached_ctypes),
+            )
+
+            for ct in not_cached_ctypes:
+                fc = shared_configs.get(str(ct.id))
+
+                if fc is None:
+                    not_shared_ctypes.append(ct)
+                else:
+                    result[ct.model_class()] = cache[cache_key_fmt(ct.id)] = fc
+
+        # Step 3: fill 'result' with configs in DB
+        to_share = {}
+        if not_shared_ctypes:
+            for fc in self.filter(content_type__in=not_shared_ctypes):
+                ct = fc.content_type
+                result[ct.model_class()] = cache[cache_key_fmt(ct.id)] = fc
+                to_share[str(ct.id)] = fc
 
-        # Step 3: fill 'result' with empty configs for remaining models
+        # Step 4: fill 'result' with empty configs for remaining models
         for model in models:
             if model not in result:
                 ct = get_ct(model)
-                result[model] = cache[cache_key_fmt(ct.id)] = self.model(
+                result[model] = cache[cache_key_fmt(ct.id)] = fc = self.model(
                     content_type=ct,
                     descriptions=(),
                 )
 
+                if ct in not_shared_ctypes:
+                    to_share[str(ct.id)] = fc
+
+        config_cache.set_many(self.cache_namespace, to_share)
+
         return result
 
     def has_configurable_fields(self, model: type[Model]) -> bool:
@@ -490,3 +517,6 @@ class FieldsConfig(CremeModel):
 
     def natural_key(self):
         return self.content_type.natural_key()
+
+
+config_cache.invalidate_on_change(FieldsConfig.objects.cache_namespace, FieldsConfig)
@@ -32,6 +32,7 @@ from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
 
+from ..core.cache import config_cache
 from ..utils.serializers import json_encode
 from . import CremeEntity
 from . import fields as core_fields
@@ -47,10 +48,7 @@ class HeaderFilterList(list):
     Indeed, it's a cache.
     """
     def __init__(self, content_type: ContentType, user):
-        super().__init__(
-            HeaderFilter.objects.filter_by_user(user)
-                                .filter(entity_type=content_type)
-        )
+        super().__init__(HeaderFilter.objects.get_for_ctype(ctype=content_type, user=user))
         self._selected: HeaderFilter | None = None
 
     @property
@@ -75,6 +73,9 @@ class HeaderFilterList(list):
 
 
 class HeaderFilterManager(models.Manager):
+    # Namespace in the shared configuration cache (see creme_core.core.cache)
+    cache_namespace = 'creme_core-header_filters'
+
     def filter_by_user(self, user) -> QuerySet:
         if user.is_team:
             raise ValueError(
@@ -93,6 +94,38 @@ class HeaderFilterManager(models.Manager):
             )
         )
 
+    def get_for_ctype(self, ctype: ContentType, user) -> list[HeaderFilter]:
+        """Get the instances related to a ContentType which a user can see.
+        It's equivalent to 'filter_by_user(user).filter(entity_type=ctype)', but
+        the instances of the ContentType are stored in the shared configuration
+        cache (see 'creme_core.core.cache') & the visibility is checked in Python.
+        @param ctype: A ContentType instance.
+        @param user: A User instance.
+        """
+        if user.is_team:
+            raise ValueError(
+                f'HeaderFilterManager.get_for_ctype(): '
+                f'user cannot be a team ({user})'
+            )
+
+        namespace = self.cache_namespace
+        key = str(ctype.id)
+        instances = config_cache.get(namespace, key)
+
+        if instances is None:
+            instances = [*self.filter(entity_type=ctype)]
+            config_cache.set(namespace, key, instances)
+
+        if user.is_staff:
+            return instances
+
+        user_ids = {user.id, *(team.id for team in user.teams)}
+
+        return [
+            instance for instance in instances
+            if not instance.is_private or instance.user_id in user_ids
+        ]
+
     def create_if_needed(
             self,
             pk: str,
@@ -287,3 +320,6 @@ class HeaderFilter(models.Model):  # CremeModel ???
         EntityCell.mixed_populate_entities(
             cells=self.cells, entities=entities, user=user,
         )
+
+
+config_cache.invalidate_on_change(HeaderFilter.objects.cache_namespace, HeaderFilter)
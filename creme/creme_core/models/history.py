@@ -21,18 +21,20 @@ from __future__ import annotations
 import logging
 # import warnings
 from builtins import getattr
+from contextlib import contextmanager
 from datetime import date, datetime, time
 from decimal import Decimal
 from functools import partial
 from json import JSONEncoder
 from json import loads as json_load
-from typing import Container, Iterable, Iterator, Sequence  # Any Callable
+from typing import Callable, Container, Iterable, Iterator, Sequence  # Any
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 # from django.core.exceptions import FieldDoesNotExist
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models, transaction
 # from django.db.models import Field
 from django.db.models import ForeignKey, Model, signals
 from django.db.models.base import ModelState
@@ -105,6 +107,9 @@ _SERIALISABLE_FIELDS = frozenset((
 ))
 
 _TIME_FMT = '%H:%M:%S.%f'
+# NB: no space, in order to reduce the size of HistoryLine.value
+_JSON_SEPARATORS = (',', ':')
+_BUFFER_KEY = 'creme_core-history_buffer'
 
 
 # TODO: in creme_core.utils ??
@@ -296,13 +301,15 @@ class _HistoryLineType:
                 if fname in excluded_fields or not field.get_tag(FieldTag.VIEWABLE):
                     continue
 
-                old_value = getattr(old_instance, fname)
-                new_value = getattr(instance, fname)
-
                 if isinstance(field, ForeignKey):
-                    old_value = old_value and old_value.pk
-                    new_value = new_value and new_value.pk
+                    # NB: we compare the IDs to avoid queries
+                    attname = field.attname
+                    old_value = getattr(old_instance, attname)
+                    new_value = getattr(instance, attname)
                 else:
+                    old_value = getattr(old_instance, fname)
+                    new_value = getattr(instance, fname)
+
                     try:
                         # Sometimes a form sets a string representing an int in
                         # an IntegerField (for example)
@@ -443,6 +450,18 @@ class _HLTCacheMixin:
     def _set_cached_line(cls, instance, hline):
         raise NotImplementedError
 
+    @classmethod
+    def _reset_cached_line(cls, instance):
+        raise NotImplementedError
+
+    @classmethod
+    def _watch_buffered_line(cls, instance, hline):
+        # NB: a buffered line must not be modified after having been written,
+        #     so the cache is reset when the buffer is flushed.
+        buffer = hline._buffer
+        if buffer is not None:
+            buffer.on_flush(partial(cls._reset_cached_line, instance))
+
 
 class _HLTInstanceCacheMixin(_HLTCacheMixin):
     @classmethod
@@ -452,6 +471,11 @@ class _HLTInstanceCacheMixin(_HLTCacheMixin):
     @classmethod
     def _set_cached_line(cls, instance, hline):
         setattr(instance, cls._get_cache_key(instance), hline)
+        cls._watch_buffered_line(instance, hline)
+
+    @classmethod
+    def _reset_cached_line(cls, instance):
+        instance.__dict__.pop(cls._get_cache_key(instance), None)
 
 
 class _HLTRequestCacheMixin(_HLTCacheMixin):
@@ -464,6 +488,11 @@ class _HLTRequestCacheMixin(_HLTCacheMixin):
     @classmethod
     def _set_cached_line(cls, instance, hline):
         get_per_request_cache()[cls._get_cache_key(instance)] = hline
+        cls._watch_buffered_line(instance, hline)
+
+    @classmethod
+    def _reset_cached_line(cls, instance):
+        get_per_request_cache().pop(cls._get_cache_key(instance), None)
 
 
 class _HLTManyToManyMixin:
@@ -498,7 +527,9 @@ class _HLTEntityCreation(_HistoryLineType):
 
     @classmethod
     def create_line(cls, entity: CremeEntity) -> None:
-        HistoryLine._create_line_4_instance(entity, cls.type_id, date=entity.created)
+        HistoryLine._create_line_4_instance(
+            entity, cls.type_id, date=entity.created, buffered=True,
+        )
         # We do not backup here (and the handler _prepare_log() only creates if
         # PK exists), in order to keep a kind of 'creation session'.
         # So when you create a CremeEntity, while you still use the same python
@@ -525,6 +556,7 @@ class _HLTEntityEdition(_HLTManyToManyMixin,
             if hline is None:
                 hline = HistoryLine._create_line_4_instance(
                     entity, cls.type_id, date=entity.modified, modifs=modifs,
+                    buffered=_HLTRelatedEntity.allows_buffering(),
                 )
                 _HLTRelatedEntity.create_lines(entity, hline)
                 cls._create_entity_backup(entity)
@@ -542,6 +574,69 @@ class _HLTEntityEdition(_HLTManyToManyMixin,
                 hline.value = hline._encode_attrs(entity, modifs=modifications)
                 hline.save()
 
+    @classmethod
+    def create_lines_for_entities(cls, entities: Sequence[CremeEntity]) -> None:
+        """Create the lines for several entities which have been saved without
+        the signal "post_save" (e.g. with QuerySet.bulk_update()) ; the lines
+        are created with few queries.
+        """
+        if not HistoryLine.ENABLED or not entities:
+            return
+
+        rtype_ids = HistoryConfigItem.objects.configured_relation_type_ids()
+        related_entity_ids = {
+            *Relation.objects.filter(
+                subject_entity__in=[e.id for e in entities],
+                type__in=rtype_ids,
+            ).values_list('subject_entity_id', flat=True),
+        } if rtype_ids else set()
+
+        user = get_global_info('user')
+        username = user.username if user else ''
+        lines = []
+
+        for entity in entities:
+            if getattr(entity, '_hline_disabled', False):
+                continue
+
+            if entity.id in related_entity_ids or cls._get_cached_line(entity) is not None:
+                # NB: the related lines need the ID of the line, & the cached
+                #     line is completed (like with a regular edition).
+                cls.create_lines(entity)
+                # NB: the signal "post_save" must not find these modifications again.
+                cls._create_entity_backup(entity)
+                continue
+
+            modifs = _HistoryLineType._build_fields_modifs(entity)
+
+            if modifs:
+                lines.append((
+                    entity,
+                    HistoryLine(
+                        entity=entity,
+                        entity_ctype_id=entity.entity_type_id,
+                        entity_owner_id=entity.user_id,
+                        username=username,
+                        type=cls.type_id,
+                        date=entity.modified,
+                        value=HistoryLine._encode_attrs(entity, modifs=modifs),
+                    ),
+                ))
+                cls._create_entity_backup(entity)
+
+        buffer = get_global_info(_BUFFER_KEY)
+
+        if buffer is None:
+            HistoryLine.objects.bulk_create([hline for __, hline in lines])
+        else:
+            for __, hline in lines:
+                buffer.add(hline)
+
+        for entity, hline in lines:
+            # NB: a written line can be completed only if its ID is known.
+            if hline._buffer is not None or hline.pk is not None:
+                cls._set_cached_line(entity, hline)
+
     @classmethod
     def create_lines_for_m2m(cls,
                              entity: CremeEntity,
@@ -555,6 +650,7 @@ class _HLTEntityEdition(_HLTManyToManyMixin,
             hline = HistoryLine._create_line_4_instance(
                 entity, cls.type_id,
                 modifs=[*cls._initial_m2m_modification(m2m_name, removed_pk_set, added_pk_set)],
+                buffered=_HLTRelatedEntity.allows_buffering(),
             )
             cls._set_cached_line(entity, hline)
 
@@ -623,6 +719,7 @@ class _HLTCustomFieldsEdition(_HLTManyToManyMixin,
         if hline is None:
             hline = HistoryLine._create_line_4_instance(
                 entity, cls.type_id, modifs=[new_modif],
+                buffered=_HLTRelatedEntity.allows_buffering(),
             )
             cls._set_cached_line(entity, hline)
             _HLTRelatedEntity.create_lines(entity, hline)
@@ -655,6 +752,7 @@ class _HLTCustomFieldsEdition(_HLTManyToManyMixin,
             hline = HistoryLine._create_line_4_instance(
                 entity, cls.type_id,
                 modifs=[*cls._initial_m2m_modification(cfield_id, removed_pk_set, added_pk_set)],
+                buffered=_HLTRelatedEntity.allows_buffering(),
             )
             cls._set_cached_line(entity, hline)
             _HLTRelatedEntity.create_lines(entity, hline)
@@ -737,11 +835,14 @@ class _HLTEntityDeletion(_HistoryLineType):
 
     @classmethod
     def create_line(cls, entity: CremeEntity) -> None:
-        HistoryLine.objects.create(
-            entity_ctype=entity.entity_type,
-            entity_owner=entity.user,
-            type=cls.type_id,
-            value=HistoryLine._encode_attrs(entity),
+        HistoryLine._record(
+            HistoryLine(
+                entity_ctype=entity.entity_type,
+                entity_owner=entity.user,
+                type=cls.type_id,
+                value=HistoryLine._encode_attrs(entity),
+            ),
+            buffered=True,
         )
 
 
@@ -754,14 +855,17 @@ class _HLTEntityTrash(_HistoryLineType):
         backup = getattr(entity, '_instance_backup', None)
 
         if backup and backup['is_deleted'] != entity.is_deleted:
-            HistoryLine.objects.create(
-                entity=entity,
-                entity_ctype=entity.entity_type,
-                entity_owner=entity.user,
-                type=cls.type_id,
-                value=HistoryLine._encode_attrs(
-                    entity, modifs=[entity.is_deleted],
+            HistoryLine._record(
+                HistoryLine(
+                    entity=entity,
+                    entity_ctype=entity.entity_type,
+                    entity_owner=entity.user,
+                    type=cls.type_id,
+                    value=HistoryLine._encode_attrs(
+                        entity, modifs=[entity.is_deleted],
+                    ),
                 ),
+                buffered=True,
             )
 
     # def verbose_modifications(self, modifications, entity_ctype, user):
@@ -782,6 +886,12 @@ class _HLTRelatedEntity(_HistoryLineType):
     verbose_name = _('Related modification')
     has_related_line = True
 
+    @staticmethod
+    def allows_buffering() -> bool:
+        "Can the lines which could have related lines be buffered?"
+        # NB: the related lines need the ID of the line they are related to.
+        return not HistoryConfigItem.objects.configured_relation_type_ids()
+
     @classmethod
     def create_lines(cls, entity: CremeEntity, related_line: HistoryLine):
         relations = Relation.objects.filter(
@@ -794,6 +904,7 @@ class _HLTRelatedEntity(_HistoryLineType):
             create_line = partial(
                 HistoryLine._create_line_4_instance,
                 ltype=cls.type_id, date=entity.modified, related_line_id=related_line.id,
+                buffered=True,
             )
 
             CremeEntity.populate_real_entities(object_entities)  # Optimisation
@@ -810,7 +921,7 @@ class _HLTPropertyCreation(_HistoryLineType):
     @classmethod
     def create_line(cls, prop: CremeProperty):
         HistoryLine._create_line_4_instance(
-            prop.creme_entity, cls.type_id, modifs=[prop.type_id],
+            prop.creme_entity, cls.type_id, modifs=[prop.type_id], buffered=True,
         )
 
     # def verbose_modifications(self, modifications, entity_ctype, user):
@@ -838,7 +949,7 @@ class _HLTPropertyDeletion(_HLTPropertyCreation):
     @classmethod
     def create_line(cls, prop: CremeProperty) -> None:
         HistoryLine._create_line_4_instance(
-            prop.creme_entity, cls.type_id, modifs=[prop.type_id],
+            prop.creme_entity, cls.type_id, modifs=[prop.type_id], buffered=True,
         )
 
 
@@ -932,6 +1043,7 @@ class _HLTAuxCreation(_HistoryLineType):
         HistoryLine._create_line_4_instance(
             related.get_related_entity(), cls.type_id,
             modifs=cls._build_modifs(related),
+            buffered=True,
         )
 
     # def verbose_modifications(self, modifications, entity_ctype, user):
@@ -971,6 +1083,7 @@ class _HLTAuxEdition(_HLTManyToManyMixin,
                     related.get_related_entity(),
                     cls.type_id,
                     modifs=[cls._build_modifs(related), *fields_modifs],
+                    buffered=True,
                 )
                 cls._create_entity_backup(related)
                 cls._set_cached_line(related, hline)
@@ -1008,6 +1121,7 @@ class _HLTAuxEdition(_HLTManyToManyMixin,
                     cls._build_modifs(related),
                     *cls._initial_m2m_modification(m2m_name, removed_pk_set, added_pk_set),
                 ],
+                buffered=True,
             )
             cls._set_cached_line(related, hline)
         else:
@@ -1147,10 +1261,16 @@ class HistoryLine(Model):
     _related_line_id: int | None = None
     _related_line: HistoryLine | bool | None = False
 
+    # The HistoryBuffer which will write the line (see buffered()).
+    _buffer: HistoryBuffer | None = None
+
     class Meta:
         app_label = 'creme_core'
         verbose_name = _('Line of history')
         verbose_name_plural = _('Lines of history')
+        index_together = [
+            ['entity', 'date'],  # Optimise the history of an entity
+        ]
 
     def __repr__(self):
         return (
@@ -1208,6 +1328,67 @@ class HistoryLine(Model):
             if not progress:
                 break
 
+    @staticmethod
+    def create_edition_lines(entities: Sequence[CremeEntity]) -> None:
+        """Create the lines of edition for several entities which have been
+        saved without signal (e.g. with QuerySet.bulk_update()).
+        The entities must have been retrieved from the DB before being
+        modified, like with the regular edition.
+        """
+        _HLTEntityEdition.create_lines_for_entities(entities)
+
+    @staticmethod
+    @contextmanager
+    def buffered(flush_size: int = 512) -> Iterator[HistoryBuffer]:
+        """Context manager which accumulates the new lines of history, in order
+        to write them with a few queries (bulk_create()) at the exit of the
+        context. It is useful when many instances are created/modified at once
+        (e.g. in jobs like mass import).
+
+            with HistoryLine.buffered():
+                for contact in contacts:
+                    [...]
+                    contact.save()
+
+        The lines are still grouped like without buffer (e.g. several calls to
+        save() on the same instance produce only one line of edition).
+        The contexts can be nested ; the inner ones use the buffer of the outer one.
+
+        Notice that:
+          - the lines of relationships (& the lines of edition when some types
+            of relationship are configured to be historised on the related
+            entities) are still written immediately, because their IDs are needed.
+          - the lines created within a transaction are written when this
+            transaction is committed ; the lines created within a transaction
+            (or a savepoint) which is rolled back are not written.
+          - the lines are written by a job when settings.HISTORY_ASYNC_FLUSH is True.
+
+        @param flush_size: The buffer is flushed when it contains this number of lines.
+        """
+        buffer = get_global_info(_BUFFER_KEY)
+        if buffer is not None:
+            yield buffer
+            return
+
+        buffer = HistoryBuffer(flush_size=flush_size)
+        set_global_info(**{_BUFFER_KEY: buffer})
+
+        try:
+            yield buffer
+        except BaseException:
+            set_global_info(**{_BUFFER_KEY: None})
+
+            # NB: the surrounding transaction is probably rolled back
+            if connection.in_atomic_block:
+                buffer.discard()
+            else:
+                buffer.flush()
+
+            raise
+        else:
+            set_global_info(**{_BUFFER_KEY: None})
+            buffer.flush()
+
     @staticmethod
     def disable(instance) -> None:
         """Disable history for this instance.
@@ -1245,7 +1426,7 @@ class HistoryLine(Model):
         if related_line_id:
             value.append(related_line_id)
 
-        encode = _JSONEncoder().encode
+        encode = _JSONEncoder(separators=_JSON_SEPARATORS).encode
 
         try:
             attrs = encode(value + [*modifs])
@@ -1367,6 +1548,20 @@ class HistoryLine(Model):
 
         return self._related_line
 
+    @staticmethod
+    def _record(hline: HistoryLine, buffered: bool = False) -> HistoryLine:
+        """Save a new line, or add it to the current buffer (if there is one
+        & if the line can be buffered).
+        """
+        buffer = get_global_info(_BUFFER_KEY) if buffered else None
+
+        if buffer is None:
+            hline.save()
+        else:
+            buffer.add(hline)
+
+        return hline
+
     @classmethod
     def _create_line_4_instance(
             cls,
@@ -1374,12 +1569,16 @@ class HistoryLine(Model):
             ltype: int,
             date=None,
             modifs=(),
-            related_line_id=None):
+            related_line_id=None,
+            buffered=False):
         """Builder.
         @param ltype: See TYPE_*
         @param date: If not given, will be 'now'.
         @param modifs: List of tuples containing JSONifiable values.
         @param related_line_id: HistoryLine.id.
+        @param buffered: If True, the line is added to the current buffer
+               (see HistoryLine.buffered()), if there is one ; so its ID will
+               not be available.
         """
         kwargs = {
             'entity': instance,
@@ -1396,9 +1595,13 @@ class HistoryLine(Model):
         if date:
             kwargs['date'] = date
 
-        return cls.objects.create(**kwargs)
+        return cls._record(cls(**kwargs), buffered=buffered)
 
     def save(self, *args, **kwargs):
+        if self._buffer is not None:
+            # NB: the line will be written by its buffer (with its last values).
+            return
+
         if self.ENABLED:
             # if self.pk is None: TODO ?
             user = get_global_info('user')
@@ -1406,6 +1609,16 @@ class HistoryLine(Model):
 
             super().save(*args, **kwargs)
 
+    @staticmethod
+    def compact_value(value: str | None) -> str | None:
+        """Get the compact version of a serialized value (see the field
+        "value") ; the lines created by old versions used a verbose JSON format.
+        """
+        if not value:
+            return value
+
+        return JSONEncoder(separators=_JSON_SEPARATORS).encode(json_load(value))
+
     @property
     def user(self):
         try:
@@ -1424,6 +1637,134 @@ class HistoryLine(Model):
         self.username = user.username if user else ''
 
 
+class _CommitMarker:
+    "Callback for transaction.on_commit() which just records its call."
+    __slots__ = ('committed',)
+
+    def __init__(self):
+        self.committed = False
+
+    def __call__(self):
+        self.committed = True
+
+
+class HistoryBuffer:
+    """Container for the lines of history which have not been written yet.
+    See HistoryLine.buffered().
+    """
+    def __init__(self, flush_size: int = 512):
+        self.flush_size = flush_size
+        # Tuples (line, marker) ; the marker is None when the line has been
+        # created outside a transaction.
+        self._lines: list[tuple[HistoryLine, _CommitMarker | None]] = []
+        self._flush_callbacks: list[Callable[[], None]] = []
+
+    def __iter__(self) -> Iterator[HistoryLine]:
+        for hline, __ in self._lines:
+            yield hline
+
+    def __len__(self):
+        return len(self._lines)
+
+    def add(self, hline: HistoryLine) -> None:
+        if not hline.ENABLED:
+            return
+
+        user = get_global_info('user')
+        hline.username = user.username if user else ''
+        hline._buffer = self
+
+        marker = None
+        if connection.in_atomic_block:
+            # NB: the callbacks of the savepoints which are rolled back are
+            #     not called ; so we know if the line must be written.
+            marker = _CommitMarker()
+            transaction.on_commit(marker)
+
+        self._lines.append((hline, marker))
+
+        if len(self._lines) >= self.flush_size:
+            self.flush()
+
+    def on_flush(self, callback: Callable[[], None]) -> None:
+        "Register a function which is called (once) at the next flush/discard."
+        self._flush_callbacks.append(callback)
+
+    def detach_entity(self, entity_id: int) -> None:
+        "The lines related to a deleted entity must not reference it anymore."
+        for hline, __ in self._lines:
+            if hline.entity_id == entity_id:
+                hline.entity = None
+
+    def _pop_lines(self) -> list[tuple[HistoryLine, _CommitMarker | None]]:
+        lines = self._lines
+        self._lines = []
+
+        callbacks = self._flush_callbacks
+        self._flush_callbacks = []
+
+        for hline, __ in lines:
+            hline._buffer = None
+
+        for callback in callbacks:
+            callback()
+
+        return lines
+
+    def discard(self) -> None:
+        "Forget the lines without writing them."
+        self._pop_lines()
+
+    def flush(self) -> None:
+        """Write the lines created outside a transaction, or whose transaction
+        has been committed. The lines whose transaction is still in progress
+        are written when this transaction is committed (the lines of the
+        savepoints which are rolled back are not written).
+        """
+        ready = []
+        pending = []
+
+        for hline, marker in self._pop_lines():
+            if marker is None or marker.committed:
+                ready.append(hline)
+            else:
+                pending.append((hline, marker))
+
+        self._write(ready)
+
+        if pending and connection.in_atomic_block:
+            # NB: this callback is called after the markers of the lines,
+            #     which have been registered before.
+            transaction.on_commit(partial(self._write_committed, pending))
+
+    def _write_committed(self, lines: list[tuple[HistoryLine, _CommitMarker]]) -> None:
+        hlines = [hline for hline, marker in lines if marker.committed]
+
+        # NB: some entities may have been deleted since the flush
+        entity_ids = {hline.entity_id for hline in hlines if hline.entity_id}
+        if entity_ids:
+            existing_ids = {
+                *CremeEntity.objects.filter(id__in=entity_ids).values_list('id', flat=True),
+            }
+
+            for hline in hlines:
+                if hline.entity_id and hline.entity_id not in existing_ids:
+                    hline.entity = None
+
+        self._write(hlines)
+
+    def _write(self, lines: list[HistoryLine]) -> None:
+        if not lines:
+            return
+
+        if settings.HISTORY_ASYNC_FLUSH:
+            from ..creme_jobs import history_writer_type
+
+            history_writer_type.enqueue(lines)
+        else:
+            HistoryLine.objects.bulk_create(lines, batch_size=self.flush_size)
+
+
 # TODO: method of CremeEntity ??
 def _final_entity(entity) -> bool:
     "Is the instance an instance of a 'leaf' class."
@@ -1566,6 +1907,11 @@ def _log_deletion(sender, instance, **kwargs):
         elif isinstance(instance, CremeEntity) and _final_entity(instance):
             _get_deleted_entity_ids().add(instance.id)
             _HLTEntityDeletion.create_line(instance)
+
+            buffer = get_global_info(_BUFFER_KEY)
+            if buffer is not None:
+                # NB: like models.SET_NULL on the lines already written
+                buffer.detach_entity(instance.id)
         elif isinstance(instance, CustomFieldValue):
             _HLTCustomFieldsEdition.create_lines(instance, emptied=True)
     except Exception:
@@ -1587,8 +1933,82 @@ class HistoryConfigItem(Model):
         app_label = 'creme_core'
 
 
+class ArchivedHistoryLine(Model):
+    """Line of history which has been moved out of the table of HistoryLine,
+    in order to keep this table small (see the job
+    'creme_core.creme_jobs.history_archiver_type').
+    The ID of the original line is kept (so the related lines can be retrieved).
+    """
+    id = models.IntegerField(primary_key=True, editable=False)
+    entity = models.ForeignKey(
+        CremeEntity, null=True, on_delete=models.SET_NULL, related_name='+',
+    )
+    entity_ctype = CTypeForeignKey(related_name='+')
+    entity_owner = CremeUserForeignKey(related_name='+')
+    username = models.CharField(max_length=30)
+    date = models.DateTimeField(_('Date'))
+    type = models.PositiveSmallIntegerField(_('Type'))
+    value = models.TextField(null=True)
+
+    archiving_date = CreationDateTimeField()
+
+    # Names of the fields copied from/to HistoryLine
+    copied_fields = (
+        'id', 'entity_id', 'entity_ctype_id', 'entity_owner_id',
+        'username', 'date', 'type', 'value',
+    )
+
+    class Meta:
+        app_label = 'creme_core'
+        verbose_name = _('Archived line of history')
+        verbose_name_plural = _('Archived lines of history')
+        index_together = [
+            ['entity', 'date'],
+        ]
+
+    def __repr__(self):
+        return (
+            f'ArchivedHistoryLine('
+            f'id={self.id}, '
+            f'entity_id={self.entity_id}, '
+            f'date={self.date}, '
+            f'type={self.type}'
+            f')'
+        )
+
+    @classmethod
+    def from_line(cls, hline: HistoryLine) -> ArchivedHistoryLine:
+        return cls(**{fname: getattr(hline, fname) for fname in cls.copied_fields})
+
+    def to_line(self) -> HistoryLine:
+        """Build a (not saved) HistoryLine, in order to use its API
+        (modifications, explainers...).
+        """
+        return HistoryLine(**{fname: getattr(self, fname) for fname in self.copied_fields})
+
+
+class PendingHistoryChunk(Model):
+    """Chunk of lines of history which have been buffered, & which are waiting
+    to be written by the system job 'creme_core.creme_jobs.history_writer_type'
+    (see the setting "HISTORY_ASYNC_FLUSH").
+    """
+    created = CreationDateTimeField()
+    # Lists [entity_id, ctype_id, owner_id, username, date, type, value]
+    lines = models.JSONField(default=list, editable=False)
+
+    class Meta:
+        app_label = 'creme_core'
+
+    def __repr__(self):
+        return f'PendingHistoryChunk(id={self.id}, lines={len(self.lines)})'
+
+
 @receiver(pre_merge_related)
 def _handle_merge(sender, other_entity, **kwargs):
     # We do not want these lines to be re-assigned to the remaining entity.
     # TODO: should we clone/copy for TYPE_RELATED
     HistoryLine.objects.filter(entity=other_entity.id).update(entity=None)
+
+    buffer = get_global_info(_BUFFER_KEY)
+    if buffer is not None:
+        buffer.detach_entity(other_entity.id)
@@ -25,7 +25,9 @@ from . import fields as core_fields
 
 # TODO: + ForeignKey to ContentType ? (takes more space but less queries)
 class Imprint(models.Model):  # CremeModel ?
-    date = models.DateTimeField(auto_now_add=True)
+    # NB: not "auto_now_add", because the imprints can be written later
+    #     (see 'creme_core.core.imprint.ImprintBuffer').
+    date = core_fields.CreationDateTimeField()
 
     entity_ctype = core_fields.EntityCTypeForeignKey(related_name='+', editable=False)
     entity = models.ForeignKey(
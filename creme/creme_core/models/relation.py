@@ -33,6 +33,7 @@ from django.dispatch import receiver
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from ..core.cache import config_cache
 from ..core.exceptions import ConflictError
 from ..signals import pre_merge_related
 from ..utils.content_type import as_ctype
@@ -45,6 +46,9 @@ logger = logging.getLogger(__name__)
 
 
 class RelationTypeManager(models.Manager):
+    # Namespace in the shared configuration cache (see creme_core.core.cache)
+    cache_namespace = 'creme_core-relation_types'
+
     def compatible(self,
                    ct_or_model: ContentType | type[CremeEntity],
                    include_internals: bool = False,
@@ -170,6 +174,20 @@ class RelationTypeManager(models.Manager):
 
         return sub_relation_type, obj_relation_type
 
+    def get_cached(self, rtype_id: str) -> RelationType:
+        """Get a RelationType by its ID ; the instance is stored in the shared
+        configuration cache (see 'creme_core.core.cache').
+        @raise RelationType.DoesNotExist.
+        """
+        namespace = self.cache_namespace
+        rtype = config_cache.get(namespace, rtype_id)
+
+        if rtype is None:
+            rtype = self.select_related('symmetric_type').get(pk=rtype_id)
+            config_cache.set(namespace, rtype_id, rtype)
+
+        return rtype
+
 
 class RelationManager(models.Manager):
     def safe_create(self, **kwargs) -> None:
@@ -489,6 +507,9 @@ class RelationType(CremeModel):
         return self.symmetric_type.subject_forbidden_properties
 
 
+config_cache.invalidate_on_change(RelationType.objects.cache_namespace, RelationType)
+
+
 class Relation(CremeModel):
     """2 instances of creme_core.models.CremeEntity can be linked by Relations.
     The first instance is called "object", the second one "object".
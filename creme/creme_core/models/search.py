@@ -24,14 +24,17 @@ from typing import TYPE_CHECKING, DefaultDict, Iterable, Iterator
 
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
-from django.db.models.query_utils import Q
+from django.db.models import signals
+from django.dispatch import receiver
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
 
+from ..core.cache import config_cache
 from ..utils.meta import ModelFieldEnumerator
 from .auth import UserRole
 from .base import CremeModel
+from .custom_field import CustomFieldMultiEnum, CustomFieldValue
 from .entity import CremeEntity
 from .fields import DatePeriodField, EntityCTypeForeignKey
 
@@ -42,6 +45,9 @@ logger = logging.getLogger(__name__)
 
 
 class SearchConfigItemManager(models.Manager):
+    # Namespace in the shared configuration cache (see creme_core.core.cache)
+    cache_namespace = 'creme_core-search_config'
+
     def create_if_needed(self,
                          model: type[CremeEntity],
                          fields: Iterable[str],
@@ -86,18 +92,22 @@ class SearchConfigItemManager(models.Manager):
         get_ct = ContentType.objects.get_for_model
         ctypes = [get_ct(model) for model in models]
 
-        role_query = Q(role__isnull=True)
+        # NB: the items of all roles are retrieved (& filtered in Python), in
+        #     order to share them between the users (see creme_core.core.cache)
         if user.is_superuser:
-            role_query |= Q(superuser=True)
+            def role_filter(sci):
+                return sci.role_id is None
 
             def filter_func(sci):
                 return sci.superuser
         else:
-            role = user.role
-            role_query |= Q(role=role)
+            role_id = user.role_id
+
+            def role_filter(sci):
+                return sci.role_id is None or sci.role_id == role_id
 
             def filter_func(sci):
-                return sci.role == role
+                return sci.role_id == role_id
 
 # TODO: use a similar way if superuser is a role
 #       (PG does not return a cool result if we do a ".order_by('role', 'superuser')")
@@ -113,12 +123,27 @@ class SearchConfigItemManager(models.Manager):
 #
 #        for ctype in ctypes:
 #            yield sc_items.get(ctype) or SearchConfigItem(content_type=ctype)
+        namespace = self.cache_namespace
         sc_items_per_ctid: DefaultDict[int, list] = defaultdict(list)
-        for sci in self.filter(content_type__in=ctypes).filter(role_query):
-            sc_items_per_ctid[sci.content_type_id].append(sci)
+        sc_items_per_ctid.update(
+            (int(ct_id), items)
+            for ct_id, items in config_cache.get_many(
+                namespace, (str(ct.id) for ct in ctypes),
+            ).items()
+        )
+
+        not_shared_ctypes = [ct for ct in ctypes if ct.id not in sc_items_per_ctid]
+        if not_shared_ctypes:
+            for sci in self.filter(content_type__in=not_shared_ctypes):
+                sc_items_per_ctid[sci.content_type_id].append(sci)
+
+            config_cache.set_many(
+                namespace,
+                {str(ct.id): sc_items_per_ctid[ct.id] for ct in not_shared_ctypes},
+            )
 
         for ctype in ctypes:
-            sc_items = sc_items_per_ctid.get(ctype.id)
+            sc_items = [*filter(role_filter, sc_items_per_ctid.get(ctype.id, ()))]
 
             if sc_items:
                 yield next((item for item in sc_items if filter_func(item)), sc_items[0])
@@ -257,3 +282,72 @@ class SearchConfigItem(CremeModel):
             raise ValueError('"role" must be NULL if "superuser" is True')
 
         super().save(*args, **kwargs)
+
+
+config_cache.invalidate_on_change(
+    SearchConfigItem.objects.cache_namespace, SearchConfigItem,
+)
+
+
+class SearchDocument(models.Model):
+    """Denormalized text of a searchable field (regular or custom field) of an
+    entity ; it's used by the search back-end
+    'creme_core.core.search.IndexSearchBackend'.
+    The instances are built & updated by 'creme_core.core.search.SearchIndex'.
+    """
+    entity = models.ForeignKey(
+        CremeEntity, related_name='+', on_delete=models.CASCADE, editable=False,
+    )
+    entity_type = EntityCTypeForeignKey(related_name='+', editable=False)
+    cell_key = models.CharField(max_length=100, editable=False)  # See EntityCell.key
+    content = models.TextField(editable=False)  # See SearchIndex.normalize()
+
+    class Meta:
+        app_label = 'creme_core'
+        index_together = [('entity_type', 'cell_key')]
+
+    def __str__(self):
+        return (
+            f'SearchDocument(entity={self.entity_id}, cell_key={self.cell_key}, '
+            f'content="{self.content}")'
+        )
+
+
+@receiver(signals.post_save)
+def _update_search_documents(sender, instance, **kwargs):
+    if isinstance(instance, CremeEntity):
+        from ..core.search import search_index
+
+        if search_index.enabled:
+            search_index.update([instance])
+    elif isinstance(instance, CustomFieldValue):
+        from ..core.search import search_index
+
+        if search_index.enabled:
+            search_index.update_custom_value(instance)
+
+
+@receiver(signals.post_delete)
+def _delete_search_document(sender, instance, **kwargs):
+    if isinstance(instance, CustomFieldValue):
+        from ..core.search import search_index
+
+        if search_index.enabled:
+            search_index.update_custom_value(instance, deleted=True)
+
+
+@receiver(signals.m2m_changed)
+def _update_search_documents_m2m(sender, instance, action, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if isinstance(instance, CremeEntity):
+        from ..core.search import search_index
+
+        if search_index.enabled:
+            search_index.update([instance])
+    elif isinstance(instance, CustomFieldMultiEnum):
+        from ..core.search import search_index
+
+        if search_index.enabled:
+            search_index.update_custom_value(instance)
@@ -22,6 +22,7 @@ import logging
 
 from django.db import models, transaction
 
+from ..core.cache import config_cache
 from ..core.setting_key import (
     SettingKey,
     _SettingKeyRegistry,
@@ -39,6 +40,8 @@ class SettingValueManager(models.Manager):
             self.value = value
 
     cache_key_fmt = 'creme_core-setting_value-{}'
+    # Namespace in the shared configuration cache (see creme_core.core.cache)
+    cache_namespace = 'creme_core-setting_values'
 
     key_registry: _SettingKeyRegistry
 
@@ -108,7 +111,8 @@ class SettingValueManager(models.Manager):
         """Get several SettingValue corresponding to several SettingKeys at once.
          It's faster than calling 'get_4_key()' several times, because only one
          SQL query is performed (in the worst case)
-         Results are cached (per request).
+         Results are cached (per request, & between requests if the shared
+         configuration cache is enabled -- see 'creme_core.core.cache').
 
         @param values_info: Each argument must be dictionary with these keys:
                "key": A SettingKey instance, or an ID of SettingKey (string).
@@ -152,10 +156,17 @@ class SettingValueManager(models.Manager):
                 svalues[key_id] = sv
 
         if uncached_info:
-            retrieved_svalues = {
-                svalue.key_id: svalue
-                for svalue in self.filter(key_id__in=[i[0] for i in uncached_info])
-            }
+            uncached_ids = [i[0] for i in uncached_info]
+            retrieved_svalues = config_cache.get_many(self.cache_namespace, uncached_ids)
+            not_shared_ids = [key_id for key_id in uncached_ids if key_id not in retrieved_svalues]
+
+            if not_shared_ids:
+                retrieved_from_db = {
+                    svalue.key_id: svalue
+                    for svalue in self.filter(key_id__in=not_shared_ids)
+                }
+                config_cache.set_many(self.cache_namespace, retrieved_from_db)
+                retrieved_svalues.update(retrieved_from_db)
 
             for key_id, cache_key, value_info in uncached_info:
                 try:
@@ -225,3 +236,6 @@ class SettingValue(models.Model):
         value = self.value
 
         return self.key.value_as_html(value) if value is not None else ''
+
+
+config_cache.invalidate_on_change(SettingValue.objects.cache_namespace, SettingValue)
@@ -100,6 +100,27 @@ class Populator(BasePopulator):
                 'status': Job.STATUS_OK,
             },
         )
+        create_job(
+            type_id=creme_jobs.history_writer_type.id,
+            defaults={
+                'language': settings.LANGUAGE_CODE,
+                'status': Job.STATUS_OK,
+            },
+        )
+        create_job(
+            type_id=creme_jobs.history_archiver_type.id,
+            defaults={
+                'language': settings.LANGUAGE_CODE,
+                'periodicity': date_period_registry.get_period('days', 1),
+                'status': Job.STATUS_OK,
+                # NB: the old lines are not displayed in the history anymore
+                #     once archived ; so the job must be enabled explicitly.
+                'enabled': False,
+                'data': {
+                    'delay': date_period_registry.get_period('years', 2).as_dict(),
+                },
+            },
+        )
 
         # ---------------------------
 
@@ -822,6 +822,10 @@ creme.bricks.Brick = creme.component.Component.sub({
         return this.isBound() && (this._element.attr('data-brick-readonly') === 'true');
     },
 
+    isLazy: function() {
+        return this.isBound() && (this._element.attr('data-brick-lazy') === 'true');
+    },
+
     reloadingInfo: function() {
         if (!this.isBound()) {
             return {};
@@ -931,6 +935,14 @@ creme.bricks.BricksReloader.prototype = {
         return this;
     },
 
+    lazyBricks: function() {
+        this._brickFilter = function(brick) {
+            return brick.isLazy();
+        };
+
+        return this;
+    },
+
     sourceBrick: function(brick) {
         this.containerFromNode(brick._element);
         var src_deps = brick.dependencies();
@@ -1048,6 +1060,78 @@ creme.bricks.BricksReloader.prototype = {
 };
 
 
+// Load the content of the lazy bricks (placeholders) ; all the lazy bricks
+// which are created at the same time are retrieved with one query per
+// reloading URL.
+creme.bricks.loadLazyBricks = function() {
+    var containers = [];
+
+    $('.brick.widget-ready[data-brick-lazy="true"]').each(function() {
+        var container = $(this).parents('[data-bricks-reload-url]').get(0);
+
+        if (container !== undefined && containers.indexOf(container) === -1) {
+            containers.push(container);
+            creme.bricks._loadContainerLazyBricks($(this));
+        }
+    });
+};
+
+creme.bricks._loadContainerLazyBricks = function(node) {
+    var reloader = new creme.bricks.BricksReloader().containerFromNode(node);
+    var container = reloader._bricksContainer;
+
+    return reloader.lazyBricks()
+                   .action()
+                   .onFail(function() {
+                       creme.bricks._setLazyBricksError(container);
+                   })
+                   .start();
+};
+
+// The placeholders which have not been loaded (error with the query) display
+// an error message, with a button to retry the loading.
+creme.bricks._setLazyBricksError = function(container) {
+    $('.brick.widget-ready[data-brick-lazy="true"]', container).each(function() {
+        var element = $(this);
+        var retryButton = $('<button type="button" class="brick-lazy-retry">').text(gettext('Retry'));
+
+        retryButton.on('click', function(e) {
+            e.preventDefault();
+            creme.bricks._retryLazyBricks(container);
+        });
+
+        element.removeClass('is-loading').addClass('is-lazy-error');
+        element.find('.brick-content').empty().append(
+            $('<div class="brick-lazy-error">').append(
+                $('<span>').text(gettext('The content of this block cannot be loaded.')),
+                retryButton
+            )
+        );
+    });
+};
+
+creme.bricks._retryLazyBricks = function(container) {
+    var elements = $('.brick.widget-ready.is-lazy-error', container);
+
+    elements.removeClass('is-lazy-error').addClass('is-loading')
+            .find('.brick-lazy-error').remove();
+
+    if (elements.length > 0) {
+        creme.bricks._loadContainerLazyBricks(elements.first());
+    }
+};
+
+creme.bricks._lazyLoadingTimeout = null;
+
+creme.bricks.scheduleLazyLoading = function(delay) {
+    if (creme.bricks._lazyLoadingTimeout === null) {
+        creme.bricks._lazyLoadingTimeout = setTimeout(function() {
+            creme.bricks._lazyLoadingTimeout = null;
+            creme.bricks.loadLazyBricks();
+        }, delay || 0);
+    }
+};
+
 creme.bricks.BrickLauncher = creme.widget.declare('brick', {
     _create: function(element, options, cb, sync, args) {
         var brick = this._brick = new creme.bricks.Brick();
@@ -1056,6 +1140,10 @@ creme.bricks.BrickLauncher = creme.widget.declare('brick', {
 
         element.addClass('widget-ready');
         brick.trigger('ready', [options]);
+
+        if (brick.isLazy()) {
+            creme.bricks.scheduleLazyLoading();
+        }
     },
 
     _destroy: function(element) {
@@ -273,6 +273,15 @@ QUnit.test('creme.bricks.Brick.reloadingInfo', function(assert) {
     deepEqual({a: 12}, new Brick().bind($('<div data-brick-reloading-info="{&quot;a&quot;:12}"></div>')).reloadingInfo());
 });
 
+QUnit.test('creme.bricks.Brick.isLazy', function(assert) {
+    var Brick = creme.bricks.Brick;
+
+    equal(false, new Brick().isLazy());
+    equal(false, new Brick().bind($('<div></div>')).isLazy());
+    equal(false, new Brick().bind($('<div data-brick-lazy="false"></div>')).isLazy());
+    equal(true, new Brick().bind($('<div data-brick-lazy="true"></div>')).isLazy());
+});
+
 QUnit.test('creme.bricks.Brick.title', function(assert) {
     var Brick = creme.bricks.Brick;
 
@@ -724,6 +733,74 @@ QUnit.test('creme.bricks.Brick.refresh', function(assert) {
     ], this.mockBackendUrlCalls('mock/brick/all/reload'));
 });
 
+QUnit.test('creme.bricks.loadLazyBricks', function(assert) {
+    var htmlA = '<div class="brick ui-creme-widget" widget="brick" id="brick-A" data-brick-lazy="true"></div>';
+    var htmlB = '<div class="brick ui-creme-widget" widget="brick" id="brick-B"></div>';
+    var htmlC = '<div class="brick ui-creme-widget" widget="brick" id="brick-C" data-brick-lazy="true"></div>';
+    var brickA = creme.widget.create($(htmlA).appendTo(this.qunitFixture())).brick();
+    var brickB = creme.widget.create($(htmlB).appendTo(this.qunitFixture())).brick();
+    var brickC = creme.widget.create($(htmlC).appendTo(this.qunitFixture())).brick();
+
+    this.setBrickReloadContent('brick-A', '<div class="brick ui-creme-widget" widget="brick" id="brick-A"></div>');
+    this.setBrickReloadContent('brick-C', '<div class="brick ui-creme-widget" widget="brick" id="brick-C"></div>');
+
+    equal(true, brickA.isLazy());
+    equal(false, brickB.isLazy());
+    equal(true, brickC.isLazy());
+
+    creme.bricks.loadLazyBricks();
+
+    // One query for all the lazy bricks
+    deepEqual([
+        ['GET', {"brick_id": ["brick-A", "brick-C"], "extra_data": "{}"}]
+    ], this.mockBackendUrlCalls('mock/brick/all/reload'));
+
+    equal(false, $('#brick-A').creme().widget().brick().isLazy());
+    equal(false, $('#brick-C').creme().widget().brick().isLazy());
+
+    // Nothing to load
+    this.resetMockBackendCalls();
+    creme.bricks.loadLazyBricks();
+    deepEqual([], this.mockBackendUrlCalls('mock/brick/all/reload'));
+});
+
+QUnit.test('creme.bricks.loadLazyBricks (error & retry)', function(assert) {
+    var htmlA = '<div class="brick ui-creme-widget is-loading" widget="brick" id="brick-A" data-brick-lazy="true"><div class="brick-content"></div></div>';
+    var htmlB = '<div class="brick ui-creme-widget" widget="brick" id="brick-B"></div>';
+    var brickA = creme.widget.create($(htmlA).appendTo(this.qunitFixture())).brick();
+    creme.widget.create($(htmlB).appendTo(this.qunitFixture()));
+
+    this.setBrickReloadContent('brick-A', '<div class="brick ui-creme-widget" widget="brick" id="brick-A"></div>');
+    this.setBrickAllRefreshUrl('mock/error');
+
+    creme.bricks.loadLazyBricks();
+
+    deepEqual([
+        ['GET', {"brick_id": ["brick-A"], "extra_data": "{}"}]
+    ], this.mockBackendUrlCalls('mock/error'));
+
+    // The placeholder displays an error
+    var element = $('#brick-A');
+    equal(true, brickA.isLazy());
+    equal(false, element.is('.is-loading'));
+    equal(true, element.is('.is-lazy-error'));
+    equal(1, element.find('.brick-content .brick-lazy-error').length);
+    equal(1, element.find('.brick-lazy-retry').length);
+
+    // Retry
+    this.setBrickAllRefreshUrl('mock/brick/all/reload');
+    element.find('.brick-lazy-retry').trigger('click');
+
+    deepEqual([
+        ['GET', {"brick_id": ["brick-A"], "extra_data": "{}"}]
+    ], this.mockBackendUrlCalls('mock/brick/all/reload'));
+
+    element = $('#brick-A');
+    equal(false, element.is('.is-lazy-error'));
+    equal(0, element.find('.brick-lazy-error').length);
+    equal(false, element.creme().widget().brick().isLazy());
+});
+
 QUnit.test('creme.bricks.Brick.refresh (no deps)', function(assert) {
     var htmlA = '<div class="brick ui-creme-widget" widget="brick" id="brick-A"></div>';
     var htmlB = '<div class="brick ui-creme-widget" widget="brick" id="brick-B"></div>';
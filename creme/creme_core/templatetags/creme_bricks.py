@@ -25,6 +25,7 @@ from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
 
 from ..core import sorter
+from ..core.brick_cache import brick_render_cache
 from ..core.entity_cell import EntityCellRegularField
 # NB: do not import registries directly to facilitate unit tests
 from ..gui import bricks, bulk_update
@@ -995,9 +996,17 @@ def brick_display(context, *bricks, **kwargs):
     Possible values are:
        - 'detail'  => detailview_display() (default value)
        - 'home'    => home_display()
+
+    The bricks with the attribute "lazy" are replaced by a placeholder, which
+    is loaded by the JavaScript (if the page has a reloading URL for its bricks).
+    You can display all the bricks this way with the keyword argument 'lazy':
+
+        {% brick_display my_brick1 my_brick2 lazy=True %}
     """
     context_dict = context.flatten()
     render_type = kwargs.get('render', 'detail')
+    lazy = kwargs.get('lazy', False)
+    can_be_lazy = bool(context_dict.get('bricks_reload_url'))
 
     try:
         brick_render_method = _DISPLAY_METHODS[render_type]
@@ -1009,12 +1018,14 @@ def brick_display(context, *bricks, **kwargs):
         ) from e
 
     def render(brick):
-        fun = getattr(brick, brick_render_method, None)
+        if hasattr(brick, brick_render_method):
+            if can_be_lazy and (lazy or brick.lazy):
+                return brick.placeholder_display({**context_dict})
 
-        if fun:
             # NB: the context is copied is order to a 'fresh' one for each brick,
             #     & so avoid annoying side-effects.
-            return fun({**context_dict})
+            #     The HTML can be retrieved from the cache (see Brick.cache_render).
+            return brick_render_cache.render(brick, brick_render_method, {**context_dict})
 
         logger.warning(
             'Brick without %s(): %s (id=%s)',
@@ -1209,6 +1209,75 @@ class FilterConditionHandlerTestCase(CremeTestCase):
             model=FakeContact, field_name='birthday', date_range='unknown_range',
         )
 
+    def test_dateregularfield_accept01(self):
+        "DateField + start/end."
+        user = self.create_user()
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        spike = create_contact(
+            first_name='Spike', last_name='Spiegel', birthday=date(year=2044, month=6, day=26),
+        )
+        jet = create_contact(
+            first_name='Jet', last_name='Black', birthday=date(year=2035, month=12, day=31),
+        )
+        faye = create_contact(first_name='Faye', last_name='Valentine')
+
+        handler1 = DateRegularFieldConditionHandler(
+            model=FakeContact, field_name='birthday',
+            start=self.create_datetime(year=2040, month=1, day=1),
+        )
+        self.assertIs(handler1.accept(entity=spike, user=user), True)
+        self.assertIs(handler1.accept(entity=jet,   user=user), False)
+        self.assertIs(handler1.accept(entity=faye,  user=user), False)
+
+        handler2 = DateRegularFieldConditionHandler(
+            model=FakeContact, field_name='birthday',
+            start=self.create_datetime(year=2035, month=12, day=31),
+            end=self.create_datetime(year=2044, month=6, day=25),
+        )
+        self.assertIs(handler2.accept(entity=spike, user=user), False)
+        self.assertIs(handler2.accept(entity=jet,   user=user), True)
+
+        # ---
+        handler3 = DateRegularFieldConditionHandler(
+            model=FakeContact, field_name='birthday', date_range='empty',
+        )
+        self.assertIs(handler3.accept(entity=spike, user=user), False)
+        self.assertIs(handler3.accept(entity=faye,  user=user), True)
+
+        handler4 = DateRegularFieldConditionHandler(
+            model=FakeContact, field_name='birthday', date_range='not_empty',
+        )
+        self.assertIs(handler4.accept(entity=spike, user=user), True)
+        self.assertIs(handler4.accept(entity=faye,  user=user), False)
+
+    def test_dateregularfield_accept02(self):
+        "DateTimeField + named range + FK."
+        user = self.create_user()
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        spike = create_contact(first_name='Spike', last_name='Spiegel')
+
+        handler1 = DateRegularFieldConditionHandler(
+            model=FakeContact, field_name='created', date_range='current_year',
+        )
+        self.assertIs(handler1.accept(entity=spike, user=user), True)
+
+        handler2 = DateRegularFieldConditionHandler(
+            model=FakeContact, field_name='created', date_range='in_future',
+        )
+        self.assertIs(handler2.accept(entity=spike, user=user), False)
+
+        # FK ---
+        img = FakeImage.objects.create(user=user, name='Spike face')
+        jet = create_contact(first_name='Jet', last_name='Black', image=img)
+
+        handler3 = DateRegularFieldConditionHandler(
+            model=FakeContact, field_name='image__created', date_range='not_empty',
+        )
+        self.assertIs(handler3.accept(entity=jet,   user=user), True)
+        self.assertIs(handler3.accept(entity=spike, user=user), False)
+
     def test_dateregularfield_description01(self):
         user = self.create_user()
 
@@ -2304,6 +2373,48 @@ class FilterConditionHandlerTestCase(CremeTestCase):
             custom_field=custom_field2, date_range='unknown_range',
         )
 
+    def test_datecustomfield_accept(self):
+        user = self.create_user()
+        custom_field = CustomField.objects.create(
+            name='First fight', content_type=FakeContact, field_type=CustomField.DATETIME,
+        )
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        spike = create_contact(first_name='Spike', last_name='Spiegel')
+        jet   = create_contact(first_name='Jet',   last_name='Black')
+        faye  = create_contact(first_name='Faye',  last_name='Valentine')
+
+        create_cfval = partial(custom_field.value_class.objects.create, custom_field=custom_field)
+        create_cfval(entity=spike, value=self.create_datetime(year=2071, month=6, day=26))
+        create_cfval(entity=jet,   value=self.create_datetime(year=2069, month=1, day=1))
+
+        handler1 = DateCustomFieldConditionHandler(
+            model=FakeContact,
+            custom_field=custom_field.id,
+            related_name='customfielddatetime',
+            start=self.create_datetime(year=2070, month=1, day=1),
+        )
+        self.assertIs(handler1.accept(entity=spike, user=user), True)
+        self.assertIs(handler1.accept(entity=jet,   user=user), False)
+        self.assertIs(handler1.accept(entity=faye,  user=user), False)
+
+        handler2 = DateCustomFieldConditionHandler(
+            model=FakeContact,
+            custom_field=custom_field,
+            related_name='customfielddatetime',
+            date_range='not_empty',
+        )
+        self.assertIs(handler2.accept(entity=spike, user=user), True)
+        self.assertIs(handler2.accept(entity=faye,  user=user), False)
+
+        handler3 = DateCustomFieldConditionHandler(
+            model=FakeContact,
+            custom_field=self.UNUSED_PK,
+            related_name='customfielddatetime',
+            date_range='not_empty',
+        )
+        self.assertIs(handler3.accept(entity=spike, user=user), False)
+
     def test_datecustomfield_get_q(self):
         "get_q() not empty."
         user = self.create_user()
@@ -2863,6 +2974,40 @@ class FilterConditionHandlerTestCase(CremeTestCase):
         self.assertIs(handler4.accept(entity=shinji, user=user), True)
         self.assertIs(handler4.accept(entity=asuka,  user=user), False)
 
+    def test_relation_populate_entities(self):
+        user = self.create_user()
+        loves = RelationType.objects.smart_update_or_create(
+            ('test-subject_love', 'Is loving'),
+            ('test-object_love',  'Is loved by'),
+        )[0]
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        shinji = create_contact(last_name='Ikari',   first_name='Shinji')
+        rei    = create_contact(last_name='Ayanami', first_name='Rei')
+        asuka  = create_contact(last_name='Langley', first_name='Asuka')
+
+        Relation.objects.create(
+            user=user, subject_entity=shinji, type=loves, object_entity=rei,
+        )
+
+        contacts = [
+            *FakeContact.objects.filter(id__in=[shinji.id, rei.id, asuka.id]).order_by('id'),
+        ]
+        handler = RelationConditionHandler(
+            model=FakeContact,
+            rtype=loves.id,
+            ctype=ContentType.objects.get_for_model(FakeContact),
+        )
+
+        # Relations + related entities
+        with self.assertNumQueries(2):
+            handler.populate_entities(entities=contacts, user=user)
+
+        with self.assertNumQueries(0):
+            accepted = [handler.accept(entity=c, user=user) for c in contacts]
+
+        self.assertListEqual([True, False, False], accepted)
+
     def test_relation_description01(self):
         user = self.login()
 
@@ -3518,6 +3663,164 @@ class FilterConditionHandlerTestCase(CremeTestCase):
             negated=True,
         )
 
+    def test_relation_subfilter_accept(self):
+        user = self.create_user()
+        loves = RelationType.objects.smart_update_or_create(
+            ('test-subject_love', 'Is loving'),
+            ('test-object_love',  'Is loved by'),
+        )[0]
+
+        sub_efilter = EntityFilter.objects.smart_update_or_create(
+            pk='test-filter01', name='Filter Ikari', model=FakeContact, is_custom=True,
+            conditions=[
+                RegularFieldConditionHandler.build_condition(
+                    model=FakeContact, field_name='last_name',
+                    operator=operators.EQUALS, values=['Ikari'],
+                ),
+            ],
+        )
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        shinji = create_contact(last_name='Ikari',     first_name='Shinji')
+        rei    = create_contact(last_name='Ayanami',   first_name='Rei')
+        asuka  = create_contact(last_name='Langley',   first_name='Asuka')
+        misato = create_contact(last_name='Katsuragi', first_name='Misato')
+
+        create_rel = partial(Relation.objects.create, user=user, type=loves)
+        create_rel(subject_entity=rei,    object_entity=shinji)
+        create_rel(subject_entity=asuka,  object_entity=rei)
+
+        handler1 = RelationSubFilterConditionHandler(
+            model=FakeContact, rtype=loves.id, subfilter=sub_efilter,
+        )
+        self.assertIs(handler1.accept(entity=rei,    user=user), True)
+        self.assertIs(handler1.accept(entity=asuka,  user=user), False)
+        self.assertIs(handler1.accept(entity=misato, user=user), False)
+
+        # Exclude ---
+        handler2 = RelationSubFilterConditionHandler(
+            model=FakeContact, rtype=loves.id, subfilter=sub_efilter, exclude=True,
+        )
+        self.assertIs(handler2.accept(entity=rei,    user=user), False)
+        self.assertIs(handler2.accept(entity=asuka,  user=user), True)
+        self.assertIs(handler2.accept(entity=misato, user=user), True)
+
+        # Populate ---
+        contacts = [
+            *FakeContact.objects.filter(id__in=[rei.id, asuka.id, misato.id]).order_by('id'),
+        ]
+        handler3 = RelationSubFilterConditionHandler(
+            model=FakeContact, rtype=loves.id, subfilter=sub_efilter.id,
+        )
+        handler3.populate_entities(entities=contacts, user=user)
+
+        with self.assertNumQueries(0):
+            accepted = [handler3.accept(entity=c, user=user) for c in contacts]
+
+        self.assertListEqual([True, False, False], accepted)
+
+    def test_relation_subfilter_accept_several_models(self):
+        "The related entities have different models."
+        user = self.create_user()
+        loves = RelationType.objects.smart_update_or_create(
+            ('test-subject_love', 'Is loving'),
+            ('test-object_love',  'Is loved by'),
+        )[0]
+
+        sub_efilter = EntityFilter.objects.smart_update_or_create(
+            pk='test-filter01', name='Filter Ikari', model=FakeContact, is_custom=True,
+            conditions=[
+                RegularFieldConditionHandler.build_condition(
+                    model=FakeContact, field_name='last_name',
+                    operator=operators.EQUALS, values=['Ikari'],
+                ),
+            ],
+        )
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        shinji = create_contact(last_name='Ikari',   first_name='Shinji')
+        rei    = create_contact(last_name='Ayanami', first_name='Rei')
+        asuka  = create_contact(last_name='Langley', first_name='Asuka')
+
+        nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+
+        create_rel = partial(Relation.objects.create, user=user, type=loves)
+        create_rel(subject_entity=rei,   object_entity=nerv)
+        create_rel(subject_entity=rei,   object_entity=shinji)
+        create_rel(subject_entity=asuka, object_entity=nerv)
+
+        contacts = [*FakeContact.objects.filter(id__in=[rei.id, asuka.id]).order_by('id')]
+        handler = RelationSubFilterConditionHandler(
+            model=FakeContact, rtype=loves.id, subfilter=sub_efilter.id,
+        )
+
+        with self.assertNoException():
+            handler.populate_entities(entities=contacts, user=user)
+
+        with self.assertNumQueries(0):
+            accepted = [handler.accept(entity=c, user=user) for c in contacts]
+
+        self.assertListEqual([True, False], accepted)
+        self.assertListEqual(
+            [rei],
+            [*FakeContact.objects.filter(
+                handler.get_q(user), id__in=[rei.id, asuka.id],
+            )],
+        )
+
+    def test_relation_subfilter_accept_entity_base(self):
+        "The sub-filter is related to CremeEntity => it accepts all the models."
+        user = self.create_user()
+        loves = RelationType.objects.smart_update_or_create(
+            ('test-subject_love', 'Is loving'),
+            ('test-object_love',  'Is loved by'),
+        )[0]
+
+        sub_efilter = EntityFilter.objects.smart_update_or_create(
+            pk='test-filter01', name='Pilots', model=CremeEntity, is_custom=True,
+            conditions=[
+                RegularFieldConditionHandler.build_condition(
+                    model=CremeEntity, field_name='description',
+                    operator=operators.ICONTAINS, values=['pilot'],
+                ),
+            ],
+        )
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        shinji = create_contact(last_name='Ikari',   first_name='Shinji', description='Pilot')
+        rei    = create_contact(last_name='Ayanami', first_name='Rei')
+        asuka  = create_contact(last_name='Langley', first_name='Asuka')
+        misato = create_contact(last_name='Katsuragi', first_name='Misato')
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        nerv = create_orga(name='Nerv', description='Employs pilots')
+        seele = create_orga(name='Seele')
+
+        create_rel = partial(Relation.objects.create, user=user, type=loves)
+        create_rel(subject_entity=rei,    object_entity=shinji)
+        create_rel(subject_entity=asuka,  object_entity=seele)
+        create_rel(subject_entity=misato, object_entity=nerv)
+
+        contact_ids = [rei.id, asuka.id, misato.id]
+        contacts = [*FakeContact.objects.filter(id__in=contact_ids).order_by('id')]
+        handler = RelationSubFilterConditionHandler(
+            model=FakeContact, rtype=loves.id, subfilter=sub_efilter.id,
+        )
+
+        with self.assertNoException():
+            handler.populate_entities(entities=contacts, user=user)
+
+        self.assertListEqual(
+            [True, False, True],
+            [handler.accept(entity=c, user=user) for c in contacts],
+        )
+        self.assertListEqual(
+            [rei, misato],
+            [*FakeContact.objects.filter(
+                handler.get_q(user), id__in=contact_ids,
+            ).order_by('id')],
+        )
+
     def test_relation_subfilter_description01(self):
         user = self.create_user()
 
@@ -3835,6 +4138,31 @@ class FilterConditionHandlerTestCase(CremeTestCase):
         self.assertIs(handler2.accept(entity=shinji, user=user), True)
         self.assertIs(handler2.accept(entity=misato, user=user), True)
 
+    def test_property_populate_entities(self):
+        user = self.create_user()
+        cute = CremePropertyType.objects.smart_update_or_create(
+            str_pk='test-prop_cute', text='Cute',
+        )
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        shinji = create_contact(last_name='Ikari',   first_name='Shinji')
+        rei    = create_contact(last_name='Ayanami', first_name='Rei')
+
+        CremeProperty.objects.create(creme_entity=rei, type=cute)
+
+        contacts = [
+            *FakeContact.objects.filter(id__in=[shinji.id, rei.id]).order_by('id'),
+        ]
+        handler = PropertyConditionHandler(model=FakeContact, ptype=cute.id)
+
+        with self.assertNumQueries(1):
+            handler.populate_entities(entities=contacts, user=user)
+
+        with self.assertNumQueries(0):
+            accepted = [handler.accept(entity=c, user=user) for c in contacts]
+
+        self.assertListEqual([False, True], accepted)
+
     def test_property_description01(self):
         user = self.create_user()
         cute = CremePropertyType.objects.smart_update_or_create(
@@ -1,11 +1,18 @@
+from unittest.mock import patch
+
 from django.db import models
+from django.db.models.signals import post_save, pre_save
+from django.db.transaction import atomic
 from django.utils.translation import gettext as _
 
 from creme.creme_core.core.batch_process import (
     BatchAction,
     batch_operator_manager,
+    bulk_update_entities,
+    can_bulk_update,
 )
-from creme.creme_core.models import FakeContact
+from creme.creme_core.models import FakeContact, HistoryLine
+from creme.creme_core.models.history import TYPE_EDITION
 
 from ..base import CremeTestCase
 
@@ -171,3 +178,133 @@ class BatchActionTestCase(CremeTestCase):
             ),
             str(baction)
         )
+
+
+class BulkUpdateTestCase(CremeTestCase):
+    def test_can_bulk_update(self):
+        self.assertIs(can_bulk_update(FakeContact), True)
+
+        def save(this, *args, **kwargs):
+            pass
+
+        with patch.object(FakeContact, 'save', save):
+            self.assertIs(can_bulk_update(FakeContact), False)
+
+    def test_bulk_update_entities(self):
+        user = self.create_user()
+
+        create_contact = FakeContact.objects.create
+        contact1 = create_contact(user=user, first_name='Spike', last_name='Spiegel')
+        contact2 = create_contact(user=user, first_name='Jet', last_name='Black')
+        old_modified = contact1.modified
+        old_count = HistoryLine.objects.count()
+
+        contacts = [*FakeContact.objects.filter(id__in=[contact1.id, contact2.id])]
+        for contact in contacts:
+            contact.last_name = contact.last_name.upper()
+
+        received = []
+        pre_received = []
+
+        def _receiver(sender, instance, created, **kwargs):
+            received.append((sender, instance.id, created))
+
+        def _pre_receiver(sender, instance, **kwargs):
+            # NB: the values are not written yet
+            pre_received.append((
+                sender, instance.id, instance.last_name,
+                FakeContact.objects.get(id=instance.id).last_name,
+            ))
+
+        post_save.connect(_receiver, sender=FakeContact)
+        pre_save.connect(_pre_receiver, sender=FakeContact)
+
+        try:
+            bulk_update_entities(FakeContact, contacts, field_names=['last_name'])
+        finally:
+            post_save.disconnect(_receiver, sender=FakeContact)
+            pre_save.disconnect(_pre_receiver, sender=FakeContact)
+
+        contact1 = self.refresh(contact1)
+        self.assertEqual('SPIEGEL', contact1.last_name)
+        self.assertEqual('Spike SPIEGEL', contact1.header_filter_search_field)
+        self.assertLess(old_modified, contact1.modified)
+        self.assertEqual('BLACK', self.refresh(contact2).last_name)
+
+        self.assertCountEqual(
+            [(FakeContact, contact1.id, False), (FakeContact, contact2.id, False)],
+            received,
+        )
+        self.assertCountEqual(
+            [
+                (FakeContact, contact1.id, 'SPIEGEL', 'Spiegel'),
+                (FakeContact, contact2.id, 'BLACK', 'Black'),
+            ],
+            pre_received,
+        )
+
+        # No duplicated line of history
+        self.assertEqual(old_count + 2, HistoryLine.objects.count())
+        hline = HistoryLine.objects.filter(entity=contact1.id).order_by('-id')[0]
+        self.assertEqual(TYPE_EDITION, hline.type)
+        self.assertListEqual([['last_name', 'Spiegel', 'SPIEGEL']], hline.modifications)
+
+    def test_bulk_update_entities_successive(self):
+        "Same entity updated several times => only one line of history."
+        user = self.create_user()
+        contact = FakeContact.objects.create(
+            user=user, first_name='Spike', last_name='Spiegel',
+        )
+        contact = self.refresh(contact)
+        old_count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with atomic(), HistoryLine.buffered():
+                contact.last_name = 'SPIEGEL'
+                bulk_update_entities(FakeContact, [contact], field_names=['last_name'])
+
+                contact.first_name = 'SPIKE'
+                bulk_update_entities(FakeContact, [contact], field_names=['first_name'])
+
+                # Regular edition
+                contact.phone = '123456'
+                contact.save()
+
+        self.assertEqual(old_count + 1, HistoryLine.objects.count())
+
+        hline = HistoryLine.objects.filter(entity=contact.id).order_by('-id')[0]
+        self.assertEqual(TYPE_EDITION, hline.type)
+        self.assertListEqual(
+            [
+                ['last_name', 'Spiegel', 'SPIEGEL'],
+                ['first_name', 'Spike', 'SPIKE'],
+                ['phone', '123456'],
+            ],
+            hline.modifications,
+        )
+
+    def test_bulk_update_entities_cached_line(self):
+        "The line of a regular edition is completed."
+        user = self.create_user()
+        contact = FakeContact.objects.create(
+            user=user, first_name='Spike', last_name='Spiegel',
+        )
+        contact = self.refresh(contact)
+        old_count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with atomic(), HistoryLine.buffered():
+                contact.phone = '123456'
+                contact.save()
+
+                contact.last_name = 'SPIEGEL'
+                bulk_update_entities(FakeContact, [contact], field_names=['last_name'])
+
+        self.assertEqual(old_count + 1, HistoryLine.objects.count())
+
+        hline = HistoryLine.objects.filter(entity=contact.id).order_by('-id')[0]
+        self.assertEqual(TYPE_EDITION, hline.type)
+        self.assertListEqual(
+            [['phone', '123456'], ['last_name', 'Spiegel', 'SPIEGEL']],
+            hline.modifications,
+        )
@@ -0,0 +1,297 @@
+from functools import partial
+from unittest.mock import patch
+
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.cache import caches
+from django.template.context import make_context
+from django.template.engine import Engine
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from creme.creme_core.bricks import PropertiesBrick
+from creme.creme_core.core.brick_cache import brick_render_cache
+from creme.creme_core.global_info import clear_global_info
+from creme.creme_core.gui.bricks import Brick, BricksManager, PaginatedBrick
+from creme.creme_core.models import (
+    CremeProperty,
+    CremePropertyType,
+    FakeContact,
+    FakeOrganisation,
+    Relation,
+    RelationType,
+)
+
+from ..base import CremeTestCase
+
+
+class BrickRenderCacheTestCase(CremeTestCase):
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        clear_global_info()
+
+    def tearDown(self):
+        super().tearDown()
+        caches['default'].clear()
+        clear_global_info()
+
+    def _build_context(self, entity, user=None, url='/'):
+        request = RequestFactory().get(url)
+        request.session = SessionBase()
+        request.user = user or self.user
+
+        context = make_context({}, request)
+
+        for processor in Engine.get_default().template_context_processors:
+            context.update(processor(request))
+
+        context = context.flatten()
+        context['object'] = entity
+
+        return context
+
+    @staticmethod
+    def _render(brick, context, method_name='detailview_display'):
+        mngr = BricksManager()
+        mngr.add_group(brick.id_, brick)
+
+        return brick_render_cache.render(
+            brick, method_name, {**context, BricksManager.var_name: mngr},
+        )
+
+    @staticmethod
+    def _build_brick_class(**attrs):
+        class FoobarBrick(Brick):
+            id_ = Brick.generate_id('creme_core', 'test_brick_cache')
+            dependencies = (FakeOrganisation,)
+            cache_render = True
+
+            render_count = 0
+
+            def detailview_display(self, context):
+                cls = type(self)
+                cls.render_count += 1
+
+                return f'<div>{cls.render_count}</div>'
+
+            home_display = detailview_display
+
+        for k, v in attrs.items():
+            setattr(FoobarBrick, k, v)
+
+        brick_render_cache.watch(FoobarBrick)
+
+        return FoobarBrick
+
+    @override_settings(BRICK_CACHE=None)
+    def test_disabled(self):
+        user = self.login()
+        orga = FakeOrganisation.objects.create(user=user, name='Nerv')
+        brick = self._build_brick_class()()
+
+        context = self._build_context(orga)
+        self.assertIsNone(brick_render_cache.backend)
+        self.assertIsNone(brick_render_cache.build_key(brick, context))
+        self.assertEqual('<div>1</div>', self._render(brick, context))
+        self.assertEqual('<div>2</div>', self._render(brick, context))
+
+    @override_settings(BRICK_CACHE='default', BRICK_CACHE_TIMEOUT=120)
+    def test_render(self):
+        user = self.login()
+        self.assertEqual(caches['default'], brick_render_cache.backend)
+        self.assertEqual(120, brick_render_cache.timeout)
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Nerv')
+        orga2 = create_orga(name='Seele')
+
+        brick_cls = self._build_brick_class()
+        brick = brick_cls()
+        context1 = self._build_context(orga1)
+        self.assertTrue(brick_render_cache.build_key(brick, context1))
+        self.assertEqual('<div>1</div>', self._render(brick, context1))
+        self.assertEqual('<div>1</div>', self._render(brick, context1))
+        self.assertEqual('<div>1</div>', self._render(brick_cls(), context1))
+        self.assertEqual(1, brick_cls.render_count)
+
+        # Other entity, other user
+        self.assertEqual('<div>2</div>', self._render(brick, self._build_context(orga2)))
+        self.assertEqual(
+            '<div>3</div>',
+            self._render(brick, self._build_context(orga1, user=self.other_user)),
+        )
+
+        # Pagination
+        self.assertEqual(
+            '<div>4</div>',
+            self._render(brick, self._build_context(orga1, url=f'/?{brick.id_}_page=2')),
+        )
+        self.assertEqual('<div>1</div>', self._render(brick, context1))
+
+        # Home is not cached
+        self.assertEqual('<div>5</div>', self._render(brick, context1, 'home_display'))
+        self.assertEqual('<div>6</div>', self._render(brick, context1, 'home_display'))
+
+        # Not opt-in
+        brick_cls.cache_render = False
+        self.assertIsNone(brick_render_cache.build_key(brick, context1))
+        self.assertEqual('<div>7</div>', self._render(brick, context1))
+
+    @override_settings(BRICK_CACHE='default')
+    def test_render_session(self):
+        "The context of the brick stored in the session is updated by a cache hit."
+        user = self.login()
+        orga = FakeOrganisation.objects.create(user=user, name='Nerv')
+
+        class PagesBrick(PaginatedBrick):
+            id_ = PaginatedBrick.generate_id('creme_core', 'test_brick_cache_session')
+            dependencies = (FakeOrganisation,)
+            cache_render = True
+            page_size = 2
+
+            render_count = 0
+
+            def detailview_display(self, context):
+                cls = type(self)
+                cls.render_count += 1
+                page = self.get_template_context(context, objects=[*range(5)])['page']
+
+                return f'<div>{page.number}</div>'
+
+        brick_render_cache.watch(PagesBrick)
+        brick = PagesBrick()
+        url = f'/?{brick.id_}_page=2'
+
+        context1 = self._build_context(orga, url=url)
+        self.assertEqual('<div>2</div>', self._render(brick, context1))
+        self.assertEqual(1, PagesBrick.render_count)
+
+        session1 = context1['request'].session
+        self.assertDictEqual(
+            {'page': 2}, session1['brickcontexts_manager']['/'][brick.id_],
+        )
+
+        # Cache hit with another session
+        context2 = self._build_context(orga, url=url)
+        self.assertEqual('<div>2</div>', self._render(brick, context2))
+        self.assertEqual(1, PagesBrick.render_count)
+
+        session2 = context2['request'].session
+        self.assertTrue(session2.modified)
+        self.assertDictEqual(
+            {'page': 2}, session2['brickcontexts_manager']['/'][brick.id_],
+        )
+
+        # The page stored in the session is used (other key)
+        context3 = self._build_context(orga)
+        context3['request'].session = session2
+        self.assertEqual('<div>2</div>', self._render(brick, context3))
+        self.assertEqual(2, PagesBrick.render_count)
+
+    @override_settings(BRICK_CACHE='default')
+    def test_invalidation(self):
+        user = self.login()
+        orga1 = FakeOrganisation.objects.create(user=user, name='Nerv')
+        contact = FakeContact.objects.create(user=user, first_name='Shinji', last_name='Ikari')
+
+        brick_cls = self._build_brick_class()
+        brick = brick_cls()
+        self.assertEqual('<div>1</div>', self._render(brick, self._build_context(contact)))
+
+        # Dependency
+        FakeOrganisation.objects.create(user=user, name='Seele')
+        self.assertEqual('<div>2</div>', self._render(brick, self._build_context(contact)))
+        self.assertEqual('<div>2</div>', self._render(brick, self._build_context(contact)))
+
+        orga1.delete()
+        self.assertEqual('<div>3</div>', self._render(brick, self._build_context(contact)))
+
+        # Entity
+        contact.last_name = 'Ikari!'
+        contact.save()
+        self.assertEqual(
+            '<div>4</div>',
+            self._render(brick, self._build_context(self.refresh(contact))),
+        )
+
+    @override_settings(BRICK_CACHE='default')
+    def test_invalidation_relation(self):
+        user = self.login()
+
+        create_rtype = RelationType.objects.smart_update_or_create
+        rtype1 = create_rtype(
+            ('test-subject_pilots', 'pilots'), ('test-object_pilots', 'is piloted by'),
+        )[0]
+        rtype2 = create_rtype(
+            ('test-subject_hates', 'hates'), ('test-object_hates', 'is hated by'),
+        )[0]
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        contact1 = create_contact(first_name='Shinji', last_name='Ikari')
+        contact2 = create_contact(first_name='Gendo', last_name='Ikari')
+
+        brick_cls = self._build_brick_class(
+            dependencies=(Relation,), relation_type_deps=(rtype1.id,),
+        )
+        brick = brick_cls()
+        context = self._build_context(contact1)
+        self.assertEqual('<div>1</div>', self._render(brick, context))
+
+        Relation.objects.create(
+            user=user, subject_entity=contact1, type=rtype2, object_entity=contact2,
+        )
+        self.assertEqual('<div>1</div>', self._render(brick, context))
+
+        Relation.objects.create(
+            user=user, subject_entity=contact1, type=rtype1, object_entity=contact2,
+        )
+        self.assertEqual('<div>2</div>', self._render(brick, context))
+
+    @override_settings(BRICK_CACHE='default')
+    def test_detailview(self):
+        "The brick of properties is cached on the detail-views."
+        user = self.login()
+        contact = FakeContact.objects.create(
+            user=user, first_name='Spike', last_name='Spiegel',
+        )
+
+        create_ptype = CremePropertyType.objects.smart_update_or_create
+        ptype1 = create_ptype(str_pk='test-prop_cool', text='Is cool')
+        ptype2 = create_ptype(str_pk='test-prop_lazy', text='Is lazy')
+        CremeProperty.objects.create(type=ptype1, creme_entity=contact)
+
+        url = contact.get_absolute_url()
+
+        with patch.object(
+            PropertiesBrick, 'detailview_display',
+            autospec=True, side_effect=PropertiesBrick.detailview_display,
+        ) as display_mock:
+            self.assertContains(self.client.get(url), 'Is cool')
+            self.assertEqual(1, display_mock.call_count)
+
+            # Cache hit
+            self.assertContains(self.client.get(url), 'Is cool')
+            self.assertEqual(1, display_mock.call_count)
+
+            # New property
+            CremeProperty.objects.create(type=ptype2, creme_entity=contact)
+            self.assertContains(self.client.get(url), 'Is lazy')
+            self.assertEqual(2, display_mock.call_count)
+
+            # Type of property modified
+            ptype1.text = 'Is very cool'
+            ptype1.save()
+            self.assertContains(self.client.get(url), 'Is very cool')
+            self.assertEqual(3, display_mock.call_count)
+
+    @override_settings(BRICK_CACHE='default')
+    def test_wildcard(self):
+        user = self.login()
+        orga = FakeOrganisation.objects.create(user=user, name='Nerv')
+
+        brick_cls = self._build_brick_class(dependencies='*')
+        brick = brick_cls()
+        context = self._build_context(orga)
+        self.assertFalse(brick_render_cache.is_cacheable(brick))
+        self.assertEqual('<div>1</div>', self._render(brick, context))
+        self.assertEqual('<div>2</div>', self._render(brick, context))
@@ -0,0 +1,254 @@
+from contextlib import contextmanager
+from threading import Event, current_thread
+from unittest.mock import patch
+
+from django.contrib.sessions.backends.base import SessionBase
+from django.db import connection
+from django.template.context import make_context
+from django.template.engine import Engine
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils.translation import get_language
+
+from creme.creme_core.core.brick_render import (
+    BrickBudgetExceeded,
+    BricksRenderer,
+    QueryBudget,
+)
+from creme.creme_core.global_info import get_global_info
+from creme.creme_core.gui.bricks import Brick, BricksManager
+from creme.creme_core.models import FakeContact
+from creme.creme_core.utils.concurrent import get_shared_executor
+
+from ..base import CremeTestCase
+
+
+class _BaseBrick(Brick):
+    def detailview_display(self, context):
+        return f'<div id="{self.id_}">{context["shared"].get("value")}</div>'
+
+
+class _SharingBrick(_BaseBrick):
+    id_ = Brick.generate_id('creme_core', 'test_brick_render_sharing')
+
+    def detailview_display(self, context):
+        context['shared']['value'] = 'shared!'
+        context['modified'] = True
+
+        return super().detailview_display(context)
+
+
+class _ConcurrentBrick1(_BaseBrick):
+    id_ = Brick.generate_id('creme_core', 'test_brick_render_concurrent1')
+    concurrent_render = True
+
+
+class _ConcurrentBrick2(_BaseBrick):
+    id_ = Brick.generate_id('creme_core', 'test_brick_render_concurrent2')
+    concurrent_render = True
+
+
+class BricksRendererTestCase(CremeTestCase):
+    def _build_context(self, *bricks):
+        user = self.login()
+
+        request = RequestFactory().get('/')
+        request.session = SessionBase()
+        request.user = user
+
+        context = make_context({}, request)
+
+        for processor in Engine.get_default().template_context_processors:
+            context.update(processor(request))
+
+        context = context.flatten()
+
+        mngr = BricksManager()
+        for brick in bricks:
+            mngr.add_group(brick.id_, brick)
+
+        context[BricksManager.var_name] = mngr
+
+        return context
+
+    def test_query_budget(self):
+        budget = QueryBudget(max_queries=2)
+        self.assertEqual(0, budget.count)
+
+        with connection.execute_wrapper(budget):
+            FakeContact.objects.count()
+            FakeContact.objects.exists()
+
+            with self.assertRaises(BrickBudgetExceeded):
+                FakeContact.objects.count()
+
+        self.assertEqual(3, budget.count)
+
+        # Time
+        budget = QueryBudget(timeout=0.01)
+        budget.deadline -= 1
+
+        with self.assertRaises(BrickBudgetExceeded):
+            with connection.execute_wrapper(budget):
+                FakeContact.objects.count()
+
+        # No limit
+        budget = QueryBudget()
+        self.assertIsNone(budget.deadline)
+
+        with connection.execute_wrapper(budget):
+            for _i in range(3):
+                FakeContact.objects.count()
+
+    @override_settings(BRICK_RELOAD_WORKERS=0)
+    def test_sequential(self):
+        bricks = [_SharingBrick(), _ConcurrentBrick1()]
+        context = self._build_context(*bricks)
+
+        renderer = BricksRenderer()
+        self.assertEqual('detailview_display', renderer.method_name)
+        self.assertEqual(0, renderer.workers)
+
+        self.assertListEqual(
+            [
+                (bricks[0].id_, f'<div id="{bricks[0].id_}">shared!</div>'),
+                (bricks[1].id_, f'<div id="{bricks[1].id_}">shared!</div>'),
+            ],
+            renderer.render(bricks, context),
+        )
+        self.assertNotIn('modified', context)
+
+    @override_settings(
+        BRICK_RELOAD_WORKERS=2, BRICK_RELOAD_TIMEOUT=0.2, BRICK_RELOAD_MAX_QUERIES=10,
+    )
+    def test_concurrent(self):
+        renderer = BricksRenderer()
+        self.assertEqual(2, renderer.workers)
+        self.assertEqual(0.2, renderer.timeout)
+        self.assertEqual(10, renderer.max_queries)
+
+        bricks = [_ConcurrentBrick1(), _SharingBrick(), _ConcurrentBrick2()]
+        context = self._build_context(*bricks)
+        user = context['user']
+        language = get_language()
+        threads = {}
+        released = Event()
+        finished = Event()
+
+        # NB: the threads cannot use the connection of the test (transaction)
+        def fake_render(brick, ctxt):
+            threads[brick.id_] = current_thread()
+
+            if isinstance(brick, _ConcurrentBrick1):
+                self.assertEqual(user, get_global_info('user'))
+                self.assertEqual(language, get_language())
+
+                # The session & the shared data are copies
+                request = ctxt['request']
+                self.assertIsNot(context['request'].session, request.session)
+                self.assertIsNot(context['shared'], ctxt['shared'])
+                ctxt['shared']['concurrent1'] = 'done'
+                request.session.setdefault(
+                    'brickcontexts_manager', {},
+                ).setdefault('/', {})[brick.id_] = {'page': 2}
+                request.session.modified = True
+
+                return 'concurrent #1'
+
+            if isinstance(brick, _ConcurrentBrick2):
+                released.wait(5)
+                ctxt['shared']['concurrent2'] = 'too late'
+                ctxt['request'].session['brickcontexts_manager'] = {}
+                ctxt['request'].session.modified = True
+                finished.set()
+
+                return 'concurrent #2'
+
+            return 'sequential'
+
+        session = context['request'].session
+
+        with patch.object(BricksRenderer, '_render', side_effect=fake_render):
+            renders = renderer.render(bricks, context)
+
+        released.set()
+        self.assertTrue(finished.wait(5))
+
+        # The modifications of the rendered bricks are applied by the current
+        # thread ; the ones of the timed out bricks are ignored.
+        self.assertEqual('done', context['shared'].get('concurrent1'))
+        self.assertNotIn('concurrent2', context['shared'])
+        self.assertDictEqual(
+            {'/': {bricks[0].id_: {'page': 2}}},
+            session['brickcontexts_manager'],
+        )
+        self.assertTrue(session.modified)
+
+        self.assertEqual(3, len(renders))
+        self.assertTupleEqual((bricks[0].id_, 'concurrent #1'), renders[0])
+        self.assertTupleEqual((bricks[1].id_, 'sequential'), renders[1])
+
+        brick_id2, html2 = renders[2]
+        self.assertEqual(bricks[2].id_, brick_id2)
+        self.assertIn(f'id="{brick_id2}"', html2)
+        self.assertIn('data-brick-error="true"', html2)
+
+        self.assertEqual(current_thread(), threads[bricks[1].id_])
+        self.assertNotEqual(current_thread(), threads[bricks[0].id_])
+        self.assertNotEqual(current_thread(), threads[bricks[2].id_])
+
+        # The threads are shared by the requests
+        executor = get_shared_executor('creme_bricks', 2)
+        self.assertIn(threads[bricks[0].id_], executor._threads)
+
+    def test_query_budget_statement_timeout(self):
+        "The queries which set/reset the timeout are not counted."
+        brick = _ConcurrentBrick1()
+        context = self._build_context(brick)
+        queries = []
+
+        @contextmanager
+        def fake_statement_timeout(timeout):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')  # NB: 'SET statement_timeout'...
+            queries.append(('set', timeout))
+
+            try:
+                yield
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')  # NB: 'RESET statement_timeout'
+                queries.append('reset')
+
+        def fake_render(this, brick, ctxt):
+            FakeContact.objects.exists()
+            FakeContact.objects.count()
+
+            return '<div>OK</div>'
+
+        renderer = BricksRenderer()
+        renderer.max_queries = 2
+        renderer.timeout = 10
+
+        with patch(
+            'creme.creme_core.core.brick_render.statement_timeout',
+            fake_statement_timeout,
+        ), patch.object(BricksRenderer, '_render', fake_render):
+            html = renderer._render_in_thread(brick, context, get_language(), None)
+
+        self.assertEqual('<div>OK</div>', html)
+        self.assertListEqual([('set', 10), 'reset'], queries)
+
+    @override_settings(BRICK_RELOAD_WORKERS=1)
+    def test_concurrent_query_budget(self):
+        bricks = [_ConcurrentBrick1()]
+        context = self._build_context(*bricks)
+
+        def fake_render(brick, ctxt):
+            raise BrickBudgetExceeded('more than 10 queries')
+
+        with patch.object(BricksRenderer, '_render', side_effect=fake_render):
+            renders = BricksRenderer().render(bricks, context)
+
+        self.assertEqual(1, len(renders))
+        self.assertIn('data-brick-error="true"', renders[0][1])
@@ -0,0 +1,252 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.test.utils import override_settings
+
+from creme.creme_core.constants import SETTING_BRICK_DEFAULT_STATE_IS_OPEN
+from creme.creme_core.core.cache import ConfigCache
+from creme.creme_core.global_info import clear_global_info
+from creme.creme_core.models import (
+    BrickDetailviewLocation,
+    CremeUser,
+    CustomField,
+    FakeContact,
+    FakeOrganisation,
+    FieldsConfig,
+    HeaderFilter,
+    RelationType,
+    SearchConfigItem,
+    SettingValue,
+    UserRole,
+)
+
+from ..base import CremeTestCase
+
+
+class ConfigCacheTestCase(CremeTestCase):
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        clear_global_info()
+
+    def tearDown(self):
+        super().tearDown()
+        caches['default'].clear()
+        clear_global_info()
+
+    @override_settings(CONFIG_CACHE=None)
+    def test_disabled(self):
+        cache = ConfigCache()
+        self.assertIsNone(cache.backend)
+
+        cache.set('tests', 'key1', 'value1')
+        self.assertIsNone(cache.get('tests', 'key1'))
+        self.assertEqual('default', cache.get('tests', 'key1', 'default'))
+        self.assertDictEqual({}, cache.get_many('tests', ['key1']))
+
+        cache.invalidate('tests')  # No error
+
+    def test_get_n_set(self):
+        cache = ConfigCache(alias='default', timeout=60)
+        self.assertEqual(caches['default'], cache.backend)
+        self.assertEqual(60, cache.timeout)
+
+        cache.set_many('tests', {'key1': 'value1', 'key2': [1, 2]})
+        cache.set('tests', 'key3', {'foo': 'bar'})
+        self.assertEqual('value1', cache.get('tests', 'key1'))
+        self.assertDictEqual(
+            {'key2': [1, 2], 'key3': {'foo': 'bar'}},
+            cache.get_many('tests', ['key2', 'key3', 'key4']),
+        )
+        self.assertIsNone(cache.get('other_tests', 'key1'))
+
+        # Other request (& other instance)
+        clear_global_info()
+        self.assertEqual('value1', ConfigCache(alias='default').get('tests', 'key1'))
+
+    @override_settings(CONFIG_CACHE='default', CONFIG_CACHE_TIMEOUT=120)
+    def test_settings(self):
+        cache = ConfigCache()
+        self.assertEqual(caches['default'], cache.backend)
+        self.assertEqual(120, cache.timeout)
+
+    def test_invalidate(self):
+        cache = ConfigCache(alias='default')
+        cache.set('tests', 'key1', 'value1')
+        cache.set('other_tests', 'key1', 'value2')
+
+        cache.invalidate('tests')
+        self.assertIsNone(cache.get('tests', 'key1'))
+        self.assertEqual('value2', cache.get('other_tests', 'key1'))
+
+        cache.set('tests', 'key1', 'value3')
+        self.assertEqual('value3', cache.get('tests', 'key1'))
+
+        # Invalidation by another process/request
+        clear_global_info()
+        ConfigCache(alias='default').invalidate('tests')
+
+        clear_global_info()
+        self.assertIsNone(cache.get('tests', 'key1'))
+
+    def test_invalidate_evicted_version(self):
+        cache = ConfigCache(alias='default')
+        cache.set('tests', 'key1', 'value1')
+
+        caches['default'].delete(cache._version_key('tests'))
+        cache.invalidate('tests')
+        self.assertIsNone(cache.get('tests', 'key1'))
+
+    @override_settings(CONFIG_CACHE='default')
+    def test_fields_config(self):
+        FieldsConfig.objects.get_for_model(FakeContact)
+
+        clear_global_info()
+        with self.assertNumQueries(0):
+            fconf = FieldsConfig.objects.get_for_model(FakeContact)
+        self.assertFalse([*fconf.hidden_fields])
+
+        FieldsConfig.objects.create(
+            content_type=FakeContact,
+            descriptions=[('phone', {FieldsConfig.HIDDEN: True})],
+        )
+
+        clear_global_info()
+        fconf = FieldsConfig.objects.get_for_model(FakeContact)
+        self.assertListEqual(['phone'], [f.name for f in fconf.hidden_fields])
+
+    @override_settings(CONFIG_CACHE='default')
+    def test_custom_fields(self):
+        self.assertFalse(CustomField.objects.get_for_model(FakeContact))
+
+        cfield = CustomField.objects.create(
+            name='Size', field_type=CustomField.INT, content_type=FakeContact,
+        )
+
+        clear_global_info()
+        self.assertListEqual(
+            [cfield.id], [*CustomField.objects.get_for_model(FakeContact).keys()],
+        )
+
+        clear_global_info()
+        with self.assertNumQueries(0):
+            cfields = CustomField.objects.get_for_model(FakeContact)
+        self.assertListEqual([cfield.id], [*cfields.keys()])
+
+    @override_settings(CONFIG_CACHE='default')
+    def test_setting_values(self):
+        key = SETTING_BRICK_DEFAULT_STATE_IS_OPEN
+        value = SettingValue.objects.value_4_key(key)
+
+        clear_global_info()
+        with self.assertNumQueries(0):
+            self.assertEqual(value, SettingValue.objects.value_4_key(key))
+
+        SettingValue.objects.set_4_key(key, not value)
+
+        clear_global_info()
+        self.assertEqual(not value, SettingValue.objects.value_4_key(key))
+
+    @override_settings(CONFIG_CACHE='default')
+    def test_search_config(self):
+        user = self.login(is_superuser=False)
+        SearchConfigItem.objects.create_if_needed(FakeContact, ['first_name'])
+        SearchConfigItem.objects.create_if_needed(
+            FakeContact, ['last_name'], role=self.role,
+        )
+        SearchConfigItem.objects.create_if_needed(
+            FakeContact, ['email'], role='superuser',
+        )
+
+        def get_field_names(u):
+            sci = next(SearchConfigItem.objects.iter_for_models([FakeContact], u))
+            return [cell.value for cell in sci.cells]
+
+        self.assertListEqual(['last_name'], get_field_names(user))
+
+        clear_global_info()
+        with self.assertNumQueries(0):
+            sci = next(SearchConfigItem.objects.iter_for_models([FakeContact], user))
+        self.assertEqual(self.role.id, sci.role_id)
+
+        self.assertListEqual(['email'], get_field_names(self.other_user))
+
+        other_role = UserRole.objects.create(name='Other')
+        self.assertListEqual(
+            ['first_name'],
+            get_field_names(self.create_user(index=2, role=other_role)),
+        )
+
+    @override_settings(CONFIG_CACHE='default')
+    def test_detailview_locations(self):
+        ctype = ContentType.objects.get_for_model(FakeOrganisation)
+        locs = BrickDetailviewLocation.objects.for_ctype(ctype)
+        self.assertTrue(all(loc.content_type_id in (None, ctype.id) for loc in locs))
+
+        clear_global_info()
+        with self.assertNumQueries(0):
+            cached_locs = BrickDetailviewLocation.objects.for_ctype(ctype)
+        self.assertListEqual([loc.id for loc in locs], [loc.id for loc in cached_locs])
+
+        loc = BrickDetailviewLocation.objects.create_if_needed(
+            brick='tests-fake_brick', order=1, zone=BrickDetailviewLocation.TOP,
+            model=FakeOrganisation,
+        )
+
+        clear_global_info()
+        self.assertIn(loc.id, [o.id for o in BrickDetailviewLocation.objects.for_ctype(ctype)])
+
+    @override_settings(CONFIG_CACHE='default')
+    def test_header_filters(self):
+        user = self.login(is_superuser=False)
+        other_user = self.other_user
+
+        ctype = ContentType.objects.get_for_model(FakeContact)
+        create_hf = HeaderFilter.objects.create_if_needed
+        hf1 = create_hf(pk='tests-hf_contact1', name='Public', model=FakeContact)
+        hf2 = create_hf(
+            pk='tests-hf_contact2', name='Private', model=FakeContact,
+            is_custom=True, is_private=True, user=other_user,
+        )
+
+        def get_ids(u):
+            return {hf.id for hf in HeaderFilter.objects.get_for_ctype(ctype=ctype, user=u)}
+
+        self.assertIn(hf1.id, get_ids(user))
+        self.assertNotIn(hf2.id, get_ids(user))
+        self.assertIn(hf2.id, get_ids(other_user))
+
+        hf2.is_private = False
+        hf2.save()
+
+        clear_global_info()
+        self.assertIn(hf2.id, get_ids(user))
+
+        with self.assertRaises(ValueError):
+            HeaderFilter.objects.get_for_ctype(
+                ctype=ctype,
+                user=CremeUser.objects.create(username='Team', is_team=True),
+            )
+
+    @override_settings(CONFIG_CACHE='default')
+    def test_relation_type(self):
+        rtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_foobar', 'is loving'),
+            ('test-object_foobar',  'is loved by'),
+        )[0]
+
+        self.assertEqual(rtype, RelationType.objects.get_cached(rtype.id))
+
+        clear_global_info()
+        with self.assertNumQueries(0):
+            cached_rtype = RelationType.objects.get_cached(rtype.id)
+        self.assertEqual('is loving', cached_rtype.predicate)
+        self.assertEqual('is loved by', cached_rtype.symmetric_type.predicate)
+
+        rtype.predicate = 'is adoring'
+        rtype.save()
+
+        clear_global_info()
+        self.assertEqual('is adoring', RelationType.objects.get_cached(rtype.id).predicate)
+
+        with self.assertRaises(RelationType.DoesNotExist):
+            RelationType.objects.get_cached('test-unknown')
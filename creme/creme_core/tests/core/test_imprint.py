@@ -1,5 +1,8 @@
 from datetime import timedelta
+from functools import partial
 
+from django.core.cache import caches
+from django.test.utils import override_settings
 from django.utils.timezone import now
 
 from creme.creme_core.core.imprint import _ImprintManager
@@ -104,3 +107,68 @@ class ImprintManagerTestCase(CremeTestCase):
         willy = FakeContact.objects.create(user=user, first_name='Willy', last_name='Wonka')
 
         self.assertIsNone(manager.create_imprint(entity=willy, user=user))
+
+    @override_settings(IMPRINT_BUFFER_SIZE=3, IMPRINT_BUFFER_DELAY=60)
+    def test_buffer(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+
+        manager = _ImprintManager()
+        manager.register(FakeContact, minutes=60)
+
+        user = self.login()
+        create_contact = partial(FakeContact.objects.create, user=user)
+        willy   = create_contact(first_name='Willy',   last_name='Wonka')
+        charlie = create_contact(first_name='Charlie', last_name='Bucket')
+
+        with self.assertNumQueries(0):
+            imprint1 = manager.create_imprint(entity=willy, user=user)
+            imprint2 = manager.create_imprint(entity=willy, user=user)
+
+        self.assertIsInstance(imprint1, Imprint)
+        self.assertIsNone(imprint1.id)
+        self.assertDatetimesAlmostEqual(now(), imprint1.date)
+        self.assertIsNone(imprint2)  # Granularity
+        self.assertEqual(1, len(manager.buffer))
+        self.assertFalse(Imprint.objects.all())
+
+        manager.create_imprint(entity=charlie, user=user)
+        manager.create_imprint(entity=willy, user=self.other_user)
+
+        imprints = [*Imprint.objects.order_by('id')]
+        self.assertEqual(0, len(manager.buffer))
+        self.assertEqual(3, len(imprints))
+        self.assertEqual(willy.id, imprints[0].entity_id)
+        self.assertEqual(imprint1.date, imprints[0].date)
+        self.assertEqual(charlie.id, imprints[1].entity_id)
+        self.assertEqual(self.other_user, imprints[2].user)
+
+    @override_settings(IMPRINT_BUFFER_SIZE=10, IMPRINT_BUFFER_DELAY=0)
+    def test_buffer_expired(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+
+        manager = _ImprintManager()
+        manager.register(FakeContact, minutes=60)
+
+        user = self.login()
+        create_contact = partial(FakeContact.objects.create, user=user)
+        willy   = create_contact(first_name='Willy',   last_name='Wonka')
+        charlie = create_contact(first_name='Charlie', last_name='Bucket')
+
+        buffer = manager.buffer
+        self.assertFalse(buffer.expired())
+
+        manager.create_imprint(entity=willy, user=user)
+        manager.create_imprint(entity=charlie, user=user)
+        self.assertTrue(buffer.expired())
+        self.assertFalse(Imprint.objects.all())
+
+        # The imprints of deleted entities are ignored
+        charlie.delete()
+        buffer.flush()
+        self.assertEqual(0, len(buffer))
+        self.assertFalse(buffer.expired())
+        self.assertListEqual(
+            [willy.id], [*Imprint.objects.values_list('entity_id', flat=True)],
+        )
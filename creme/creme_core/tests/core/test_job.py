@@ -1,8 +1,10 @@
 import os
 from datetime import timedelta
+from io import BytesIO, StringIO
 from shutil import rmtree
 from tempfile import mkdtemp
 from unittest import skipIf
+from unittest.mock import patch
 
 from django.core.exceptions import ImproperlyConfigured
 from django.test.utils import override_settings
@@ -10,6 +12,7 @@ from django.utils.timezone import now
 
 from creme.creme_core.core.job import JobScheduler, _JobTypeRegistry
 from creme.creme_core.core.job.queue.unix_socket import UnixSocketQueue
+from creme.creme_core.core.job.worker import Worker, WorkerPool, run_worker
 from creme.creme_core.core.reminder import Reminder, reminder_registry
 from creme.creme_core.creme_jobs import reminder_type
 from creme.creme_core.creme_jobs.base import JobType
@@ -132,6 +135,159 @@ class JobTypeRegistryTestCase(CremeTestCase):
         )
 
 
+class FakeProcess:
+    "Stand-in for subprocess.Popen."
+    pid_counter = 1000
+
+    def __init__(self):
+        FakeProcess.pid_counter += 1
+        self.pid = FakeProcess.pid_counter
+        self.stdin = BytesIO()
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        self.returncode = 0
+        return 0
+
+
+class WorkerPoolTestCase(CremeTestCase):
+    @staticmethod
+    def _build_pool(**kwargs):
+        pool = WorkerPool(**kwargs)
+        pool._create_worker = lambda: Worker(FakeProcess())
+
+        return pool
+
+    def test_init_error(self):
+        with self.assertRaises(ValueError):
+            WorkerPool(size=0)
+
+    def test_fill(self):
+        pool = self._build_pool(size=3)
+        self.assertEqual(0, len(pool))
+
+        pool.fill()
+        self.assertEqual(3, len(pool))
+
+        workers = [*pool]
+        self.assertTrue(all(isinstance(w, Worker) for w in workers))
+        self.assertEqual(3, len({w.pid for w in workers}))
+
+        # Dead workers are replaced
+        workers[0].process.returncode = 1
+        pool.fill()
+        self.assertEqual(3, len(pool))
+        self.assertNotIn(workers[0], [*pool])
+
+    def test_run_job(self):
+        pool = self._build_pool(size=2)
+        pool.fill()
+
+        worker1 = pool.run_job(12)
+        self.assertEqual(12, worker1.job_id)
+        self.assertEqual(1, worker1.jobs_count)
+        self.assertEqual(b'12\n', worker1.process.stdin.getvalue())
+        self.assertEqual(2, len(pool))
+
+        worker2 = pool.run_job(13)
+        self.assertIsNot(worker1, worker2)
+
+        # All workers are busy => a new one is created
+        worker3 = pool.run_job(14)
+        self.assertNotIn(worker3, [worker1, worker2])
+        self.assertEqual(3, len(pool))
+
+        metrics = pool.metrics()
+        self.assertEqual(3, len(metrics))
+        self.assertSetEqual({12, 13, 14}, {m['job_id'] for m in metrics})
+        self.assertEqual(1, metrics[0]['jobs_count'])
+
+        # Extra worker is stopped
+        self.assertIs(worker3, pool.release(14))
+        self.assertIsNone(worker3.job_id)
+        self.assertEqual(0, worker3.process.returncode)
+        self.assertEqual(2, len(pool))
+
+        self.assertIs(worker1, pool.release(12))
+        self.assertIsNone(worker1.process.returncode)
+        self.assertIs(worker1, pool.run_job(15))
+        self.assertEqual(2, worker1.jobs_count)
+        self.assertEqual(b'12\n15\n', worker1.process.stdin.getvalue())
+
+    def test_release_recycle_jobs_count(self):
+        pool = self._build_pool(size=1, max_jobs=2)
+        pool.fill()
+
+        worker1 = pool.run_job(12)
+        pool.release(12)
+        self.assertIs(worker1, pool.run_job(13))
+
+        pool.release(13)
+        self.assertEqual(0, worker1.process.returncode)
+        self.assertEqual(1, len(pool))
+        self.assertIsNot(worker1, pool.run_job(14))
+
+    def test_release_recycle_memory(self):
+        pool = self._build_pool(size=1, max_memory=1024)
+        pool.fill()
+
+        worker1 = pool.run_job(12)
+
+        with patch('creme.creme_core.core.job.worker._get_rss', return_value=2048):
+            pool.release(12)
+
+        self.assertEqual(0, worker1.process.returncode)
+        self.assertEqual(1, len(pool))
+
+    def test_release_error(self):
+        pool = self._build_pool(size=1)
+
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(pool.release(12))
+
+    def test_stop(self):
+        pool = self._build_pool(size=2)
+        pool.fill()
+        workers = [*pool]
+
+        pool.stop()
+        self.assertEqual(0, len(pool))
+        self.assertTrue(all(w.process.returncode == 0 for w in workers))
+
+    def test_run_worker(self):
+        job_ids = []
+
+        with patch(
+            'creme.creme_core.core.job.job_type_registry',
+            side_effect=lambda job_id: job_ids.append(job_id),
+        ):
+            with self.assertLogs(level='WARNING'):
+                run_worker(stdin=StringIO('12\ninvalid\n13\n'))
+
+        self.assertListEqual([12, 13], job_ids)
+
+    @override_settings(JOBMANAGER_WORKERS=0)
+    def test_scheduler_without_workers(self):
+        scheduler = JobScheduler()
+        self.assertIsNone(scheduler._workers)
+        self.assertListEqual([], scheduler.workers_metrics())
+
+    @override_settings(
+        JOBMANAGER_WORKERS=4,
+        JOBMANAGER_WORKER_MAX_JOBS=10,
+        JOBMANAGER_WORKER_MAX_MEMORY=128,
+    )
+    def test_scheduler_with_workers(self):
+        workers = JobScheduler()._workers
+        self.assertIsInstance(workers, WorkerPool)
+        self.assertEqual(4, workers.size)
+        self.assertEqual(10, workers.max_jobs)
+        self.assertEqual(128 * 1024 * 1024, workers.max_memory)
+
+
 class JobSchedulerTestCase(CremeTestCase):
     def setUp(self):
         super().setUp()
@@ -180,6 +180,29 @@ class FlowPaginatorTestCase(CremeTestCase):
 
         self.assertIsNone(page.next_page_info())
 
+    def test_unknown_count(self):
+        self._build_contacts()
+        contacts = FakeContact.objects.all()
+        per_page = 3
+
+        paginator = FlowPaginator(contacts, key='last_name', per_page=per_page, count=None)
+        self.assertIsNone(paginator.count)
+        self.assertIsNone(paginator.num_pages)
+
+        page1 = paginator.page()
+        self.assertListEqual([*contacts][:per_page], page1.object_list)
+        self.assertIs(page1.has_next(), True)
+
+        page2 = paginator.page(page1.next_page_info())
+        self.assertListEqual([*contacts][per_page:2 * per_page], page2.object_list)
+        self.assertIs(page2.has_previous(), True)
+
+        last_page = paginator.last_page()
+        self.assertIs(last_page.has_next(), False)
+        self.assertEqual([*contacts][-1], last_page[-1])
+
+        self.assertListEqual([*contacts], [c for page in paginator.pages() for c in page])
+
     def test_invalid_paginator(self):
         contacts = FakeContact.objects.all()
         count = len(contacts)
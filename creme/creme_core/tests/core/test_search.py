@@ -0,0 +1,337 @@
+from functools import partial
+from threading import Event, current_thread
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.test.utils import override_settings
+
+from creme.creme_core.core.entity_cell import EntityCellCustomField
+from creme.creme_core.core.search import (
+    IndexSearchBackend,
+    RegularSearchBackend,
+    Searcher,
+    SearchRunner,
+    search_index,
+)
+from creme.creme_core.global_info import clear_global_info
+from creme.creme_core.models import (
+    CustomField,
+    CustomFieldEnumValue,
+    FakeContact,
+    FakeOrganisation,
+    FakeSector,
+    SearchConfigItem,
+    SearchDocument,
+)
+from creme.creme_core.utils.concurrent import get_shared_executor
+
+from ..base import CremeTestCase
+
+INDEX_BACKEND = 'creme.creme_core.core.search.IndexSearchBackend'
+
+
+class SearchTestCase(CremeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.login()
+
+        SearchConfigItem.objects.filter(
+            content_type__in=[
+                ContentType.objects.get_for_model(model)
+                for model in (FakeContact, FakeOrganisation)
+            ],
+        ).delete()
+        SearchConfigItem.objects.create_if_needed(
+            FakeContact, ['first_name', 'last_name', 'sector__title'],
+        )
+        SearchConfigItem.objects.create_if_needed(FakeOrganisation, ['name'])
+
+    def _build_contacts(self):
+        sector = FakeSector.objects.create(title='Linux dev')
+
+        create_contact = partial(FakeContact.objects.create, user=self.user)
+        self.linus = create_contact(first_name='Linus', last_name='Torvalds')
+        self.alan = create_contact(
+            first_name='Alan', last_name='Cox', description='Cool beard',
+        )
+        self.andrew = create_contact(
+            first_name='Andrew', last_name='Morton', sector=sector,
+        )
+
+    def _get_contents(self, entity):
+        return {
+            doc.cell_key: doc.content
+            for doc in SearchDocument.objects.filter(entity=entity.id)
+        }
+
+    def test_regular_backend(self):
+        self.assertFalse(search_index.enabled)
+        self._build_contacts()
+
+        searcher = Searcher([FakeContact], self.user)
+        self.assertIsInstance(searcher.backend, RegularSearchBackend)
+        self.assertFalse(searcher.backend.indexed)
+
+        self.assertCountEqual(
+            [self.linus, self.andrew], [*searcher.search(FakeContact, 'linu')],
+        )
+        self.assertListEqual(
+            [self.andrew], [*searcher.search(FakeContact, 'linu mor')],
+        )
+
+        # The index is not maintained
+        self.assertFalse(SearchDocument.objects.filter(entity=self.linus.id))
+
+    @override_settings(SEARCH_BACKEND=INDEX_BACKEND)
+    def test_index_cells(self):
+        self.assertTrue(search_index.enabled)
+
+        SearchConfigItem.objects.create_if_needed(
+            FakeContact, ['last_name', 'email', 'description'], role=self.role,
+        )
+        SearchConfigItem.objects.create_if_needed(
+            FakeContact, ['phone'], role='superuser', disabled=True,
+        )
+        clear_global_info()
+
+        self.assertListEqual(
+            [
+                'regular_field-first_name',
+                'regular_field-last_name',
+                'regular_field-sector__title',
+                'regular_field-email',
+                'regular_field-description',
+            ],
+            [cell.key for cell in search_index.get_cells(FakeContact)],
+        )
+
+    @override_settings(SEARCH_BACKEND=INDEX_BACKEND)
+    def test_index_signals(self):
+        self._build_contacts()
+
+        andrew = self.andrew
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'andrew',
+                'regular_field-last_name': 'morton',
+                'regular_field-sector__title': 'linux dev',
+            },
+            self._get_contents(andrew),
+        )
+        self.assertTrue(all(
+            doc.entity_type_id == andrew.entity_type_id
+            for doc in SearchDocument.objects.filter(entity=andrew.id)
+        ))
+
+        andrew.last_name = '  Van  der\tMorton '
+        andrew.sector = None
+        andrew.save()
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'andrew',
+                'regular_field-last_name': 'van der morton',
+            },
+            self._get_contents(andrew),
+        )
+
+        andrew.delete()
+        self.assertFalse(SearchDocument.objects.filter(entity=andrew.id))
+
+    @override_settings(SEARCH_BACKEND=INDEX_BACKEND)
+    def test_index_custom_fields(self):
+        create_cfield = partial(CustomField.objects.create, content_type=FakeOrganisation)
+        cfield1 = create_cfield(name='ID number', field_type=CustomField.STR)
+        cfield2 = create_cfield(name='Tags', field_type=CustomField.MULTI_ENUM)
+        cfield3 = create_cfield(name='Not indexed', field_type=CustomField.STR)
+
+        SearchConfigItem.objects.create(
+            content_type=FakeOrganisation, superuser=True,
+            cells=[EntityCellCustomField(cfield1), EntityCellCustomField(cfield2)],
+        )
+        clear_global_info()
+
+        orga = FakeOrganisation.objects.create(user=self.user, name='Foobar')
+        self.assertDictEqual({'regular_field-name': 'foobar'}, self._get_contents(orga))
+
+        key1 = f'custom_field-{cfield1.id}'
+        key2 = f'custom_field-{cfield2.id}'
+
+        cfield1.value_class(custom_field=cfield1, entity=orga).set_value_n_save('ABCD123')
+        cfield3.value_class(custom_field=cfield3, entity=orga).set_value_n_save('Ignored')
+        self.assertDictEqual(
+            {'regular_field-name': 'foobar', key1: 'abcd123'}, self._get_contents(orga),
+        )
+
+        create_evalue = partial(CustomFieldEnumValue.objects.create, custom_field=cfield2)
+        green = create_evalue(value='Green')
+        red = create_evalue(value='Red')
+        cvalue2 = cfield2.value_class(custom_field=cfield2, entity=orga)
+        cvalue2.set_value_n_save([green.id, red.id])
+        self.assertDictEqual(
+            {'regular_field-name': 'foobar', key1: 'abcd123', key2: 'green red'},
+            self._get_contents(orga),
+        )
+
+        cvalue2.value.remove(green)
+        self.assertDictEqual(
+            {'regular_field-name': 'foobar', key1: 'abcd123', key2: 'red'},
+            self._get_contents(orga),
+        )
+
+        cfield1.value_class.objects.get(custom_field=cfield1, entity=orga).delete()
+        self.assertDictEqual(
+            {'regular_field-name': 'foobar', key2: 'red'}, self._get_contents(orga),
+        )
+
+        searcher = Searcher([FakeOrganisation], self.user)
+        self.assertListEqual([orga], [*searcher.search(FakeOrganisation, 'RED')])
+        self.assertFalse(searcher.search(FakeOrganisation, 'green').exists())
+
+    @override_settings(SEARCH_BACKEND=INDEX_BACKEND)
+    def test_index_search(self):
+        self._build_contacts()
+        coxi = FakeContact.objects.create(
+            user=self.user, first_name='Coxi', last_name='Cox',
+        )
+
+        searcher = Searcher([FakeContact, FakeOrganisation], self.user)
+        self.assertIsInstance(searcher.backend, IndexSearchBackend)
+
+        search = partial(searcher.search, FakeContact)
+        self.assertCountEqual([self.linus, self.andrew], [*search('LINU')])
+        self.assertListEqual([self.andrew], [*search('linu mor')])
+        self.assertListEqual([self.andrew], [*search('"linux dev" andrew')])
+        self.assertFalse(search('beard').exists())  # Not in the configuration
+
+        # Short words (not managed by the trigram index)
+        self.assertCountEqual([self.linus, self.alan], [*search('al')])
+
+        # Relevance: <coxi> contains "cox" in 2 fields
+        contacts = [*search('cox')]
+        self.assertListEqual([coxi, self.alan], contacts)
+        self.assertEqual(2, contacts[0].search_relevance)
+        self.assertEqual(1, contacts[1].search_relevance)
+
+    @override_settings(SEARCH_BACKEND=INDEX_BACKEND)
+    def test_rebuild(self):
+        self._build_contacts()
+        SearchDocument.objects.all().delete()
+
+        SearchConfigItem.objects.create_if_needed(
+            FakeContact, ['description'], role='superuser',
+        )
+        clear_global_info()
+
+        count = search_index.rebuild(FakeContact, chunk_size=2)
+
+        self.assertEqual(FakeContact.objects.count(), count)
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'alan',
+                'regular_field-last_name': 'cox',
+                'regular_field-description': 'cool beard',
+            },
+            self._get_contents(self.alan),
+        )
+        self.assertListEqual(
+            [self.alan], [*Searcher([FakeContact], self.user).search(FakeContact, 'beard')],
+        )
+
+    @override_settings(SEARCH_WORKERS=0)
+    def test_runner(self):
+        self._build_contacts()
+        coxi = FakeContact.objects.create(
+            user=self.user, first_name='Coxi', last_name='Cox',
+        )
+        FakeOrganisation.objects.create(user=self.user, name='Linux Foundation')
+
+        searcher = Searcher([FakeContact, FakeOrganisation], self.user)
+        runner = SearchRunner(searcher)
+        self.assertIs(searcher, runner.searcher)
+        self.assertEqual(0, runner.workers)
+
+        results = runner.run('cox')
+        self.assertListEqual(
+            [FakeContact, FakeOrganisation], [result.model for result in results],
+        )
+
+        result1 = results[0]
+        self.assertCountEqual([self.alan, coxi], result1.entities)
+        self.assertEqual(2, result1.count)
+        self.assertFalse(result1.capped)
+        self.assertFalse(result1.timed_out)
+
+        result2 = results[1]
+        self.assertListEqual([], result2.entities)
+        self.assertEqual(0, result2.count)
+
+        # Limit (no COUNT query is needed when there are fewer entities)
+        with self.assertNumQueries(2):
+            results = runner.run('linu', limit=5)
+        self.assertEqual(2, results[0].count)
+        self.assertEqual(1, results[1].count)
+
+        result = runner.run('cox', limit=1)[0]
+        self.assertEqual(1, len(result.entities))
+        self.assertEqual(2, result.count)
+
+        # Cap
+        result = runner.run('o', limit=1, count_cap=2)[0]
+        self.assertEqual(2, result.count)
+        self.assertTrue(result.capped)
+
+        result = runner.run('o', limit=1, count_cap=10)[0]
+        self.assertEqual(4, result.count)
+        self.assertFalse(result.capped)
+
+    @override_settings(SEARCH_WORKERS=2, SEARCH_TIMEOUT=0.2)
+    def test_runner_concurrency(self):
+        searcher = Searcher([FakeContact, FakeOrganisation], self.user)
+        runner = SearchRunner(searcher)
+        self.assertEqual(2, runner.workers)
+        self.assertEqual(0.2, runner.timeout)
+
+        threads = {}
+        released = Event()
+        finished = Event()
+
+        # NB: the threads cannot use the connection of the test (transaction)
+        def fake_fetch(queryset, limit, count_cap):
+            model = queryset.model
+            threads[model] = current_thread()
+
+            if model == FakeContact:
+                released.wait(5)
+                finished.set()
+
+                return [], 3, False
+
+            return [], 12, False
+
+        with patch.object(SearchRunner, '_fetch', side_effect=fake_fetch):
+            results = runner.run('foo', limit=5)
+
+            # The timed out search ends later, but does not modify its result
+            released.set()
+            self.assertTrue(finished.wait(5))
+
+        self.assertListEqual(
+            [FakeContact, FakeOrganisation], [result.model for result in results],
+        )
+
+        result1 = results[0]
+        self.assertTrue(result1.timed_out)
+        self.assertIsNone(result1.count)
+        self.assertListEqual([], result1.entities)
+
+        result2 = results[1]
+        self.assertFalse(result2.timed_out)
+        self.assertEqual(12, result2.count)
+
+        self.assertEqual(2, len(threads))
+        self.assertNotIn(current_thread(), threads.values())
+        self.assertEqual(2, len({*threads.values()}))
+
+        # The threads are shared by the requests
+        executor = get_shared_executor('creme_search', 2)
+        self.assertLessEqual({*threads.values()}, executor._threads)
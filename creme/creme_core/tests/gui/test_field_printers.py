@@ -1,7 +1,11 @@
+import os
 from datetime import date
 from decimal import Decimal
 from functools import partial
 from os.path import basename
+from time import perf_counter
+from unittest import skipUnless
+from unittest.mock import patch
 
 from django.conf import settings
 from django.db import models
@@ -1381,6 +1385,111 @@ class FieldsPrintersTestCase(CremeTestCase):
         self.assertEqual(HIDDEN_VALUE, get_csv_val(casca, 'image__description', user))
         self.assertEqual(HIDDEN_VALUE, get_csv_val(casca, 'image__categories', user))
 
+    def test_registry_compiled_printers(self):
+        user = CremeUser()
+
+        registry = _FieldPrintersRegistry()
+        get_printer = registry.get_field_printer
+
+        html_printer = get_printer(FakeOrganisation, 'name')
+        self.assertIs(html_printer, get_printer(FakeOrganisation, 'name', output='html'))
+        self.assertIsNot(html_printer, get_printer(FakeOrganisation, 'name', output='csv'))
+        self.assertIsNot(html_printer, get_printer(FakeContact, 'last_name'))
+
+        sector_printer = get_printer(FakeOrganisation, 'sector__title')
+        self.assertIs(sector_printer, get_printer(FakeOrganisation, 'sector__title'))
+
+        orga = FakeOrganisation(user=user, name='Nerv')
+        self.assertEqual('Nerv', html_printer(orga, user))
+        self.assertEqual('', sector_printer(orga, user))
+
+        # Invalidation
+        def print_charfield_html(entity, fval, user, field):
+            return f'<span>{fval}</span>'
+
+        registry.register(models.CharField, print_charfield_html)
+        new_html_printer = get_printer(FakeOrganisation, 'name')
+        self.assertIsNot(html_printer, new_html_printer)
+        self.assertEqual('<span>Nerv</span>', new_html_printer(orga, user))
+        self.assertEqual('<span>Nerv</span>', registry.get_html_field_value(orga, 'name', user))
+
+        line = FakeInvoiceLine(discount_unit=FakeInvoiceLine.Discount.PERCENT)
+        choice_printer = get_printer(FakeInvoiceLine, 'discount_unit', output='csv')
+        registry.register_choice_printer(
+            lambda entity, fval, user, field: 'CHOICE', output='csv',
+        )
+        self.assertIsNot(
+            choice_printer, get_printer(FakeInvoiceLine, 'discount_unit', output='csv'),
+        )
+        self.assertEqual('CHOICE', registry.get_csv_field_value(line, 'discount_unit', user))
+
+    def _aux_test_compiled_printers_rows(self, row_count):
+        "<row_count> rows * 20 columns ; the printers are built once per column."
+        user = self.create_user()
+        registry = _FieldPrintersRegistry()
+
+        field_names = [
+            'last_name', 'first_name', 'is_a_nerd', 'loves_comics', 'phone',
+            'mobile', 'email', 'url_site', 'birthday', 'description',
+            'created', 'modified', 'user', 'user__username', 'civility',
+            'civility__title', 'position', 'sector__title', 'address__city', 'image__name',
+        ]
+        contacts = [
+            FakeContact(
+                user=user, first_name=f'Shinji #{i}', last_name='Ikari',
+                email=f'shinji{i}@nerv.jp', birthday=date(year=2001, month=6, day=6),
+            ) for i in range(row_count)
+        ]
+
+        build_printer = registry.build_field_printer
+        built = []
+
+        def build_field_printer(model, field_name, output='html'):
+            built.append((model, field_name, output))
+            return build_printer(model, field_name, output=output)
+
+        with patch.object(registry, 'build_field_printer', side_effect=build_field_printer):
+            start = perf_counter()
+
+            for output in ('html', 'csv'):
+                get_value = (
+                    registry.get_html_field_value
+                    if output == 'html' else
+                    registry.get_csv_field_value
+                )
+                values = [
+                    [get_value(contact, field_name, user) for field_name in field_names]
+                    for contact in contacts
+                ]
+
+                self.assertEqual(row_count, len(values))
+                self.assertEqual('Ikari', values[0][0])
+                self.assertEqual(f'Shinji #{row_count - 1}', values[-1][1])
+
+            duration = perf_counter() - start
+
+        self.assertListEqual(
+            [
+                *((FakeContact, field_name, 'html') for field_name in field_names),
+                *((FakeContact, field_name, 'csv') for field_name in field_names),
+            ],
+            built,
+        )
+
+        return duration
+
+    def test_registry_compiled_printers_rows(self):
+        self._aux_test_compiled_printers_rows(row_count=50)
+
+    @skipUnless(
+        os.environ.get('CREME_BENCHMARKS'),
+        'Micro-benchmark ; set the environment variable "CREME_BENCHMARKS" to run it.',
+    )
+    def test_registry_compiled_printers_rows_benchmark(self):
+        "Micro-benchmark: 10k rows * 20 columns."
+        duration = self._aux_test_compiled_printers_rows(row_count=10000)
+        print(f'\nField printers: 10000 rows * 20 columns * 2 outputs in {duration:.2f}s')
+
     # TODO: test image_size()
     # TODO: test print_color_html()
     # TODO: test print_duration()
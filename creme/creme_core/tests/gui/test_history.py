@@ -191,7 +191,7 @@ class HistoryRenderTestCase(CremeTestCase):
 
         hline = self.get_hline()
         self.assertEqual(history.TYPE_EDITION, hline.type)
-        self.assertIn('["NERV", ["name", "Nerv", "NERV"]]', hline.value)
+        self.assertIn('["NERV",["name","Nerv","NERV"]]', hline.value)
 
         fname = 'invalid'
         hline.value = hline.value.replace('name', fname)
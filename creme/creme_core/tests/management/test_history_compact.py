@@ -0,0 +1,52 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from creme.creme_core.management.commands.creme_history_compact import (
+    Command as HistoryCompactCommand,
+)
+from creme.creme_core.models import (
+    ArchivedHistoryLine,
+    FakeOrganisation,
+    HistoryLine,
+)
+from creme.creme_core.models.history import TYPE_EDITION
+
+from .. import base
+
+
+class HistoryCompactTestCase(base.CremeTestCase):
+    @staticmethod
+    def call_command(*args, **kwargs):
+        call_command(HistoryCompactCommand(), *args, verbosity=0, **kwargs)
+
+    def test_errors(self):
+        with self.assertRaises(CommandError):
+            self.call_command(chunk_size=1)
+
+    def test_compact(self):
+        user = self.create_user()
+        nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+
+        hline1 = HistoryLine.objects.get(entity=nerv.id)
+        compact_value = hline1.value
+        self.assertEqual('["Nerv"]', compact_value)
+
+        verbose_value = '["Nerv", ["name", "Nerf", "Nerv"]]'
+        hline2 = HistoryLine.objects.create(
+            entity=nerv, entity_ctype=nerv.entity_type, entity_owner=user,
+            type=TYPE_EDITION, value=verbose_value,
+        )
+        archived_line = ArchivedHistoryLine.objects.create(
+            id=hline2.id + 1,
+            entity_ctype=nerv.entity_type, entity_owner=user,
+            date=hline2.date, type=TYPE_EDITION, value=verbose_value,
+        )
+
+        self.call_command(chunk_size=2)
+        self.assertEqual(compact_value, self.refresh(hline1).value)
+
+        expected = '["Nerv",["name","Nerf","Nerv"]]'
+        hline2 = self.refresh(hline2)
+        self.assertEqual(expected, hline2.value)
+        self.assertListEqual([['name', 'Nerf', 'Nerv']], hline2.modifications)
+        self.assertEqual(expected, self.refresh(archived_line).value)
@@ -0,0 +1,62 @@
+from functools import partial
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from creme.creme_core.management.commands.creme_search_index import (
+    Command as SearchIndexCommand,
+)
+from creme.creme_core.models import (
+    FakeContact,
+    FakeOrganisation,
+    SearchConfigItem,
+    SearchDocument,
+)
+
+from .. import base
+
+
+class SearchIndexTestCase(base.CremeTestCase):
+    @staticmethod
+    def call_command(*args, **kwargs):
+        call_command(SearchIndexCommand(), *args, verbosity=0, **kwargs)
+
+    def test_errors(self):
+        with self.assertRaises(CommandError):
+            self.call_command('creme_core.unknown')
+
+        with self.assertRaises(CommandError):
+            self.call_command('creme_core.fakesector')
+
+        with self.assertRaises(CommandError):
+            self.call_command(chunk_size=1)
+
+    def test_rebuild(self):
+        user = self.create_user()
+
+        SearchConfigItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(FakeContact),
+        ).delete()
+        SearchConfigItem.objects.create_if_needed(FakeContact, ['last_name'])
+
+        # NB: the regular back-end does not maintain the index
+        create_contact = partial(FakeContact.objects.create, user=user)
+        contact1 = create_contact(first_name='Linus', last_name='Torvalds')
+        contact2 = create_contact(first_name='Alan', last_name='Cox')
+        orga = FakeOrganisation.objects.create(user=user, name='Linux Foundation')
+        self.assertFalse(SearchDocument.objects.filter(entity__in=[contact1, contact2, orga]))
+
+        self.call_command('creme_core.fakecontact', chunk_size=2)
+        self.assertListEqual(
+            ['torvalds'],
+            [*SearchDocument.objects.filter(entity=contact1).values_list('content', flat=True)],
+        )
+        self.assertListEqual(
+            ['cox'],
+            [*SearchDocument.objects.filter(entity=contact2).values_list('content', flat=True)],
+        )
+        self.assertFalse(SearchDocument.objects.filter(entity=orga))
+
+        self.call_command()
+        self.assertTrue(SearchDocument.objects.filter(entity=orga))
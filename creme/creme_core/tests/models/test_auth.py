@@ -1793,6 +1793,116 @@ class CredentialsTestCase(CremeTestCase):
 
         self.assertListEqual([contact1.id, contact4.id], ids_list)
 
+    def test_populate_credentials01(self):
+        "ESET_FILTER (allowed & forbidden) ; computed with one query per filter."
+        user = self.user
+        VIEW = EntityCredentials.VIEW
+        CHANGE = EntityCredentials.CHANGE
+
+        contact1 = self.contact1
+        contact2 = self.contact2
+        contact3 = FakeContact.objects.create(
+            user=self.other_user, first_name='Gonnosuke', last_name=contact1.last_name,
+        )
+        orga = FakeOrganisation.objects.create(user=user, name=contact1.last_name)
+
+        def create_filter(id, **kwargs):
+            efilter = EntityFilter.objects.create(
+                id=id, entity_type=FakeContact, filter_type=EF_CREDENTIALS,
+            )
+            efilter.set_conditions(
+                [
+                    condition_handler.RegularFieldConditionHandler.build_condition(
+                        model=FakeContact, operator=operators.IEQUALS,
+                        filter_type=EF_CREDENTIALS,
+                        **kwargs
+                    ),
+                ],
+                check_cycles=False, check_privacy=False,
+            )
+
+            return efilter
+
+        efilter1 = create_filter(
+            'creme_core-test_auth1', field_name='last_name', values=[contact1.last_name],
+        )
+        efilter2 = create_filter(
+            'creme_core-test_auth2', field_name='first_name', values=[contact3.first_name],
+        )
+
+        self._create_role(
+            'Coder', ['creme_core'], users=[user],
+            set_creds=[
+                SetCredentials(
+                    value=VIEW | CHANGE,
+                    set_type=SetCredentials.ESET_FILTER,
+                    ctype=FakeContact,
+                    efilter=efilter1,
+                ),
+                SetCredentials(
+                    value=CHANGE,
+                    set_type=SetCredentials.ESET_FILTER,
+                    ctype=FakeContact,
+                    efilter=efilter2,
+                    forbidden=True,
+                ),
+            ],
+        )
+
+        user = self.refresh(user)
+        entities = [
+            *CremeEntity.objects.filter(
+                id__in=[contact1.id, contact2.id, contact3.id, orga.id],
+            ).order_by('id'),
+        ]
+        user.role._get_setcredentials()  # Fill the cache
+        user.teams  # NOQA
+
+        # For each filter: the filter, its conditions & the entities' IDs
+        with self.assertNumQueries(6):
+            user.populate_credentials(entities)
+
+        with self.assertNumQueries(0):
+            self.assertListEqual(
+                [True, False, True, False],
+                [user.has_perm_to_view(e) for e in entities],
+            )
+            self.assertListEqual(
+                [True, False, False, False],
+                [user.has_perm_to_change(e) for e in entities],
+            )
+
+        # Same results than the per-entity computing
+        populated = {e.id: e for e in entities}
+        for entity in CremeEntity.objects.filter(id__in=[*populated.keys()]):
+            self.assertEqual(
+                user.has_perm_to_view(entity), user.has_perm_to_view(populated[entity.id]),
+            )
+            self.assertEqual(
+                user.has_perm_to_change(entity), user.has_perm_to_change(populated[entity.id]),
+            )
+
+        # Already computed
+        with self.assertNumQueries(0):
+            user.populate_credentials(entities)
+
+    def test_populate_credentials02(self):
+        "Superuser."
+        user = self.user
+        user.is_superuser = True
+        user.save()
+
+        contact1 = self.contact1
+
+        with self.assertNumQueries(0):
+            user.populate_credentials([contact1, self.contact2])
+            self.assertTrue(user.has_perm_to_delete(contact1))
+
+        # Other users are not concerned
+        other_user = self.other_user
+        self._create_role('Coder', ['creme_core'], users=[other_user])
+        self.assertFalse(self.refresh(other_user).has_perm_to_view(contact1))
+
     def test_creation_creds01(self):
         user = self.user
         role = self._create_role('Coder', users=[user])
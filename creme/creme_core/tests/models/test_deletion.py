@@ -15,9 +15,11 @@ from creme.creme_core.models import (
     FakeSector,
     FakeTicket,
     FakeTicketPriority,
+    HistoryLine,
     Job,
     JobResult,
 )
+from creme.creme_core.models.history import TYPE_EDITION
 from creme.creme_core.utils.translation import get_model_verbose_name
 
 from ..base import CremeTestCase
@@ -322,6 +324,60 @@ class DeletionCommandTestCase(CremeTestCase):
             deletor_type.get_stats(job),
         )
 
+    def test_deletor_job_bulk(self):
+        "Replacements in bulk (several chunks) & history."
+        user = self.create_user()
+
+        civ = FakeCivility.objects.first()
+        civ2del = FakeCivility.objects.create(title='Kun')
+
+        create_contact = partial(FakeContact.objects.create, user=user, civility=civ2del)
+        contacts = [
+            create_contact(last_name='Hattori', first_name=f'Hanzo #{i}') for i in range(3)
+        ]
+        other = FakeContact.objects.create(
+            user=user, last_name='Fuma', first_name='Kotaro', civility=civ,
+        )
+
+        job = Job.objects.create(type_id=deletor_type.id, user=user)
+        dcom = DeletionCommand.objects.create(
+            job=job,
+            instance_to_delete=civ2del,
+            replacers=[
+                FixedValueReplacer(
+                    model_field=FakeContact._meta.get_field('civility'),
+                    value=civ,
+                ),
+            ],
+            total_count=3,
+        )
+
+        hlines_ids = [*HistoryLine.objects.values_list('id', flat=True)]
+        chunk_size = deletor_type.chunk_size
+        try:
+            deletor_type.chunk_size = 2
+            with self.captureOnCommitCallbacks(execute=True):
+                deletor_type.execute(job)
+        finally:
+            deletor_type.chunk_size = chunk_size
+
+        self.assertDoesNotExist(civ2del)
+        self.assertFalse(JobResult.objects.filter(job=job))
+        self.assertEqual(3, self.refresh(dcom).updated_count)
+
+        for contact in contacts:
+            self.assertEqual(civ, self.refresh(contact).civility)
+
+        other = self.refresh(other)
+        self.assertEqual(civ, other.civility)
+
+        hlines = HistoryLine.objects.exclude(id__in=hlines_ids).order_by('id')
+        self.assertListEqual(
+            [contact.id for contact in contacts],
+            [hline.entity_id for hline in hlines],
+        )
+        self.assertTrue(all(hline.type == TYPE_EDITION for hline in hlines))
+
     def test_deletor_job04(self):
         "No replacement + exception."
         user = self.create_user()
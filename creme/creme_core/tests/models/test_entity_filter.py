@@ -51,6 +51,10 @@ from creme.creme_core.models import (
     RelationType,
 )
 from creme.creme_core.models.entity_filter import EntityFilterList
+from creme.creme_core.utils.db import (
+    is_db_equal_case_sensitive,
+    is_db_like_case_sensitive,
+)
 
 from ..base import CremeTestCase
 
@@ -1508,6 +1512,68 @@ class EntityFiltersTestCase(CremeTestCase):
         self.assertIs(accept(contacts['rei']),    True)
         self.assertIs(accept(contacts['spike']),  False)
 
+    def test_accept_many(self):
+        user = CremeUser.objects.create(
+            username='Kanna', email='kanna@century.jp',
+            first_name='Kanna', last_name='Gendou',
+            password='uselesspw',
+        )
+        ptype = CremePropertyType.objects.smart_update_or_create(
+            str_pk='test-prop_kawaii', text='Kawaii',
+        )
+        rtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_love', 'Is loving'),
+            ('test-object_love',  'Is loved by'),
+        )[0]
+
+        contacts = self.contacts
+        CremeProperty.objects.create(type=ptype, creme_entity=contacts['faye'])
+        Relation.objects.create(
+            user=user, type=rtype,
+            subject_entity=contacts['spike'], object_entity=contacts['faye'],
+        )
+
+        efilter = EntityFilter.objects.smart_update_or_create(
+            'test-filter01', 'Kawaii or loving', FakeContact,
+            use_or=True,
+            conditions=[
+                PropertyConditionHandler.build_condition(
+                    model=FakeContact, ptype=ptype, has=True,
+                ),
+                RelationConditionHandler.build_condition(
+                    model=FakeContact, rtype=rtype, has=True,
+                ),
+                RegularFieldConditionHandler.build_condition(
+                    model=FakeContact, operator=operators.EQUALS,
+                    field_name='civility__title', values=['Miss'],
+                ),
+            ],
+        )
+        efilter = self.refresh(efilter)
+
+        short_names = ('spike', 'jet', 'faye', 'rei')
+        entities = [
+            *FakeContact.objects.filter(
+                id__in=[contacts[sn].id for sn in short_names],
+            ).order_by('id'),
+        ]
+
+        # NB: the probes of the case-sensitivity of the DB are performed once
+        #     per process (& so depend on the tests which have been run before).
+        is_db_equal_case_sensitive()
+        is_db_like_case_sensitive()
+
+        # Conditions + properties + relations (& related entities) + civilities
+        with self.assertNumQueries(5):
+            accepted = efilter.accept_many(entities, user=user)
+
+        self.assertListEqual(
+            [efilter.accept(entity=e, user=user) for e in entities],
+            accepted,
+        )
+        self.assertListEqual([True, False, True, False], accepted)
+        self.assertListEqual([], efilter.accept_many([], user=user))
+
     def test_condition_update(self):
         build = partial(RegularFieldConditionHandler.build_condition, model=FakeContact)
         EQUALS = operators.EQUALS
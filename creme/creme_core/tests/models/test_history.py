@@ -2,16 +2,26 @@
 from datetime import date, timedelta
 from decimal import Decimal
 from functools import partial
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.db.transaction import atomic
+from django.test.utils import override_settings
 from django.urls import reverse
 # from django.utils.formats import date_format, number_format
 # from django.utils.translation import gettext as _
 from django.utils.timezone import now
+from django.utils.translation import gettext as _
+from django.utils.translation import ngettext
 
-from creme.creme_core.global_info import clear_global_info
+from creme.creme_core.creme_jobs import (
+    history_archiver_type,
+    history_writer_type,
+)
+from creme.creme_core.global_info import clear_global_info, set_global_info
 from creme.creme_core.models import (
+    ArchivedHistoryLine,
     CremeProperty,
     CremePropertyType,
     CustomField,
@@ -32,6 +42,9 @@ from creme.creme_core.models import (
     FakeTodoCategory,
     HistoryConfigItem,
     HistoryLine,
+    Job,
+    JobResult,
+    PendingHistoryChunk,
     Relation,
     RelationType,
 )
@@ -52,6 +65,7 @@ from creme.creme_core.models.history import (
     TYPE_SYM_RELATION,
     TYPE_TRASH,
 )
+from creme.creme_core.utils.date_period import date_period_registry
 from creme.creme_core.utils.dates import dt_to_ISO8601
 
 from ..base import CremeTestCase
@@ -307,6 +321,85 @@ about this fantastic animation studio."""
         #     vmodifs,
         # )
 
+    def test_edition_bulk01(self):
+        user = self.user
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        ids = [
+            create_orga(name='Gainax', capital=1000).id,
+            create_orga(name='Ghibli', capital=2000).id,
+            create_orga(name='Trigger').id,
+        ]
+
+        old_count = HistoryLine.objects.count()
+        orgas = [*FakeOrganisation.objects.filter(id__in=ids).order_by('id')]
+        orgas[0].capital = 1500
+        orgas[1].name = 'Studio Ghibli'
+
+        FakeOrganisation.objects.bulk_update(orgas, fields=['name', 'capital'])
+
+        with self.assertNumQueries(2):  # Configuration + lines
+            HistoryLine.create_edition_lines(orgas)
+
+        hlines = self._get_hlines()
+        self.assertEqual(old_count + 2, len(hlines))
+
+        hline1 = hlines[-2]
+        self.assertEqual(orgas[0].id,  hline1.entity.id)
+        self.assertEqual(TYPE_EDITION, hline1.type)
+        self.assertEqual(user,         hline1.entity_owner)
+        self.assertListEqual([['capital', 1000, 1500]], hline1.modifications)
+
+        hline2 = hlines[-1]
+        self.assertEqual(orgas[1].id, hline2.entity.id)
+        self.assertListEqual([['name', 'Ghibli', 'Studio Ghibli']], hline2.modifications)
+
+        # The backups are updated
+        HistoryLine.create_edition_lines(orgas)
+        self.assertEqual(old_count + 2, HistoryLine.objects.count())
+
+    def test_edition_bulk02(self):
+        "Related lines."
+        user = self.user
+        ghibli = FakeOrganisation.objects.create(user=user, name='Ghibli')
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        hayao = create_contact(first_name='Hayao', last_name='Miyazaki')
+        isao  = create_contact(first_name='Isao',  last_name='Takahata')
+
+        rtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_employed', 'is employed'),
+            ('test-object_employed', 'employs'),
+        )[0]
+        Relation.objects.create(
+            user=user, subject_entity=hayao, object_entity=ghibli, type=rtype,
+        )
+        HistoryConfigItem.objects.create(relation_type=rtype)
+
+        old_count = HistoryLine.objects.count()
+        contacts = [*FakeContact.objects.filter(id__in=[hayao.id, isao.id]).order_by('id')]
+        for contact in contacts:
+            contact.description = 'Animation movie maker'
+
+        HistoryLine.create_edition_lines(contacts)
+
+        hlines = self._get_hlines()
+        self.assertEqual(old_count + 3, len(hlines))
+        self.assertSetEqual(
+            {(hayao.id, TYPE_EDITION), (ghibli.id, TYPE_RELATED), (isao.id, TYPE_EDITION)},
+            {(hline.entity_id, hline.type) for hline in hlines[-3:]},
+        )
+
+    def test_edition_bulk03(self):
+        "History disabled."
+        orga = FakeOrganisation.objects.create(user=self.user, name='Gainax')
+        orga = self.refresh(orga)
+        orga.name = 'Gainax Studio'
+
+        old_count = HistoryLine.objects.count()
+        HistoryLine.ENABLED = False
+        HistoryLine.create_edition_lines([orga])
+        self.assertEqual(old_count, HistoryLine.objects.count())
+
     def test_edition_no_change(self):
         "No change."
         name = 'gainax'
@@ -1894,7 +1987,7 @@ about this fantastic animation studio."""
         nerv.save()
         hline = HistoryLine.objects.filter(entity=nerv.id).order_by('-id')[0]
         self.assertEqual(TYPE_EDITION, hline.type)
-        self.assertIn('["NERV", ["name", "Nerv", "NERV"]]', hline.value)
+        self.assertIn('["NERV",["name","Nerv","NERV"]]', hline.value)
 
         # self.assertListEqual(
         #     [
@@ -2202,3 +2295,297 @@ about this fantastic animation studio."""
         self.assertIsNone(rline1)
         self.assertEqual(hlines[2], rline2)
         self.assertEqual(hlines[1], rline3)
+
+    def test_buffered(self):
+        user = self.user
+        ptype = CremePropertyType.objects.smart_update_or_create(
+            str_pk='test-prop_foobar', text='Foobar',
+        )
+
+        old_count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with HistoryLine.buffered() as buffer:
+                nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+                nerv = self.refresh(nerv)
+
+                nerv.phone = '123456'
+                nerv.save()
+                nerv.email = 'contact@nerv.jp'
+                nerv.save()
+
+                CremeProperty.objects.create(type=ptype, creme_entity=nerv)
+
+                with HistoryLine.buffered() as inner_buffer:
+                    self.assertIs(buffer, inner_buffer)
+                    FakeAddress.objects.create(entity=nerv, value='Tokyo-3')
+
+                self.assertEqual(old_count, HistoryLine.objects.count())
+                self.assertEqual(4, len(buffer))
+
+        self.assertFalse(len(buffer))
+
+        hlines = self._get_hlines()[old_count:]
+        self.assertListEqual(
+            [TYPE_CREATION, TYPE_EDITION, TYPE_PROP_ADD, TYPE_AUX_CREATION],
+            [hline.type for hline in hlines],
+        )
+        self.assertTrue(all(hline.entity_id == nerv.id for hline in hlines))
+        self.assertListEqual(
+            [['phone', '123456'], ['email', 'contact@nerv.jp']],
+            hlines[1].modifications,
+        )
+
+        # The cached line has been reset by the flush
+        self.assertFalse(hasattr(nerv, '_historyline_edition'))
+        nerv.phone = '654321'
+        nerv.save()
+        self.assertEqual(old_count + 5, HistoryLine.objects.count())
+
+    def test_buffered_deletion(self):
+        user = self.user
+        old_count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with HistoryLine.buffered():
+                nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+                nerv.delete()
+
+        hlines = self._get_hlines()[old_count:]
+        self.assertListEqual(
+            [TYPE_CREATION, TYPE_DELETION], [hline.type for hline in hlines],
+        )
+        self.assertIsNone(hlines[0].entity_id)
+        self.assertIsNone(hlines[1].entity_id)
+
+    def test_buffered_rollback(self):
+        user = self.user
+        old_count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with HistoryLine.buffered():
+                nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+
+                try:
+                    with atomic():
+                        FakeOrganisation.objects.create(user=user, name='Seele')
+                        raise ValueError('Rolled back')
+                except ValueError:
+                    pass
+
+        hlines = self._get_hlines()[old_count:]
+        self.assertEqual(1, len(hlines))
+        self.assertEqual(nerv.id, hlines[0].entity_id)
+
+        # Exception in a transaction => the lines are discarded
+        with self.assertRaises(ValueError):
+            with HistoryLine.buffered():
+                FakeOrganisation.objects.create(user=user, name='Gehirn')
+                raise ValueError('Rolled back')
+
+        self.assertEqual(old_count + 1, HistoryLine.objects.count())
+
+    def test_buffered_transaction(self):
+        "The lines created within a transaction are written after the commit."
+        user = self.user
+        old_count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with atomic():
+                with HistoryLine.buffered():
+                    nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+                    seele = FakeOrganisation.objects.create(user=user, name='Seele')
+
+                self.assertEqual(old_count, HistoryLine.objects.count())
+
+                # Deleted after the flush, but before the commit
+                with HistoryLine.buffered():
+                    seele.delete()
+
+        self.assertTrue(callbacks)
+
+        hlines = self._get_hlines()[old_count:]
+        self.assertListEqual(
+            [TYPE_CREATION, TYPE_CREATION, TYPE_DELETION],
+            [hline.type for hline in hlines],
+        )
+        self.assertEqual(nerv.id, hlines[0].entity_id)
+        self.assertIsNone(hlines[1].entity_id)
+        self.assertIsNone(hlines[2].entity_id)
+
+    def test_buffered_related_lines(self):
+        "The lines with related lines need an ID => not buffered."
+        user = self.user
+        rtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_works_for', 'works for'),
+            ('test-object_works_for',  'employs'),
+        )[0]
+        HistoryConfigItem.objects.create(relation_type=rtype)
+
+        nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+        rei = FakeContact.objects.create(user=user, first_name='Rei', last_name='Ayanami')
+        Relation.objects.create(
+            user=user, subject_entity=rei, type=rtype, object_entity=nerv,
+        )
+        rei = self.refresh(rei)
+        old_count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with HistoryLine.buffered() as buffer:
+                rei.phone = '123456'
+                rei.save()
+
+                self.assertEqual(1, len(buffer))  # Related line
+
+                edition_line = self.get_object_or_fail(
+                    HistoryLine, entity=rei.id, type=TYPE_EDITION,
+                )
+
+        related_line = self.get_object_or_fail(HistoryLine, entity=nerv.id, type=TYPE_RELATED)
+        self.assertEqual(edition_line, related_line.related_line)
+        self.assertEqual(old_count + 2, HistoryLine.objects.count())
+
+    @override_settings(HISTORY_ASYNC_FLUSH=True)
+    def test_buffered_async(self):
+        user = self.user
+        set_global_info(user=user)
+        old_count = HistoryLine.objects.count()
+        old_jobs_count = Job.objects.count()
+
+        job = self.get_object_or_fail(Job, type_id=history_writer_type.id)
+        self.assertIsNone(job.user)
+        self.assertIsNone(history_writer_type.next_wakeup(job, now()))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with HistoryLine.buffered(flush_size=2):
+                nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+                seele = FakeOrganisation.objects.create(user=user, name='Seele')
+                FakeOrganisation.objects.create(user=user, name='Wille')
+
+        self.assertEqual(old_count, HistoryLine.objects.count())
+
+        # The lines are queued for the system job (no job is created)
+        self.assertEqual(old_jobs_count, Job.objects.count())
+        self.assertEqual(2, PendingHistoryChunk.objects.count())
+
+        now_value = now()
+        self.assertEqual(now_value, history_writer_type.next_wakeup(job, now_value))
+        self.assertListEqual(
+            [
+                ngettext(
+                    '{count} line of history to write',
+                    '{count} lines of history to write',
+                    3
+                ).format(count=3),
+            ],
+            history_writer_type.get_description(job),
+        )
+
+        seele.delete()
+        history_writer_type.execute(job)
+
+        hlines = self._get_hlines()[old_count:]
+        self.assertListEqual(
+            [TYPE_DELETION, TYPE_CREATION, TYPE_CREATION, TYPE_CREATION],
+            [hline.type for hline in hlines],
+        )
+        self.assertEqual(nerv.id, hlines[1].entity_id)
+        self.assertEqual(user.username, hlines[1].username)
+        self.assertEqual(nerv.created, hlines[1].date)
+        self.assertIsNone(hlines[2].entity_id)
+
+        self.assertFalse(PendingHistoryChunk.objects.all())
+        self.assertIsNone(history_writer_type.next_wakeup(job, now()))
+
+    @override_settings(HISTORY_ASYNC_FLUSH=True)
+    def test_buffered_async_rollback(self):
+        "The queued lines are not written if the transaction is rolled back."
+        user = self.user
+        set_global_info(user=user)
+
+        try:
+            with atomic(), HistoryLine.buffered():
+                FakeOrganisation.objects.create(user=user, name='Nerv')
+                raise ValueError('Rollback')
+        except ValueError:
+            pass
+
+        self.assertFalse(PendingHistoryChunk.objects.all())
+
+    def test_archiver(self):
+        job = self.get_object_or_fail(Job, type_id=history_archiver_type.id)
+        self.assertIsNone(job.user)
+        self.assertFalse(job.enabled)
+        self.assertEqual(
+            date_period_registry.get_period('years', 2),
+            history_archiver_type.get_delay(job),
+        )
+
+        user = self.user
+        nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+        seele = FakeOrganisation.objects.create(user=user, name='Seele')
+        nerv_line = HistoryLine.objects.get(entity=nerv.id)
+        seele_line = HistoryLine.objects.get(entity=seele.id)
+
+        HistoryLine.objects.filter(id=nerv_line.id).update(date=now() - timedelta(days=10))
+
+        job.data = {'delay': date_period_registry.get_period('days', 7).as_dict()}
+        job.save()
+        self.assertListEqual(
+            [
+                _('Archive the lines of history which are older than: {}').format(
+                    date_period_registry.get_period('days', 7),
+                ),
+            ],
+            history_archiver_type.get_description(job),
+        )
+
+        history_archiver_type.execute(job)
+        self.assertDoesNotExist(nerv_line)
+        self.assertStillExists(seele_line)
+
+        archived_line = self.get_object_or_fail(ArchivedHistoryLine, id=nerv_line.id)
+        self.assertEqual(nerv.id, archived_line.entity_id)
+        self.assertEqual(nerv_line.entity_ctype_id, archived_line.entity_ctype_id)
+        self.assertEqual(user.id, archived_line.entity_owner_id)
+        self.assertEqual(nerv_line.username, archived_line.username)
+        self.assertEqual(TYPE_CREATION, archived_line.type)
+        self.assertEqual(nerv_line.value, archived_line.value)
+        self.assertDatetimesAlmostEqual(now() - timedelta(days=10), archived_line.date)
+
+        hline = archived_line.to_line()
+        self.assertIsInstance(hline, HistoryLine)
+        self.assertEqual(nerv_line.id, hline.id)
+        self.assertEqual('Nerv', hline.entity_repr)
+
+        # Entity deletion
+        nerv.delete()
+        self.assertIsNone(self.refresh(archived_line).entity_id)
+
+    def test_archiver_chunks(self):
+        user = self.user
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orgas = [create_orga(name=f'Orga #{i}') for i in range(5)]
+        HistoryLine.objects.filter(entity__in=orgas).update(
+            date=now() - timedelta(days=10),
+        )
+
+        with patch.object(history_archiver_type, 'chunk_size', 2):
+            count = history_archiver_type.archive(date_limit=now() - timedelta(days=7))
+
+        self.assertEqual(5, count)
+        self.assertFalse(HistoryLine.objects.filter(entity__in=orgas))
+        self.assertEqual(5, ArchivedHistoryLine.objects.filter(entity__in=orgas).count())
+
+    def test_archiver_invalid_delay(self):
+        job = self.get_object_or_fail(Job, type_id=history_archiver_type.id)
+        job.data = {'delay': 'invalid'}
+        job.save()
+
+        history_archiver_type.execute(job)
+
+        jresult = self.get_object_or_fail(JobResult, job=job)
+        self.assertListEqual(
+            [_("The configured delay is invalid. Edit the job's configuration to fix it.")],
+            jresult.messages,
+        )
@@ -143,6 +143,81 @@ class CremeBricksTagsTestCase(BrickTestCaseMixin, CremeTestCase):
 
         self.assertFalse(render.strip())
 
+    def test_brick_declare_n_display_lazy(self):
+        self.login()
+
+        class _FooBrick(Brick):
+            verbose_name = 'Testing purpose'
+            dependencies = (FakeContact,)
+            brick_str = 'OVERLOAD ME'
+
+            def detailview_display(this, context):
+                return this.brick_str
+
+        prefix = 'CremeBricksTagsTestCase__brick_test_brick_declare_n_display_lazy'
+
+        class FooBrick1(_FooBrick):
+            id_ = _FooBrick.generate_id('creme_core', f'{prefix}_01')
+            brick_str = '<div>FOOBARBAZ #1</div>'
+
+        class FooBrick2(_FooBrick):
+            id_ = _FooBrick.generate_id('creme_core', f'{prefix}_02')
+            brick_str = '<div>FOOBARBAZ #2</div>'
+            lazy = True
+
+        template = Template(
+            '{% load creme_bricks %}'
+            '{% brick_declare my_brick1 my_brick2 %}'
+            '{% brick_display my_brick1 %}'
+            '{% brick_display my_brick2 %}'
+        )
+
+        # No reloading URL => no lazy brick
+        with self.assertNoException():
+            render1 = template.render(RequestContext(
+                self.build_request(),
+                {'my_brick1': FooBrick1(), 'my_brick2': FooBrick2()},
+            ))
+
+        self.assertEqual(FooBrick1.brick_str + FooBrick2.brick_str, render1.strip())
+
+        # ---
+        with self.assertNoException():
+            render2 = template.render(RequestContext(
+                self.build_request(),
+                {
+                    'my_brick1': FooBrick1(),
+                    'my_brick2': FooBrick2(),
+                    'bricks_reload_url': '/creme_core/bricks/reload',
+                },
+            ))
+
+        self.assertStartsWith(render2.strip(), FooBrick1.brick_str)
+        self.assertNotIn(FooBrick2.brick_str, render2)
+
+        brick_node2 = self.get_brick_node(self.get_html_tree(render2), FooBrick2.id_)
+        self.assertEqual('true', brick_node2.attrib.get('data-brick-lazy'))
+        self.assertIn('is-loading', brick_node2.attrib.get('class'))
+        self.assertEqual(
+            json_encode(['creme_core.fakecontact']),
+            brick_node2.attrib.get('data-brick-deps'),
+        )
+
+        # Argument "lazy" ---
+        with self.assertNoException():
+            render3 = Template(
+                '{% load creme_bricks %}'
+                '{% brick_declare my_brick1 %}'
+                '{% brick_display my_brick1 lazy=True %}'
+            ).render(RequestContext(
+                self.build_request(),
+                {'my_brick1': FooBrick1(), 'bricks_reload_url': '/creme_core/bricks/reload'},
+            ))
+
+        self.assertNotIn(FooBrick1.brick_str, render3)
+        brick_node1 = self.get_brick_node(self.get_html_tree(render3), FooBrick1.id_)
+        self.assertEqual('true', brick_node1.attrib.get('data-brick-lazy'))
+
     def test_brick_end(self):
         self.login()
 
@@ -1,4 +1,10 @@
+from django.http import StreamingHttpResponse
+
 from creme.creme_core.backends import _BackendRegistry, base
+from creme.creme_core.backends.csv_export import (
+    CSVExportBackend,
+    SemiCSVExportBackend,
+)
 from creme.creme_core.backends.csv_import import CSVImportBackend
 from creme.creme_core.backends.xls_import import XLSImportBackend
 
@@ -57,3 +63,34 @@ class BackendsTestCase(CremeTestCase):
 
         with self.assertRaises(registry.InvalidClass):
             registry.get_backend_class(CSVImportBackend.id)
+
+    def test_csv_export_stream(self):
+        backend = CSVExportBackend()
+        self.assertTrue(backend.streaming)
+
+        backend.chunk_size = 10
+        chunks = [*backend.stream(iter([['Spike', 'Spiegel'], ['Jet', 'Black'], ['Ed']]))]
+        self.assertListEqual(
+            ['"Spike","Spiegel"\r\n', '"Jet","Black"\r\n', '"Ed"\r\n'],
+            chunks,
+        )
+
+        backend.chunk_size = 1024
+        self.assertListEqual(
+            ['"Spike";"Spiegel"\r\n"Jet";"Black"\r\n'],
+            [*SemiCSVExportBackend().stream([['Spike', 'Spiegel'], ['Jet', 'Black']])],
+        )
+
+    def test_csv_export_streaming_response(self):
+        user = self.create_user()
+
+        response = CSVExportBackend().get_streaming_response(
+            rows=iter([['Spike', 'Spiegel']]), filename='My contacts', user=user,
+        )
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual('text/csv', response['Content-Type'])
+        self.assertEqual(
+            'attachment; filename="my-contacts.csv"',
+            response['Content-Disposition'],
+        )
+        self.assertEqual(b'"Spike","Spiegel"\r\n', b''.join(response.streaming_content))
@@ -0,0 +1,36 @@
+from threading import current_thread
+from unittest.mock import patch
+
+from django.db import connections
+
+from creme.creme_core.utils.concurrent import (
+    get_shared_executor,
+    release_db_connections,
+)
+
+from ..base import CremeTestCase
+
+
+class ConcurrentTestCase(CremeTestCase):
+    def test_get_shared_executor(self):
+        executor = get_shared_executor('creme_test_concurrent', 2)
+        self.assertEqual(2, executor._max_workers)
+        self.assertIs(executor, get_shared_executor('creme_test_concurrent', 2))
+
+        self.assertIsNot(executor, get_shared_executor('creme_test_concurrent', 3))
+        self.assertIsNot(executor, get_shared_executor('creme_test_concurrent2', 2))
+
+        thread_name = executor.submit(lambda: current_thread().name).result(timeout=5)
+        self.assertTrue(thread_name.startswith('creme_test_concurrent'))
+
+    def test_release_db_connections(self):
+        with patch.object(
+            type(connections['default']), 'close_if_unusable_or_obsolete',
+            autospec=True,
+        ) as close_mock:
+            release_db_connections()
+
+        self.assertListEqual(
+            [*connections.all()],
+            [call_args.args[0] for call_args in close_mock.call_args_list],
+        )
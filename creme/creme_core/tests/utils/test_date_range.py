@@ -1,4 +1,5 @@
 from datetime import date, datetime
+from functools import partial
 
 from django.utils.timezone import now
 from django.utils.translation import gettext as _
@@ -532,3 +533,60 @@ class DateRangeTestCase(CremeTestCase):
             {'created__isnull': False},
             date_range.get_q_dict(field='created', now=now()),
         )
+
+    def test_accept01(self):
+        "Custom range."
+        dt = self.create_datetime
+        date_range = self.registry.get_range(
+            start=date(year=2011, month=8, day=2),
+            end=date(year=2011, month=8, day=3),
+        )
+        accept = partial(date_range.accept, now=now())
+        self.assertIs(accept(None), False)
+
+        self.assertIs(accept(dt(year=2011, month=8, day=1, hour=23, minute=59)), False)
+        self.assertIs(accept(dt(year=2011, month=8, day=2, hour=0)),             True)
+        self.assertIs(accept(dt(year=2011, month=8, day=3, hour=23, minute=59)), True)
+        self.assertIs(accept(dt(year=2011, month=8, day=4, hour=0)),             False)
+
+        self.assertIs(accept(date(year=2011, month=8, day=1)), False)
+        self.assertIs(accept(date(year=2011, month=8, day=2)), True)
+        self.assertIs(accept(date(year=2011, month=8, day=3)), True)
+        self.assertIs(accept(date(year=2011, month=8, day=4)), False)
+
+        # Only start ---
+        accept = partial(
+            self.registry.get_range(start=date(year=2011, month=8, day=2)).accept,
+            now=now(),
+        )
+        self.assertIs(accept(date(year=2011, month=8, day=1)), False)
+        self.assertIs(accept(date(year=2050, month=1, day=1)), True)
+
+    def test_accept02(self):
+        "Named ranges."
+        today = self.create_datetime(year=2019, month=5, day=23, hour=14)
+
+        in_future = self.registry.get_range(name='in_future')
+        self.assertIs(in_future.accept(date(year=2019, month=5, day=23), now=today), True)
+        self.assertIs(in_future.accept(date(year=2019, month=5, day=22), now=today), False)
+        self.assertIs(
+            in_future.accept(self.create_datetime(year=2019, month=5, day=23, hour=15), now=today),
+            True,
+        )
+        self.assertIs(
+            in_future.accept(self.create_datetime(year=2019, month=5, day=23, hour=13), now=today),
+            False,
+        )
+
+        current_year = self.registry.get_range(name='current_year')
+        self.assertIs(current_year.accept(date(year=2019, month=1, day=1), now=today),   True)
+        self.assertIs(current_year.accept(date(year=2018, month=12, day=31), now=today), False)
+
+    def test_accept_empty(self):
+        empty = self.registry.get_range(name='empty')
+        self.assertIs(empty.accept(None, now=now()), True)
+        self.assertIs(empty.accept(date(year=2019, month=5, day=23), now=now()), False)
+
+        not_empty = self.registry.get_range(name='not_empty')
+        self.assertIs(not_empty.accept(None, now=now()), False)
+        self.assertIs(not_empty.accept(date(year=2019, month=5, day=23), now=now()), True)
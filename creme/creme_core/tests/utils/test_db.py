@@ -2,7 +2,12 @@ from functools import partial
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db import DEFAULT_DB_ALIAS, connections
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    OperationalError,
+    connections,
+    transaction,
+)
 
 from creme.creme_core.constants import REL_SUB_HAS
 from creme.creme_core.models import (
@@ -19,9 +24,12 @@ from creme.creme_core.models import (
 from creme.creme_core.utils.db import (
     PreFetcher,
     build_columns_key,
+    get_capped_count,
+    get_estimated_count,
     get_indexed_ordering,
     get_indexes_columns,
     populate_related,
+    statement_timeout,
 )
 
 from ..base import CremeTestCase
@@ -510,6 +518,52 @@ class DBTestCase(CremeTestCase):
         with self.assertNumQueries(2):
             populate_related(contacts, ['user__role__name'])
 
+    def test_capped_count(self):
+        user = self.create_user()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        for i in range(5):
+            create_orga(name=f'Orga #{i}')
+
+        qs = FakeOrganisation.objects.filter(user=user)
+        self.assertEqual(5, get_capped_count(qs, cap=10))
+        self.assertEqual(5, get_capped_count(qs, cap=5))
+        self.assertEqual(4, get_capped_count(qs, cap=3))  # More than 3
+        self.assertEqual(2, get_capped_count(qs.filter(name__in=['Orga #1', 'Orga #2']), cap=3))
+
+    def test_estimated_count(self):
+        user = self.create_user()
+        FakeOrganisation.objects.create(user=user, name='Nerv')
+
+        qs = FakeOrganisation.objects.filter(user=user)
+        count = get_estimated_count(qs)
+
+        if connections[DEFAULT_DB_ALIAS].vendor == 'postgresql':
+            self.assertIsInstance(count, int)
+            self.assertGreaterEqual(count, 0)
+        else:
+            self.assertIsNone(count)
+
+    def test_statement_timeout(self):
+        # NB: the query is long enough to exceed the timeout
+        sql = (
+            'WITH RECURSIVE c(x) AS ('
+            'SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000'
+            ') SELECT COUNT(*) FROM c'
+        )
+        connection = connections[DEFAULT_DB_ALIAS]
+
+        with self.assertRaises(OperationalError):
+            with transaction.atomic(), statement_timeout(0.05):
+                with connection.cursor() as cursor:
+                    cursor.execute(sql)
+
+        # The timeout is removed at the end of the block
+        with statement_timeout(5):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                self.assertEqual((1,), cursor.fetchone())
+
     def test_prefetcher01(self):
         sector1, sector2, sector3 = FakeSector.objects.all()[:3]
 
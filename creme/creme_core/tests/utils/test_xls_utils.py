@@ -83,6 +83,18 @@ class XLSUtilsTestCase(CremeTestCase):
             rd = XlrdReader(file_contents=file_content)
             self.assertEqual([*rd], self.data)
 
+    def test_write_flush(self):
+        file = NamedTemporaryFile(suffix=".xls")
+
+        wt = XlwtWriter()
+        wt.flush_period = 3
+        writerow = wt.writerow
+        for element in self.data:
+            writerow(element)
+        wt.save(file.name)
+
+        self.assertEqual([*XlrdReader(filedata=file.name)], self.data)
+
     def test_truncate(self):
         content = """Lôrèm ipsum dolor sit amet, consectetur adipiscing elit. Proin ac odio libero.
 Praesent sollicitudin, mauris non sagittis tincidunt, magna libero malesuada lectus,
@@ -1,9 +1,11 @@
 from functools import partial
 from json import dumps as json_dump
+from unittest.mock import patch
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db.models.signals import post_save
 from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.timezone import now
@@ -11,6 +13,7 @@ from django.utils.translation import gettext as _
 from django.utils.translation import ngettext
 
 from creme.creme_core.auth.entity_credentials import EntityCredentials
+from creme.creme_core.core.batch_process import can_bulk_update
 from creme.creme_core.core.entity_filter import operands, operators
 from creme.creme_core.core.entity_filter.condition_handler import (
     RegularFieldConditionHandler,
@@ -23,9 +26,11 @@ from creme.creme_core.models import (
     EntityJobResult,
     FakeContact,
     FakeOrganisation,
+    HistoryLine,
     Job,
     SetCredentials,
 )
+from creme.creme_core.models.history import TYPE_EDITION
 
 from .base import ViewsTestCase
 
@@ -706,6 +711,109 @@ class BatchProcessViewsTestCase(ViewsTestCase):
         self.assertEqual('Anime',   self.refresh(orga03).name)
         self.assertEqual('Coding',  self.refresh(orga01).name)  # <== Should not be modified again
 
+    def _create_upper_job(self, model):
+        response = self.client.post(
+            self._build_add_url(model), follow=True,
+            data={
+                'actions': self.build_formfield_value(
+                    name='name', operator='upper', value='',
+                ),
+            },
+        )
+        self.assertNoFormError(response)
+
+        return self._get_job(response)
+
+    def test_chunks01(self):
+        "Bulk update."
+        user = self.login()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orgas = [create_orga(name=f'Club #{i}') for i in range(5)]
+        old_modified = self.refresh(orgas[0]).modified
+        old_count = HistoryLine.objects.count()
+
+        job = self._create_upper_job(FakeOrganisation)
+
+        self.assertIs(can_bulk_update(FakeOrganisation), True)
+
+        with patch.object(batch_process_type, 'chunk_size', 2):
+            with self.captureOnCommitCallbacks(execute=True):
+                batch_process_type.execute(job)
+
+        for i, orga in enumerate(orgas):
+            orga = self.refresh(orga)
+            self.assertEqual(f'CLUB #{i}', orga.name)
+            self.assertEqual(f'CLUB #{i}', orga.header_filter_search_field)
+
+        self.assertLess(old_modified, self.refresh(orgas[0]).modified)
+        self.assertEqual(5, EntityJobResult.objects.filter(job=job).count())
+
+        hlines = HistoryLine.objects.order_by('-id')[:5]
+        self.assertEqual(old_count + 5, HistoryLine.objects.count())
+        self.assertSetEqual({TYPE_EDITION}, {hline.type for hline in hlines})
+        self.assertListEqual(
+            [['name', 'Club #4', 'CLUB #4']],
+            HistoryLine.objects.filter(entity=orgas[4].id).order_by('-id')[0].modifications,
+        )
+
+    def test_chunks_bulk_signal(self):
+        "Bulk update: the signal 'post_save' is sent for each entity."
+        user = self.login()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Genshiken')
+        orga2 = create_orga(name='Manga club')
+        old_count = HistoryLine.objects.count()
+
+        job = self._create_upper_job(FakeOrganisation)
+
+        received = []
+
+        def _receiver(sender, instance, created, update_fields, **kwargs):
+            received.append((sender, instance.id, instance.name, created, update_fields))
+
+        post_save.connect(_receiver, sender=FakeOrganisation)
+
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                batch_process_type.execute(job)
+        finally:
+            post_save.disconnect(_receiver, sender=FakeOrganisation)
+
+        self.assertCountEqual(
+            [
+                (FakeOrganisation, orga1.id, 'GENSHIKEN', False, None),
+                (FakeOrganisation, orga2.id, 'MANGA CLUB', False, None),
+            ],
+            received,
+        )
+
+        # No duplicated line of history
+        self.assertEqual(old_count + 2, HistoryLine.objects.count())
+
+    def test_chunks02(self):
+        "No bulk update (the model overrides save())."
+        user = self.login()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Genshiken')
+        orga2 = create_orga(name='Manga club')
+        old_count = HistoryLine.objects.count()
+
+        job = self._create_upper_job(FakeOrganisation)
+
+        with patch(
+            'creme.creme_core.creme_jobs.batch_process.can_bulk_update',
+            return_value=False,
+        ), self.captureOnCommitCallbacks(execute=True):
+            batch_process_type.execute(job)
+
+        self.assertEqual('GENSHIKEN',  self.refresh(orga1).name)
+        self.assertEqual('MANGA CLUB', self.refresh(orga2).name)
+        self.assertEqual(old_count + 2, HistoryLine.objects.count())
+        self.assertEqual(2, EntityJobResult.objects.filter(job=job).count())
+
     def test_job_limit(self):
         settings.MAX_JOBS_PER_USER = 1
 
@@ -765,11 +765,27 @@ class BrickViewTestCase(CremeTestCase, BrickTestCaseMixin):
 
         HistoryBrick.page_size = max(4, settings.BLOCK_SIZE)
 
-        response = self.assertGET200(atom.get_absolute_url())
-        self.assertTemplateUsed(response, 'creme_core/bricks/history.html')
+        # NB: the brick is lazy => placeholder
+        response1 = self.assertGET200(atom.get_absolute_url())
+        self.assertTemplateNotUsed(response1, 'creme_core/bricks/history.html')
 
-        tree = self.get_html_tree(response.content)
+        placeholder_node = self.get_brick_node(
+            self.get_html_tree(response1.content), HistoryBrick.id_,
+        )
+        self.assertEqual('true', placeholder_node.attrib.get('data-brick-lazy'))
+
+        response2 = self.assertGET200(
+            reverse('creme_core__reload_detailview_bricks', args=(atom.id,)),
+            data={'brick_id': HistoryBrick.id_},
+        )
+        self.assertTemplateUsed(response2, 'creme_core/bricks/history.html')
+
+        brick_id, content = response2.json()[0]
+        self.assertEqual(HistoryBrick.id_, brick_id)
+
+        tree = self.get_html_tree(content)
         brick_node = self.get_brick_node(tree, HistoryBrick.id_)
+        self.assertIsNone(brick_node.attrib.get('data-brick-lazy'))
 
         h_info = []
         cls_prefix = 'history-line-'
@@ -803,10 +819,17 @@ class BrickViewTestCase(CremeTestCase, BrickTestCaseMixin):
 
         HistoryBrick.page_size = max(4, settings.BLOCK_SIZE)
 
-        response = self.assertGET200(reverse('creme_core__home'))
-        self.assertTemplateUsed(response, 'creme_core/bricks/history.html')
+        # NB: the brick is lazy => placeholder
+        response1 = self.assertGET200(reverse('creme_core__home'))
+        self.assertTemplateNotUsed(response1, 'creme_core/bricks/history.html')
 
-        tree = self.get_html_tree(response.content)
+        response2 = self.assertGET200(
+            reverse('creme_core__reload_home_bricks'),
+            data={'brick_id': HistoryBrick.id_},
+        )
+        self.assertTemplateUsed(response2, 'creme_core/bricks/history.html')
+
+        tree = self.get_html_tree(response2.json()[0][1])
         brick_node = self.get_brick_node(tree, HistoryBrick.id_)
         self.assertInstanceLink(brick_node, atom)
         self.assertInstanceLink(brick_node, tenma)
@@ -7,7 +7,9 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from django.db.models import Max
+from django.db.models.signals import pre_delete
 from django.forms import CharField
 from django.test.utils import override_settings
 from django.urls import reverse
@@ -845,6 +847,129 @@ class EntityViewsTestCase(ViewsTestCase, BrickTestCaseMixin):
         self.assertNotEqual(job1, job2)
         self.assertEqual(Job.STATUS_WAIT, job2.status)
 
+    def test_empty_trash_bulk(self):
+        "Relations, properties & history with the bulk deletion."
+        user = self.login()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        entity01 = create_orga(name='Nerv', is_deleted=True)
+        entity02 = create_orga(name='Seele', is_deleted=True)
+        entity03 = create_orga(name='Gehirn')
+
+        rtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_foobar', 'is loving'),
+            ('test-object_foobar',  'is loved by'),
+        )[0]
+        create_rel = partial(Relation.objects.create, user=user, type=rtype)
+        rel1 = create_rel(subject_entity=entity01, object_entity=entity03)
+        rel2 = create_rel(subject_entity=entity03, object_entity=entity02)
+
+        ptype = CremePropertyType.objects.smart_update_or_create(
+            str_pk='test-prop_eva', text='has eva',
+        )
+        create_prop = partial(CremeProperty.objects.create, type=ptype)
+        prop1 = create_prop(creme_entity=entity01)
+        prop2 = create_prop(creme_entity=entity03)
+
+        self.assertTrue(trash_cleaner_type._can_bulk_delete(FakeOrganisation))
+
+        hlines_ids = [*HistoryLine.objects.values_list('id', flat=True)]
+        self.assertPOST200(self.EMPTY_TRASH_URL)
+
+        job = self.get_object_or_fail(Job, type_id=trash_cleaner_type.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            trash_cleaner_type.execute(job)
+
+        self.assertDoesNotExist(entity01)
+        self.assertDoesNotExist(entity02)
+        self.assertStillExists(entity03)
+
+        self.assertDoesNotExist(rel1)
+        self.assertDoesNotExist(rel2)
+        self.assertDoesNotExist(prop1)
+        self.assertStillExists(prop2)
+
+        self.assertFalse(EntityJobResult.objects.filter(job=job))
+        self.assertEqual(2, self.get_object_or_fail(TrashCleaningCommand, job=job).deleted_count)
+
+        hlines = HistoryLine.objects.exclude(id__in=hlines_ids)
+        self.assertSetEqual(
+            {
+                history.TYPE_RELATION_DEL,
+                history.TYPE_SYM_REL_DEL,
+                history.TYPE_PROP_DEL,
+                history.TYPE_DELETION,
+            },
+            {*hlines.values_list('type', flat=True)},
+        )
+        self.assertEqual(2, hlines.filter(type=history.TYPE_DELETION).count())
+
+    def test_empty_trash_bulk_error(self):
+        "Unexpected error during the bulk deletion => deletion one by one."
+        user = self.login()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        entity01 = create_orga(name='Nerv', is_deleted=True)
+        entity02 = create_orga(name='Seele', is_deleted=True)
+
+        def raise_error(sender, instance, **kwargs):
+            if isinstance(instance, FakeOrganisation) and instance.name == 'Seele':
+                raise IntegrityError('Seele is immortal')
+
+        self.assertPOST200(self.EMPTY_TRASH_URL)
+        job = self.get_object_or_fail(Job, type_id=trash_cleaner_type.id)
+
+        pre_delete.connect(raise_error)
+
+        try:
+            trash_cleaner_type.execute(job)
+        finally:
+            pre_delete.disconnect(raise_error)
+
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_OK, job.status)
+
+        self.assertDoesNotExist(entity01)
+        self.assertStillExists(entity02)
+        self.assertEqual(1, self.get_object_or_fail(TrashCleaningCommand, job=job).deleted_count)
+
+        jresult = self.get_object_or_fail(EntityJobResult, job=job)
+        self.assertEqual(entity02.id, jresult.entity_id)
+        self.assertListEqual(
+            [_('Deletion caused an unexpected error [{}].').format('Seele is immortal')],
+            jresult.messages,
+        )
+
+    def test_empty_trash_dependencies_order(self):
+        "The referencing entities are deleted before the referenced ones."
+        user = self.login()
+
+        folder = FakeFolder.objects.create(user=user, title='Faithful', is_deleted=True)
+        doc = FakeDocument.objects.create(
+            user=user, title='Doc #1', linked_folder=folder, is_deleted=True,
+        )
+
+        self.assertListEqual(
+            [FakeDocument, FakeFolder],
+            trash_cleaner_type._sort_entity_classes([FakeFolder, FakeDocument]),
+        )
+        self.assertListEqual(
+            [FakeDocument, FakeFolder],
+            trash_cleaner_type._sort_entity_classes([FakeDocument, FakeFolder]),
+        )
+        self.assertListEqual(
+            [FakeContact, FakeFolder],
+            trash_cleaner_type._sort_entity_classes([FakeContact, FakeFolder]),
+        )
+
+        self.assertPOST200(self.EMPTY_TRASH_URL)
+
+        job = self.get_object_or_fail(Job, type_id=trash_cleaner_type.id)
+        trash_cleaner_type.execute(job)
+        self.assertDoesNotExist(doc)
+        self.assertDoesNotExist(folder)
+        self.assertFalse(EntityJobResult.objects.filter(job=job))
+
     @staticmethod
     def _build_finish_cleaner_url(job):
         return reverse('creme_core__finish_trash_cleaner', args=(job.id,))
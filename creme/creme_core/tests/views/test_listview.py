@@ -8,6 +8,7 @@ from xml.etree.ElementTree import tostring as html_tostring
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.db.models import Q
 from django.test.utils import override_settings
 from django.urls import reverse
@@ -3170,6 +3171,90 @@ class ListViewTestCase(ViewsTestCase):
         page1_fast = post()
         self.assertTrue(hasattr(page1_fast, 'next_page_info'))  # Means fast mode
 
+    @override_settings(
+        FAST_QUERY_MODE_THRESHOLD=100000,
+        PAGE_SIZES=[10],
+        DEFAULT_PAGE_SIZE_IDX=0,
+        LISTVIEW_COUNT_MODE='capped',
+        LISTVIEW_COUNT_CAP=5,
+    )
+    def test_count_capped01(self):
+        "Count exceeds the cap => fast mode without total."
+        self.login()
+        organisations = self._build_orgas()
+        hf = self._build_hf()
+
+        def post(page_info=None):
+            return self.assertPOST200(
+                self.url,
+                data={
+                    'hfilter': hf.id,
+                    'page': json_dump(page_info) if page_info else '',
+                },
+            )
+
+        response1 = post()
+        context = response1.context
+        self.assertEqual(5,        context['entities_count'])
+        self.assertEqual('capped', context['count_mode'])
+
+        page1 = context['page_obj']
+        self.assertTrue(hasattr(page1, 'next_page_info'))  # Means fast mode
+        self.assertIsNone(page1.paginator.count)
+        self.assertEqual(10, len(page1))
+        self.assertTrue(page1.has_next())
+
+        self.assertContains(
+            response1, _('More than %(entities_count)s recordings') % {'entities_count': 5},
+        )
+
+        response2 = post(page1.next_page_info())
+        page2 = response2.context['page_obj']
+        self.assertEqual(3, len(page2))
+        self.assertIndex(organisations[10], [*page2.object_list])
+
+    @override_settings(
+        FAST_QUERY_MODE_THRESHOLD=100000,
+        LISTVIEW_COUNT_MODE='capped',
+        LISTVIEW_COUNT_CAP=100,
+    )
+    def test_count_capped02(self):
+        "Count under the cap => exact count."
+        self.login()
+        self._build_orgas()
+        hf = self._build_hf()
+
+        response = self.assertPOST200(self.url, data={'hfilter': hf.id})
+        context = response.context
+        self.assertEqual(13,      context['entities_count'])
+        self.assertEqual('exact', context['count_mode'])
+
+        page = context['page_obj']
+        self.assertTrue(hasattr(page, 'number'))  # Means slow mode
+        self.assertEqual(13, page.paginator.count)
+
+    @override_settings(
+        FAST_QUERY_MODE_THRESHOLD=100000,
+        LISTVIEW_COUNT_MODE='estimated',
+        LISTVIEW_COUNT_CAP=5,
+    )
+    def test_count_estimated(self):
+        self.login()
+        self._build_orgas()
+        hf = self._build_hf()
+
+        response = self.assertPOST200(self.url, data={'hfilter': hf.id})
+        context = response.context
+        page = context['page_obj']
+        self.assertTrue(hasattr(page, 'next_page_info'))  # Means fast mode
+        self.assertIsNone(page.paginator.count)
+
+        if connections[DEFAULT_DB_ALIAS].vendor == 'postgresql':
+            self.assertIn(context['count_mode'], ('estimated', 'capped'))
+        else:
+            self.assertEqual('capped', context['count_mode'])
+            self.assertEqual(5, context['entities_count'])
+
     def test_listview_popup_GET(self):
         user = self.login()
 
@@ -5,6 +5,7 @@ from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core import mail
 from django.db.models import Q
 from django.test.utils import override_settings
 from django.urls import reverse
@@ -15,6 +16,7 @@ from django.utils.timezone import localtime
 from django.utils.translation import gettext as _
 from django.utils.translation import pgettext
 
+from creme.creme_core.bricks import MassExportJobResultBrick
 from creme.creme_core.core.entity_cell import (
     EntityCellFunctionField,
     EntityCellRegularField,
@@ -24,7 +26,9 @@ from creme.creme_core.core.entity_filter.condition_handler import (
     RegularFieldConditionHandler,
 )
 from creme.creme_core.core.entity_filter.operators import ISTARTSWITH
+from creme.creme_core.creme_jobs import mass_export_type
 from creme.creme_core.gui.history import html_history_registry
+from creme.creme_core.gui.listview import MassExportButton
 from creme.creme_core.models import (
     CremeProperty,
     CremePropertyType,
@@ -39,6 +43,7 @@ from creme.creme_core.models import (
     FieldsConfig,
     FileRef,
     HeaderFilter,
+    Job,
     Relation,
     RelationType,
 )
@@ -131,6 +136,10 @@ class MassExportViewsTestCase(ViewsTestCase):
 
         return reverse('creme_core__mass_export') + parameters
 
+    @staticmethod
+    def _get_lines(response):
+        return b''.join(response.streaming_content).splitlines()
+
     def _build_contact_dl_url(self, hfilter_id=None, **kwargs):
         ct = self.ct
 
@@ -204,7 +213,7 @@ class MassExportViewsTestCase(ViewsTestCase):
 
         self.assertListEqual(
             [','.join(f'"{hfi.title}"' for hfi in cells)],
-            [force_str(line) for line in response.content.splitlines()],
+            [force_str(line) for line in self._get_lines(response)],
         )
         self.assertFalse(HistoryLine.objects.exclude(id__in=existing_hline_ids))
 
@@ -229,7 +238,7 @@ class MassExportViewsTestCase(ViewsTestCase):
         response = self.assertGET200(self._build_contact_dl_url())
 
         # TODO: sort the relations by their verbose_name ??
-        result = response.content.splitlines()
+        result = self._get_lines(response)
         it = (force_str(line) for line in result)
         self.assertEqual(next(it), ','.join(f'"{hfi.title}"' for hfi in hf.cells))
         self.assertEqual(next(it), '"","Black","Jet","Bebop",""')
@@ -280,6 +289,26 @@ class MassExportViewsTestCase(ViewsTestCase):
             html_history_registry.line_explainers([hline], user)[0].render(),
         )
 
+    def test_list_view_export_csv_streaming(self):
+        "The content is generated lazily, page by page."
+        self.login()
+        self._build_hf_n_contacts()
+        existing_hline_ids = [*HistoryLine.objects.values_list('id', flat=True)]
+
+        response = self.assertGET200(self._build_contact_dl_url())
+        self.assertTrue(response.streaming)
+        self.assertFalse(HistoryLine.objects.exclude(id__in=existing_hline_ids))
+
+        self.assertEqual(5, len(self._get_lines(response)))
+        self.assertListEqual(
+            [TYPE_EXPORT],
+            [
+                *HistoryLine.objects
+                            .exclude(id__in=existing_hline_ids)
+                            .values_list('type', flat=True),
+            ],
+        )
+
     def test_list_view_export_scsv(self):
         self.login()
         cells = self._build_hf_n_contacts().cells
@@ -287,7 +316,7 @@ class MassExportViewsTestCase(ViewsTestCase):
         response = self.assertGET200(self._build_contact_dl_url(doc_type='scsv'))
 
         # TODO: sort the relations by their verbose_name ??
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in self._get_lines(response))
         self.assertEqual(next(it), ';'.join(f'"{hfi.title}"' for hfi in cells))
         self.assertEqual(next(it), '"";"Black";"Jet";"Bebop";""')
         self.assertEqual(next(it), '"";"Spiegel";"Spike";"Bebop/Swordfish";""')
@@ -329,7 +358,7 @@ class MassExportViewsTestCase(ViewsTestCase):
         self.assertTrue(user.has_perm_to_view(organisations['Swordfish']))
 
         response = self.assertGET200(self._build_contact_dl_url())
-        result = [*map(force_str, response.content.splitlines())]
+        result = [*map(force_str, self._get_lines(response))]
         self.assertEqual(result[1], '"","Black","Jet","",""')
         self.assertEqual(result[2], '"","Spiegel","Spike","Swordfish",""')
         self.assertEqual(result[3], '"","Wong","Edward","","is a girl"')
@@ -354,7 +383,7 @@ class MassExportViewsTestCase(ViewsTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url(hfilter_id=hf.id))
 
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in self._get_lines(response)]
         self.assertEqual(2, len(result))
         self.assertEqual(
             result[1],
@@ -396,7 +425,7 @@ class MassExportViewsTestCase(ViewsTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url(hfilter_id=hf.id))
 
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in self._get_lines(response))
         next(it)
 
         self.assertEqual(next(it), '"Black","Jet face","Jet\'s selfie"')
@@ -431,7 +460,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             list_url=FakeEmailCampaign.get_lv_absolute_url(),
             hfilter_id=hf.id,
         ))
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in self._get_lines(response)]
         self.assertEqual(4, len(result))
 
         self.assertEqual(result[1], '"Camp#1","ML#1/ML#2"')
@@ -449,7 +478,7 @@ class MassExportViewsTestCase(ViewsTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url())
 
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in self._get_lines(response))
         self.assertEqual(
             next(it),
             ','.join(
@@ -467,10 +496,26 @@ class MassExportViewsTestCase(ViewsTestCase):
             self._build_contact_dl_url(extra_q=QSerializer().dumps(Q(last_name='Wong'))),
         )
 
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in self._get_lines(response)]
         self.assertEqual(2, len(result))
         self.assertEqual('"","Wong","Edward","","is a girl"', result[1])
 
+    def test_extra_filter_error(self):
+        "The errors are raised before the streaming of the response."
+        self.login()
+        self._build_hf_n_contacts()
+
+        # Invalid JSON
+        self.assertGET404(self._build_contact_dl_url(extra_q='{"op": "AND", "val": ['))
+
+        # Invalid field
+        self.assertGET404(self._build_contact_dl_url(
+            extra_q=QSerializer().dumps(Q(unknown_field='Wong')),
+        ))
+
+        # Header only => no filtering
+        self.assertGET200(self._build_contact_dl_url(header=True, extra_q='{invalid'))
+
     def test_list_view_export_with_filter01(self):
         user = self.login()
         hf = self._build_hf_n_contacts()
@@ -491,7 +536,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             list_url=FakeContact.get_lv_absolute_url(),
             efilter_id=efilter.id
         ))
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in self._get_lines(response)]
         self.assertEqual(2, len(result))
 
         self.assertEqual('"","Wong","Edward","","is a girl"', result[1])
@@ -630,7 +675,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             follow=True,
         )
 
-        lines = {force_str(line) for line in response.content.splitlines()}
+        lines = {force_str(line) for line in self._get_lines(response)}
         self.assertIn('"Bebop","1000"', lines)
         self.assertIn('"Swordfish","20000"', lines)
         self.assertIn('"Redtail",""', lines)
@@ -663,7 +708,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             follow=True,
         )
 
-        lines = {force_str(line) for line in response.content.splitlines()}
+        lines = {force_str(line) for line in self._get_lines(response)}
         self.assertIn(f'''"Bebop","{_('Percent')}"''',    lines)
         self.assertIn(f'''"Swordfish","{_('Amount')}"''', lines)
 
@@ -723,7 +768,7 @@ class MassExportViewsTestCase(ViewsTestCase):
                 '"123233","Spiegel","Spike"',
             ],
             # NB: slice to remove the header
-            [force_str(line) for line in response.content.splitlines()[1:]],
+            [force_str(line) for line in self._get_lines(response)[1:]],
         )
 
     @override_settings(PAGE_SIZES=[10], DEFAULT_PAGE_SIZE_IDX=0)
@@ -758,9 +803,18 @@ class MassExportViewsTestCase(ViewsTestCase):
                 '"123455","Black","Jet"',
             ],
             # NB: slice to remove the header
-            [force_str(line) for line in response.content.splitlines()[1:]],
+            [force_str(line) for line in self._get_lines(response)[1:]],
         )
 
+    def test_sorting_error(self):
+        "The errors are raised before the streaming of the response."
+        self.login()
+        self._build_hf_n_contacts()
+
+        self.assertGET404(self._build_contact_dl_url(
+            sort_key='regular_field-last_name', sort_order='INVALID',
+        ))
+
     def test_distinct(self):
         user = self.login()
 
@@ -796,3 +850,141 @@ class MassExportViewsTestCase(ViewsTestCase):
         self.assertCountOccurrences(camp1.name, content, count=1)  # Not 2
         self.assertCountOccurrences(camp2.name, content, count=1)
         self.assertNotIn(camp3.name, content)
+
+    def test_job_csv(self):
+        user = self.login()
+        user.email = 'spike@bebop.mrs'
+        user.save()
+
+        hf = self._build_hf_n_contacts()
+        existing_fileref_ids = [*FileRef.objects.values_list('id', flat=True)]
+
+        response = self.assertGET200(self._build_contact_dl_url(job=1), follow=True)
+
+        job = response.context['job']
+        self.assertEqual(mass_export_type, job.type)
+        self.assertEqual(user, job.user)
+        self.assertEqual(Job.STATUS_WAIT, job.status)
+        self.assertListEqual(
+            [_('Export «{model}»').format(model='Test Contacts')],
+            job.description,
+        )
+        self.assertFalse(FileRef.objects.exclude(id__in=existing_fileref_ids))
+
+        job_data = job.data
+        self.assertEqual(self.ct.id, job_data['ctype'])
+        self.assertNotIn('job=', job_data['GET'])
+
+        mass_export_type.execute(job)
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_OK, job.status)
+
+        fileref = mass_export_type.get_fileref(job)
+        self.assertIsInstance(fileref, FileRef)
+        self.assertEqual('fakecontact.csv', fileref.basename)
+        self.assertEqual(user, fileref.user)
+        self.assertTrue(fileref.temporary)
+
+        fullpath = Path(fileref.filedata.path)
+        self.assertEqual(Path(settings.MEDIA_ROOT, 'mass_export'), fullpath.parent)
+
+        with open(fullpath, 'rb') as f:
+            lines = [force_str(line) for line in f.read().splitlines()]
+
+        self.assertEqual(5, len(lines))
+        self.assertEqual(lines[0], ','.join(f'"{hfi.title}"' for hfi in hf.cells))
+        self.assertEqual(lines[1], '"","Black","Jet","Bebop",""')
+
+        self.assertEqual(1, len(mail.outbox))
+        message = mail.outbox[0]
+        self.assertListEqual([user.email], message.to)
+        self.assertIn(job.get_absolute_url(), message.body)
+
+        self.assertListEqual(
+            [MassExportJobResultBrick.id_],
+            [brick.id_ for brick in mass_export_type.results_bricks],
+        )
+        detail_response = self.assertGET200(job.get_absolute_url())
+        self.assertContains(detail_response, fileref.get_download_absolute_url())
+
+    def test_job_xls(self):
+        user = self.login()
+        user.email = ''
+        user.save()
+
+        self._build_hf_n_contacts()
+
+        response = self.assertGET200(
+            self._build_contact_dl_url(doc_type='xls', job='true'), follow=True,
+        )
+
+        job = response.context['job']
+        mass_export_type.execute(job)
+
+        fileref = mass_export_type.get_fileref(self.refresh(job))
+        self.assertEqual('fakecontact.xls', fileref.basename)
+
+        with open(fileref.filedata.path, 'rb') as f:
+            result = [*XlrdReader(None, file_contents=f.read())]
+
+        self.assertEqual(5, len(result))
+        self.assertListEqual(['', 'Wong', 'Edward', '', 'is a girl'], result[4])
+
+        # No email address => no notification
+        self.assertFalse(mail.outbox)
+
+    def test_job_header_only(self):
+        "No job when only the header is exported."
+        self.login()
+        self._build_hf_n_contacts()
+
+        response = self.assertGET200(self._build_contact_dl_url(header=True, job=1))
+        self.assertEqual(1, len(self._get_lines(response)))
+        self.assertFalse(Job.objects.filter(type_id=mass_export_type.id))
+
+    @override_settings(MAX_JOBS_PER_USER=1)
+    def test_job_too_many_jobs(self):
+        user = self.login()
+        self._build_hf_n_contacts()
+        Job.objects.create(user=user, type=mass_export_type, data={})
+
+        response = self.assertGET200(self._build_contact_dl_url(job=1), follow=True)
+        self.assertRedirects(response, reverse('creme_core__my_jobs'))
+        self.assertEqual(1, Job.objects.filter(type_id=mass_export_type.id).count())
+
+    @override_settings(MASS_EXPORT_JOB_THRESHOLD=3)
+    def test_listview_button_job(self):
+        self.login()
+        self._build_hf_n_contacts()
+
+        button = MassExportButton()
+
+        response1 = self.assertGET200(FakeContact.get_lv_absolute_url())
+        context1 = button.get_context(request=response1.wsgi_request, lv_context=response1.context)
+        self.assertTrue(context1['use_job'])
+
+        with override_settings(MASS_EXPORT_JOB_THRESHOLD=None, FAST_QUERY_MODE_THRESHOLD=100):
+            response2 = self.assertGET200(FakeContact.get_lv_absolute_url())
+            context2 = button.get_context(
+                request=response2.wsgi_request, lv_context=response2.context,
+            )
+
+        self.assertFalse(context2['use_job'])
+
+    @override_settings(
+        MASS_EXPORT_JOB_THRESHOLD=100, LISTVIEW_COUNT_MODE='capped', LISTVIEW_COUNT_CAP=2,
+    )
+    def test_listview_button_job_capped_count(self):
+        "The count is a minimum (cap exceeded) => job even if the cap < threshold."
+        self.login()
+        self._build_hf_n_contacts()
+
+        response = self.assertGET200(FakeContact.get_lv_absolute_url())
+        lv_context = response.context
+        self.assertEqual('capped', lv_context['count_mode'])
+        self.assertEqual(2, lv_context['entities_count'])
+
+        context = MassExportButton().get_context(
+            request=response.wsgi_request, lv_context=lv_context,
+        )
+        self.assertTrue(context['use_job'])
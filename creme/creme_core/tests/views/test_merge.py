@@ -175,26 +175,27 @@ class MergeViewsTestCase(ViewsTestCase):
         self.assertFalse(fields['capital'].required)
 
         description = ' '.join([orga01.description, orga02.description])
-        response = self.client.post(
-            url, follow=True,
-            data={
-                'user_1':      user.id,
-                'user_2':      user.id,
-                'user_merged': user.id,
-
-                'name_1':      orga01.name,
-                'name_2':      orga02.name,
-                'name_merged': orga01.name,  # <======
-
-                'description_1':      orga01.description,
-                'description_2':      orga02.description,
-                'description_merged': description,  # <======
-
-                'email_1':      '',
-                'email_2':      orga02.email,
-                'email_merged': orga02.email,  # <======
-            },
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                url, follow=True,
+                data={
+                    'user_1':      user.id,
+                    'user_2':      user.id,
+                    'user_merged': user.id,
+
+                    'name_1':      orga01.name,
+                    'name_2':      orga02.name,
+                    'name_merged': orga01.name,  # <======
+
+                    'description_1':      orga01.description,
+                    'description_2':      orga02.description,
+                    'description_merged': description,  # <======
+
+                    'email_1':      '',
+                    'email_2':      orga02.email,
+                    'email_merged': orga02.email,  # <======
+                },
+            )
         self.assertNoFormError(response)
         self.assertRedirects(response, orga01.get_absolute_url())
 
@@ -1,4 +1,5 @@
 from functools import partial
+from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
@@ -9,6 +10,7 @@ from creme.creme_core.core.entity_cell import (
     EntityCellCustomField,
     EntityCellFunctionField,
 )
+from creme.creme_core.core.search import SearchRunner
 from creme.creme_core.gui.bricks import QuerysetBrick
 from creme.creme_core.models import (
     CustomField,
@@ -19,6 +21,7 @@ from creme.creme_core.models import (
     SearchConfigItem,
     SetCredentials,
 )
+from creme.creme_core.views.search import FoundEntitiesBrick
 
 from ..fake_models import FakeContact, FakeOrganisation, FakeSector
 from .base import BrickTestCaseMixin, ViewsTestCase
@@ -484,6 +487,93 @@ class SearchViewTestCase(ViewsTestCase, BrickTestCaseMixin):
         response = self._search('cool', ct.id)
         self.assertEqual(200, response.status_code)
 
+    def test_search_first_page(self):
+        "The first page of the bricks is retrieved by the SearchRunner."
+        user = self.login()
+        SearchConfigItem.objects.create_if_needed(FakeContact, ['last_name'])
+
+        create_contact = partial(FakeContact.objects.create, user=user, first_name='John')
+        contacts = [create_contact(last_name=f'Doe #{i:02}') for i in range(12)]
+
+        response = self._search('doe', self.contact_ct_id)
+        self.assertEqual(200, response.status_code)
+
+        brick = response.context['bricks'][0]
+        self.assertIsInstance(brick, FoundEntitiesBrick)
+
+        result = brick.result
+        self.assertEqual(FakeContact, result.model)
+        self.assertEqual(12, result.count)
+        self.assertListEqual(contacts[:10], result.entities)
+
+        brick_node = self.get_brick_node(self.get_html_tree(response.content), brick.id_)
+        self.assertEqual('12', brick_node.attrib.get('search-count'))
+        self.assertContains(response, contacts[9].get_absolute_url())
+        self.assertNotContains(response, contacts[10].get_absolute_url())
+
+        # Second page (from the QuerySet)
+        response = self.assertGET200(
+            reverse('creme_core__reload_search_brick'),
+            data={'brick_id': brick.id_, 'search': 'doe', f'{brick.id_}_page': 2},
+        )
+        content = response.json()[0][1]
+        self.assertIn(contacts[10].get_absolute_url(), content)
+        self.assertNotIn(contacts[9].get_absolute_url(), content)
+
+    def test_search_timed_out(self):
+        self.login()
+        self._setup_contacts()
+        self._setup_orgas()
+
+        original_run = SearchRunner.run
+
+        def run(runner, *args, **kwargs):
+            results = original_run(runner, *args, **kwargs)
+
+            for result in results:
+                if result.model == FakeContact:
+                    result.timed_out = True
+                    result.count = None
+                    result.entities = []
+
+            return results
+
+        with patch.object(SearchRunner, 'run', new=run):
+            response = self._search('cox')
+            light_response = self.assertGET200(self.LIGHT_URL, data={'value': 'cox'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotContains(response, self.alan.get_absolute_url())
+        self.assertContains(response, self.coxco.get_absolute_url())
+        self.assertContains(
+            response,
+            _(
+                'The search has been interrupted because it took too long; '
+                'reload the block to search again.'
+            ),
+        )
+
+        coxco = self.coxco
+        self.assertDictEqual(
+            {
+                'best': {'label': str(coxco), 'url': coxco.get_absolute_url()},
+                'results': [
+                    {
+                        'count':   1,
+                        'id':      coxco.entity_type_id,
+                        'label':   'Test Organisation',
+                        'results': [
+                            {'label': str(coxco), 'url': coxco.get_absolute_url()},
+                        ],
+                    },
+                ],
+                'timed_out': [
+                    {'id': self.contact_ct_id, 'label': 'Test Contact'},
+                ],
+            },
+            light_response.json(),
+        )
+
     def test_reload_brick(self):
         self.login()
         self._setup_contacts()
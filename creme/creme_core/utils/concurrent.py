@@ -0,0 +1,64 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from django.db import connections
+
+_executors: dict[tuple[str, int], ThreadPoolExecutor] = {}
+_executors_lock = Lock()
+
+
+def get_shared_executor(name: str, workers: int) -> ThreadPoolExecutor:
+    """Get a pool of threads shared by all the requests (of the process).
+    The pools are created on the first call & never shut down ; so the number
+    of threads (& so of connections to the database, because each thread uses
+    its own connection) is bounded, whatever the number of requests.
+
+    @param name: Name of the pool (used as prefix of the names of the threads).
+    @param workers: Maximum number of threads of the pool ; must be > 0.
+    @return: An instance of ThreadPoolExecutor ; the same instance is returned
+             for the same arguments.
+    """
+    key = (name, workers)
+
+    with _executors_lock:
+        executor = _executors.get(key)
+
+        if executor is None:
+            _executors[key] = executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=name,
+            )
+
+    return executor
+
+
+def release_db_connections() -> None:
+    """Function to call at the end of the tasks run by the threads of a shared
+    pool (see get_shared_executor()).
+    The connections to the database of the current thread are handled like at
+    the end of a request: the broken connections, & the connections which are
+    older than settings.CONN_MAX_AGE, are closed ; the other ones are kept open,
+    in order to be re-used by the next tasks run by this thread (the number of
+    threads is bounded, so the number of connections too).
+    """
+    for connection in connections.all():
+        connection.close_if_unusable_or_obsolete()
@@ -23,6 +23,8 @@ from calendar import monthrange
 from collections import OrderedDict
 from datetime import date, datetime, timedelta
 
+from django.conf import settings
+from django.utils.timezone import get_default_timezone, is_aware, make_naive
 from django.utils.translation import gettext_lazy as _
 
 from .dates import make_aware_dt
@@ -33,6 +35,14 @@ _DAY_START = {'hour': 0,  'minute': 0,  'second': 0}
 _DAY_END   = {'hour': 23, 'minute': 59, 'second': 59}
 
 
+def _to_date(dt: datetime) -> date:
+    # NB: same conversion than <django.db.models.DateField.to_python()>
+    if settings.USE_TZ and is_aware(dt):
+        dt = make_naive(dt, get_default_timezone())
+
+    return dt.date()
+
+
 def get_month_last_day(year, month):
     return monthrange(year, month)[1]
 
@@ -77,6 +87,25 @@ class DateRange:
 
         return {f'{field}__lte': end}
 
+    def accept(self, value: date | datetime | None, now) -> bool:
+        """Is a value in the range?
+        It's the equivalent of get_q_dict() for values which have already been
+        retrieved.
+        @param value: Instance of <datetime.date> or <datetime.datetime> (or None).
+        @param now: Instance of <datetime.datetime>.
+        """
+        if value is None:
+            return False
+
+        start, end = self.get_dates(now)
+
+        if not isinstance(value, datetime):
+            # NB: like the DateFields of Django, the bounds are converted to dates
+            start = start and _to_date(start)
+            end = end and _to_date(end)
+
+        return (start is None or start <= value) and (end is None or value <= end)
+
 
 class CustomRange(DateRange):
     name = ''
@@ -294,6 +323,9 @@ class EmptyRange(DateRange):
     def get_q_dict(self, field, now):
         return {f'{field}__isnull': True}
 
+    def accept(self, value, now):
+        return value is None
+
 
 class NotEmptyRange(DateRange):
     name = 'not_empty'
@@ -302,6 +334,9 @@ class NotEmptyRange(DateRange):
     def get_q_dict(self, field, now):
         return {f'{field}__isnull': False}
 
+    def accept(self, value, now):
+        return value is not None
+
 
 class DateRangeRegistry:
     class RegistrationError(Exception):
@@ -23,17 +23,23 @@
 
 from __future__ import annotations
 
+import logging
 from collections import defaultdict
+from contextlib import contextmanager
 from fnmatch import fnmatch
 from functools import lru_cache
+from json import loads as json_load
+from time import monotonic
 from typing import Any, DefaultDict, Iterable, Iterator, Sequence
 
-from django.db import DEFAULT_DB_ALIAS, connections
-from django.db.models import ForeignKey, Model
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.models import ForeignKey, Model, QuerySet
 
 from ..models import CaseSensitivity
 from .meta import FieldInfo
 
+logger = logging.getLogger(__name__)
+
 
 def get_indexes_columns(model: type[Model]) -> Iterator[list[str]]:
     """Generator which yields the columns corresponding to a model-s indexes.
@@ -282,6 +288,103 @@ def is_db_like_case_sensitive() -> bool:  # TODO: idem
     return not CaseSensitivity.objects.filter(text__contains='case').exists()
 
 
+def get_capped_count(queryset: QuerySet, cap: int) -> int:
+    """Count the rows of a QuerySet, but stop counting after <cap + 1> rows
+    (so the query stays fast with big tables).
+    @param queryset: QuerySet instance.
+    @param cap: Positive integer.
+    @return An integer <= cap + 1 ; a value greater than <cap> means
+            "more than <cap> rows".
+    """
+    return queryset.order_by()[:cap + 1].count()
+
+
+def get_estimated_count(queryset: QuerySet) -> int | None:
+    """Get the number of rows of a QuerySet as estimated by the planner of the
+    database (i.e. the query is not executed, so it's fast even with big tables,
+    but the result can be quite inaccurate with complex queries).
+    @param queryset: QuerySet instance.
+    @return An integer, or None if the estimation is not available (only
+            PostgreSQL is currently managed).
+    """
+    db = queryset.db
+    connection = connections[db]
+
+    if connection.vendor != 'postgresql':
+        return None
+
+    sql, params = queryset.order_by().query.get_compiler(using=db).as_sql()
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError as e:
+        logger.warning('get_estimated_count(): the query cannot be explained (%s)', e)
+        return None
+
+    # NB: psycopg2 decodes the JSON column, but other drivers may not.
+    if isinstance(plan, str):
+        plan = json_load(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+@contextmanager
+def statement_timeout(timeout: float, using: str = DEFAULT_DB_ALIAS):
+    """Context manager which makes the database interrupt the queries which
+    exceed a duration (they raise a django.db.OperationalError).
+    With PostgreSQL & MySQL the duration is applied to each query ; with SQLite
+    it's applied to the whole block.
+    @param timeout: Duration in seconds.
+    @param using: Alias of the database.
+
+    NB: the connection of the current thread is used, so the timeout does not
+        impact the queries performed by the other threads.
+    """
+    connection = connections[using]
+    vendor = connection.vendor
+    connection.ensure_connection()
+
+    if vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET statement_timeout = %s', [max(1, int(timeout * 1000))])
+
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('RESET statement_timeout')
+    elif vendor == 'mysql':
+        if connection.mysql_is_mariadb:
+            variable, value = 'max_statement_time', timeout
+        else:
+            # NB: only SELECT queries are interrupted
+            variable, value = 'max_execution_time', max(1, int(timeout * 1000))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SET SESSION {variable} = %s', [value])
+
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SET SESSION {variable} = DEFAULT')
+    elif vendor == 'sqlite':
+        deadline = monotonic() + timeout
+        # NB: the handler is called every N virtual machine instructions ; a
+        #     return value which is <True> interrupts the query.
+        connection.connection.set_progress_handler(lambda: monotonic() > deadline, 1000)
+
+        try:
+            yield
+        finally:
+            connection.connection.set_progress_handler(None, 0)
+    else:
+        logger.warning('statement_timeout(): the vendor "%s" is not managed', vendor)
+        yield
+
+
 # TODO: accept multiple/iterative order()/proceed() calls ?
 class PreFetcher:
     """Regroup queries on same model (to retrieve instances by their PK)
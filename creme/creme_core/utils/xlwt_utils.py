@@ -25,6 +25,10 @@ from . import prefixed_truncate
 
 
 class XlwtWriter:
+    # The rows are regularly serialized (with this period) in order to free the
+    # memory used by the intermediate objects ; 0 means "never".
+    flush_period: int = 1000
+
     def __init__(self, encoding='utf-8'):
         self.nline = 0
         self.wb = wb = Workbook(encoding=encoding)
@@ -48,5 +52,9 @@ class XlwtWriter:
 
         self.nline += 1
 
+        flush_period = self.flush_period
+        if flush_period and not self.nline % flush_period:
+            self.ws.flush_row_data()
+
     def save(self, filepath):
         self.wb.save(filepath)
@@ -28,6 +28,7 @@ from django.template.context import make_context
 from django.template.engine import Engine
 
 from .. import utils
+from ..core.brick_render import BricksRenderer
 from ..gui.bricks import Brick, BricksManager, _BrickRegistry
 from ..gui.bricks import brick_registry as global_brick_registry
 from ..http import CremeJsonResponse
@@ -53,6 +54,8 @@ class BricksReloading(generic.CheckedView):
     # A boolean indicating if the attribute 'permission' of the bricks
     # instances has to be checked.
     check_bricks_permission: bool = True
+    # Class which renders the bricks (sequentially or concurrently).
+    renderer_class: type[BricksRenderer] = BricksRenderer
 
     def get_brick_ids(self) -> list[str]:
         # TODO: filter empty IDs ??
@@ -72,7 +75,6 @@ class BricksReloading(generic.CheckedView):
         @return A JSON-friendly list of tuples.
         """
         request = self.request
-        brick_renders = []
         bricks = self.get_bricks()
         context = self.get_bricks_context().flatten()
         bricks_manager = BricksManager.get(context)
@@ -111,26 +113,28 @@ class BricksReloading(generic.CheckedView):
             bricks_manager.add_group(brick.id_, brick)
 
         render_method = self.brick_render_method
+        renderable_bricks = []
         for brick in bricks:
             reloading_info = all_reloading_info.get(brick.id_)
             if reloading_info is not None:
                 brick.reloading_info = reloading_info
 
-            render_func = getattr(brick, render_method, None)
-
-            if render_func is None:
+            if not hasattr(brick, render_method):
                 logger.warning(
                     'Brick without %s(): %s (id=%s)',
                     render_method, brick.__class__, brick.id_,
                 )
             else:
-                # NB: the context is copied is order to a 'fresh' one for each
-                # brick, & so avoid annoying side-effects
-                # Notice that build_context() creates a shared dictionary with
-                # the "shared" key in order to explicitly share data between 2+ bricks.
-                brick_renders.append((brick.id_, render_func({**context})))
-
-        return brick_renders
+                renderable_bricks.append(brick)
+
+        # NB: the context is copied is order to a 'fresh' one for each
+        # brick, & so avoid annoying side-effects
+        # Notice that build_context() creates a shared dictionary with
+        # the "shared" key in order to explicitly share data between 2+ bricks.
+        # Some bricks can be rendered concurrently (see Brick.concurrent_render).
+        return self.renderer_class(method_name=render_method).render(
+            renderable_bricks, context,
+        )
 
     def get_bricks_context(self):
         request = self.request
@@ -20,7 +20,6 @@ import logging
 from collections import defaultdict
 from itertools import chain
 
-from django.db.models import Q
 from django.urls import reverse
 from django.views.generic import DetailView
 
@@ -40,21 +39,25 @@ logger = logging.getLogger(__name__)
 
 def detailview_bricks(user, entity, registry=brick_registry):
     is_superuser = user.is_superuser
-    role = user.role
+    role_id = user.role_id
 
-    role_q = Q(role=None, superuser=True) if is_superuser else Q(role=role, superuser=False)
-    locs = BrickDetailviewLocation.objects.filter(
-        Q(content_type=None) | Q(content_type=entity.entity_type)
-    ).filter(
-        role_q | Q(role=None, superuser=False)
-    ).order_by('order')
+    if is_superuser:
+        def role_filter(loc):
+            return loc.role_id is None
+    else:
+        def role_filter(loc):
+            return not loc.superuser and loc.role_id in (None, role_id)
+
+    locs = [
+        *filter(role_filter, BrickDetailviewLocation.objects.for_ctype(entity.entity_type)),
+    ]
 
     # We fall back to the default config is there is no config for this content type.
     locs = [
         loc
         for loc in locs
         # NB: useless as long as default conf cannot have a related role
-        if loc.superuser == is_superuser and loc.role == role
+        if loc.superuser == is_superuser and loc.role_id == role_id
     ] or [
         loc for loc in locs if loc.content_type_id is not None
     ] or locs
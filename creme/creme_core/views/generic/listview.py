@@ -53,6 +53,7 @@ from creme.creme_core.models.header_filter import (
     HeaderFilterList,
 )
 from creme.creme_core.utils import get_from_GET_or_404, get_from_POST_or_404
+from creme.creme_core.utils.db import get_capped_count, get_estimated_count
 from creme.creme_core.utils.meta import Order
 from creme.creme_core.utils.queries import QSerializer
 from creme.creme_core.utils.serializers import json_encode
@@ -68,6 +69,20 @@ class SelectionMode(Enum):
     MULTIPLE = 'multiple'
 
 
+class CountMode(Enum):
+    """How the entities of a list-view are counted.
+     - EXACT: the exact number is computed (can be slow with big tables).
+     - CAPPED: the entities are counted until a limit is reached
+       (see settings.LISTVIEW_COUNT_CAP) ; the count is a minimum.
+     - ESTIMATED: the estimation of the database's planner is used when it
+       exceeds the limit (only with PostgreSQL ; CAPPED is used with the
+       other databases).
+    """
+    EXACT = 'exact'
+    CAPPED = 'capped'
+    ESTIMATED = 'estimated'
+
+
 class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
     """Base class for list-view of CremeEntities with a given type.
 
@@ -76,6 +91,8 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
      - Choice of EntityFilters (ie: which entities to display).
      - Pagination, with a fast pagination mode when there is a lot of entities
        Related settings : PAGE_SIZES, DEFAULT_PAGE_SIZE_IDX, FAST_QUERY_MODE_THRESHOLD.
+     - Count of the entities, which can be approximated with big tables (see CountMode).
+       Related settings : LISTVIEW_COUNT_MODE, LISTVIEW_COUNT_CAP.
      - Ordering: some columns can be used to order the list ; the chosen column
        is used as main order criterion, the model's meta ordering information are used
        as secondary criteria.
@@ -102,6 +119,9 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
     mode: SelectionMode | None = None
     default_selection_mode: SelectionMode = SelectionMode.MULTIPLE
 
+    # <None> means that settings.LISTVIEW_COUNT_MODE is used
+    default_count_mode: CountMode | None = None
+
     # GET/POST parameters
     header_filter_id_arg: str = 'hfilter'
     entity_filter_id_arg: str = 'filter'
@@ -159,6 +179,7 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
 
         self.queryset = None  # We hide voluntarily the class attribute which SHOULD not be used.
         self.count = None
+        self.count_mode = CountMode.EXACT  # Mode really used to get "count"
         self.fast_mode = None
         self.ordering = None  # Idem
 
@@ -301,6 +322,10 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         context['buttons'] = self.get_buttons()
         context['page_sizes'] = settings.PAGE_SIZES
 
+        # NB: the paginator does not know the count when it is not exact
+        context['entities_count'] = self.count
+        context['count_mode'] = self.count_mode.value
+
         # TODO: pass the bulk_update_registry in a list-view context
         #  (see listview_td_action_for_cell)
         # TODO: regroup registries ??
@@ -358,8 +383,18 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
 
         return Q()
 
+    def get_count_mode(self) -> CountMode:
+        mode = self.default_count_mode
+
+        return CountMode(settings.LISTVIEW_COUNT_MODE) if mode is None else mode
+
     def get_fast_mode(self) -> bool:
-        return self.count >= settings.FAST_QUERY_MODE_THRESHOLD
+        # NB: the approximated counts are only used with big tables, & the
+        #     slow paginator needs the exact count anyway.
+        return (
+            self.count_mode is not CountMode.EXACT
+            or self.count >= settings.FAST_QUERY_MODE_THRESHOLD
+        )
 
     def get_header_filter(self, header_filters: HeaderFilterList) -> HeaderFilter:
         return self.state.set_headerfilter(
@@ -444,7 +479,8 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         else:
             paginator = FlowPaginator(
                 queryset=queryset, key=self.ordering[0],
-                per_page=per_page, count=self.count,
+                per_page=per_page,
+                count=self.count if self.count_mode is CountMode.EXACT else None,
             )
 
         return paginator
@@ -453,6 +489,36 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         # assert self.queryset is not None TODO ?
         return self.queryset
 
+    def count_entities(self, queryset: QuerySet) -> int:
+        """Count the entities of the list with the mode returned by
+        get_count_mode() ; the attribute "count_mode" is set with the mode
+        which has really been used (e.g. the count is exact if there are
+        less entities than the cap).
+        """
+        mode = self.get_count_mode()
+        cap = settings.LISTVIEW_COUNT_CAP
+
+        if mode is CountMode.ESTIMATED:
+            count = get_estimated_count(queryset)
+
+            # NB: when the estimation is small, the capped count is cheap
+            #     (& more accurate)
+            if count is not None and count > cap:
+                self.count_mode = mode
+                return count
+
+            mode = CountMode.CAPPED
+
+        if mode is CountMode.CAPPED:
+            count = get_capped_count(queryset, cap=cap)
+            self.count_mode = mode if count > cap else CountMode.EXACT
+
+            return min(count, cap)
+
+        self.count_mode = CountMode.EXACT
+
+        return queryset.count()
+
     def get_unordered_queryset_n_count(self) -> tuple[QuerySet, int]:
         # Cannot use this because it uses get_ordering() too early
         qs = self.model._default_manager.filter(is_deleted=False)
@@ -510,26 +576,26 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         # If the query does not use the real entities' specific fields to filter,
         # we perform a query on CremeEntity & so we avoid a JOIN.
         if filtered:
-            count = qs.count()
+            count_qs = qs
         else:
             model = self.model
             try:
-                count = EntityCredentials.filter_entities(
+                count_qs = EntityCredentials.filter_entities(
                     user,
                     CremeEntity.objects.filter(
                         is_deleted=False,
                         entity_type=ContentType.objects.get_for_model(model),
                     ),
                     as_model=model,
-                ).count()
+                )
             except EntityCredentials.FilteringError as e:
                 logger.debug(
                     '%s.get_unordered_queryset_n_count() : fast count is not possible (%s)',
                     type(self).__name__, e,
                 )
-                count = qs.count()
+                count_qs = qs
 
-        return qs, count
+        return qs, self.count_entities(count_qs)
 
     def get_search_field_registry(self) -> lv_gui.ListViewSearchFieldRegistry:
         return self.search_field_registry
@@ -639,7 +705,9 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         page = self.PAGE_BUILDERS[type(paginator)](self, paginator=paginator)
 
         # Optimisation time !!
-        self.header_filter.populate_entities(page.object_list, self.request.user)
+        user = self.request.user
+        self.header_filter.populate_entities(page.object_list, user)
+        user.populate_credentials(page.object_list)
 
         is_paginated = page.has_other_pages()
 
@@ -18,16 +18,20 @@
 
 import logging
 
-from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
 from django.utils.encoding import smart_str
 
 from ..backends import export_backend_registry
 from ..core import sorter
 from ..core.paginator import FlowPaginator
+from ..creme_jobs import mass_export_type
 from ..forms.listview import ListViewSearchForm
+from ..global_info import iter_in_request_context
 from ..gui.listview import search_field_registry
-from ..models import EntityCredentials, EntityFilter, HeaderFilter
+from ..models import EntityCredentials, EntityFilter, HeaderFilter, Job
 from ..models.history import _HLTEntityExport
 from ..utils import bool_from_str_extended, get_from_GET_or_404
 from ..utils.meta import Order
@@ -37,7 +41,6 @@ from .generic import base
 logger = logging.getLogger(__name__)
 
 
-# TODO: stream response ??
 # TODO: factorise with generic.listview.EntitiesList ?
 class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
     ct_id_arg = 'ct_id'
@@ -48,6 +51,7 @@ class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
     sort_cellkey_arg = 'sort_key'
     sort_order_arg = 'sort_order'
     extra_q_arg = 'extra_q'
+    job_arg = 'job'
 
     page_size = 1024
 
@@ -104,6 +108,35 @@ class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
             default='0',
         )
 
+    def get_use_job(self):
+        "Is the file generated by a job (see 'creme_jobs.mass_export')?"
+        return get_from_GET_or_404(
+            self.request.GET,
+            key=self.job_arg,
+            cast=bool_from_str_extended,
+            default='0',
+        )
+
+    def create_job(self, ctype):
+        user = self.request.user
+
+        if Job.objects.not_finished(user).count() >= settings.MAX_JOBS_PER_USER:
+            return HttpResponseRedirect(reverse('creme_core__my_jobs'))
+
+        GET = self.request.GET.copy()
+        GET.pop(self.job_arg, None)
+
+        job = Job.objects.create(
+            user=user,
+            type=mass_export_type,
+            data={
+                'ctype': ctype.id,
+                'GET': GET.urlencode(),
+            },
+        )
+
+        return redirect(job)
+
     def get_paginator(self, *, queryset, ordering):
         return FlowPaginator(
             queryset=queryset.order_by(*ordering),
@@ -144,96 +177,155 @@ class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
 
     def get_ordering(self, *, model, cells):
         get = self.request.GET.get
+
+        try:
+            order = Order.from_string(get(self.sort_order_arg), required=False)
+        except ValueError as e:
+            raise Http404(f'Invalid argument "{self.sort_order_arg}": {e}') from e
+
         sort_info = self.get_query_sorter().get(
             model=model,
             cells=cells,
             cell_key=get(self.sort_cellkey_arg),
-            order=Order.from_string(get(self.sort_order_arg), required=False),
+            order=order,
         )
 
         return sort_info.field_names
 
-    def get(self, request, *args, **kwargs):
-        user = request.user
+    def get_queryset(self, *, model, cells, efilter):
+        "Get the (not ordered) queryset of the exported entities."
+        request = self.request
+        entities_qs = model.objects.filter(is_deleted=False)
+        use_distinct = False
 
-        header_only = self.get_header_only()
-        backend_cls = self.get_backend_class()
-        ct = self.get_ctype()
-        model = ct.model_class()
-        hf = self.get_header_filter()
+        # ----
+        if efilter is not None:
+            entities_qs = efilter.filter(entities_qs)
 
-        cells = self.get_cells(header_filter=hf)
+        # ----
+        extra_q = request.GET.get(self.extra_q_arg)
+        if extra_q is not None:
+            try:
+                entities_qs = entities_qs.filter(QSerializer().loads(extra_q))
+            except Exception as e:
+                raise Http404(f'Invalid argument "{self.extra_q_arg}": {e}') from e
+
+            use_distinct = True  # TODO: test + only if needed
+
+        # ----
+        search_form = self.get_search_form(cells=cells)
+        search_q = search_form.search_q
+        if search_q:
+            try:
+                entities_qs = entities_qs.filter(search_q)
+            except Exception as e:
+                logger.exception(
+                    'Error when building the search queryset with Q=%s (%s).',
+                    search_q, e,
+                )
+            else:
+                use_distinct = True  # TODO: test + only if needed
 
-        writer = backend_cls()
-        writerow = writer.writerow
-        # Doesn't accept generator expression... ;(
-        writerow([smart_str(cell.title) for cell in cells])
+        # ----
+        entities_qs = EntityCredentials.filter(request.user, entities_qs)
 
-        if not header_only:
-            ordering = self.get_ordering(model=model, cells=cells)
+        if use_distinct:
+            entities_qs = entities_qs.distinct()
 
-            entities_qs = model.objects.filter(is_deleted=False)
-            use_distinct = False
+        return entities_qs
 
-            # ----
-            efilter = self.get_entity_filter()
-            if efilter is not None:
-                entities_qs = efilter.filter(entities_qs)
+    def get_entities_paginator(self, *, model, cells, efilter):
+        """Get the paginator of the exported entities.
+        The arguments are validated (Http404 is raised if they are invalid) ;
+        so it must be called before the streaming of the response starts.
+        """
+        return self.get_paginator(
+            queryset=self.get_queryset(model=model, cells=cells, efilter=efilter),
+            ordering=self.get_ordering(model=model, cells=cells),
+        )
 
-            # ----
-            extra_q = request.GET.get(self.extra_q_arg)
-            if extra_q is not None:
-                entities_qs = entities_qs.filter(QSerializer().loads(extra_q))
-                use_distinct = True  # TODO: test + only if needed
+    def generate_rows(self, *, ctype, header_filter, cells, efilter, paginator=None):
+        """Generator which yields the rows of the exported file (the first one is
+        the header).
+        The entities are retrieved page by page, so the memory usage does not
+        depend on the number of entities.
+        @param paginator: FlowPaginator on the exported entities (see
+               get_entities_paginator()) ; <None> means "only the header".
+        """
+        user = self.request.user
 
-            # ----
-            search_form = self.get_search_form(cells=cells)
-            search_q = search_form.search_q
-            if search_q:
-                try:
-                    entities_qs = entities_qs.filter(search_q)
-                except Exception as e:
-                    logger.exception(
-                        'Error when building the search queryset with Q=%s (%s).',
-                        search_q, e,
-                    )
-                else:
-                    use_distinct = True  # TODO: test + only if needed
+        # Doesn't accept generator expression... ;(
+        yield [smart_str(cell.title) for cell in cells]
 
-            # ----
-            entities_qs = EntityCredentials.filter(user, entities_qs)
+        if paginator is None:
+            return
 
-            if use_distinct:
-                entities_qs = entities_qs.distinct()
+        total_count = 0
 
-            paginator = self.get_paginator(queryset=entities_qs, ordering=ordering)
+        for entities_page in paginator.pages():
+            entities = entities_page.object_list
 
-            total_count = 0
+            header_filter.populate_entities(entities, user)  # Optimisation time !!!
 
-            for entities_page in paginator.pages():
-                entities = entities_page.object_list
+            for entity in entities:
+                total_count += 1
+                line = []
 
-                hf.populate_entities(entities, user)  # Optimisation time !!!
+                for cell in cells:
+                    try:
+                        res = cell.render_csv(entity, user)
+                    except Exception as e:
+                        logger.debug('Exception in CSV export: %s', e)
+                        res = ''
 
-                for entity in entities:
-                    total_count += 1
-                    line = []
+                    line.append(smart_str(res) if res else '')
 
-                    for cell in cells:
-                        try:
-                            res = cell.render_csv(entity, user)
-                        except Exception as e:
-                            logger.debug('Exception in CSV export: %s', e)
-                            res = ''
+                yield line
 
-                        line.append(smart_str(res) if res else '')
+        _HLTEntityExport.create_line(
+            ctype=ctype, user=user, count=total_count, hfilter=header_filter, efilter=efilter,
+        )
 
-                    writerow(line)
+    def get(self, request, *args, **kwargs):
+        user = request.user
+        header_only = self.get_header_only()
+        backend_cls = self.get_backend_class()
+        ct = self.get_ctype()
+        hf = self.get_header_filter()
+        cells = self.get_cells(header_filter=hf)
+
+        # NB: errors (404...) must be raised before the streaming starts ;
+        #     so the arguments (filters, ordering...) are validated here, & the
+        #     generator of rows only iterates on the entities.
+        if header_only:
+            efilter = paginator = None
+        else:
+            efilter = self.get_entity_filter()
+
+            if self.get_use_job():
+                return self.create_job(ctype=ct)
+
+            paginator = self.get_entities_paginator(
+                model=ct.model_class(), cells=cells, efilter=efilter,
+            )
+
+        rows = self.generate_rows(
+            ctype=ct, header_filter=hf, cells=cells,
+            efilter=efilter, paginator=paginator,
+        )
+        writer = backend_cls()
 
-            _HLTEntityExport.create_line(
-                ctype=ct, user=user, count=total_count, hfilter=hf, efilter=efilter,
+        if writer.streaming:
+            return writer.get_streaming_response(
+                rows=iter_in_request_context(rows, user),
+                filename=ct.model,
+                user=user,
             )
 
+        writerow = writer.writerow
+        for row in rows:
+            writerow(row)
+
         writer.save(ct.model, user)
 
         return writer.response
@@ -25,7 +25,7 @@ from django.http import Http404
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
-from ..core.search import Searcher
+from ..core.search import Searcher, SearchRunner
 from ..gui.bricks import QuerysetBrick
 from ..http import CremeJsonResponse
 from ..models import CremeEntity, EntityCredentials
@@ -37,16 +37,53 @@ from .generic import base
 MIN_RESEARCH_LENGTH = 3
 
 
+class _FoundEntities:
+    """Sequence of entities given to the paginator of FoundEntitiesBrick, when
+    the number of entities & the entities of the first page have already been
+    retrieved (see <creme_core.core.search.SearchResult>) ; the other pages are
+    retrieved from the QuerySet.
+    """
+    def __init__(self, result):
+        self._result = result
+        self.model = result.model
+        self.ordered = result.queryset.ordered
+
+    def __getitem__(self, k):
+        result = self._result
+        entities = result.entities
+        count = result.count
+
+        if len(entities) < count:
+            stop = k.stop if isinstance(k, slice) else k + 1
+
+            if stop is None or stop > len(entities):
+                return result.queryset[k]
+
+        return entities[k]
+
+    def __len__(self):
+        return self._result.count
+
+    def count(self):
+        return self._result.count
+
+
 class FoundEntitiesBrick(QuerysetBrick):
     template_name = 'creme_core/bricks/found-entities.html'
 
-    def __init__(self, searcher, model, research, user, id=None):
+    def __init__(self, searcher, model, research, user, id=None, result=None):
+        """Constructor.
+        @param result: Instance of <creme_core.core.search.SearchResult>
+               corresponding to the model (optional) ; it avoids to search
+               again the entities of the first page.
+        """
         super().__init__()
         # dependencies  = (...,)  # TODO: ??
         self.searcher = searcher
         self.model = model
         self.research = research
         self.user = user
+        self.result = result
         # self.ctype = ctype = ContentType.objects.get_for_model(model)
         ctype = ContentType.objects.get_for_model(model)
         self.id_ = id or self.generate_id(
@@ -75,19 +112,30 @@ class FoundEntitiesBrick(QuerysetBrick):
 
     def detailview_display(self, context):
         model = self.model
-        research = self.research
         searcher = self.searcher
-        results = searcher.search(model, research)
+        result = self.result
+        timed_out = False
 
-        if results is None:
-            # HACK: ensures that the brick is displayed (with a strange title anyway...)
-            qs = model.objects.all()[:1]
+        if result is None:
+            results = searcher.search(model, self.research)
+
+            if results is None:
+                # HACK: ensures that the brick is displayed (with a strange title anyway...)
+                qs = model.objects.all()[:1]
+            else:
+                qs = EntityCredentials.filter(self.user, results)
+        elif result.timed_out:
+            qs = model.objects.none()
+            timed_out = True
+        elif result.queryset is None:
+            qs = model.objects.all()[:1]  # See HACK above
         else:
-            qs = EntityCredentials.filter(self.user, results)
+            qs = _FoundEntities(result)
 
         return self._render(self.get_template_context(
             context, qs,
             cells=searcher.get_cells(model),
+            timed_out=timed_out,
             # # If the model is inserted in the context, the template calls it
             # # and creates an instance...
             # ctype=self.ctype,
@@ -96,6 +144,7 @@ class FoundEntitiesBrick(QuerysetBrick):
 
 class SearcherMixin:
     searcher_class = Searcher
+    search_runner_class = SearchRunner
     searchable_models_registry = creme_registry
 
     def get_raw_models(self):
@@ -114,6 +163,9 @@ class SearcherMixin:
 
         return searcher
 
+    def get_search_runner(self):
+        return self.search_runner_class(searcher=self.get_searcher())
+
 
 class Search(SearcherMixin, base.EntityCTypeRelatedMixin, base.BricksView):
     template_name = 'creme_core/search_results.html'
@@ -132,14 +184,23 @@ class Search(SearcherMixin, base.EntityCTypeRelatedMixin, base.BricksView):
 
         if not self.get_search_error():
             searcher = self.get_searcher()
+            research = self.get_search_terms()
+            brick_class = self.brick_class
             ResultBrick = partial(
-                self.brick_class,
+                brick_class,
                 searcher=searcher,
-                research=self.get_search_terms(),
+                research=research,
                 user=searcher.user,
             )
 
-            bricks.extend(ResultBrick(model=model) for model in searcher.models)
+            # NB: the first page of each brick is retrieved here (the models
+            #     can be searched concurrently).
+            bricks.extend(
+                ResultBrick(model=result.model, result=result)
+                for result in self.get_search_runner().run(
+                    research, limit=brick_class.page_size,
+                )
+            )
 
         return bricks
 
@@ -231,6 +292,8 @@ class LightSearch(SearcherMixin, base.CheckedView):
     error_msg_empty = _('Empty search…')
     error_msg_length = _('Please enter at least {count} characters')
     limit = 5
+    # The entities are counted until this number (the counts are exact if it's None).
+    count_cap = 1000
 
     def build_entry(self, entity):
         return {'label': str(entity), 'url': entity.get_absolute_url()}
@@ -255,32 +318,30 @@ class LightSearch(SearcherMixin, base.CheckedView):
             data['error'] = self.error_msg_length.format(count=MIN_RESEARCH_LENGTH)
         else:
             results = []
-            user = request.user
-            searcher = self.get_searcher()
+            timed_out = []
 
-            best_score = -1
+            # NB: the relevance is given by the indexed search back-ends
+            #     (see creme_core.core.search.IndexSearchBackend).
+            best_score = (-1, -1)
             best_entry = None
 
             get_ct = ContentType.objects.get_for_model
 
-            for model in searcher.models:
-                query = searcher.search(model, terms)
-
-                if query is None:
-                    count = 0
-                    query = []
-                else:
-                    query = EntityCredentials.filter(user, query)
-                    count = query.count()
-
-                    if limit > 0:
-                        query = query[:limit]
+            for result in self.get_search_runner().run(
+                terms, limit=limit, count_cap=self.count_cap,
+            ):
+                model = result.model
 
-                if query:
+                if result.timed_out:
+                    timed_out.append({
+                        'id': get_ct(model).id,
+                        'label': self.build_model_label(model),
+                    })
+                elif result.entities:
                     entities = []
 
-                    for e in query:
-                        score = e.search_score
+                    for e in result.entities:
+                        score = (e.search_score, getattr(e, 'search_relevance', 0))
                         entry = self.build_entry(e)
 
                         if score > best_score:
@@ -292,7 +353,7 @@ class LightSearch(SearcherMixin, base.CheckedView):
                     results.append({
                         'id': get_ct(model).id,
                         'label': self.build_model_label(model),
-                        'count': count,
+                        'count': result.count,
                         'results': entities,
                     })
 
@@ -300,6 +361,9 @@ class LightSearch(SearcherMixin, base.CheckedView):
             data['results'] = sorted(results, key=lambda r: sort_key(r['label']))
             data['best'] = best_entry
 
+            if timed_out:
+                data['timed_out'] = sorted(timed_out, key=lambda r: sort_key(r['label']))
+
         return self.response_class(data)
 
     def get_limit(self):
@@ -0,0 +1,308 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2022  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Engine which sends the emails of the campaigns.
+
+The emails of a sending are retrieved by chunks ; the messages are built by
+the current thread & sent through a pool of connections to the SMTP server
+(one thread per connection), at a rate limited by a token bucket. The
+connections are opened once, & kept open during the whole sending (they are
+re-opened after an error).
+The statuses of the emails are saved in bulk, after a small number of emails
+or a short delay (see CampaignMailer.status_flush_size/status_flush_delay), so
+a sending which has been interrupted (crash of the job manager...) can be
+resumed: the emails which have been sent are ignored (only the emails sent
+since the last saving of the statuses can be sent twice).
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent import futures
+from queue import SimpleQueue
+from time import monotonic, sleep
+from typing import Callable
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.utils.timezone import now
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Rate limiter.
+    The bucket contains at most <capacity> tokens, & is refilled at the rate
+    of <rate> tokens per second ; a token is consumed by each call to acquire(),
+    which waits when the bucket is empty. So bursts of <capacity> operations
+    are allowed, but the average rate cannot exceed <rate>.
+    """
+    def __init__(self,
+                 rate: float,
+                 capacity: int = 1,
+                 clock: Callable[[], float] = monotonic,
+                 sleep: Callable[[float], None] = sleep,
+                 ):
+        """Constructor.
+        @param rate: Number of tokens per second ; 0 means "no limit".
+        @param capacity: Maximum number of tokens (size of the bursts).
+        @param clock: Function returning a time in seconds (useful for unit tests).
+        @param sleep: Function used to wait (useful for unit tests).
+        """
+        self.rate = rate
+        self.capacity = capacity = max(1, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._last = clock()
+
+    def _refill(self) -> None:
+        current = self._clock()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (current - self._last) * self.rate,
+        )
+        self._last = current
+
+    def acquire(self) -> float:
+        """Consume a token ; wait if needed.
+        @return: The waited time (in seconds).
+        """
+        rate = self.rate
+        if not rate:
+            return 0.0
+
+        self._refill()
+
+        waited = 0.0
+        if self._tokens < 1:
+            waited = (1 - self._tokens) / rate
+            self._sleep(waited)
+            self._refill()
+
+        self._tokens = max(0.0, self._tokens - 1)
+
+        return waited
+
+
+class _StatusBuffer:
+    """Store the statuses of the sent emails, & save them with one query per
+    status when <size> statuses are stored, or after <delay> seconds.
+    """
+    def __init__(self, size: int, delay: float, clock: Callable[[], float] = monotonic):
+        self.size = size
+        self.delay = delay
+        self._clock = clock
+        self._sent_ids: list[int] = []
+        self._error_ids: list[int] = []
+        self._last_flush = clock()
+
+    def add(self, mail_id: int, sent: bool) -> None:
+        (self._sent_ids if sent else self._error_ids).append(mail_id)
+
+        if (
+            len(self._sent_ids) + len(self._error_ids) >= self.size
+            or self._clock() - self._last_flush >= self.delay
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        from ..models import LightWeightEmail
+
+        Status = LightWeightEmail.Status
+        mails = LightWeightEmail.objects
+
+        if self._sent_ids:
+            mails.filter(id__in=self._sent_ids).update(status=Status.SENT, sending_date=now())
+            self._sent_ids = []
+
+        if self._error_ids:
+            mails.filter(id__in=self._error_ids).update(status=Status.SENDING_ERROR)
+            self._error_ids = []
+
+        self._last_flush = self._clock()
+
+
+class CampaignMailer:
+    """Send the emails (instances of LightWeightEmail) of a sending of campaign.
+
+    Hint: use the class attribute "connection_factory" to use a custom
+    back-end (a local stand-in for unit tests...).
+    """
+    # Number of emails retrieved by query
+    chunk_size = 256
+
+    # The statuses of the emails are saved when this number of emails have
+    # been sent, or after this delay (in seconds).
+    status_flush_size = 64
+    status_flush_delay = 2.0
+
+    def __init__(self,
+                 connections: int | None = None,
+                 rate: float | None = None,
+                 burst: int | None = None,
+                 ):
+        """Constructor.
+        @param connections: Size of the pool of SMTP connections (& of threads) ;
+               1 means that the emails are sent by the current thread.
+               By default, settings.EMAILCAMPAIGN_CONNECTIONS is used.
+        @param rate: Maximum number of emails sent per second ; 0 means "no limit".
+               By default, settings.EMAILCAMPAIGN_RATE is used.
+        @param burst: Number of emails which can be sent without limit of rate
+               (after a pause). By default, settings.EMAILCAMPAIGN_SIZE is used.
+        """
+        self.connections = max(
+            1, settings.EMAILCAMPAIGN_CONNECTIONS if connections is None else connections,
+        )
+        self.rate = settings.EMAILCAMPAIGN_RATE if rate is None else rate
+        self.burst = settings.EMAILCAMPAIGN_SIZE if burst is None else burst
+
+    def connection_factory(self):
+        return get_connection(
+            host=settings.EMAILCAMPAIGN_HOST,
+            port=settings.EMAILCAMPAIGN_PORT,
+            username=settings.EMAILCAMPAIGN_HOST_USER,
+            password=settings.EMAILCAMPAIGN_PASSWORD,
+            use_tls=settings.EMAILCAMPAIGN_USE_TLS,
+        )
+
+    @staticmethod
+    def _send_message(pool: SimpleQueue, message) -> bool:
+        connection = pool.get()
+
+        try:
+            connection.send_messages([message])
+        except Exception:
+            logger.exception('CampaignMailer: error during sending mail.')
+
+            # The session is probably broken ; we start a new one.
+            try:
+                connection.close()
+                connection.open()
+            except Exception:
+                # NB: if the connection is not open, send_messages() opens
+                #     (& closes) a session for each message.
+                logger.exception('CampaignMailer: error when re-opening a connection.')
+
+            return False
+        else:
+            return True
+        finally:
+            pool.put(connection)
+
+    def _iter_chunks(self, sending):
+        from ..models import LightWeightEmail
+
+        mails = LightWeightEmail.objects.filter(
+            sending=sending,
+        ).exclude(
+            status=LightWeightEmail.Status.SENT,
+        ).order_by('id')
+        chunk_size = self.chunk_size
+        last_id = None
+
+        while True:
+            chunk = [
+                *(mails if last_id is None else mails.filter(id__gt=last_id))[:chunk_size]
+            ]
+            if not chunk:
+                break
+
+            yield chunk
+
+            last_id = chunk[-1].id
+
+    def send(self, sending, sender) -> int:
+        """Send the emails of a sending which have not been sent yet.
+        @param sending: Instance of EmailSending.
+        @param sender: Instance of LightWeightEmailSender (which builds the messages).
+        @return: The number of sent emails.
+        """
+        bucket = TokenBucket(rate=self.rate, capacity=self.burst)
+        connections = []
+        pool = SimpleQueue()
+        executor = futures.ThreadPoolExecutor(
+            max_workers=self.connections, thread_name_prefix='creme_emails',
+        ) if self.connections > 1 else None
+        send_message = self._send_message
+        statuses = _StatusBuffer(size=self.status_flush_size, delay=self.status_flush_delay)
+        sent_count = 0
+        start = monotonic()
+
+        # NB: the statuses are saved by the current thread only (the threads
+        #     of the pool do not use the database).
+        def save_done(pending):
+            nonlocal sent_count
+
+            for future in [f for f in pending if f.done()]:
+                sent = future.result()
+                statuses.add(pending.pop(future), sent)
+                sent_count += sent
+
+        try:
+            for _i in range(self.connections):
+                connection = self.connection_factory()
+                connections.append(connection)
+                # NB: the session is kept open between the calls to send_messages()
+                try:
+                    connection.open()
+                except Exception:
+                    # NB: if the connection is not open, send_messages() tries
+                    #     to open (& close) a session for each message ; so the
+                    #     emails get an error status if the server is unreachable.
+                    logger.exception('CampaignMailer: error when opening a connection.')
+
+                pool.put(connection)
+
+            for chunk in self._iter_chunks(sending):
+                pending = {}
+
+                for mail in chunk:
+                    message = sender.build_message(mail)
+                    bucket.acquire()
+
+                    if executor is None:
+                        sent = send_message(pool, message)
+                        statuses.add(mail.id, sent)
+                        sent_count += sent
+                    else:
+                        pending[executor.submit(send_message, pool, message)] = mail.id
+                        save_done(pending)
+
+                futures.wait(pending)
+                save_done(pending)
+
+                logger.debug(
+                    'CampaignMailer: %s mail(s) sent (%.1f mails/s)',
+                    sent_count, sent_count / max(monotonic() - start, 0.001),
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+            # NB: the statuses of the emails which have been sent are saved
+            #     even if the sending is interrupted by an error.
+            statuses.flush()
+
+            for connection in connections:
+                try:
+                    connection.close()
+                except Exception:
+                    logger.exception('CampaignMailer: error when closing a connection.')
+
+        return sent_count
@@ -16,13 +16,16 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+from datetime import timedelta
+
 from django.db.models.query_utils import Q
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
 
-from creme.creme_core.creme_jobs.base import JobType
+from creme.creme_core.creme_jobs.base import JobProgress, JobType
 
-from ..models import EmailSending
+from ..models import EmailSending, LightWeightEmail
 
 
 class _CampaignEmailsSendType(JobType):
@@ -65,5 +68,27 @@ class _CampaignEmailsSendType(JobType):
 
         return dsending.sending_date if dsending is not None else None
 
+    def progress(self, job):
+        Status = LightWeightEmail.Status
+        mails = LightWeightEmail.objects.filter(
+            sending__state=EmailSending.State.IN_PROGRESS,
+        )
+        total = mails.count()
+        sent = mails.filter(status=Status.SENT).count() if total else 0
+        # Send-rate
+        recent_count = LightWeightEmail.objects.filter(
+            status=Status.SENT,
+            sending_date__gte=now() - timedelta(minutes=1),
+        ).count()
+
+        return JobProgress(
+            percentage=(sent * 100) // total if total else None,
+            label=ngettext(
+                '{count} email sent during the last minute',
+                '{count} emails sent during the last minute',
+                recent_count
+            ).format(count=recent_count),
+        )
+
 
 campaign_emails_send_type = _CampaignEmailsSendType()
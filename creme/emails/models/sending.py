@@ -18,10 +18,9 @@
 
 import logging
 from json import loads as json_load
-from time import sleep
 
 from django.conf import settings
-from django.core.mail import get_connection, send_mail
+from django.core.mail import send_mail
 from django.db import IntegrityError, models
 from django.db.transaction import atomic
 from django.template import Context, Template
@@ -35,6 +34,7 @@ from django.utils.translation import pgettext, pgettext_lazy
 import creme.creme_core.models.fields as core_fields
 from creme.creme_core.models import CremeEntity, CremeModel
 
+from ..core.sending import CampaignMailer
 from ..utils import EMailSender, ImageFromHTMLError, generate_id
 from .mail import ID_LENGTH, _Email
 from .signature import EmailSignature
@@ -124,36 +124,12 @@ class EmailSending(CremeModel):
 
             return self.State.ERROR
 
-        connection = get_connection(
-            host=settings.EMAILCAMPAIGN_HOST,
-            port=settings.EMAILCAMPAIGN_PORT,
-            username=settings.EMAILCAMPAIGN_HOST_USER,
-            password=settings.EMAILCAMPAIGN_PASSWORD,
-            use_tls=settings.EMAILCAMPAIGN_USE_TLS,
-        )
-
-        mails_count = 0
-        one_mail_sent = False
-        SENDING_SIZE = getattr(settings, 'EMAILCAMPAIGN_SIZE', 40)
-        SLEEP_TIME = getattr(settings, 'EMAILCAMPAIGN_SLEEP_TIME', 2)
-
-        for mail in LightWeightEmail.objects.filter(sending=self):
-            if sender.send(mail, connection=connection):
-                mails_count += 1
-                one_mail_sent = True
-                logger.debug('Mail sent to %s', mail.recipient)
+        CampaignMailer().send(sending=self, sender=sender)
 
-            if mails_count > SENDING_SIZE:
-                logger.debug('Sending: waiting timeout')
-
-                mails_count = 0
-                sleep(SLEEP_TIME)  # Avoiding the mail to be classed as spam
-
-        if not one_mail_sent:
+        # NB: the emails sent before an interruption are counted too.
+        if not self.mails_set.filter(status=_Email.Status.SENT).exists():
             return self.State.ERROR
 
-        # TODO: close the connection ??
-
     @property
     def unsent_mails(self):
         Status = _Email.Status
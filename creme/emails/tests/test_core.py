@@ -1,8 +1,67 @@
+from threading import Lock, current_thread
+from unittest.mock import patch
+
 from django.core.exceptions import ValidationError
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils.timezone import now
 from django.utils.translation import gettext as _
 
 from creme.creme_core.tests.base import CremeTestCase
+from creme.emails.core.sending import CampaignMailer, TokenBucket
 from creme.emails.core.validators import TemplateVariablesValidator
+from creme.emails.models import EmailSending, LightWeightEmail
+from creme.emails.models.sending import LightWeightEmailSender
+
+from .base import EmailCampaign, skipIfCustomEmailCampaign
+
+
+class FakeSMTPBackend(BaseEmailBackend):
+    """Local stand-in for a SMTP server.
+    Like the SMTP back-end of Django, send_messages() opens (& closes) a
+    session when the connection is not already open.
+    """
+    lock = Lock()
+    instances = []
+    # Recipients which make the sending fail
+    refused = set()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = []
+        self.threads = set()
+        self.sessions = 0
+        self.is_open = False
+
+        with self.lock:
+            self.instances.append(self)
+
+    def open(self):
+        if self.is_open:
+            return False
+
+        self.sessions += 1
+        self.is_open = True
+
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, email_messages):
+        new_session = self.open()
+        self.threads.add(current_thread())
+
+        try:
+            for message in email_messages:
+                if self.refused.intersection(message.recipients()):
+                    raise ConnectionError('Recipient refused')
+
+            self.sent.extend(email_messages)
+        finally:
+            if new_session:
+                self.close()
+
+        return len(email_messages)
 
 
 class ValidatorsTestCase(CremeTestCase):
@@ -62,3 +121,238 @@ class ValidatorsTestCase(CremeTestCase):
             _('You can use variables: {}').format('{{name}} {{nick_name}}'),
             v.help_text,
         )
+
+
+class TokenBucketTestCase(CremeTestCase):
+    def test_acquire(self):
+        clock = [100.0]
+        waits = []
+
+        def fake_sleep(duration):
+            waits.append(duration)
+            clock[0] += duration
+
+        bucket = TokenBucket(
+            rate=2, capacity=3, clock=lambda: clock[0], sleep=fake_sleep,
+        )
+        self.assertEqual(2, bucket.rate)
+        self.assertEqual(3, bucket.capacity)
+
+        # Burst
+        for _i in range(3):
+            self.assertEqual(0, bucket.acquire())
+        self.assertFalse(waits)
+
+        # Empty bucket => wait 1 / rate
+        self.assertEqual(0.5, bucket.acquire())
+        self.assertListEqual([0.5], waits)
+
+        # Time passed => refilled
+        clock[0] += 1
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0.5, bucket.acquire())
+
+        # Capacity is a maximum
+        clock[0] += 100
+        for _i in range(3):
+            self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0.5, bucket.acquire())
+
+    def test_no_limit(self):
+        def fake_sleep(duration):
+            self.fail('sleep() should not be called')
+
+        bucket = TokenBucket(rate=0, sleep=fake_sleep)
+        for _i in range(10):
+            self.assertEqual(0, bucket.acquire())
+
+
+@skipIfCustomEmailCampaign
+class CampaignMailerTestCase(CremeTestCase):
+    def setUp(self):
+        super().setUp()
+        FakeSMTPBackend.instances.clear()
+        FakeSMTPBackend.refused.clear()
+
+    def _build_sending(self, mails_count):
+        user = self.create_user()
+        camp = EmailCampaign.objects.create(user=user, name='Camp#1')
+        sending = EmailSending.objects.create(
+            sender='vicious@reddragons.mrs',
+            campaign=camp,
+            sending_date=now(),
+            subject='Hello',
+            body='My body is ready',
+            body_html='My body is <b>ready</b>',
+        )
+
+        for i in range(mails_count):
+            LightWeightEmail(
+                sending=sending,
+                sender=sending.sender,
+                recipient=f'spike{i}@bebop.mrs',
+            ).genid_n_save()
+
+        return sending
+
+    def _send(self, sending, **kwargs):
+        mailer = CampaignMailer(**kwargs)
+        mailer.chunk_size = 4
+
+        with patch.object(CampaignMailer, 'connection_factory', FakeSMTPBackend):
+            return mailer.send(sending=sending, sender=LightWeightEmailSender(sending))
+
+    def test_settings(self):
+        with self.settings(
+            EMAILCAMPAIGN_CONNECTIONS=3, EMAILCAMPAIGN_RATE=15, EMAILCAMPAIGN_SIZE=30,
+        ):
+            mailer = CampaignMailer()
+
+        self.assertEqual(3,  mailer.connections)
+        self.assertEqual(15, mailer.rate)
+        self.assertEqual(30, mailer.burst)
+
+        mailer = CampaignMailer(connections=0, rate=0, burst=12)
+        self.assertEqual(1,  mailer.connections)
+        self.assertEqual(0,  mailer.rate)
+        self.assertEqual(12, mailer.burst)
+
+    def test_send(self):
+        sending = self._build_sending(10)
+
+        self.assertEqual(10, self._send(sending, connections=1, rate=0))
+
+        backends = FakeSMTPBackend.instances
+        self.assertEqual(1, len(backends))
+
+        backend = backends[0]
+        self.assertFalse(backend.is_open)
+        self.assertEqual(1, backend.sessions)
+        self.assertSetEqual({current_thread()}, backend.threads)
+        self.assertCountEqual(
+            [f'spike{i}@bebop.mrs' for i in range(10)],
+            [r for message in backend.sent for r in message.recipients()],
+        )
+        self.assertEqual('Hello', backend.sent[0].subject)
+        self.assertFalse(sending.mails_set.exclude(status=LightWeightEmail.Status.SENT))
+        self.assertFalse(sending.mails_set.filter(sending_date=None))
+
+    def test_send_pool(self):
+        sending = self._build_sending(10)
+
+        # NB: the threads do not use the database
+        self.assertEqual(10, self._send(sending, connections=3, rate=0))
+
+        backends = FakeSMTPBackend.instances
+        self.assertEqual(3, len(backends))
+        self.assertFalse(any(backend.is_open for backend in backends))
+        self.assertListEqual([1, 1, 1], [backend.sessions for backend in backends])
+        self.assertEqual(10, sum(len(backend.sent) for backend in backends))
+        self.assertNotIn(
+            current_thread(),
+            {thread for backend in backends for thread in backend.threads},
+        )
+        self.assertFalse(sending.mails_set.exclude(status=LightWeightEmail.Status.SENT))
+
+    def test_send_errors_n_resume(self):
+        sending = self._build_sending(6)
+        Status = LightWeightEmail.Status
+
+        # Interrupted sending: some emails have already been sent
+        sent_ids = [*sending.mails_set.order_by('id').values_list('id', flat=True)[:2]]
+        sending.mails_set.filter(id__in=sent_ids).update(status=Status.SENT)
+
+        refused = sending.mails_set.exclude(id__in=sent_ids).order_by('id')[0]
+        FakeSMTPBackend.refused.add(refused.recipient)
+
+        self.assertEqual(3, self._send(sending, connections=2, rate=0))
+
+        self.assertEqual(3, sum(len(backend.sent) for backend in FakeSMTPBackend.instances))
+        self.assertEqual(Status.SENDING_ERROR, self.refresh(refused).status)
+        self.assertEqual(5, sending.mails_set.filter(status=Status.SENT).count())
+        # The session is re-opened after the error
+        self.assertEqual(3, sum(backend.sessions for backend in FakeSMTPBackend.instances))
+
+        # The emails with error are sent again
+        FakeSMTPBackend.refused.clear()
+        self.assertEqual(1, self._send(sending, connections=1, rate=0))
+        self.assertEqual(Status.SENT, self.refresh(refused).status)
+
+    def test_send_queries(self):
+        sending = self._build_sending(8)
+        sender = LightWeightEmailSender(sending)
+        mailer = CampaignMailer(connections=1, rate=0)
+        mailer.chunk_size = 4
+
+        # 3 chunks (the last one is empty), 1 update for all the statuses, attachments
+        with patch.object(CampaignMailer, 'connection_factory', FakeSMTPBackend):
+            with self.assertNumQueries(5):
+                mailer.send(sending=sending, sender=sender)
+
+        self.assertEqual(
+            8, sending.mails_set.filter(status=LightWeightEmail.Status.SENT).count(),
+        )
+
+    def test_send_queries_flush_size(self):
+        "The statuses are saved in bulk every <status_flush_size> emails."
+        sending = self._build_sending(8)
+        sender = LightWeightEmailSender(sending)
+        mailer = CampaignMailer(connections=1, rate=0)
+        mailer.chunk_size = 4
+        mailer.status_flush_size = 3
+
+        FakeSMTPBackend.refused.add(
+            sending.mails_set.order_by('id').values_list('recipient', flat=True)[0]
+        )
+
+        # 3 chunks, 3 flushes (the first one with 2 updates: sent & error), attachments
+        with patch.object(CampaignMailer, 'connection_factory', FakeSMTPBackend):
+            with self.assertNumQueries(8):
+                self.assertEqual(7, mailer.send(sending=sending, sender=sender))
+
+        Status = LightWeightEmail.Status
+        self.assertEqual(7, sending.mails_set.filter(status=Status.SENT).count())
+        self.assertEqual(1, sending.mails_set.filter(status=Status.SENDING_ERROR).count())
+
+    def test_send_open_error(self):
+        "The SMTP server is unreachable."
+        sending = self._build_sending(3)
+        Status = LightWeightEmail.Status
+
+        class RefusingSMTPBackend(FakeSMTPBackend):
+            def open(this):
+                raise ConnectionRefusedError('Server unreachable')
+
+        mailer = CampaignMailer(connections=2, rate=0)
+
+        with patch.object(CampaignMailer, 'connection_factory', RefusingSMTPBackend):
+            with self.assertNoException():
+                sent = mailer.send(sending=sending, sender=LightWeightEmailSender(sending))
+
+        self.assertEqual(0, sent)
+        self.assertEqual(3, sending.mails_set.filter(status=Status.SENDING_ERROR).count())
+
+    def test_send_interrupted(self):
+        "The statuses of the sent emails are saved when the sending is interrupted."
+        sending = self._build_sending(6)
+        Status = LightWeightEmail.Status
+
+        class CrashingSMTPBackend(FakeSMTPBackend):
+            def send_messages(this, email_messages):
+                if len(this.sent) == 3:
+                    raise KeyboardInterrupt('Crash of the job manager')
+
+                return super().send_messages(email_messages)
+
+        mailer = CampaignMailer(connections=1, rate=0)
+
+        with patch.object(CampaignMailer, 'connection_factory', CrashingSMTPBackend):
+            with self.assertRaises(KeyboardInterrupt):
+                mailer.send(sending=sending, sender=LightWeightEmailSender(sending))
+
+        self.assertEqual(3, sending.mails_set.filter(status=Status.SENT).count())
+
+        # Only the remaining emails are sent
+        self.assertEqual(3, self._send(sending, connections=1, rate=0))
+        self.assertEqual(6, sending.mails_set.filter(status=Status.SENT).count())
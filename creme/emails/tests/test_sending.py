@@ -8,6 +8,7 @@ from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.timezone import get_current_timezone, make_naive, now
 from django.utils.translation import gettext as _
+from django.utils.translation import ngettext
 
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 # Should be a test queue
@@ -463,7 +464,7 @@ class SendingsTestCase(_EmailsTestCase):
 
     @skipIfCustomContact
     @skipIfCustomOrganisation
-    @override_settings(EMAILCAMPAIGN_SLEEP_TIME=0.1)
+    @override_settings(EMAILCAMPAIGN_RATE=0)
     def test_create03(self):
         "Job + outbox."
         queue = get_queue()
@@ -540,6 +541,17 @@ class SendingsTestCase(_EmailsTestCase):
         # Other save() in job should not send REFRESH signals
         self.assertFalse(queue.refreshed_jobs)
 
+        progress = job.type.progress(job)
+        self.assertIsNone(progress.percentage)
+        self.assertEqual(
+            ngettext(
+                '{count} email sent during the last minute',
+                '{count} emails sent during the last minute',
+                3
+            ).format(count=3),
+            progress.label,
+        )
+
     def test_create04(self):
         "Test deferred"
         user = self.login()
@@ -111,6 +111,29 @@ class EMailSender:
     def _process_bodies(self, mail):
         return self._body, self._body_html
 
+    def build_message(self, mail, connection=None):
+        """Build the message to send.
+        @param mail: Object with a class inheriting emails.models.mail._Email
+        @param connection: Instance of email back-end, or None.
+        @return An instance of <django.core.mail.EmailMultiAlternatives>.
+        """
+        body, body_html = self._process_bodies(mail)
+
+        msg = EmailMultiAlternatives(
+            self.get_subject(mail), body, mail.sender, [mail.recipient],
+            connection=connection,
+        )
+        msg.attach_alternative(body_html, 'text/html')
+
+        for image in self._mime_images:
+            msg.attach(image)
+
+        MEDIA_ROOT = settings.MEDIA_ROOT
+        for attachment in self._attachments:
+            msg.attach_file(join(MEDIA_ROOT, attachment.filedata.name))
+
+        return msg
+
     def send(self, mail, connection=None):
         """
         @param mail: Object with a class inheriting emails.models.mail._Email
@@ -121,20 +144,7 @@ class EMailSender:
         if mail.status == mail.Status.SENT:
             logger.error('Mail already sent to the recipient')
         else:
-            body, body_html = self._process_bodies(mail)
-
-            msg = EmailMultiAlternatives(
-                self.get_subject(mail), body, mail.sender, [mail.recipient],
-                connection=connection,
-            )
-            msg.attach_alternative(body_html, 'text/html')
-
-            for image in self._mime_images:
-                msg.attach(image)
-
-            MEDIA_ROOT = settings.MEDIA_ROOT
-            for attachment in self._attachments:
-                msg.attach_file(join(MEDIA_ROOT, attachment.filedata.name))
+            msg = self.build_message(mail, connection=connection)
 
             try:
                 msg.send()
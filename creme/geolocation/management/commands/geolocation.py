@@ -20,6 +20,9 @@ import csv
 import io
 import logging
 from functools import partial
+from shutil import copyfileobj
+from tempfile import TemporaryFile
+from time import monotonic
 from urllib.request import urlopen
 from zipfile import ZipFile
 
@@ -34,6 +37,7 @@ from creme.creme_core.utils.url import parse_path
 from creme.persons import get_address_model
 
 from ...models import GeoAddress, Town
+from ...utils import geohash_encode
 
 logger = logging.getLogger(__name__)
 
@@ -141,14 +145,15 @@ class CSVPopulator:
 
                 with self._get_source_file(url_info) as bytes_input:
                     if url_info.path.endswith('.zip'):
-                        archive = ZipFile(
-                            bytes_input
-                            if bytes_input.seekable() else
-                            io.BytesIO(bytes_input.read())
-                        )
-
-                        with archive.open(archive.namelist()[0]) as zipped_bytes_input:
-                            self._populate_from_bytes(zipped_bytes_input)
+                        if bytes_input.seekable():
+                            self._populate_from_zip(bytes_input)
+                        else:
+                            # NB: a ZIP file cannot be read without seeking ; the
+                            #     downloaded file is stored on disk (not in memory).
+                            with TemporaryFile() as tmp_file:
+                                copyfileobj(bytes_input, tmp_file)
+                                tmp_file.seek(0)
+                                self._populate_from_zip(tmp_file)
                     else:
                         self._populate_from_bytes(bytes_input)
             except CSVPopulatorError:
@@ -160,6 +165,13 @@ class CSVPopulator:
         else:
             raise ValueError('The source must be a path or an iterable.')
 
+    def _populate_from_zip(self, bytes_input):
+        archive = ZipFile(bytes_input)
+
+        # NB: the member is decompressed incrementally
+        with archive.open(archive.namelist()[0]) as zipped_bytes_input:
+            self._populate_from_bytes(zipped_bytes_input)
+
     def _populate_from_bytes(self, bytes_input):
         with io.TextIOWrapper(bytes_input) as wrapped_bytes_input:
             self._populate_from_lines(csv.reader(wrapped_bytes_input))
@@ -212,11 +224,60 @@ class CSVPopulator:
 
 
 class CSVTownPopulator(CSVPopulator):
-    def __init__(self, defaults=None, chunksize=100):
+    """Import Towns from a CSV file.
+
+    The towns are identified by the key (zipcode, slug) ; the keys & a hash of
+    the values of all the existing towns are loaded in memory at the beginning,
+    so the rows are compared with the database without query: the unchanged
+    towns are skipped (so an import can be run again to apply only the
+    differences), the duplicated rows are ignored, & the other towns are
+    created/updated with 'bulk_create()'/'bulk_update()' by chunks.
+    """
+    class Context(CSVPopulator.Context):
+        def __init__(self, defaults):
+            super().__init__(defaults)
+            self.start = monotonic()
+            self.created = 0
+            self.updated = 0
+            self.unchanged = 0
+            self.duplicates = 0
+
+    # Fields written by 'bulk_update()' (the key is not modified)
+    updated_fields = ['name', 'country', 'latitude', 'longitude', 'geohash']
+
+    def __init__(self, defaults=None, chunksize=1000):
         super().__init__(
             ['title', 'zipcode', 'latitude', 'longitude', 'country'],
             defaults=defaults, chunksize=chunksize,
         )
+        self._index = None
+
+    @staticmethod
+    def town_key(town):
+        return town.zipcode, town.slug
+
+    @staticmethod
+    def town_hash(town):
+        return hash((
+            town.name, town.country,
+            round(float(town.latitude), 6), round(float(town.longitude), 6),
+        ))
+
+    def _get_index(self):
+        "@return: Dictionary {key: (pk, hash)} for the existing towns."
+        index = self._index
+
+        if index is None:
+            self._index = index = {}
+            town_key = self.town_key
+            town_hash = self.town_hash
+
+            for town in Town.objects.only(
+                'id', 'zipcode', 'slug', 'name', 'country', 'latitude', 'longitude',
+            ).order_by('id').iterator(chunk_size=self.chunksize):
+                index[town_key(town)] = (town.pk, town_hash(town))
+
+        return index
 
     def line_error(self, e, row, context):
         logger.error('    invalid data (line %d) : %s', context.line, e)
@@ -228,13 +289,18 @@ class CSVTownPopulator(CSVPopulator):
         zipcodes = row['zipcode'].split('-')
 
         name      = row['title']
-        latitude  = row['latitude']
-        longitude = row['longitude']
+        latitude  = float(row['latitude'])
+        longitude = float(row['longitude'])
 
         slug = slugify(name)
         country = row['country']
 
-        build_town = partial(Town, country=country)
+        # NB: Town.save() is not called by bulk_create()
+        build_town = partial(
+            Town,
+            country=country,
+            geohash=geohash_encode(latitude, longitude),
+        )
 
         return [
             build_town(
@@ -247,16 +313,56 @@ class CSVTownPopulator(CSVPopulator):
         ]
 
     def save(self, entries, context):
-        get_existing_pk_by_zipcode = dict(
-            Town.objects.filter(
-                zipcode__in=(t.zipcode for t in entries),
-                slug__in=(t.slug for t in entries),
-            ).values_list('zipcode', 'pk')
-        ).get
-
-        self.sync(
-            Town, entries,
-            lambda town: get_existing_pk_by_zipcode(town.zipcode),
+        index = self._get_index()
+        town_key = self.town_key
+        town_hash = self.town_hash
+        created = []
+        updated = []
+
+        for town in entries:
+            key = town_key(town)
+            new_hash = town_hash(town)
+            pk, old_hash = index.get(key, (None, None))
+
+            if old_hash == new_hash:
+                # NB: unchanged town, or duplicated row in the file
+                if pk is None:
+                    context.duplicates += 1
+                else:
+                    context.unchanged += 1
+
+                continue
+
+            if pk is None:
+                if key in index:
+                    context.duplicates += 1
+                    continue
+
+                created.append(town)
+            else:
+                town.pk = pk
+                updated.append(town)
+
+            # NB: the pk of created towns is not retrieved by all the DBMS (so
+            #     the duplicates of a created town are ignored).
+            index[key] = (pk, new_hash)
+
+        with transaction.atomic():
+            Town.objects.bulk_create(created, batch_size=self.chunksize)
+            Town.objects.bulk_update(
+                updated, fields=self.updated_fields, batch_size=self.chunksize,
+            )
+
+        context.created += len(created)
+        context.updated += len(updated)
+
+    def post(self, entries, context):
+        elapsed = monotonic() - context.start
+        self.info(
+            f'    {context.line - 1} line(s) read ; {context.created} town(s) created, '
+            f'{context.updated} updated, {context.unchanged} unchanged, '
+            f'{context.duplicates} duplicate(s) ignored '
+            f'({(context.line - 1) / max(elapsed, 0.001):.0f} lines/s)'
         )
 
 
@@ -275,6 +381,10 @@ class Command(BaseCommand):
             '-i', '--import', action='store_true', dest='import', default=False,
             help='Import towns configured in GEOLOCATION_TOWNS setting',
         )
+        add_argument(
+            '-c', '--chunk-size', action='store', dest='chunk_size', type=int, default=1024,
+            help='Number of addresses populated by group of queries [default: %(default)s]',
+        )
 
     def sysout(self, message, visible):
         if visible:
@@ -283,15 +393,25 @@ class Command(BaseCommand):
     def syserr(self, message):
         self.stderr.write(message)
 
-    def populate_addresses(self, verbosity=0):
+    def populate_addresses(self, verbosity=0, chunk_size=1024):
         self.sysout('Populate geolocation information of addresses...', verbosity > 0)
         GeoAddress.populate_geoaddresses(
-            get_address_model().objects.exclude(zipcode='', city='')
+            get_address_model().objects
+                               .exclude(zipcode='', city='')
+                               .select_related('geoaddress')
+                               .order_by('id'),
+            chunk_size=chunk_size,
         )
 
-    def import_town_database(self, url, defaults):
+    def import_town_database(self, url, defaults, verbosity=0):
+        populator = CSVTownPopulator(defaults=defaults)
+
+        if verbosity > 1:
+            # Display the progress/throughput
+            populator.info = partial(self.sysout, visible=True)
+
         try:
-            CSVTownPopulator(defaults=defaults).populate(url)
+            populator.populate(url)
         except Exception as e:
             self.syserr(str(e))
 
@@ -300,7 +420,7 @@ class Command(BaseCommand):
 
         for url, defaults in settings.GEOLOCATION_TOWNS:
             self.sysout(url, verbosity > 1)
-            self.import_town_database(url, defaults)
+            self.import_town_database(url, defaults, verbosity=verbosity)
 
     def print_stats(self, verbosity=0):
         self.sysout(f'{Town.objects.count()} town(s) in database.', verbosity > 0)
@@ -318,4 +438,4 @@ class Command(BaseCommand):
             self.import_town_all(verbosity)
 
         if populate:
-            self.populate_addresses(verbosity)
+            self.populate_addresses(verbosity, chunk_size=max(options['chunk_size'], 1))
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+from creme.geolocation.utils import geohash_encode
+
+
+def fill_geohashes(apps, schema_editor):
+    for model_name in ('GeoAddress', 'Town'):
+        model = apps.get_model('geolocation', model_name)
+        instances = []
+
+        for instance in model.objects.exclude(
+            latitude=None,
+        ).exclude(longitude=None).order_by('pk').iterator():
+            instance.geohash = geohash_encode(instance.latitude, instance.longitude)
+            instances.append(instance)
+
+            if len(instances) >= 1024:
+                model.objects.bulk_update(instances, fields=['geohash'])
+                instances = []
+
+        if instances:
+            model.objects.bulk_update(instances, fields=['geohash'])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('geolocation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='geoaddress',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=9),
+        ),
+        migrations.AddField(
+            model_name='town',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=9),
+        ),
+        migrations.RunPython(fill_geohashes),
+    ]
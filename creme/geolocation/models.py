@@ -16,10 +16,11 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from itertools import chain, groupby
+from collections import defaultdict
+from itertools import chain
 
 from django.conf import settings
-from django.db import models
+from django.db import connections, models
 from django.db.models.query_utils import Q
 from django.db.transaction import atomic
 from django.template.defaultfilters import slugify
@@ -29,7 +30,20 @@ from django.utils.translation import pgettext_lazy
 from creme.creme_core.utils import update_model_instance
 from creme.creme_core.utils.chunktools import iter_as_slices
 
-from .utils import location_bounding_box
+from .utils import (
+    GEOHASH_LENGTH,
+    geohash_covering_cells,
+    geohash_encode,
+    geohash_prefix_q,
+    location_bounding_box,
+)
+
+
+def _compute_geohash(latitude, longitude):
+    if latitude is None or longitude is None:
+        return ''
+
+    return geohash_encode(float(latitude), float(longitude))
 
 
 class GeoAddress(models.Model):
@@ -57,6 +71,10 @@ class GeoAddress(models.Model):
         verbose_name=pgettext_lazy('geolocation', 'Status'),
         choices=Status.choices, default=Status.UNDEFINED,
     )
+    # Spatial index (see utils.geohash_encode()) ; updated by save().
+    geohash = models.CharField(
+        max_length=GEOHASH_LENGTH, blank=True, db_index=True, editable=False,
+    )
 
     creation_label = pgettext_lazy('geolocation-address', 'Create an address')
 
@@ -70,6 +88,10 @@ class GeoAddress(models.Model):
         super().__init__(*args, **kwargs)
         self._neighbours = {}
 
+    def save(self, *args, **kwargs):
+        self.update_geohash()
+        super().save(*args, **kwargs)
+
     @property
     def is_complete(self):
         return self.status == self.Status.COMPLETE
@@ -98,12 +120,18 @@ class GeoAddress(models.Model):
         return geoaddress
 
     @classmethod
-    def populate_geoaddresses(cls, addresses):
-        for addresses in iter_as_slices(addresses, 50):
+    def populate_geoaddresses(cls, addresses, chunk_size=256):
+        """Create/update the GeoAddresses of some addresses, with the position
+        of their Town (the addresses which are already localized are ignored).
+        The queries are grouped by chunks of addresses.
+        @param addresses: Iterable of Addresses. Hint: use a QuerySet with
+               select_related('geoaddress').
+        @param chunk_size: Number of addresses per chunk.
+        """
+        for addresses in iter_as_slices(addresses, chunk_size):
             create = []
             update = []
 
-            # TODO: regroup queries ?
             for address in addresses:
                 try:
                     geoaddress = address.geoaddress
@@ -117,14 +145,14 @@ class GeoAddress(models.Model):
 
             for geoaddress, town in zip(chain(create, update), towns):
                 geoaddress.set_town_position(town)
-
-            GeoAddress.objects.bulk_create(create)
+                geoaddress.update_geohash()
 
             # TODO: only if has changed
-            # TODO: bulk_update() ?
             with atomic():
-                for geoaddress in update:
-                    geoaddress.save(force_update=True)
+                GeoAddress.objects.bulk_create(create)
+                GeoAddress.objects.bulk_update(
+                    update, fields=['latitude', 'longitude', 'status', 'geohash'],
+                )
 
     def set_town_position(self, town):
         if town is not None:
@@ -147,6 +175,18 @@ class GeoAddress(models.Model):
 
         return neighbours
 
+    @staticmethod
+    def _area_q(latitude, longitude, distance):
+        "Q instance to retrieve the GeoAddresses around a position (geohash index + box)."
+        upper_left, lower_right = location_bounding_box(latitude, longitude, distance)
+
+        return geohash_prefix_q(
+            geohash_covering_cells(latitude, longitude, distance)
+        ) & Q(
+            latitude__range=(upper_left[0], lower_right[0]),
+            longitude__range=(upper_left[1], lower_right[1]),
+        )
+
     def _get_neighbours(self, distance):
         latitude = self.latitude
         longitude = self.longitude
@@ -154,17 +194,93 @@ class GeoAddress(models.Model):
         if latitude is None and longitude is None:
             return GeoAddress.objects.none()
 
-        upper_left, lower_right = location_bounding_box(latitude, longitude, distance)
-
         return GeoAddress.objects.exclude(
             address_id=self.address.pk,
         ).exclude(
             address__object_id=self.address.object_id,
         ).filter(
-            latitude__range=(upper_left[0], lower_right[0]),
-            longitude__range=(upper_left[1], lower_right[1]),
+            self._area_q(latitude, longitude, distance),
         )
 
+    @classmethod
+    def neighbours_many(cls, geoaddresses, distance, chunk_size=256):
+        """Get the neighbours of several GeoAddresses, with one query per chunk
+        of GeoAddresses (see neighbours() for the search of one GeoAddress).
+        @param geoaddresses: Sequence of GeoAddresses. Hint: their addresses
+               should be retrieved with select_related('address').
+        @param distance: Maximum distance in meters.
+        @param chunk_size: Maximum number of GeoAddresses per query ; it's
+               reduced if the DB limits the number of parameters of a query
+               (e.g. SQLite).
+        @return: A dictionary {address_id: [neighbour GeoAddresses]} ; the
+                 GeoAddresses without position get an empty list.
+        """
+        max_params = connections[cls.objects.db].features.max_query_params
+        if max_params:
+            # NB: 4 parameters for the bounding box ; 9 geohash cells per
+            #     GeoAddress, with 2 parameters per range of geohashes.
+            chunk_size = max(1, min(chunk_size, (max_params - 4) // 18))
+
+        neighbours = {geoaddress.address_id: [] for geoaddress in geoaddresses}
+        localized = [
+            geoaddress for geoaddress in geoaddresses
+            if geoaddress.latitude is not None and geoaddress.longitude is not None
+        ]
+
+        for sources in iter_as_slices(localized, chunk_size):
+            prefixes = set()
+            boxes = []
+
+            for source in sources:
+                latitude = source.latitude
+                longitude = source.longitude
+                cells = geohash_covering_cells(latitude, longitude, distance)
+
+                if not cells:
+                    prefixes = None
+                elif prefixes is not None:
+                    prefixes.update(cells)
+
+                boxes.append(location_bounding_box(latitude, longitude, distance))
+
+            candidates = GeoAddress.objects.annotate(
+                owner_id=models.F('address__object_id'),
+            ).filter(
+                latitude__range=(
+                    min(upper_left[0] for upper_left, __ in boxes),
+                    max(lower_right[0] for __, lower_right in boxes),
+                ),
+                longitude__range=(
+                    min(upper_left[1] for upper_left, __ in boxes),
+                    max(lower_right[1] for __, lower_right in boxes),
+                ),
+            )
+            if prefixes:
+                candidates = candidates.filter(geohash_prefix_q(prefixes))
+
+            candidates = [*candidates]
+
+            for source, (upper_left, lower_right) in zip(sources, boxes):
+                source_id = source.address_id
+                owner_id = source.address.object_id
+                min_lat, min_lon = upper_left
+                max_lat, max_lon = lower_right
+
+                neighbours[source_id] = [
+                    candidate
+                    for candidate in candidates
+                    if min_lat <= candidate.latitude <= max_lat
+                    and min_lon <= candidate.longitude <= max_lon
+                    and candidate.address_id != source_id
+                    and candidate.owner_id != owner_id
+                ]
+
+        return neighbours
+
+    def update_geohash(self):
+        "Compute the field 'geohash' from the position."
+        self.geohash = _compute_geohash(self.latitude, self.longitude)
+
     def __str__(self):
         return f'GeoAddress(lat={self.latitude}, lon={self.longitude}, status={self.status})'
 
@@ -176,6 +292,10 @@ class Town(models.Model):
     country = models.CharField(_('Country'), max_length=40, blank=True)
     latitude = models.FloatField(verbose_name=_('Latitude'))
     longitude = models.FloatField(verbose_name=_('Longitude'))
+    # Spatial index (see utils.geohash_encode()) ; updated by save().
+    geohash = models.CharField(
+        max_length=GEOHASH_LENGTH, blank=True, db_index=True, editable=False,
+    )
 
     creation_label = _('Create a town')
 
@@ -190,6 +310,7 @@ class Town(models.Model):
 
     def save(self, *args, **kwargs):
         self.slug = slugify(self.name)
+        self.geohash = _compute_geohash(self.latitude, self.longitude)
         super().save(*args, **kwargs)
 
     @classmethod
@@ -223,8 +344,13 @@ class Town(models.Model):
             ).order_by('zipcode'),
         ]
 
-        cities = {key: [*c] for key, c in groupby(candidates, lambda c: c.slug)}
-        zipcodes = {key: [*c] for key, c in groupby(candidates, lambda c: c.zipcode)}
+        # NB: the candidates are sorted by zipcode, so groupby() cannot be used for slugs.
+        cities = defaultdict(list)
+        zipcodes = defaultdict(list)
+
+        for candidate in candidates:
+            cities[candidate.slug].append(candidate)
+            zipcodes[candidate.zipcode].append(candidate)
 
         get_city = cities.get
         get_zipcode = zipcodes.get
@@ -1,5 +1,7 @@
 from functools import partial
+from unittest.mock import patch
 
+from django.db import connection
 from django.utils.translation import gettext as _
 
 from creme.persons.tests.base import (
@@ -9,6 +11,7 @@ from creme.persons.tests.base import (
 )
 
 from ..models import GeoAddress, Town
+from ..utils import geohash_encode
 from .base import Address, Contact, GeoLocationBaseTestCase, Organisation
 
 
@@ -612,6 +615,90 @@ class GeoLocationModelsTestCase(GeoLocationBaseTestCase):
         self.assertFalse(address.geoaddress.neighbours(distance=1000))
         self.assertFalse(address.geoaddress.neighbours(distance=10000))
 
+    @skipIfCustomContact
+    def test_neighbours_many(self):
+        contact = Contact.objects.create(last_name='Contact 1', user=self.user)
+        orga2   = Organisation.objects.create(name='Orga 2', user=self.user)
+
+        town1 = self.marseille1
+        town2 = self.aubagne
+
+        create_address = self.create_address
+        ST_VICTOR = create_address(
+            self.orga, address='St Victor', zipcode='13007', town=town1.name,
+            geoloc=(43.290347, 5.365572),
+        )
+        COMMANDERIE = create_address(
+            contact, address='Commanderie', zipcode='13011', town=town1.name,
+            geoloc=(43.301963, 5.462410),
+        )
+        AUBAGNE = create_address(
+            orga2, address='Maire Aubagne', zipcode=town2.zipcode, town=town2.name,
+            geoloc=(43.295783, 5.565589),
+        )
+        # Same owner as COMMANDERIE
+        OTHER = create_address(
+            contact, address='Other', zipcode='13011', town=town1.name,
+            geoloc=(43.301, 5.4624),
+        )
+        UNKNOWN = create_address(orga2, address='Unknown', zipcode='0', town='Unknown')
+        GeoAddress.populate_geoaddress(UNKNOWN)
+
+        geoaddresses = [
+            *GeoAddress.objects.filter(
+                address__in=[ST_VICTOR.id, COMMANDERIE.id, AUBAGNE.id, UNKNOWN.id],
+            ).select_related('address'),
+        ]
+
+        with self.assertNumQueries(1):
+            neighbours = GeoAddress.neighbours_many(geoaddresses, distance=10000)
+
+        self.assertDictEqual(
+            {
+                ST_VICTOR.id: [COMMANDERIE.geoaddress, OTHER.geoaddress],
+                COMMANDERIE.id: [ST_VICTOR.geoaddress, AUBAGNE.geoaddress],
+                AUBAGNE.id: [COMMANDERIE.geoaddress, OTHER.geoaddress],
+                UNKNOWN.id: [],
+            },
+            neighbours,
+        )
+        self.assertDictEqual(
+            {
+                geoaddress.address_id: [*geoaddress.neighbours(distance=10000)]
+                for geoaddress in geoaddresses
+            },
+            neighbours,
+        )
+
+        neighbours = GeoAddress.neighbours_many(geoaddresses, distance=1000)
+        self.assertFalse(any(neighbours.values()))
+
+        # The number of parameters is limited by the DB => smaller chunks
+        with patch.object(connection.features, 'max_query_params', 40):
+            with self.assertNumQueries(2):
+                neighbours = GeoAddress.neighbours_many(geoaddresses, distance=10000)
+
+        self.assertListEqual(
+            [COMMANDERIE.geoaddress, OTHER.geoaddress], neighbours[ST_VICTOR.id],
+        )
+        self.assertListEqual(
+            [COMMANDERIE.geoaddress, OTHER.geoaddress], neighbours[AUBAGNE.id],
+        )
+
+    def test_geohash(self):
+        self.assertEqual(geohash_encode(43.299985, 5.378865), self.marseille1.geohash)
+
+        ST_VICTOR = self.create_address(
+            self.orga, address='St Victor', zipcode='13007', town='Marseille',
+            geoloc=(43.290347, 5.365572),
+        )
+        geoaddress = self.refresh(ST_VICTOR.geoaddress)
+        self.assertEqual(geohash_encode(43.290347, 5.365572), geoaddress.geohash)
+        self.assertEqual(9, len(geoaddress.geohash))
+
+        geoaddress.update(latitude=None, longitude=None)
+        self.assertEqual('', self.refresh(geoaddress).geohash)
+
     def test_town_unicode(self):
         self.assertEqual('13001 Marseille FRANCE', str(self.marseille1))
         self.assertEqual('13002 Marseille FRANCE', str(self.marseille2))
@@ -672,3 +759,24 @@ class GeoLocationModelsTestCase(GeoLocationBaseTestCase):
             [town2, town1, town3, town3, None, None, town1, None],
             [*Town.search_all(addresses)],
         )
+
+    def test_town_search_all_slug_groups(self):
+        "The towns with the same name are not consecutive when sorted by zipcode."
+        Town.objects.create(
+            name='Marseille', country='FRANCE', zipcode='13500',
+            latitude=43.3, longitude=5.4,
+        )
+
+        create_address = partial(Address.objects.create, owner=self.orga, address='Mairie')
+        addresses = [
+            create_address(city='Marseille'),
+            create_address(city='Aubagne'),
+        ]
+
+        self.assertListEqual(
+            [Town.search(address) for address in addresses],
+            [*Town.search_all(addresses)],
+        )
+        self.assertListEqual(
+            [self.marseille1, self.aubagne], [*Town.search_all(addresses)],
+        )
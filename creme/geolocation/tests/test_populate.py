@@ -10,8 +10,9 @@ from creme.persons.tests.base import (
 )
 
 from ..management.commands.geolocation import Command as GeolocationCommand
-from ..management.commands.geolocation import CSVPopulator
+from ..management.commands.geolocation import CSVPopulator, CSVTownPopulator
 from ..models import GeoAddress, Town
+from ..utils import geohash_encode
 from .base import Address, GeoLocationBaseTestCase, Organisation
 
 
@@ -332,6 +333,42 @@ class TownPopulatorTestCase(GeoLocationBaseTestCase):
             slug='saint-bonnet-sur-gironde', longitude=-0.666667, latitude=45.35,
         )
 
+    def test_populate_incremental(self):
+        "Unchanged rows are skipped, duplicates are ignored."
+        self.command.import_town_database(
+            [self.HEADER, self.OZAN, self.PERON, self.OZAN],
+            {'country': 'FRANCE'},
+        )
+        self.assertEqual(2, Town.objects.count())
+
+        ozan = self.get_object_or_fail(Town, zipcode='01190', slug='ozan')
+        self.assertEqual(geohash_encode(46.3833, 4.91667), ozan.geohash)
+
+        # Second import: only the changed/new rows are written
+        peron = [*self.PERON]
+        peron[19] = '5.9'
+
+        populator = CSVTownPopulator(defaults={'country': 'FRANCE'})
+        messages = []
+        populator.info = messages.append
+
+        # Index (1) + savepoint (2) + create (1) + update (1) -- Ozan is not written
+        with self.assertNumQueries(5):
+            populator.populate([self.HEADER, self.OZAN, peron, self.ACOUA])
+
+        self.assertEqual(3, Town.objects.count())
+        self.assertTown(
+            Town.objects.get(zipcode='01630'),
+            zipcode='01630', name='Péron', slug='peron', longitude=5.9, latitude=46.2,
+            geohash=geohash_encode(46.2, 5.9),
+        )
+        self.assertEqual(1, len(messages))
+        self.assertStartsWith(
+            messages[0],
+            '    3 line(s) read ; 1 town(s) created, 1 updated, 1 unchanged, '
+            '0 duplicate(s) ignored',
+        )
+
     def test_populate_invalid_ignored(self):
         self.command.import_town_database(
             [self.HEADER, self.OZAN, self.PERON, self.INVALID, self.ACOUA],
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from creme.creme_core.tests.base import OverrideSettingValueContext
@@ -14,6 +15,10 @@ from ..models import GeoAddress
 from ..utils import (
     address_as_dict,
     addresses_from_persons,
+    geohash_cell_size,
+    geohash_covering_cells,
+    geohash_encode,
+    geohash_prefix_q,
     get_google_api_key,
     get_radius,
     location_bounding_box,
@@ -297,3 +302,71 @@ class GeoLocationUtilsTestCase(GeoLocationBaseTestCase):
             ),
             location_bounding_box(20.0, 5.0, 10000),
         )
+
+    def test_geohash_encode(self):
+        self.assertEqual('ezs42', geohash_encode(42.6, -5.6, length=5))
+        self.assertEqual('u4pruydqq', geohash_encode(57.64911, 10.40744))
+        self.assertEqual('u4pru', geohash_encode(57.64911, 10.40744, length=5))
+        self.assertEqual('s0000', geohash_encode(0, 0, length=5))
+
+    def test_geohash_cell_size(self):
+        self.assertTupleEqual((45.0, 45.0), geohash_cell_size(1))
+        self.assertTupleEqual((5.625, 11.25), geohash_cell_size(2))
+
+    def test_geohash_covering_cells(self):
+        # ~5 km x 5 km cells
+        cells = geohash_covering_cells(43.290347, 5.365572, 3000)
+        self.assertEqual(9, len(cells))
+        self.assertTrue(all(len(cell) == 5 for cell in cells))
+        self.assertIn(geohash_encode(43.290347, 5.365572, length=5), cells)
+
+        # Corners of the bounding box are covered
+        upper_left, lower_right = location_bounding_box(43.290347, 5.365572, 3000)
+        self.assertIn(geohash_encode(*upper_left, length=5), cells)
+        self.assertIn(geohash_encode(*lower_right, length=5), cells)
+
+        # Bigger distance => shorter hashes
+        self.assertTrue(all(
+            len(cell) == 4 for cell in geohash_covering_cells(43.290347, 5.365572, 10000)
+        ))
+
+        # Too big
+        self.assertSetEqual(set(), geohash_covering_cells(43.290347, 5.365572, 10000000))
+
+    def test_geohash_prefix_q(self):
+        self.assertEqual(
+            str(Q(geohash__gte='spey', geohash__lt='spez')),
+            str(geohash_prefix_q(['spey'])),
+        )
+        # Carry
+        self.assertEqual(
+            str(Q(geohash__gte='spz', geohash__lt='sq')),
+            str(geohash_prefix_q(['spz'])),
+        )
+        self.assertEqual(
+            str(Q(my_hash__gte='zz')),
+            str(geohash_prefix_q(['zz'], field_name='my_hash')),
+        )
+
+    def test_geohash_prefix_q_merge(self):
+        "Contiguous ranges are merged."
+        self.assertEqual(
+            str(Q(geohash__gte='spey', geohash__lt='spf')),
+            str(geohash_prefix_q(['spez', 'spey'])),
+        )
+        # Nested ranges
+        self.assertEqual(
+            str(Q(geohash__gte='s0', geohash__lt='s1')),
+            str(geohash_prefix_q(['s0b', 's0', 's0bc'])),
+        )
+        self.assertEqual(
+            str(
+                Q(geohash__gte='s0', geohash__lt='s1')
+                | Q(geohash__gte='s3', geohash__lt='s4')
+            ),
+            str(geohash_prefix_q(['s3', 's0'])),
+        )
+        self.assertEqual(
+            str(Q(geohash__gte='zy')),
+            str(geohash_prefix_q(['zz', 'zy', 'zzb'])),
+        )
@@ -140,3 +140,146 @@ def location_bounding_box(latitude, longitude, distance):
         (latitude - offset_latitude, longitude - offset_longitude),
         (latitude + offset_latitude, longitude + offset_longitude),
     )
+
+
+# Geohash ----------------------------------------------------------------------
+# See https://en.wikipedia.org/wiki/Geohash
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Length of the geohashes stored in GeoAddress & Town (cells of ~5m x 5m)
+GEOHASH_LENGTH = 9
+
+
+def geohash_encode(latitude, longitude, length=GEOHASH_LENGTH):
+    """Compute the geohash of a position.
+    @param latitude: Float in [-90, 90].
+    @param longitude: Float in [-180, 180].
+    @param length: Length of the hash (i.e. precision).
+    @return: A string.
+    """
+    lat_interval = [-90.0, 90.0]
+    lon_interval = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bits_count = 0
+    even = True  # NB: even bits are for longitude
+
+    while len(chars) < length:
+        if even:
+            interval = lon_interval
+            value = longitude
+        else:
+            interval = lat_interval
+            value = latitude
+
+        middle = (interval[0] + interval[1]) / 2
+        bits <<= 1
+
+        if value >= middle:
+            bits |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+
+        even = not even
+        bits_count += 1
+
+        if bits_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bits_count = 0
+
+    return ''.join(chars)
+
+
+def geohash_cell_size(length):
+    "@return: Tuple (height, width) in degrees of the cells with a given geohash length."
+    bits = 5 * length
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def geohash_covering_cells(latitude, longitude, distance):
+    """Get the geohash cells which cover the area around a position.
+    The length of the hashes is chosen in order to get cells which are bigger
+    than <distance> ; so the cell of the position & its 8 neighbours are enough.
+    @param latitude: Float.
+    @param longitude: Float.
+    @param distance: In meters.
+    @return: A set of geohashes (prefixes) ; an empty set means that the area
+             is too big to be covered (i.e. do not filter by geohash).
+    """
+    offset_latitude = distance / 110540.0
+    offset_longitude = distance / (111320.0 * max(cos(radians(latitude)), 0.01))
+    length = GEOHASH_LENGTH
+
+    while length:
+        height, width = geohash_cell_size(length)
+
+        if height >= offset_latitude and width >= offset_longitude:
+            break
+
+        length -= 1
+    else:
+        return set()
+
+    cells = set()
+
+    for delta_lat in (-height, 0, height):
+        lat = min(90.0, max(-90.0, latitude + delta_lat))
+
+        for delta_lon in (-width, 0, width):
+            lon = (longitude + delta_lon + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(lat, lon, length))
+
+    return cells
+
+
+def geohash_prefix_q(prefixes, field_name='geohash'):
+    """Build a Q instance which retrieves the instances with a geohash starting
+    with one of the given prefixes.
+    Ranges are used (instead of "startswith") to take advantage of the index
+    with all the DBMS ; the contiguous (or overlapping) ranges are merged, in
+    order to reduce the number of parameters of the query.
+    """
+    ranges = []
+
+    for prefix in sorted(prefixes):
+        # Upper bound: next prefix in the alphabet (with carry) ; None means "no bound".
+        chars = [*prefix]
+
+        while chars and chars[-1] == GEOHASH_ALPHABET[-1]:
+            chars.pop()
+
+        if chars:
+            chars[-1] = GEOHASH_ALPHABET[GEOHASH_ALPHABET.index(chars[-1]) + 1]
+            upper = ''.join(chars)
+        else:
+            upper = None
+
+        if ranges:
+            last_lower, last_upper = ranges[-1]
+
+            if last_upper is None:
+                continue
+
+            if prefix <= last_upper:
+                ranges[-1] = (
+                    last_lower,
+                    None if upper is None else max(upper, last_upper),
+                )
+                continue
+
+        ranges.append((prefix, upper))
+
+    q = Q()
+
+    for lower, upper in ranges:
+        if upper is None:
+            q |= Q(**{f'{field_name}__gte': lower})
+        else:
+            q |= Q(**{f'{field_name}__gte': lower, f'{field_name}__lt': upper})
+
+    return q
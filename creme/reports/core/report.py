@@ -19,7 +19,9 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Iterable, Iterator
+from collections import defaultdict
+from itertools import chain
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -32,7 +34,12 @@ from django.utils.translation import gettext_lazy as _
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.core.function_field import function_field_registry
 from creme.creme_core.gui.field_printers import field_printers_registry
-from creme.creme_core.models import CremeEntity, CustomField, RelationType
+from creme.creme_core.models import (
+    CremeEntity,
+    CustomField,
+    Relation,
+    RelationType,
+)
 from creme.creme_core.utils.meta import FieldInfo
 
 from .. import constants
@@ -68,6 +75,10 @@ class ReportHand:
         self._title = title
         self._support_subreport = support_subreport
 
+        # Related instances retrieved by _populate_related_instances()
+        #  key: ID of entity ; value: list of instances.
+        self._related_cache: dict[int, list] = {}
+
     def _generate_flattened_report(self, entities, user, scope: QuerySet) -> str:
         columns = self._report_field.sub_report.columns
 
@@ -82,17 +93,89 @@ class ReportHand:
     def _get_related_instances(self, entity: CremeEntity, user) -> QuerySet:
         raise NotImplementedError
 
-    def _get_filtered_related_entities(self, entity: CremeEntity, user) -> QuerySet:
-        related_entities = EntityCredentials.filter(
-            user=user,
-            queryset=self._get_related_instances(entity, user),
-        )
+    def _get_related_ids_map(self, entities: Sequence[CremeEntity]) -> dict[int, list]:
+        """Get the IDs of the instances returned by _get_related_instances()
+        for several entities at once ; used by _populate_related_instances().
+        @return A dictionary ; keys are IDs of entities, values are lists of IDs.
+        """
+        raise NotImplementedError
+
+    def _get_related_model_queryset(self) -> QuerySet:
+        """Get the QuerySet on all the instances which can be returned by
+        _get_related_instances() ; used by _populate_related_instances().
+        """
+        raise NotImplementedError
+
+    def _filter_related_instances(self, instances: QuerySet, user) -> QuerySet:
+        "Apply the credentials (& the filter of the sub-report if there is one)."
         report = self._report_field.sub_report
 
+        if report is None:
+            return (
+                EntityCredentials.filter(user, instances)
+                if issubclass(instances.model, CremeEntity) else
+                instances
+            )
+
+        instances = EntityCredentials.filter(user=user, queryset=instances)
+
         if report.filter is not None:
-            related_entities = report.filter.filter(related_entities)
+            instances = report.filter.filter(instances)
+
+        return instances
 
-        return related_entities
+    def _get_filtered_related_entities(self, entity: CremeEntity, user) -> QuerySet:
+        return self._filter_related_instances(self._get_related_instances(entity, user), user)
+
+    def _get_cached_related_instances(self, entity: CremeEntity, user) -> list:
+        """Get the related instances (filtered) of an entity ; the cache filled
+        by populate() is used if possible.
+        """
+        instances = self._related_cache.get(entity.id)
+
+        if instances is None:
+            instances = [*self._get_filtered_related_entities(entity, user)]
+
+        return instances
+
+    def _populate_related_instances(self, entities: Sequence[CremeEntity], user) -> None:
+        """Retrieve the related instances of several entities with few queries
+        (see _get_related_ids_map() & _get_related_model_queryset()) ; the
+        columns of the sub-report are populated with these instances too.
+        Can be used by populate() in child classes.
+        """
+        ids_map = self._get_related_ids_map(entities)
+        instances = [
+            *self._filter_related_instances(
+                self._get_related_model_queryset().filter(
+                    id__in={*chain.from_iterable(ids_map.values())},
+                ),
+                user,
+            ),
+        ] if ids_map else []
+
+        # NB: the order of the QuerySet is kept for each entity
+        positions = {instance.id: i for i, instance in enumerate(instances)}
+        self._related_cache = cache = {}
+
+        for entity in entities:
+            related_ids = {*ids_map.get(entity.id, ())}.intersection(positions)
+            cache[entity.id] = [
+                instances[position]
+                for position in sorted(positions[rel_id] for rel_id in related_ids)
+            ]
+
+        if instances and isinstance(instances[0], CremeEntity):
+            user.populate_credentials(instances)
+
+        self._populate_subreport(instances, user)
+
+    def _populate_subreport(self, entities: Sequence[CremeEntity], user) -> None:
+        report = self._report_field.sub_report
+
+        if report is not None and entities:
+            for column in report.columns:
+                column.populate(entities, user)
 
     def _get_value(self,
                    entity: CremeEntity,
@@ -128,11 +211,13 @@ class ReportHand:
         """Used as _get_value() method by subclasses which manage
         sub-reports (extended sub-report case).
         """
-        related_entities = self._get_filtered_related_entities(entity, user)
+        related_entities = self._get_cached_related_instances(entity, user)
+        # NB: the QuerySet is lazy ; it's only used by the aggregates.
+        scope = self._get_filtered_related_entities(entity, user)
         gen_values = self._handle_report_values
 
         # "(None,)" : even if sub-scope if empty, with must generate empty columns for this line
-        return [gen_values(e, user, related_entities) for e in related_entities or (None,)]
+        return [gen_values(e, user, scope) for e in related_entities or (None,)]
 
     def _get_value_flattened_subreport(self,
                                        entity: CremeEntity,
@@ -143,7 +228,7 @@ class ReportHand:
         sub-reports (flattened sub-report case).
         """
         return self._generate_flattened_report(
-            self._get_filtered_related_entities(entity, user), user, scope,
+            self._get_cached_related_instances(entity, user), user, scope,
         )
 
     def _get_value_no_subreport(self,
@@ -154,13 +239,12 @@ class ReportHand:
         """Used as _get_value() method by subclasses which manage
         sub-reports (no sub-report case).
         """
-        qs = self._get_related_instances(entity, user)
         extract = self._related_model_value_extractor
 
-        if issubclass(qs.model, CremeEntity):
-            qs = EntityCredentials.filter(user, qs)
-
-        return ', '.join(str(extract(instance)) for instance in qs)
+        return ', '.join(
+            str(extract(instance))
+            for instance in self._get_cached_related_instances(entity, user)
+        )
 
     def _get_value_single(self,
                           entity: CremeEntity,
@@ -228,6 +312,16 @@ class ReportHand:
 
         return '' if value is None else value
 
+    def populate(self, entities: Sequence[CremeEntity], user) -> None:
+        """Retrieve the data needed by get_value() for several entities at once
+        (e.g. the entities of a page), in order to avoid some queries per entity.
+        Overload this method in child classes ; the default implementation does
+        nothing.
+        @param entities: Sequence of CremeEntities with the model of the report.
+        @param user: User instance.
+        """
+        pass
+
     @property
     def hidden(self) -> bool:
         "Is the hand hidden ? (see FieldsConfig or deleted CustomFields)."
@@ -322,8 +416,8 @@ class RHRegularField(ReportHand):
             support_subreport=support_subreport,
         )
 
-        # TODO: FieldInfo is used by build_field_printer do the same work: can we factorise this ??
-        self._printer = field_printers_registry.build_field_printer(
+        # TODO: FieldInfo is used by get_field_printer do the same work: can we factorise this ??
+        self._printer = field_printers_registry.get_field_printer(
             model=model,
             field_name=report_field.name,
             output='csv',
@@ -358,7 +452,7 @@ class RHForeignKey(RHRegularField):
         else:
             # Small optimization: only used by _get_value_no_subreport()
             if len(field_info) > 1:
-                self._value_extractor = field_printers_registry.build_field_printer(
+                self._value_extractor = field_printers_registry.get_field_printer(
                     model=field_info[0].remote_field.model,
                     field_name=field_info[1].name,
                     output='csv',
@@ -367,6 +461,8 @@ class RHForeignKey(RHRegularField):
                 self._value_extractor = lambda fk_instance, user: str(fk_instance)
 
         self._qs = qs
+        # Instances retrieved by populate() ; key: value of the FK.
+        self._fk_cache: dict = {}
         super().__init__(
             report_field,
             support_subreport=True,
@@ -376,13 +472,39 @@ class RHForeignKey(RHRegularField):
     # NB: cannot rename to _get_related_instances() because forbidden entities
     #     are filtered instead of outputting '??'
     def _get_fk_instance(self, entity: CremeEntity) -> CremeEntity | None:
+        fk_id = getattr(entity, self._fk_attr_name)
+        if fk_id is None:
+            return None
+
         try:
-            rel_entity = self._qs.get(pk=getattr(entity, self._fk_attr_name))
+            return self._fk_cache[fk_id]
+        except KeyError:
+            pass
+
+        try:
+            rel_entity = self._qs.get(pk=fk_id)
         except ObjectDoesNotExist:
             rel_entity = None
 
         return rel_entity
 
+    def populate(self, entities, user):
+        attr_name = self._fk_attr_name
+        fk_ids = {getattr(entity, attr_name) for entity in entities}
+        fk_ids.discard(None)
+
+        # NB: None => the instance does not pass the filter of the sub-report
+        self._fk_cache = cache = dict.fromkeys(fk_ids)
+        if fk_ids:
+            cache.update((instance.pk, instance) for instance in self._qs.filter(pk__in=fk_ids))
+
+        instances = [instance for instance in cache.values() if instance is not None]
+
+        if self._linked2entity:
+            user.populate_credentials(instances)
+
+        self._populate_subreport(instances, user)
+
     def _get_value_flattened_subreport(self, entity, user, scope):
         fk_entity = self._get_fk_instance(entity)
 
@@ -428,6 +550,25 @@ class RHManyToManyField(RHRegularField):
     def _get_related_instances(self, entity, user):
         return getattr(entity, self._field_info[0].name).all()
 
+    def _get_related_ids_map(self, entities):
+        m2m_field = self._field_info[0]
+        source_name = m2m_field.m2m_field_name()
+        target_name = m2m_field.m2m_reverse_field_name()
+        ids_map = defaultdict(list)
+
+        for entity_id, related_id in m2m_field.remote_field.through._default_manager.filter(
+            **{f'{source_name}__in': [entity.id for entity in entities]}
+        ).values_list(source_name, target_name):
+            ids_map[entity_id].append(related_id)
+
+        return ids_map
+
+    def _get_related_model_queryset(self):
+        return self._field_info[0].remote_field.model._default_manager.all()
+
+    def populate(self, entities, user):
+        self._populate_related_instances(entities, user)
+
     def get_linkable_ctypes(self):
         m2m_model = self._field_info[0].remote_field.model
 
@@ -450,6 +591,9 @@ class RHCustomField(ReportHand):
 
         super().__init__(report_field, title=cf.name)
 
+    def populate(self, entities, user):
+        CremeEntity.populate_custom_values(entities, [self._cfield])
+
     def _get_value_single_on_allowed(self, entity, user, scope):
         cvalue = entity.get_custom_value(self._cfield)
         # TODO: use a EntityCellCustomField & remove __str__ methods of CustomFieldValue models ?
@@ -500,6 +644,26 @@ class RHRelation(ReportHand):
             if has_perm(e)
         )
 
+    def _get_related_ids_map(self, entities):
+        ids_map = defaultdict(list)
+
+        for subject_id, object_id in Relation.objects.filter(
+            subject_entity__in=[entity.id for entity in entities],
+            type=self._rtype,
+        ).values_list('subject_entity_id', 'object_entity_id'):
+            ids_map[subject_id].append(object_id)
+
+        return ids_map
+
+    def _get_related_model_queryset(self):
+        return self._related_model.objects.all()
+
+    def populate(self, entities, user):
+        if self._report_field.sub_report:
+            self._populate_related_instances(entities, user)
+        else:
+            CremeEntity.populate_relations(entities, [self._rtype.id])
+
     def get_linkable_ctypes(self):
         return self._rtype.object_ctypes.all()
 
@@ -528,6 +692,9 @@ class RHFunctionField(ReportHand):
 
         super().__init__(report_field, title=str(funcfield.verbose_name))
 
+    def populate(self, entities, user):
+        self._funcfield.populate_entities(entities, user)
+
     def _get_value_single_on_allowed(self, entity, user, scope):
         return self._funcfield(entity, user).for_csv()
 
@@ -702,6 +869,25 @@ class RHRelated(ReportHand):
     def _get_related_instances(self, entity, user):
         return getattr(entity, self._attr_name).filter(is_deleted=False)
 
+    def _get_related_ids_map(self, entities):
+        fk = self._related_field.field
+        ids_map = defaultdict(list)
+
+        for entity_id, related_id in self._get_related_model_queryset().filter(
+            **{f'{fk.name}__in': [entity.id for entity in entities]}
+        ).values_list(fk.attname, 'id'):
+            ids_map[entity_id].append(related_id)
+
+        return ids_map
+
+    def _get_related_model_queryset(self):
+        return self._related_field.related_model._default_manager.filter(is_deleted=False)
+
+    def populate(self, entities, user):
+        # NB: only the reverse sides of ForeignKeys are managed
+        if self._related_field.one_to_many:
+            self._populate_related_instances(entities, user)
+
     def get_linkable_ctypes(self):
         return (
             ContentType.objects.get_for_model(self._related_field.related_model),
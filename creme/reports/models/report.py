@@ -21,7 +21,7 @@ from __future__ import annotations
 import logging
 # import warnings
 from itertools import chain
-from typing import TYPE_CHECKING, Iterator
+from typing import TYPE_CHECKING, Iterator, Sequence
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -33,6 +33,7 @@ from django.utils.translation import gettext_lazy as _
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.core.entity_filter import EF_USER
 from creme.creme_core.core.field_tags import FieldTag
+from creme.creme_core.core.paginator import FlowPaginator
 from creme.creme_core.models import (
     CremeEntity,
     CremeModel,
@@ -40,6 +41,8 @@ from creme.creme_core.models import (
     FieldsConfig,
 )
 from creme.creme_core.models.fields import EntityCTypeForeignKey
+from creme.creme_core.models.manager import LowNullsQuerySet
+from creme.creme_core.utils.meta import FieldInfo
 
 if TYPE_CHECKING:
     from ..core.report import ReportHand
@@ -59,6 +62,9 @@ class AbstractReport(CremeEntity):
     creation_label = _('Create a report')
     save_label     = _('Save the report')
 
+    # Number of entities retrieved (& populated) at once when the lines are built
+    fetch_page_size = 256
+
     _columns: list[Field] | None = None
 
     class Meta:
@@ -140,15 +146,43 @@ class AbstractReport(CremeEntity):
 
         return {*asc_reports}
 
+    def _get_entities_paginator(self,
+                                entities: models.QuerySet,
+                                per_page: int) -> FlowPaginator:
+        # NB: the natural ordering of the model is kept (the lines of the
+        #     report are ordered like before the pagination) ; the ID is used
+        #     to get a stable order.
+        #     FlowPaginator expects the NULL values to be the lowest values ;
+        #     if the key is nullable, the QuerySet must be a LowNullsQuerySet
+        #     (see CremeEntityManager), so the ID is used as key with other
+        #     QuerySets.
+        model = entities.model
+        ordering = (*model._meta.ordering, 'id')
+        key_field = FieldInfo(model, ordering[0].lstrip('-'))[-1]
+
+        if key_field.null and not isinstance(entities, LowNullsQuerySet):
+            ordering = ('id',)
+
+        return FlowPaginator(
+            queryset=entities.order_by(*ordering),
+            key=ordering[0],
+            per_page=per_page,
+        )
+
     # TODO: move 'user' as first argument + no default value ?
     def _fetch(self,
                limit_to: int | None = None,
                extra_q: models.Q | None = None,
                user=None) -> Iterator[list]:
+        """Generator which yields the values of the columns for each entity.
+        The entities are retrieved page by page, & the columns can populate
+        their data for a whole page (see Field.populate()), so the memory
+        usage does not depend on the number of entities.
+        """
         user = user or get_user_model()(is_superuser=True)
         entities = EntityCredentials.filter(
             user,
-            self.ct.get_all_objects_for_this_type(is_deleted=False),
+            self.ct.model_class()._default_manager.filter(is_deleted=False),
         )
 
         if self.filter is not None:
@@ -157,33 +191,62 @@ class AbstractReport(CremeEntity):
         if extra_q is not None:
             entities = entities.filter(extra_q)
 
-        if limit_to:
-            entities = entities[:limit_to]
-
         fields = self.filtered_columns
-
-        for entity in entities:
-            yield [
-                field.get_value(entity, scope=entities, user=user)
-                for field in fields
-            ]
-
-    # TODO: transform into generator (--> StreamResponse)
-    def fetch_all_lines(self,
-                        limit_to: int | None = None,
-                        extra_q: models.Q | None = None,
-                        user=None) -> list[list[str]]:
+        paginator = self._get_entities_paginator(
+            entities,
+            per_page=max(min(limit_to, self.fetch_page_size), 2)
+            if limit_to else self.fetch_page_size,
+        )
+        count = 0
+
+        for entities_page in paginator.pages():
+            page_entities = entities_page.object_list
+            user.populate_credentials(page_entities)
+
+            for field in fields:
+                field.populate(page_entities, user)
+
+            for entity in page_entities:
+                # NB: the scope is the whole queryset (used by aggregates)
+                yield [
+                    field.get_value(entity, scope=entities, user=user)
+                    for field in fields
+                ]
+
+                count += 1
+                if count == limit_to:
+                    return
+
+    def iter_lines(self,
+                   limit_to: int | None = None,
+                   extra_q: models.Q | None = None,
+                   user=None) -> Iterator[list[str]]:
+        """Generator which yields the lines of the report (a line is a list of
+        strings) ; the lines are built lazily, so a huge report can be streamed.
+        @param limit_to: Approximate maximum number of lines ; the lines of an
+               entity are never truncated (an entity can produce several lines
+               with the selected sub-reports). <None> means "no limit".
+        @param extra_q: Instance of Q used to filter the entities.
+        @param user: Instance of get_user_model() used to check the credentials.
+        """
         from ..core.report import ExpandableLine  # Lazy loading
 
-        lines = []
+        count = 0
 
         for values in self._fetch(limit_to=limit_to, extra_q=extra_q, user=user):
-            lines.extend(ExpandableLine(values).get_lines())
+            lines = ExpandableLine(values).get_lines()
+            yield from lines
 
-            if limit_to is not None and len(lines) >= limit_to:  # Meh
-                break  # TODO: test
+            count += len(lines)
+            if limit_to is not None and count >= limit_to:
+                break
 
-        return lines
+    def fetch_all_lines(self,
+                        limit_to: int | None = None,
+                        extra_q: models.Q | None = None,
+                        user=None) -> list[list[str]]:
+        "Get all the lines in a list ; see iter_lines()."
+        return [*self.iter_lines(limit_to=limit_to, extra_q=extra_q, user=user)]
 
     def get_children_fields_flat(self) -> Iterator[Field]:
         return chain.from_iterable(
@@ -293,6 +356,16 @@ class Field(CremeModel):
 
         return children
 
+    def populate(self, entities: Sequence[CremeEntity], user) -> None:
+        """Retrieve the data needed by get_value() for several entities at once
+        (in order to reduce the number of queries).
+        @param entities: Sequence of CremeEntities (like a page of entities).
+        @param user: User instance.
+        """
+        hand = self.hand
+        if hand:
+            hand.populate(entities, user)
+
     def get_value(self,
                   entity: CremeEntity | None,
                   user,
@@ -1,6 +1,7 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from functools import partial
+from unittest.mock import patch
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -35,6 +36,8 @@ from creme.creme_core.models import (
     CustomField,
     CustomFieldInteger,
     EntityFilter,
+    FakeActivity,
+    FakeActivityType,
     FakeContact,
 )
 from creme.creme_core.models import FakeDocument as FakeCoreDocument
@@ -51,16 +54,19 @@ from creme.creme_core.models import (
     FakePosition,
     FieldsConfig,
     HeaderFilter,
+    Language,
     Relation,
     RelationType,
     SetCredentials,
 )
+from creme.creme_core.models.manager import LowNullsQuery, LowNullsQuerySet
 from creme.creme_core.tests.fake_constants import (
     FAKE_REL_OBJ_BILL_ISSUED,
     FAKE_REL_OBJ_EMPLOYED_BY,
     FAKE_REL_SUB_EMPLOYED_BY,
 )
 from creme.creme_core.tests.views.base import BrickTestCaseMixin
+from creme.creme_core.utils.profiling import CaptureQueriesContext
 from creme.creme_core.utils.xlrd_utils import XlrdReader
 
 from ..actions import ExportReportAction
@@ -144,6 +150,10 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
     def _build_export_url(report):
         return reverse('reports__export_report', args=(report.id,))
 
+    @staticmethod
+    def _get_csv_content(response):
+        return b''.join(response.streaming_content).decode()
+
     @staticmethod
     def _build_preview_url(report):
         return reverse('reports__export_report_preview', args=(report.id,))
@@ -1205,11 +1215,12 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
 
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
         self.assertEqual('doc_type=csv', response.request['QUERY_STRING'])
+        self.assertTrue(response.streaming)
         self.assertEqual(
             '"{}","{}","{}","{}"\r\n'.format(
                 _('Name'), _('Owner user'), rt.predicate, _('Properties'),
             ),
-            response.content.decode(),
+            self._get_csv_content(response),
         )
 
     def test_report_csv02(self):
@@ -1223,7 +1234,7 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
             self._build_export_url(report), data={'doc_type': 'csv'},
         )
 
-        content = (s for s in response.content.decode().split('\r\n') if s)
+        content = (s for s in self._get_csv_content(response).split('\r\n') if s)
         self.assertEqual(
             smart_str('"{}","{}","{}","{}"'.format(
                 _('Last name'), _('Owner user'), _('owns'), _('Properties'),
@@ -1258,7 +1269,7 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
             },
         )
 
-        content = [s for s in response.content.decode().split('\r\n') if s]
+        content = [s for s in self._get_csv_content(response).split('\r\n') if s]
         self.assertEqual(3, len(content))
 
         self.assertEqual(f'"Ayanami","{user}","","Kawaii"', content[1])
@@ -1284,7 +1295,7 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
             },
         )
 
-        content = [s for s in response.content.decode().split('\r\n') if s]
+        content = [s for s in self._get_csv_content(response).split('\r\n') if s]
         self.assertEqual(2, len(content))
         self.assertEqual(f'"Baby","{user}","",""', content[1])
 
@@ -1341,7 +1352,7 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
 
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
 
-        content = (s for s in response.content.decode().split('\r\n') if s)
+        content = (s for s in self._get_csv_content(response).split('\r\n') if s)
         self.assertEqual(smart_str('"{}"'.format(_('Last name'))), next(content))
 
         self.assertEqual('"Ayanami"',   next(content))
@@ -1364,7 +1375,7 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
 
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
 
-        content = (s for s in response.content.decode().split('\r\n') if s)
+        content = (s for s in self._get_csv_content(response).split('\r\n') if s)
         self.assertEqual(smart_str('"{}"'.format(_('Last name'))), next(content))
 
         self.assertEqual('"Ayanami"',   next(content))
@@ -1389,7 +1400,7 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
 
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
 
-        content = (s for s in response.content.decode().split('\r\n') if s)
+        content = (s for s in self._get_csv_content(response).split('\r\n') if s)
         self.assertEqual(
             smart_str('"{}","is an employee of"'.format(_('Last name'))),
             next(content),
@@ -2256,6 +2267,110 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
             report.fetch_all_lines(),
         )
 
+    def test_fetch_pages(self):
+        "Entities are retrieved & populated page by page."
+        user = self.login()
+
+        cfield = CustomField.objects.create(
+            content_type=FakeContact, name='Size', field_type=CustomField.INT,
+        )
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        contacts = [create_contact(last_name=f'Mister {i}') for i in (3, 0, 4, 2, 1)]
+
+        create_cvalue = partial(CustomFieldInteger.objects.create, custom_field=cfield)
+        for i, contact in enumerate(contacts):
+            create_cvalue(entity=contact, value=150 + i)
+
+        report = self._create_simple_contacts_report('Contacts report')
+        Field.objects.create(report=report, name=str(cfield.id), type=RFT_CUSTOM, order=2)
+
+        with patch.object(Report, 'fetch_page_size', 2):
+            lines = report.iter_lines()
+            self.assertNotIsInstance(lines, list)
+
+            with CaptureQueriesContext() as ctxt:
+                lines = [*lines]
+
+            # Natural ordering of the model (not the ID)
+            self.assertListEqual(
+                [
+                    ['Mister 0', '151'],
+                    ['Mister 1', '154'],
+                    ['Mister 2', '153'],
+                    ['Mister 3', '150'],
+                    ['Mister 4', '152'],
+                ],
+                lines,
+            )
+
+            # The custom values are retrieved once per page
+            table_name = CustomFieldInteger._meta.db_table
+            self.assertEqual(
+                3, len([sql for sql in ctxt.captured_sql if table_name in sql]),
+            )
+
+            self.assertListEqual(
+                [['Mister 0', '151'], ['Mister 1', '154']],
+                report.fetch_all_lines(limit_to=2),
+            )
+            self.assertListEqual(
+                [['Mister 0', '151']], report.fetch_all_lines(limit_to=1),
+            )
+
+    def test_fetch_pages_nullable_ordering(self):
+        "The first ordering field of the model is nullable ('-start')."
+        user = self.login()
+
+        atype = FakeActivityType.objects.first()
+        create_activity = partial(FakeActivity.objects.create, user=user, type=atype)
+        create_activity(title='Meeting #1', start=now() - timedelta(days=2))
+        create_activity(title='Meeting #2')
+        create_activity(title='Meeting #3', start=now() - timedelta(days=1))
+        create_activity(title='Meeting #4')
+        create_activity(title='Meeting #5', start=now())
+
+        report = Report.objects.create(user=user, name='Activities', ct=FakeActivity)
+        Field.objects.create(report=report, name='title', type=RFT_FIELD, order=1)
+
+        # The lines are ordered like the activities (not by ID)
+        expected = [
+            [f'Meeting #{i}'] for i in (5, 3, 1, 2, 4)
+        ]
+        self.assertListEqual(
+            expected,
+            [[a.title] for a in FakeActivity.objects.filter(user=user).order_by('-start', 'id')],
+        )
+
+        with patch.object(Report, 'fetch_page_size', 2):
+            self.assertListEqual(expected, [*report.iter_lines()])
+
+    def test_entities_paginator_nullable_key(self):
+        "NULL values must be the lowest ones whatever the DBMS."
+        report = Report(name='Activities', ct=FakeActivity)
+
+        # CremeEntityManager => LowNullsQuerySet => key of the model's ordering
+        paginator = report._get_entities_paginator(
+            FakeActivity.objects.filter(is_deleted=False), per_page=10,
+        )
+        self.assertEqual('-start', paginator.key)
+        self.assertIsInstance(paginator.queryset, LowNullsQuerySet)
+        self.assertIsInstance(paginator.queryset.query, LowNullsQuery)
+        self.assertListEqual(['-start', 'id'], [*paginator.queryset.query.order_by])
+
+        # Regular QuerySet => the ordering of NULL values depends on the DBMS
+        paginator = report._get_entities_paginator(
+            FakeActivity._base_manager.filter(is_deleted=False), per_page=10,
+        )
+        self.assertEqual('id', paginator.key)
+        self.assertListEqual(['id'], [*paginator.queryset.query.order_by])
+
+        # Not nullable key
+        paginator = report._get_entities_paginator(
+            FakeContact._base_manager.all(), per_page=10,
+        )
+        self.assertEqual('last_name', paginator.key)
+
     @override_settings(USE_L10N=True)
     @override_language('en')
     def test_fetch_field_02(self):
@@ -3295,6 +3410,62 @@ class ReportTestCase(BrickTestCaseMixin, BaseReportsTestCase):
             report_orga.fetch_all_lines(),
         )
 
+    def test_fetch_populate(self):
+        "Sub-reports, FK & M2M are retrieved for the whole page."
+        user = self.login()
+        self._aux_test_fetch_persons()
+
+        report_contact = self.report_contact
+        create_field = partial(Field.objects.create, report=report_contact, type=RFT_FIELD)
+        create_field(name='image__name', order=3)
+        create_field(name='languages',   order=4)
+
+        report_orga = self.report_orga
+        Field.objects.create(
+            report=report_orga, name=FAKE_REL_OBJ_EMPLOYED_BY, order=2,
+            type=RFT_RELATION, selected=True, sub_report=report_contact,
+        )
+
+        def create_contacts(orga, count):
+            languages = [*Language.objects.all()[:2]]
+
+            for i in range(count):
+                contact = FakeContact.objects.create(
+                    user=user, first_name=f'Member #{i}', last_name=orga.name,
+                    image=FakeImage.objects.create(user=user, name=f'Pic of {orga}#{i}'),
+                )
+                contact.languages.set(languages[:i])
+                Relation.objects.create(
+                    user=user, subject_entity=orga,
+                    type_id=FAKE_REL_OBJ_EMPLOYED_BY, object_entity=contact,
+                )
+
+        create_contacts(self.starks, 2)
+        report_orga.fetch_all_lines()  # Fill the caches (ContentTypes etc...)
+
+        with CaptureQueriesContext() as ctxt1:
+            report_orga.fetch_all_lines()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        create_contacts(self.lannisters, 3)
+        create_contacts(create_orga(name='House Tully'), 3)
+        create_contacts(create_orga(name='House Greyjoy'), 2)
+
+        with CaptureQueriesContext() as ctxt2:
+            lines = report_orga.fetch_all_lines()
+
+        self.assertEqual(len(ctxt1), len(ctxt2))
+
+        # The values are the same without population
+        with patch.object(Field, 'populate'):
+            self.assertListEqual(report_orga.fetch_all_lines(), lines)
+
+        self.assertIn(
+            ['House Tully', 'House Tully', 'Member #1', 'Pic of House Tully#1',
+             str(Language.objects.first())],
+            lines,
+        )
+
     def _aux_test_fetch_aggregate(self, invalid_ones=False):
         user = self.login()
         self._aux_test_fetch_persons(create_contacts=False, report_4_contact=False)
@@ -28,6 +28,7 @@ from django.utils.translation import pgettext_lazy
 
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.core.exceptions import ConflictError
+from creme.creme_core.global_info import iter_in_request_context
 from creme.creme_core.views import generic
 
 from .. import get_report_model
@@ -135,6 +136,16 @@ class Export(generic.base.EntityRelatedMixin, generic.CheckedView):
 
         return form
 
+    @staticmethod
+    def generate_rows(*, report, extra_q, user):
+        """Generator which yields the rows of the exported file (the first one
+        is the header) ; the lines of the report are built lazily.
+        """
+        yield [smart_str(column.title) for column in report.get_children_fields_flat()]
+
+        for line in report.iter_lines(extra_q=extra_q, user=user):
+            yield [smart_str(value) for value in line]
+
     def get(self, request, *args, **kwargs):
         user = request.user
         report = self.get_related_entity()
@@ -146,15 +157,20 @@ class Export(generic.base.EntityRelatedMixin, generic.CheckedView):
         if writer is None:
             raise ConflictError('Unknown extension')
 
-        writerow = writer.writerow
+        rows = self.generate_rows(report=report, extra_q=q_filter, user=user)
+        filename = smart_str(report.name)
 
-        writerow([
-            smart_str(column.title) for column in report.get_children_fields_flat()
-        ])
+        if writer.streaming:
+            return writer.get_streaming_response(
+                rows=iter_in_request_context(rows, user),
+                filename=filename,
+                user=user,
+            )
 
-        for line in report.fetch_all_lines(extra_q=q_filter, user=user):
-            writerow([smart_str(value) for value in line])
+        writerow = writer.writerow
+        for row in rows:
+            writerow(row)
 
-        writer.save(smart_str(report.name), user)
+        writer.save(filename, user)
 
         return writer.response
@@ -76,6 +76,111 @@ DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 # - the paginator only allows to go to the next & the previous pages (& the main query is faster).
 FAST_QUERY_MODE_THRESHOLD = 100000
 
+# How the list-views count the entities ; computing the exact number of entities
+# can be slower than retrieving the displayed page with big tables.
+# Possible values:
+#  - 'exact': the exact number is computed.
+#  - 'capped': the entities are counted until LISTVIEW_COUNT_CAP is exceeded ;
+#    in this case "10000+" (with the default cap) is displayed.
+#  - 'estimated': the number is estimated by the planner of the database when
+#    the estimation exceeds LISTVIEW_COUNT_CAP (the behaviour is 'capped' otherwise).
+#    Only available with PostgreSQL ('capped' is used with other databases).
+# Notice that the fast-mode (see FAST_QUERY_MODE_THRESHOLD) is always used when
+# the count is not exact.
+LISTVIEW_COUNT_MODE = 'exact'
+LISTVIEW_COUNT_CAP = 10000
+
+# When the number of entities to export from a list-view reaches this value,
+# the file is generated by a job (the user downloads it when the job is
+# finished) instead of being generated during the HTTP request.
+# <None> means that the value of FAST_QUERY_MODE_THRESHOLD is used.
+MASS_EXPORT_JOB_THRESHOLD = None
+
+# The configuration instances which are read in almost all the requests
+# (FieldsConfig, CustomFields, SettingValues, HeaderFilters, EntityFilters,
+# detail-views bricks configuration...) can be stored in a cache which is
+# shared between the requests (see 'creme_core.core.cache').
+# The value is the name of a cache in CACHES (<None> means "disabled").
+# BEWARE: the cache must be shared by all the processes of Creme (web servers
+#   & job manager), like the Memcached backends of Django ; the values
+#   are invalidated with signals, so a per-process cache (like the default
+#   cache 'LocMemCache') would return obsolete values to the other processes.
+# Example:
+#   CACHES = {
+#       'default': {...},
+#       'config': {
+#           'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+#           'LOCATION': '127.0.0.1:11211',
+#       },
+#   }
+#   CONFIG_CACHE = 'config'
+CONFIG_CACHE = None
+
+# Lifetime of the values stored in the configuration cache (in seconds).
+CONFIG_CACHE_TIMEOUT = 3600
+
+# The HTML of some bricks of the detail-views (see the attribute
+# 'Brick.cache_render') can be stored in a cache, in order to avoid rendering
+# them again when their data have not changed (see 'creme_core.core.brick_cache').
+# The value is the name of a cache in CACHES (<None> means "disabled") ; the
+# cache must be shared by all the processes of Creme (see CONFIG_CACHE).
+BRICK_CACHE = None
+
+# Lifetime of the fragments stored in the bricks cache (in seconds).
+BRICK_CACHE_TIMEOUT = 600
+
+# Number of threads used by the views which reload the bricks to render at the
+# same time the bricks which accept it (see 'Brick.concurrent_render') ; the
+# threads are shared by all the requests of a process, & each thread uses its
+# own connection to the database (so take care of the maximum number of
+# connections of your DB server).
+# 0 means that the bricks are rendered sequentially by the thread of the request.
+BRICK_RELOAD_WORKERS = 0
+
+# Budget of the rendering of a brick, when BRICK_RELOAD_WORKERS > 0: maximum
+# duration (in seconds) & maximum number of queries (0 means "no limit").
+# The bricks which exceed it are displayed as errors (instead of blocking the
+# reloading of all the bricks).
+BRICK_RELOAD_TIMEOUT = 5
+BRICK_RELOAD_MAX_QUERIES = 500
+
+# Back-end used by the global search & the quick search (class inheriting
+# 'creme.creme_core.core.search.SearchBackend'). Available back-ends:
+#  - 'creme.creme_core.core.search.RegularSearchBackend': the fields of the
+#    entities are searched directly (no index is used).
+#  - 'creme.creme_core.core.search.IndexSearchBackend': a denormalized table
+#    (see 'creme_core.models.SearchDocument') is searched, with an index of
+#    trigrams with PostgreSQL (the extension "pg_trgm" must be available) or a
+#    full-text table with SQLite (FTS5) ; the results are ordered by relevance.
+#    The table is updated when the entities are saved, but it must be built
+#    with the command "creme_search_index" when the back-end is activated &
+#    after each modification of the search configuration.
+SEARCH_BACKEND = 'creme.creme_core.core.search.RegularSearchBackend'
+
+# Number of threads used by the global search & the quick search to search in
+# the different types of entity at the same time ; the threads are shared by
+# all the requests of a process, & each thread uses its own connection to the
+# database (so take care of the maximum number of connections of your DB server).
+# 0 means that the types are searched sequentially by the thread of the request.
+SEARCH_WORKERS = 0
+
+# Time budget (in seconds) of the search in a type of entity, when
+# SEARCH_WORKERS > 0 ; the types which exceed it are displayed as interrupted
+# (instead of blocking all the results).
+SEARCH_TIMEOUT = 3
+
+# The imprints (i.e. the consultations of the detail-views, see
+# 'creme_core.core.imprint') can be buffered & written by groups, instead of
+# being written during the request of the detail-view. This value is the size
+# of the buffer (0 means "no buffer"). The recent imprints are then tracked
+# with the default cache (see CACHES) ; use a cache shared between the
+# processes (like Memcached) to avoid duplicated imprints.
+IMPRINT_BUFFER_SIZE = 0
+
+# Maximum age (in seconds) of the buffered imprints ; the older ones are
+# written at the end of the next request (after the response is sent).
+IMPRINT_BUFFER_DELAY = 60
+
 # JOBS #########################################################################
 # Maximum number of not finished jobs each user can have at the same time.
 #  When this number is reached for a user, he must wait one of his
@@ -95,6 +200,22 @@ MAX_JOBS_PER_USER = 2
 # periodicity can be precisely managed).
 MAX_USER_JOBS = 5
 
+# Number of pre-initialized ("warm") processes which are kept by the job
+# scheduler to run the jobs. With the value 0, each job is run in a new
+# process, which must initialize Django & all the apps before doing any work.
+# Notice that the limits on the running jobs (see MAX_USER_JOBS) are the same
+# with or without workers (extra workers are started if needed).
+JOBMANAGER_WORKERS = 0
+
+# A worker is stopped & replaced by a new one when it has run this number of
+# jobs (0 means "no limit")...
+JOBMANAGER_WORKER_MAX_JOBS = 100
+
+# ... or when its resident memory exceeds this size (in MB ; 0 means "no limit").
+# Notice that the memory used by a process is only available on some platforms
+# (like Linux).
+JOBMANAGER_WORKER_MAX_MEMORY = 512
+
 # 'security' period for pseudo-periodic jobs : they will be run at least with
 # this periodicity, even if they do not receive a new request (in order to reduce
 # the effects of an hypothetical redis problem).
@@ -123,6 +244,13 @@ PSEUDO_PERIOD = 1  # In hours
 #           have to indicate the parent directory.
 JOBMANAGER_BROKER = 'redis://@localhost:6379/0'
 
+# The lines of history which are buffered (e.g. by the mass import, see
+# 'creme_core.models.HistoryLine.buffered()') are queued & written by a system
+# job instead of the current process/request.
+# It reduces the duration of the large operations, but the history is
+# completed a bit later.
+HISTORY_ASYNC_FLUSH = False
+
 
 # AUTHENTICATION ###############################################################
 
@@ -1338,9 +1466,16 @@ EMAILCAMPAIGN_PASSWORD  = ''
 EMAILCAMPAIGN_PORT      = 25
 EMAILCAMPAIGN_USE_TLS   = True
 
-# Emails are sent by chunks, and sleep between 2 chunks.
+# Maximum number of emails sent per second (0 means "no limit") ; it's useful
+# to avoid the emails to be classed as spam.
+EMAILCAMPAIGN_RATE = 20
+# Number of emails which can be sent in a burst (i.e. without limit of rate,
+# after a pause).
 EMAILCAMPAIGN_SIZE = 40
-EMAILCAMPAIGN_SLEEP_TIME = 2
+# Number of connections to the SMTP server used to send the emails (each
+# connection is used by its own thread) ; 1 means that the emails are sent
+# sequentially by the thread of the job.
+EMAILCAMPAIGN_CONNECTIONS = 1
 
 # Sketch -----------------------------------------------------------------------
 SKETCH_ENABLE_DEMO_BRICKS = False